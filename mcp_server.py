@@ -3,6 +3,10 @@
 MCP Server for HWP/HWPX Toolkit.
 
 Exposes the hwp-toolkit scripts as MCP tools that Claude can call directly.
+Tools are async; their work runs on bounded thread/process pools (hwp_pool),
+so a long conversion does not block other requests. Reads, conversions, edits
+and creation report progress to clients that ask for it, and stop when the
+client cancels the request.
 Run with the project's .venv Python interpreter:
     .venv/bin/python mcp_server.py
 
@@ -13,6 +17,8 @@ Configure in Claude Code via .mcp.json (project-level) or:
 import os
 import sys
 import json
+import asyncio
+import tempfile
 
 # macOS: ensure Homebrew libraries are findable for WeasyPrint
 if sys.platform == "darwin":
@@ -28,47 +34,275 @@ SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"
 if SCRIPTS_DIR not in sys.path:
     sys.path.insert(0, SCRIPTS_DIR)
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.types import BlobResourceContents, EmbeddedResource
+
+import hwp_metrics
+import hwp_profile
+from hwp_pool import Offload
+from hwp_session import SessionStore
+from hwp_warmup import WarmUp, timings as warm_timings
 
 mcp = FastMCP("hwp-toolkit")
 
+# Tool bodies run off the event loop: reads/analysis and creation on threads,
+# edits and conversions (PDF rendering, python-hwpx parsing) on processes.
+# Calls on open sessions run on threads, next to the cached documents.
+# Limits per class: HWP_MCP_<READ|CREATE|EDIT|CONVERT|SESSION>_<WORKERS|QUEUE>.
+offload = Offload()
+
+# Documents opened with hwp_open, parsed once and kept in memory
+# (HWP_MCP_SESSION_MB, HWP_MCP_SESSIONS).
+sessions = SessionStore()
+
+# Backends preloaded at startup on a background thread (HWP_MCP_WARMUP).
+warmup = WarmUp(offload)
+
+# Stage timings, fallbacks, bytes and cache hits from every tool call (hwp_stats);
+# also written to HWP_MCP_METRICS_FILE every HWP_MCP_METRICS_INTERVAL seconds.
+METRICS_FILE = os.environ.get("HWP_MCP_METRICS_FILE", "")
+METRICS_INTERVAL = float(os.environ.get("HWP_MCP_METRICS_INTERVAL", "15"))
+
+# Tool calls made with profile="cpu|mem|both" write their profiles here.
+PROFILE_DIR = os.environ.get("HWP_MCP_PROFILE_DIR",
+                             os.path.join(tempfile.gettempdir(), "hwp-profile"))
+
+HWPX_MIME = "application/hwp+zip"
+
+
+def _reporter(ctx: Context):
+    """Progress callback for offload.run: notifies the client and lets it cancel the work."""
+    return ctx.report_progress if ctx is not None else None
+
+
+async def _run(work_class: str, label: str, fn, *args, profile: str = "", report=None):
+    """offload.run, profiling the call when ``profile`` is set.
+
+    A profiled call returns {"result": ..., "profile": report} JSON; the report
+    lists the pstats/collapsed-stack/JSON files written under PROFILE_DIR.
+    """
+    if not profile:
+        return await offload.run(work_class, fn, *args, report=report)
+    if profile not in hwp_profile.MODES:
+        raise ValueError(f"지원하지 않는 프로파일: {profile}. 'cpu', 'mem', 'both' 중 하나여야 합니다.")
+    result, prof = await offload.run(work_class, hwp_profile.profiled, profile, PROFILE_DIR, label,
+                                     fn, *args, report=report)
+    return json.dumps({"result": result, "profile": prof}, ensure_ascii=False)
+
+
+def _inline_resource(data: bytes, filename: str, mime_type: str) -> EmbeddedResource:
+    """Wrap generated bytes as an embedded MCP resource so nothing touches disk."""
+    import base64
+
+    return EmbeddedResource(
+        type="resource",
+        resource=BlobResourceContents(
+            uri=f"hwp://inline/{filename}",
+            mimeType=mime_type,
+            blob=base64.b64encode(data).decode("ascii"),
+        ),
+    )
+
 
 # ---------------------------------------------------------------------------
 # Tool 1: Read
 # ---------------------------------------------------------------------------
 
+def _read(
+    input_path: str,
+    output_format: str = "md",
+    sections: str = "",
+    paragraphs: str = "",
+    cursor: str = "",
+    max_chars: int = 0,
+    max_paragraphs: int = 0,
+    progress=None,
+) -> str:
+    """Blocking body of hwp_read; runs on the 'read' worker pool."""
+    if not input_path:
+        raise ValueError("input_path 또는 session이 필요합니다.")
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_path}")
+    if output_format not in ("md", "txt", "json"):
+        raise ValueError(f"지원하지 않는 형식: {output_format}. 'md', 'txt', 'json' 중 하나여야 합니다.")
+
+    from hwp_read import Selection, read_page, write_file, write_json
+    from hwp_sink import MemorySink
+
+    selection = Selection.from_specs(sections, paragraphs)
+    if _paged(selection, cursor, max_chars, max_paragraphs):
+        return json.dumps(read_page(input_path, output_format, cursor, max_chars, max_paragraphs),
+                          ensure_ascii=False)
+    sink = MemorySink()
+    if output_format == "json":
+        write_json(input_path, sink, output_format, selection, progress)
+    else:
+        write_file(input_path, sink, output_format, selection, progress)
+    return sink.getvalue()
+
+
+def _paged(selection, cursor: str, max_chars: int, max_paragraphs: int) -> bool:
+    """True if a read asks for a page; pages and section/paragraph ranges do not mix."""
+    if max_chars < 0 or max_paragraphs < 0:
+        raise ValueError("max_chars와 max_paragraphs는 0 이상이어야 합니다.")
+    paged = bool(cursor or max_chars or max_paragraphs)
+    if paged and not selection.is_all:
+        raise ValueError("cursor/max_chars/max_paragraphs는 sections/paragraphs와 함께 쓸 수 없습니다.")
+    return paged
+
+
+def _session_read(session: str, output_format: str = "md", sections: str = "",
+                  paragraphs: str = "", cursor: str = "", max_chars: int = 0,
+                  max_paragraphs: int = 0) -> str:
+    """Blocking body of hwp_read on an open session; runs on the 'session' worker pool."""
+    if output_format not in ("md", "txt", "json"):
+        raise ValueError(f"지원하지 않는 형식: {output_format}. 'md', 'txt', 'json' 중 하나여야 합니다.")
+
+    from hwp_read import Selection
+    from hwp_sink import MemorySink
+
+    selection = Selection.from_specs(sections, paragraphs)
+    paged = _paged(selection, cursor, max_chars, max_paragraphs)
+    if selection.is_all:
+        selection = None
+    with sessions.use(session) as doc:
+        if paged:
+            return json.dumps(doc.read_page(output_format, cursor, max_chars, max_paragraphs),
+                              ensure_ascii=False)
+        if output_format == "json":
+            return json.dumps({"source": doc.path, "session": doc.handle,
+                               "paragraphs": doc.paragraphs(selection)}, ensure_ascii=False)
+        sink = MemorySink()
+        doc.read(sink, output_format, selection)
+        return sink.getvalue()
+
+
 @mcp.tool()
-def hwp_read(input_path: str, output_format: str = "md") -> str:
+async def hwp_read(
+    input_path: str = "",
+    output_format: str = "md",
+    sections: str = "",
+    paragraphs: str = "",
+    session: str = "",
+    cursor: str = "",
+    max_chars: int = 0,
+    max_paragraphs: int = 0,
+    profile: str = "",
+    ctx: Context = None,
+) -> str:
     """HWP/HWPX 파일에서 텍스트를 추출합니다.
 
     Args:
-        input_path: HWP 또는 HWPX 파일의 절대 경로
+        input_path: HWP 또는 HWPX 파일의 절대 경로 (session을 주면 생략)
         output_format: 출력 형식 — "md" (Markdown, 기본값), "txt" (일반 텍스트), "json"
+        sections: 읽을 섹션 범위 (0부터 시작), 예: "0-2", "0,3,5-" (생략 시 전체)
+        paragraphs: 선택한 섹션 안에서 읽을 단락 범위 "A:B" (생략 시 전체)
+        session: hwp_open으로 연 세션 핸들 — 파일을 다시 파싱하지 않고 메모리의 문서
+            (저장하지 않은 편집 포함)를 읽습니다. json 형식은 단락 번호·섹션·텍스트 목록입니다.
+        cursor: 페이지 읽기 시작 위치 "섹션.단락" — 이전 페이지의 next_cursor (생략 시 처음부터)
+        max_chars: 페이지 최대 글자 수 (0이면 제한 없음). 최소 한 단락은 반환합니다.
+        max_paragraphs: 페이지 최대 단락 수 (0이면 제한 없음)
+        profile: "cpu" | "mem" | "both" — 이 호출을 프로파일링해 pstats, flamegraph용
+            collapsed stack, JSON 요약을 서버의 HWP_MCP_PROFILE_DIR에 씁니다
 
     Returns:
-        지정한 형식의 추출된 텍스트 내용
+        지정한 형식의 추출된 텍스트 내용. cursor/max_chars/max_paragraphs를 주면
+        {"content", "cursor", "next_cursor"} JSON (마지막 페이지의 next_cursor는 null).
+        큰 문서는 max_chars로 나눠 읽으세요. 앞 섹션을 다시 파싱하지 않고 이어 읽습니다.
+        profile을 주면 {"result": 위 내용, "profile": 파일 경로·단계별 시간·상위 함수·할당}.
     """
-    if not os.path.exists(input_path):
-        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_path}")
-    if output_format not in ("md", "txt", "json"):
-        raise ValueError(f"지원하지 않는 형식: {output_format}. 'md', 'txt', 'json' 중 하나여야 합니다.")
-
-    from hwp_read import read_file
-
-    content = read_file(input_path, output_format)
-
-    if output_format == "json":
-        return json.dumps({"source": input_path, "content": content}, ensure_ascii=False, indent=2)
-    return content
+    if session:
+        return await _run("session", "read", _session_read, session, output_format, sections,
+                          paragraphs, cursor, max_chars, max_paragraphs, profile=profile)
+    return await _run("read", "read", _read, input_path, output_format, sections, paragraphs,
+                      cursor, max_chars, max_paragraphs, profile=profile, report=_reporter(ctx))
 
 
 # ---------------------------------------------------------------------------
 # Tool 2: Create
 # ---------------------------------------------------------------------------
 
+def _create(
+    output_path: str = "",
+    title: str = "",
+    author: str = "",
+    body: str = "",
+    markdown_text: str = "",
+    markdown_file: str = "",
+    json_file: str = "",
+    method: str = "python-hwpx",
+    inline: bool = False,
+    progress=None,
+) -> str | EmbeddedResource:
+    """Blocking body of hwp_create; runs on the 'create' worker pool."""
+    if not output_path and not inline:
+        raise ValueError("output_path를 지정하거나 inline=True로 호출해야 합니다.")
+    if output_path and not output_path.endswith(".hwpx"):
+        output_path += ".hwpx"
+    if method not in ("python-hwpx", "md2hwp"):
+        raise ValueError(f"지원하지 않는 방법: {method}. 'python-hwpx' 또는 'md2hwp'여야 합니다.")
+
+    from io import BytesIO
+
+    from hwp_create import (
+        create_hwpx_bytes_via_node,
+        write_hwpx_from_markdown_stream,
+        write_hwpx_from_paragraphs,
+    )
+    from hwp_sink import FileSink
+
+    def build(out):
+        """Write the document into the binary file object ``out``."""
+        if markdown_file:
+            if not os.path.exists(markdown_file):
+                raise FileNotFoundError(f"Markdown 파일을 찾을 수 없습니다: {markdown_file}")
+            with open(markdown_file, "r", encoding="utf-8") as f:
+                if method == "md2hwp":
+                    out.write(create_hwpx_bytes_via_node(f.read(), title, author, progress))
+                else:
+                    write_hwpx_from_markdown_stream(out, f, title, author)
+
+        elif markdown_text:
+            if method == "md2hwp":
+                out.write(create_hwpx_bytes_via_node(markdown_text, title, author, progress))
+            else:
+                write_hwpx_from_markdown_stream(out, markdown_text, title, author)
+
+        elif json_file:
+            if not os.path.exists(json_file):
+                raise FileNotFoundError(f"JSON 파일을 찾을 수 없습니다: {json_file}")
+            with open(json_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            write_hwpx_from_paragraphs(
+                out,
+                data.get("title", title),
+                data.get("author", author),
+                data.get("paragraphs", []),
+                data.get("tables", []),
+            )
+
+        elif body:
+            paragraphs = [p for p in body.split("\n") if p.strip()]
+            write_hwpx_from_paragraphs(out, title, author, paragraphs)
+
+        else:
+            raise ValueError("body, markdown_text, markdown_file, json_file 중 하나를 제공해야 합니다.")
+
+    if inline:
+        buf = BytesIO()
+        build(buf)
+        name = os.path.basename(output_path) if output_path else "document.hwpx"
+        return _inline_resource(buf.getvalue(), name, HWPX_MIME)
+
+    # 임시 파일에 쓰고 성공했을 때만 교체 (검증 오류·취소 시 빈 파일을 남기지 않음)
+    with FileSink(output_path, binary=True) as sink:
+        build(sink.stream)
+    return f"생성 완료: {output_path}"
+
+
 @mcp.tool()
-def hwp_create(
-    output_path: str,
+async def hwp_create(
+    output_path: str = "",
     title: str = "",
     author: str = "",
     body: str = "",
@@ -76,11 +310,14 @@ def hwp_create(
     markdown_file: str = "",
     json_file: str = "",
     method: str = "python-hwpx",
-) -> str:
+    inline: bool = False,
+    profile: str = "",
+    ctx: Context = None,
+) -> str | EmbeddedResource:
     """새 HWPX 파일을 텍스트, Markdown, 또는 JSON 내용으로 생성합니다.
 
     Args:
-        output_path: 생성할 .hwpx 파일의 절대 경로
+        output_path: 생성할 .hwpx 파일의 절대 경로 (inline=True이면 생략 가능)
         title: 문서 제목
         author: 문서 작성자
         body: 일반 텍스트 본문 (\\n으로 단락 구분)
@@ -88,78 +325,34 @@ def hwp_create(
         markdown_file: Markdown 파일 경로 (.md)
         json_file: 구조화된 JSON 파일 경로 ({"title","author","paragraphs","tables"} 형식)
         method: 생성 방법 — "python-hwpx" (기본값, 빠름) 또는 "md2hwp" (Markdown 서식 보존)
+        inline: True이면 파일을 쓰지 않고 HWPX를 base64 리소스로 바로 반환
+        profile: "cpu" | "mem" | "both" — 이 호출을 프로파일링 (hwp_read 참고, inline과 함께 쓸 수 없음)
 
     Returns:
-        생성된 파일의 경로
+        생성된 파일의 경로, 또는 inline=True일 때 HWPX 리소스
+        (profile을 주면 {"result", "profile"} JSON)
     """
-    if not output_path.endswith(".hwpx"):
-        output_path += ".hwpx"
-    if method not in ("python-hwpx", "md2hwp"):
-        raise ValueError(f"지원하지 않는 방법: {method}. 'python-hwpx' 또는 'md2hwp'여야 합니다.")
-
-    from hwp_create import (
-        create_hwpx_from_paragraphs,
-        create_hwpx_from_markdown_via_node,
-        parse_markdown_to_structure,
-    )
-
-    if markdown_file:
-        if not os.path.exists(markdown_file):
-            raise FileNotFoundError(f"Markdown 파일을 찾을 수 없습니다: {markdown_file}")
-        with open(markdown_file, "r", encoding="utf-8") as f:
-            md_text = f.read()
-        if method == "md2hwp":
-            create_hwpx_from_markdown_via_node(output_path, md_text, title, author)
-        else:
-            struct = parse_markdown_to_structure(md_text)
-            create_hwpx_from_paragraphs(output_path, title, author, struct["paragraphs"], struct["tables"])
-
-    elif markdown_text:
-        if method == "md2hwp":
-            create_hwpx_from_markdown_via_node(output_path, markdown_text, title, author)
-        else:
-            struct = parse_markdown_to_structure(markdown_text)
-            create_hwpx_from_paragraphs(output_path, title, author, struct["paragraphs"], struct["tables"])
-
-    elif json_file:
-        if not os.path.exists(json_file):
-            raise FileNotFoundError(f"JSON 파일을 찾을 수 없습니다: {json_file}")
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        create_hwpx_from_paragraphs(
-            output_path,
-            data.get("title", title),
-            data.get("author", author),
-            data.get("paragraphs", []),
-            data.get("tables", []),
-        )
-
-    elif body:
-        paragraphs = [p for p in body.split("\n") if p.strip()]
-        create_hwpx_from_paragraphs(output_path, title, author, paragraphs)
-
-    else:
-        raise ValueError("body, markdown_text, markdown_file, json_file 중 하나를 제공해야 합니다.")
-
-    return f"생성 완료: {output_path}"
+    if profile and inline:
+        raise ValueError("profile은 inline 반환과 함께 쓸 수 없습니다.")
+    return await _run("create", "create", _create, output_path, title, author, body, markdown_text,
+                      markdown_file, json_file, method, inline, profile=profile,
+                      report=_reporter(ctx))
 
 
 # ---------------------------------------------------------------------------
 # Tool 3: Convert
 # ---------------------------------------------------------------------------
 
-@mcp.tool()
-def hwp_convert(input_path: str, target_format: str, output_path: str = "") -> str:
-    """HWP/HWPX 파일을 다른 형식으로 변환합니다.
-
-    Args:
-        input_path: 입력 HWP 또는 HWPX 파일의 절대 경로
-        target_format: 대상 형식 — "pdf", "md", "html", "txt", "odt"
-        output_path: 출력 파일 경로 (생략 시 자동 생성)
-
-    Returns:
-        출력 파일 경로 (pdf/odt), 또는 텍스트 내용 (md/html/txt에서 output_path 생략 시)
-    """
+def _convert(
+    input_path: str,
+    target_format: str,
+    output_path: str = "",
+    sections: str = "",
+    paragraphs: str = "",
+    inline: bool = False,
+    progress=None,
+) -> str | EmbeddedResource:
+    """Blocking body of hwp_convert; runs on the 'convert' worker pool."""
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_path}")
 
@@ -168,56 +361,95 @@ def hwp_convert(input_path: str, target_format: str, output_path: str = "") -> s
         raise ValueError(f"지원하지 않는 형식: {target_format}. {valid_formats} 중 하나여야 합니다.")
 
     from hwp_convert import (
-        convert_to_markdown,
-        convert_to_text,
-        convert_to_html,
+        write_markdown,
+        write_text,
+        write_html,
         convert_to_pdf,
+        convert_to_pdf_bytes,
         convert_to_odt,
     )
+    from hwp_read import Selection
+    from hwp_sink import FileSink, MemorySink
+
+    selection = Selection.from_specs(sections, paragraphs)
+    if target_format == "odt" and not selection.is_all:
+        raise ValueError("odt 변환에서는 sections/paragraphs 범위 지정을 지원하지 않습니다.")
 
     ext_map = {"pdf": ".pdf", "md": ".md", "html": ".html", "txt": ".txt", "odt": ".odt"}
     base = os.path.splitext(input_path)[0]
     resolved_output = output_path or (base + ext_map[target_format])
 
+    if inline and target_format == "odt":
+        raise ValueError("odt 변환은 inline 반환을 지원하지 않습니다 (hwp5odt가 파일로만 출력).")
+
+    if inline and target_format == "pdf":
+        data = convert_to_pdf_bytes(input_path, selection, progress)
+        name = os.path.splitext(os.path.basename(input_path))[0] + ".pdf"
+        return _inline_resource(data, name, "application/pdf")
+
     if target_format == "pdf":
-        convert_to_pdf(input_path, resolved_output)
+        convert_to_pdf(input_path, resolved_output, selection, progress)
         return f"PDF 생성 완료: {resolved_output}"
 
-    elif target_format == "md":
-        content = convert_to_markdown(input_path)
-        if output_path:
-            with open(resolved_output, "w", encoding="utf-8") as f:
-                f.write(content)
-            return f"Markdown 저장 완료: {resolved_output}"
-        return content
-
-    elif target_format == "html":
-        content = convert_to_html(input_path)
-        if output_path:
-            with open(resolved_output, "w", encoding="utf-8") as f:
-                f.write(content)
-            return f"HTML 저장 완료: {resolved_output}"
-        return content
-
-    elif target_format == "txt":
-        content = convert_to_text(input_path)
-        if output_path:
-            with open(resolved_output, "w", encoding="utf-8") as f:
-                f.write(content)
-            return f"텍스트 저장 완료: {resolved_output}"
-        return content
-
     elif target_format == "odt":
-        convert_to_odt(input_path, resolved_output)
+        convert_to_odt(input_path, resolved_output, progress)
         return f"ODT 생성 완료: {resolved_output}"
 
+    writers = {
+        "md": (write_markdown, "Markdown 저장 완료"),
+        "html": (write_html, "HTML 저장 완료"),
+        "txt": (write_text, "텍스트 저장 완료"),
+    }
+    writer, saved_msg = writers[target_format]
+
+    # 출력 경로가 있으면 파일로 바로 스트리밍, 없으면 메모리에 모아 반환
+    if output_path and not inline:
+        with FileSink(resolved_output) as sink:
+            writer(input_path, sink, selection=selection, progress=progress)
+        return f"{saved_msg}: {resolved_output}"
+
+    sink = MemorySink()
+    writer(input_path, sink, selection=selection, progress=progress)
+    return sink.getvalue()
+
+
+@mcp.tool()
+async def hwp_convert(
+    input_path: str,
+    target_format: str,
+    output_path: str = "",
+    sections: str = "",
+    paragraphs: str = "",
+    inline: bool = False,
+    profile: str = "",
+    ctx: Context = None,
+) -> str | EmbeddedResource:
+    """HWP/HWPX 파일을 다른 형식으로 변환합니다.
+
+    Args:
+        input_path: 입력 HWP 또는 HWPX 파일의 절대 경로
+        target_format: 대상 형식 — "pdf", "md", "html", "txt", "odt"
+        output_path: 출력 파일 경로 (생략 시 자동 생성)
+        sections: 변환할 섹션 범위 (0부터 시작), 예: "0-2", "0,3,5-" (생략 시 전체, odt 미지원)
+        paragraphs: 선택한 섹션 안에서 변환할 단락 범위 "A:B" (생략 시 전체, odt 미지원)
+        inline: True이면 파일을 쓰지 않고 결과를 바로 반환 (pdf는 base64 리소스, odt 미지원)
+        profile: "cpu" | "mem" | "both" — 이 호출을 프로파일링 (hwp_read 참고, inline과 함께 쓸 수 없음)
+
+    Returns:
+        출력 파일 경로 (pdf/odt), 또는 텍스트 내용 (md/html/txt에서 output_path 생략 시),
+        또는 inline=True일 때 PDF 리소스 (profile을 주면 {"result", "profile"} JSON)
+    """
+    if profile and inline:
+        raise ValueError("profile은 inline 반환과 함께 쓸 수 없습니다.")
+    return await _run("convert", "convert", _convert, input_path, target_format, output_path,
+                      sections, paragraphs, inline, profile=profile, report=_reporter(ctx))
+
 
 # ---------------------------------------------------------------------------
 # Tool 4: Edit
 # ---------------------------------------------------------------------------
 
-@mcp.tool()
-def hwp_edit(
+def _edit(
     input_path: str,
     output_path: str,
     operation: str,
@@ -227,27 +459,23 @@ def hwp_edit(
     table_json: str = "",
     memo_text: str = "",
     para_index: int = 0,
+    insert_before: int = -1,
+    insert_after: int = -1,
+    match_text: str = "",
+    script_json: str = "",
+    replace_map_json: str = "",
+    regex: bool = False,
+    whole_word: bool = False,
+    ignore_case: bool = False,
+    progress=None,
 ) -> str:
-    """기존 HWPX 파일을 편집합니다. HWPX 형식 파일만 지원합니다.
-
-    Args:
-        input_path: 입력 HWPX 파일의 절대 경로
-        output_path: 출력 HWPX 파일의 절대 경로
-        operation: 작업 유형 — "replace", "add_paragraph", "add_table", "add_memo"
-        find_text: [replace 전용] 찾을 텍스트
-        replace_text: [replace 전용] 바꿀 텍스트
-        paragraph_text: [add_paragraph 전용] 추가할 단락 텍스트
-        table_json: [add_table 전용] 테이블 JSON 문자열 {"headers":[...],"rows":[[...]]}
-        memo_text: [add_memo 전용] 메모 텍스트
-        para_index: [add_memo 전용] 메모를 붙일 단락 인덱스 (기본값: 0)
-
-    Returns:
-        출력 파일 경로
-    """
+    """Blocking body of hwp_edit; runs on the 'edit' worker pool."""
+    if not input_path or not output_path:
+        raise ValueError("input_path와 output_path가 필요합니다 (또는 session).")
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_path}")
 
-    valid_ops = ("replace", "add_paragraph", "add_table", "add_memo")
+    valid_ops = ("replace", "replace_many", "add_paragraph", "add_table", "add_memo", "script")
     if operation not in valid_ops:
         raise ValueError(f"지원하지 않는 작업: {operation}. {valid_ops} 중 하나여야 합니다.")
 
@@ -256,8 +484,28 @@ def hwp_edit(
         add_paragraph,
         add_table,
         add_memo,
+        apply_edits,
     )
 
+    if operation == "replace_many":
+        if not replace_map_json:
+            raise ValueError("'replace_many' 작업에는 replace_map_json이 필요합니다.")
+        from hwp_replace import replace_many
+
+        counts = replace_many(input_path, output_path, json.loads(replace_map_json),
+                              regex, whole_word, ignore_case, progress)
+        return json.dumps({"output": output_path, "total": sum(counts.values()), "counts": counts},
+                          ensure_ascii=False)
+
+    if operation == "script":
+        if not script_json:
+            raise ValueError("'script' 작업에는 script_json이 필요합니다.")
+        operations = json.loads(script_json)
+        if not isinstance(operations, list):
+            raise ValueError("script_json은 작업 객체의 JSON 배열이어야 합니다.")
+        results = apply_edits(input_path, output_path, operations, progress)
+        return json.dumps({"output": output_path, "results": results}, ensure_ascii=False)
+
     if operation == "replace":
         if not find_text:
             raise ValueError("'replace' 작업에는 find_text가 필요합니다.")
@@ -267,7 +515,9 @@ def hwp_edit(
     elif operation == "add_paragraph":
         if not paragraph_text:
             raise ValueError("'add_paragraph' 작업에는 paragraph_text가 필요합니다.")
-        add_paragraph(input_path, output_path, paragraph_text)
+        add_paragraph(input_path, output_path, paragraph_text,
+                      before=insert_before if insert_before >= 0 else None,
+                      after=insert_after if insert_after >= 0 else None)
         return f"단락 추가 완료: {output_path}"
 
     elif operation == "add_table":
@@ -280,24 +530,152 @@ def hwp_edit(
     elif operation == "add_memo":
         if not memo_text:
             raise ValueError("'add_memo' 작업에는 memo_text가 필요합니다.")
-        add_memo(input_path, output_path, memo_text, para_index)
-        return f"메모 추가 완료 (단락 {para_index}): {output_path}"
+        add_memo(input_path, output_path, memo_text, para_index, match_text or None)
+        target = f"'{match_text}' 포함 단락" if match_text else f"단락 {para_index}"
+        return f"메모 추가 완료 ({target}): {output_path}"
 
 
-# ---------------------------------------------------------------------------
-# Tool 5: Analyze
-# ---------------------------------------------------------------------------
+def _session_edit(
+    session: str,
+    operation: str,
+    find_text: str = "",
+    replace_text: str = "",
+    paragraph_text: str = "",
+    table_json: str = "",
+    memo_text: str = "",
+    para_index: int = 0,
+    insert_before: int = -1,
+    insert_after: int = -1,
+    match_text: str = "",
+    script_json: str = "",
+    replace_map_json: str = "",
+    regex: bool = False,
+    whole_word: bool = False,
+    ignore_case: bool = False,
+) -> str:
+    """Blocking body of hwp_edit on an open session; runs on the 'session' worker pool.
+
+    The single-operation forms are turned into hwp_edit operations and applied
+    to the cached document; nothing is written until hwp_save/hwp_close.
+    """
+    where = {key: value for key, value in (("before", insert_before), ("after", insert_after))
+             if value >= 0}
+    if operation == "script":
+        if not script_json:
+            raise ValueError("'script' 작업에는 script_json이 필요합니다.")
+        operations = json.loads(script_json)
+        if not isinstance(operations, list):
+            raise ValueError("script_json은 작업 객체의 JSON 배열이어야 합니다.")
+    elif operation == "replace":
+        if not find_text:
+            raise ValueError("'replace' 작업에는 find_text가 필요합니다.")
+        operations = [{"op": "replace", "find": find_text, "replace": replace_text}]
+    elif operation == "replace_many":
+        if not replace_map_json:
+            raise ValueError("'replace_many' 작업에는 replace_map_json이 필요합니다.")
+        if regex or whole_word or ignore_case:
+            raise ValueError("세션에서는 regex/whole_word/ignore_case를 쓸 수 없습니다. "
+                             "hwp_save 후 파일에 replace_many를 실행하세요.")
+        operations = [{"op": "replace", "find": find, "replace": repl}
+                      for find, repl in json.loads(replace_map_json).items()]
+    elif operation == "add_paragraph":
+        if not paragraph_text:
+            raise ValueError("'add_paragraph' 작업에는 paragraph_text가 필요합니다.")
+        operations = [{"op": "add_paragraph", "text": paragraph_text, **where}]
+    elif operation == "add_table":
+        if not table_json:
+            raise ValueError("'add_table' 작업에는 table_json이 필요합니다.")
+        tbl = json.loads(table_json)
+        operations = [{"op": "add_table", "headers": tbl["headers"], "rows": tbl["rows"], **where}]
+    elif operation == "add_memo":
+        if not memo_text:
+            raise ValueError("'add_memo' 작업에는 memo_text가 필요합니다.")
+        operations = [{"op": "add_memo", "text": memo_text, "para_index": para_index}]
+        if match_text:
+            operations[0]["match"] = match_text
+    else:
+        valid_ops = ("replace", "replace_many", "add_paragraph", "add_table", "add_memo", "script")
+        raise ValueError(f"지원하지 않는 작업: {operation}. {valid_ops} 중 하나여야 합니다.")
+
+    with sessions.use(session) as doc:
+        results = doc.edit(operations)
+        return json.dumps({"session": doc.handle, "results": results, "dirty": doc.dirty},
+                          ensure_ascii=False)
+
 
 @mcp.tool()
-def hwp_analyze(input_path: str) -> str:
-    """HWP/HWPX 파일의 내부 구조와 메타데이터를 분석합니다.
+async def hwp_edit(
+    input_path: str = "",
+    output_path: str = "",
+    operation: str = "",
+    find_text: str = "",
+    replace_text: str = "",
+    paragraph_text: str = "",
+    table_json: str = "",
+    memo_text: str = "",
+    para_index: int = 0,
+    insert_before: int = -1,
+    insert_after: int = -1,
+    match_text: str = "",
+    script_json: str = "",
+    replace_map_json: str = "",
+    regex: bool = False,
+    whole_word: bool = False,
+    ignore_case: bool = False,
+    session: str = "",
+    profile: str = "",
+    ctx: Context = None,
+) -> str:
+    """기존 HWPX 파일을 편집합니다. replace/replace_many는 HWP(바이너리) 파일도 직접 수정합니다.
 
     Args:
-        input_path: HWP 또는 HWPX 파일의 절대 경로
+        input_path: 입력 HWPX 파일의 절대 경로 (session을 주면 생략)
+        output_path: 출력 HWPX 파일의 절대 경로 (session을 주면 생략)
+        operation: 작업 유형 — "replace", "replace_many", "add_paragraph", "add_table", "add_memo", "script"
+        find_text: [replace 전용] 찾을 텍스트
+        replace_text: [replace 전용] 바꿀 텍스트
+        paragraph_text: [add_paragraph 전용] 추가할 단락 텍스트
+        table_json: [add_table 전용] 테이블 JSON 문자열 {"headers":[...],"rows":[[...]]}
+        memo_text: [add_memo 전용] 메모 텍스트
+        para_index: [add_memo 전용] 메모를 붙일 단락 인덱스 (기본값: 0)
+        insert_before: [add_paragraph 전용] 이 단락 앞에 삽입 (-1이면 끝에 추가)
+        insert_after: [add_paragraph 전용] 이 단락 뒤에 삽입 (-1이면 끝에 추가)
+        match_text: [add_memo 전용] 이 텍스트를 포함한 첫 단락에 메모 (para_index 대신)
+        replace_map_json: [replace_many 전용] {"찾을 말": "바꿀 말", ...} JSON — 한 번의 패스로 모두 치환
+        regex: [replace_many 전용] 찾을 말을 정규식으로 해석
+        whole_word: [replace_many 전용] 단어 단위로만 일치
+        ignore_case: [replace_many 전용] 대소문자 무시
+        script_json: [script 전용] 작업 목록 JSON — 한 번 열고 한 번 저장
+            예: [{"op":"replace","find":"a","replace":"b"},{"op":"add_paragraph","text":"..."},
+                 {"op":"add_table","headers":[...],"rows":[[...]]},
+                 {"op":"add_memo","text":"...","match":"..."},{"op":"delete","para_index":3}]
+            단락 번호는 섹션 전체에 걸친 순번이며, add_paragraph/add_table은 "before"/"after"로
+            위치를, replace는 "para_index"로 범위를 지정할 수 있습니다.
+        session: hwp_open으로 연 세션 핸들 — 메모리의 문서를 편집하고 파일은 hwp_save 또는
+            hwp_close(save=True) 때 씁니다. 여러 번의 편집이 한 번의 파싱을 공유합니다.
+            replace_many는 순서대로 적용되며 regex/whole_word/ignore_case는 쓸 수 없습니다.
+        profile: "cpu" | "mem" | "both" — 이 호출을 프로파일링 (hwp_read 참고)
 
     Returns:
-        파일 구조, 섹션 수, 이미지 수, 단락 수 등을 포함한 JSON 문자열
+        출력 파일 경로 (session이면 작업별 결과 JSON; profile을 주면 {"result", "profile"} JSON)
     """
+    if session:
+        return await _run("session", "edit", _session_edit, session, operation, find_text,
+                          replace_text, paragraph_text, table_json, memo_text, para_index,
+                          insert_before, insert_after, match_text, script_json,
+                          replace_map_json, regex, whole_word, ignore_case, profile=profile)
+    return await _run("edit", "edit", _edit, input_path, output_path, operation, find_text,
+                      replace_text, paragraph_text, table_json, memo_text, para_index,
+                      insert_before, insert_after, match_text, script_json, replace_map_json,
+                      regex, whole_word, ignore_case, profile=profile, report=_reporter(ctx))
+
+
+# ---------------------------------------------------------------------------
+# Tool 5: Analyze
+# ---------------------------------------------------------------------------
+
+def _analyze(input_path: str) -> str:
+    """Blocking body of hwp_analyze; runs on the 'read' worker pool."""
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_path}")
 
@@ -307,9 +685,252 @@ def hwp_analyze(input_path: str) -> str:
     return json.dumps(info, ensure_ascii=False, indent=2)
 
 
+def _session_analyze(session: str) -> str:
+    """Blocking body of hwp_analyze on an open session; runs on the 'session' worker pool."""
+    with sessions.use(session) as doc:
+        return json.dumps(doc.analyze(), ensure_ascii=False, indent=2)
+
+
+@mcp.tool()
+async def hwp_analyze(input_path: str = "", session: str = "", profile: str = "") -> str:
+    """HWP/HWPX 파일의 내부 구조와 메타데이터를 분석합니다.
+
+    Args:
+        input_path: HWP 또는 HWPX 파일의 절대 경로 (session을 주면 생략)
+        session: hwp_open으로 연 세션 핸들 — 메모리의 문서(저장하지 않은 편집 포함)의
+            섹션·단락·표 수와 저장 여부를 반환합니다.
+        profile: "cpu" | "mem" | "both" — 이 호출을 프로파일링 (hwp_read 참고)
+
+    Returns:
+        파일 구조, 섹션 수, 이미지 수, 단락 수 등을 포함한 JSON 문자열
+        (profile을 주면 {"result", "profile"} JSON)
+    """
+    if session:
+        return await _run("session", "analyze", _session_analyze, session, profile=profile)
+    if not input_path:
+        raise ValueError("input_path 또는 session이 필요합니다.")
+    return await _run("read", "analyze", _analyze, input_path, profile=profile)
+
+
+# ---------------------------------------------------------------------------
+# Tool 6: Sessions
+# ---------------------------------------------------------------------------
+
+def _open(input_path: str) -> str:
+    """Blocking body of hwp_open; runs on the 'session' worker pool."""
+    session = sessions.open(input_path)
+    with sessions.use(session.handle) as doc:
+        return json.dumps(doc.analyze(), ensure_ascii=False)
+
+
+def _search(session: str, text: str, max_results: int = 50) -> str:
+    """Blocking body of hwp_search; runs on the 'session' worker pool."""
+    with sessions.use(session) as doc:
+        return json.dumps({"session": doc.handle, "matches": doc.search(text, max_results)},
+                          ensure_ascii=False)
+
+
+def _save(session: str, output_path: str = "") -> str:
+    """Blocking body of hwp_save; runs on the 'session' worker pool."""
+    with sessions.use(session) as doc:
+        return json.dumps({"session": doc.handle, "path": doc.save(output_path or None)},
+                          ensure_ascii=False)
+
+
+def _close(session: str, save: bool = False, output_path: str = "") -> str:
+    """Blocking body of hwp_close; runs on the 'session' worker pool."""
+    return json.dumps(sessions.close(session, save, output_path or None), ensure_ascii=False)
+
+
+@mcp.tool()
+async def hwp_open(input_path: str) -> str:
+    """HWP/HWPX 파일을 한 번 파싱해 메모리에 두고 세션 핸들을 반환합니다.
+
+    반환된 session을 hwp_read, hwp_analyze, hwp_edit, hwp_search에 넘기면 파일을 다시
+    읽지 않고 같은 문서를 사용합니다. 편집은 hwp_save 또는 hwp_close(save=True) 때만
+    디스크에 씁니다. HWP(바이너리) 세션은 읽기 전용입니다.
+
+    Args:
+        input_path: HWP 또는 HWPX 파일의 절대 경로
+
+    Returns:
+        session 핸들과 섹션·단락 수 등을 담은 JSON 문자열
+    """
+    return await offload.run("session", _open, input_path)
+
+
+@mcp.tool()
+async def hwp_search(session: str, text: str, max_results: int = 50) -> str:
+    """열린 세션의 문서에서 텍스트를 찾습니다.
+
+    Args:
+        session: hwp_open으로 연 세션 핸들
+        text: 찾을 텍스트 (단락 경계를 넘는 일치는 찾지 않음)
+        max_results: 반환할 최대 일치 수 (기본값: 50)
+
+    Returns:
+        일치마다 단락 번호(para_index), 단락 안 위치(offset), 단락 텍스트를 담은 JSON 문자열
+    """
+    return await offload.run("session", _search, session, text, max_results)
+
+
+@mcp.tool()
+async def hwp_save(session: str, output_path: str = "") -> str:
+    """열린 세션의 문서를 디스크에 저장합니다. 바뀌지 않은 파트는 원본에서 그대로 복사합니다.
+
+    Args:
+        session: hwp_open으로 연 세션 핸들
+        output_path: 저장할 경로 (생략 시 원래 파일에 덮어씀; 지정하면 이후 세션은 새 파일을 가리킴)
+
+    Returns:
+        저장된 경로를 담은 JSON 문자열
+    """
+    return await offload.run("session", _save, session, output_path)
+
+
+@mcp.tool()
+async def hwp_close(session: str, save: bool = False, output_path: str = "") -> str:
+    """세션을 닫고 메모리에서 문서를 내립니다.
+
+    Args:
+        session: hwp_open으로 연 세션 핸들
+        save: True이면 닫기 전에 저장 (False이면 저장하지 않은 편집은 버림)
+        output_path: save=True일 때 저장할 경로 (생략 시 원래 파일)
+
+    Returns:
+        닫은 세션, 경로, 버려진 편집이 있었는지(discarded)를 담은 JSON 문자열
+    """
+    return await offload.run("session", _close, session, save, output_path)
+
+
+# ---------------------------------------------------------------------------
+# Tool 7: Batch
+# ---------------------------------------------------------------------------
+
+@mcp.tool()
+async def hwp_batch(
+    operation: str,
+    input_paths: list[str] | None = None,
+    pattern: str = "",
+    output_dir: str = "",
+    output_format: str = "md",
+    target_format: str = "",
+    script_json: str = "",
+    replace_map_json: str = "",
+    regex: bool = False,
+    whole_word: bool = False,
+    ignore_case: bool = False,
+    workers: int = 0,
+    ctx: Context = None,
+) -> str:
+    """여러 HWP/HWPX 파일에 같은 작업을 동시에 실행합니다 (파일마다 도구를 호출하지 않아도 됨).
+
+    결과는 모두 output_dir 아래 파일로 쓰고, 응답에는 파일별 상태·출력 경로·크기·시간·오류
+    표만 담습니다. 한 파일의 실패는 그 행에만 기록되고 나머지는 계속 처리합니다.
+
+    Args:
+        operation: 작업 — "read" (텍스트 추출), "analyze" (구조 분석 JSON),
+            "convert" (target_format으로 변환), "edit" (script_json 또는 replace_map_json 적용)
+        input_paths: 입력 파일 절대 경로 목록
+        pattern: 입력 파일 glob 패턴, 예: "/data/**/*.hwp" (input_paths와 함께 쓸 수 있음)
+        output_dir: 결과를 쓸 디렉터리 (생략 시 새 임시 디렉터리). 파일 이름이 겹치면 -2, -3을 붙임
+        output_format: [read 전용] "md" (기본값), "txt", "json"
+        target_format: [convert 전용] "pdf", "md", "html", "txt", "odt"
+        script_json: [edit 전용] hwp_edit의 script_json과 같은 작업 목록 (HWPX만)
+        replace_map_json: [edit 전용] {"찾을 말": "바꿀 말"} JSON (HWP/HWPX)
+        regex: [edit + replace_map_json 전용] 찾을 말을 정규식으로 해석
+        whole_word: [edit + replace_map_json 전용] 단어 단위로만 일치
+        ignore_case: [edit + replace_map_json 전용] 대소문자 무시
+        workers: 동시에 처리할 파일 수 (0이면 작업 분류의 작업자 수, 그보다 크게는 불가)
+
+    Returns:
+        {"operation", "output_dir", "total", "ok", "failed", "seconds", "columns", "rows"} JSON.
+        columns는 ["input", "status", "output", "bytes", "seconds", "error"]이고 rows는 파일별 값 목록입니다.
+    """
+    from hwp_batch import expand_inputs, run_batch
+
+    options = {}
+    if operation == "read":
+        options["output_format"] = output_format
+    elif operation == "convert":
+        options["target_format"] = target_format
+    elif operation == "edit":
+        if script_json:
+            options["operations"] = json.loads(script_json)
+            if not isinstance(options["operations"], list):
+                raise ValueError("script_json은 작업 객체의 JSON 배열이어야 합니다.")
+        if replace_map_json:
+            options.update(mapping=json.loads(replace_map_json), regex=regex,
+                           whole_word=whole_word, ignore_case=ignore_case)
+    inputs = await asyncio.to_thread(expand_inputs, input_paths, pattern)
+    summary = await run_batch(offload, operation, inputs, output_dir, options, workers,
+                              report=_reporter(ctx))
+    return json.dumps(summary, ensure_ascii=False)
+
+
+# ---------------------------------------------------------------------------
+# Tool 8: Diagnostics
+# ---------------------------------------------------------------------------
+
+async def _worker_timings(work_class: str) -> dict:
+    try:
+        return await asyncio.wait_for(offload.run(work_class, warm_timings), timeout=10)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+@mcp.tool()
+async def hwp_diagnostics() -> str:
+    """서버 상태를 진단합니다: 백엔드 예열(warm-up) 진행 상황과 import 시간, 작업자 풀 상태.
+
+    Returns:
+        {"warmup", "server", "workers", "pools"} JSON — server는 서버 프로세스,
+        workers는 프로세스 풀마다 작업자 하나에서 잰 백엔드별 import·예열 시간(초)과 오류입니다.
+    """
+    pools = offload.stats()
+    workers = {name: await _worker_timings(name)
+               for name, stats in pools.items() if stats["kind"] == "process"}
+    return json.dumps({"warmup": warmup.status(), "server": warm_timings(), "workers": workers,
+                       "pools": offload.stats()}, ensure_ascii=False)
+
+
+# ---------------------------------------------------------------------------
+# Tool 9: Stats
+# ---------------------------------------------------------------------------
+
+@mcp.tool()
+async def hwp_stats(format: str = "json", reset: bool = False) -> str:
+    """서버가 시작된 뒤(또는 마지막 reset 뒤) 기록한 성능 지표를 반환합니다.
+
+    단계별 지연 시간(open, decompress, decode, render, save 등; 풀 대기는 queue,
+    전체는 total), 백엔드 폴백 횟수(예: pyhwp2md → olefile), 처리한 바이트,
+    캐시 적중률(열린 세션, 재압축 없이 복사한 ZIP 멤버)을 담습니다.
+    프로세스 풀 작업자가 기록한 지표도 합쳐집니다.
+
+    Args:
+        format: "json" (요약: 단계별 count/mean/p50/p95/max ms) 또는
+                "prometheus" (Prometheus 텍스트 형식)
+        reset: True면 반환한 뒤 지표를 비웁니다
+
+    Returns:
+        json: {"metrics", "pools", "sessions"} JSON / prometheus: 텍스트
+    """
+    if format not in ("json", "prometheus"):
+        raise ValueError(f"지원하지 않는 형식: {format}. 'json' 또는 'prometheus'여야 합니다.")
+    snapshot = hwp_metrics.REGISTRY.take() if reset else hwp_metrics.REGISTRY.snapshot()
+    if format == "prometheus":
+        return hwp_metrics.to_prometheus(snapshot)
+    return json.dumps({"metrics": hwp_metrics.summary(snapshot), "pools": offload.stats(),
+                       "sessions": sessions.stats()}, ensure_ascii=False)
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    # Returns at once; the stdio handshake does not wait for the imports.
+    warmup.start()
+    if METRICS_FILE:
+        hwp_metrics.start_dump(METRICS_FILE, METRICS_INTERVAL)
     mcp.run(transport="stdio")
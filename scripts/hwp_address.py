@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Paragraph addressing for HWPX edits: (section, paragraph, char offset).
+
+python-hwpx's ``doc.paragraphs`` builds a wrapper object for every paragraph of
+every section on each access, so picking paragraph N, or appending somewhere
+other than the end of the first section, costs a walk over the whole document.
+ParagraphIndex lists the top-level ``hp:p`` elements of all sections once and
+keeps that list current as paragraphs are inserted or removed through it.
+Paragraph texts and their character offsets are computed on the first text
+lookup and reused until the text changes.
+
+One index is meant to serve every operation of an edit session
+(see hwp_edit.apply_edits).
+
+Usage:
+    from hwp_address import ParagraphIndex
+
+    index = ParagraphIndex(doc)
+    index.insert("새 단락", after=3)
+    n, offset = index.find("검토 의견")
+    doc.add_memo_with_anchor("확인 필요", paragraph=index.paragraph(n), memo_shape_id_ref="0")
+    index.replace(5, "초안", "최종")
+
+Dependencies:
+    pip install python-hwpx
+"""
+
+import sys
+import os
+from bisect import bisect_left, bisect_right
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from hwp_table import HP_URI
+
+_P = f"{{{HP_URI}}}p"
+_T = f"{{{HP_URI}}}t"
+_SEC_PR = f".//{{{HP_URI}}}secPr"
+
+
+class ParagraphIndex:
+    """Document-order index of the top-level paragraphs of an open HwpxDocument.
+
+    Paragraph numbers are global across sections, like ``doc.paragraphs``.
+    Edits made through the index keep it valid; after editing paragraphs some
+    other way, call ``refresh()``.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rebuild the index from the document tree."""
+        self.sections = list(self.doc.sections)
+        self._elements = []
+        self._section_of = []
+        for s, section in enumerate(self.sections):
+            found = section.element.findall(_P)
+            self._elements.extend(found)
+            self._section_of.extend([s] * len(found))
+        self._texts = None
+        self._starts = None
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def _check(self, n: int) -> int:
+        if not 0 <= n < len(self._elements):
+            raise IndexError(f"paragraph {n} out of range (0-{len(self._elements) - 1})")
+        return n
+
+    def locate(self, n: int) -> tuple:
+        """Return (section index, paragraph index within that section) of paragraph ``n``."""
+        s = self._section_of[self._check(n)]
+        return s, n - bisect_right(self._section_of, s - 1)
+
+    def seek(self, section: int, paragraph: int = 0) -> int:
+        """Return the number of the first paragraph at or after paragraph
+        ``paragraph`` of ``section`` (``len(self)`` past the end)."""
+        first = bisect_left(self._section_of, section)
+        return min(first + paragraph, bisect_left(self._section_of, section + 1))
+
+    def element(self, n: int):
+        return self._elements[self._check(n)]
+
+    def paragraph(self, n: int):
+        """Return a python-hwpx paragraph wrapper for paragraph ``n`` only."""
+        from hwpx.oxml.document import HwpxOxmlParagraph
+
+        return HwpxOxmlParagraph(self.element(n), self.sections[self._section_of[n]])
+
+    # -- text and offsets --------------------------------------------------
+
+    def _ensure_text(self) -> None:
+        if self._texts is not None:
+            return
+        self._texts = ["".join(t.text or "" for t in el.iter(_T)) for el in self._elements]
+        self._starts = []
+        pos = 0
+        for text in self._texts:
+            self._starts.append(pos)
+            pos += len(text) + 1
+        self._joined = "\n".join(self._texts)
+
+    def text_changed(self) -> None:
+        """Drop cached texts after paragraph text was changed outside the index."""
+        self._texts = None
+        self._starts = None
+
+    def text(self, n: int) -> str:
+        self._ensure_text()
+        return self._texts[self._check(n)]
+
+    def offset(self, n: int) -> int:
+        """Character offset of paragraph ``n`` in the document text (paragraphs joined by newlines)."""
+        self._ensure_text()
+        return self._starts[self._check(n)]
+
+    def at(self, offset: int) -> tuple:
+        """Map a document character offset to (paragraph, offset within it)."""
+        self._ensure_text()
+        if not 0 <= offset <= len(self._joined):
+            raise IndexError(f"offset {offset} out of range (0-{len(self._joined)})")
+        n = bisect_right(self._starts, offset) - 1
+        return n, offset - self._starts[n]
+
+    def find(self, text: str, start: int = 0):
+        """Return (paragraph, offset) of the first match of ``text`` at or after
+        paragraph ``start``, or None. Matches never span paragraphs."""
+        if not text:
+            raise ValueError("search text must be a non-empty string")
+        if "\n" in text:
+            return None
+        self._ensure_text()
+        if start >= len(self._elements):
+            return None
+        pos = self._joined.find(text, self._starts[self._check(start)])
+        return None if pos < 0 else self.at(pos)
+
+    def find_all(self, text: str):
+        """Yield (paragraph, offset) for every match of ``text``."""
+        self._ensure_text()
+        pos = self._joined.find(text) if text and "\n" not in text else -1
+        while pos >= 0:
+            yield self.at(pos)
+            pos = self._joined.find(text, pos + len(text))
+
+    # -- edits -------------------------------------------------------------
+
+    def _slot(self, section: int, before: int = None, after: int = None) -> tuple:
+        """Return (global index, section index, reference element, place before it?)."""
+        if before is not None and after is not None:
+            raise ValueError("give either before or after, not both")
+        if before is not None:
+            target = self.element(before)
+            if target.find(_SEC_PR) is not None:
+                raise ValueError(f"paragraph {before} holds the section properties; "
+                                 f"nothing can be inserted before it")
+            return before, self._section_of[before], target, True
+        if after is not None:
+            return after + 1, self._section_of[self._check(after)], self.element(after), False
+        if not 0 <= section < len(self.sections):
+            raise IndexError(f"section {section} out of range (0-{len(self.sections) - 1})")
+        return bisect_right(self._section_of, section), section, None, False
+
+    def place(self, paragraph, before: int = None, after: int = None) -> int:
+        """Move a paragraph just appended to its section (e.g. by ``doc.add_paragraph``
+        or ``BulkTables.add``) before or after paragraph N, and index it.
+
+        Without ``before``/``after`` it stays at the end of its section.
+        Returns its paragraph number.
+        """
+        element = paragraph.element
+        s = self.sections.index(paragraph.section)
+        if before is None and after is None:
+            n = bisect_right(self._section_of, s)
+        else:
+            n, s, target, is_before = self._slot(s, before, after)
+            paragraph.section.element.remove(element)
+            paragraph.section.mark_dirty()
+            parent = self.sections[s].element
+            at = list(parent).index(target)
+            parent.insert(at if is_before else at + 1, element)
+            paragraph.section = self.sections[s]
+        self._elements.insert(n, element)
+        self._section_of.insert(n, s)
+        self.sections[s].mark_dirty()
+        self.text_changed()
+        return n
+
+    def insert(self, text: str, before: int = None, after: int = None, section: int = 0) -> int:
+        """Add a paragraph before or after paragraph N, or at the end of ``section``.
+
+        Returns the new paragraph's number.
+        """
+        _, s, _, _ = self._slot(section, before, after)
+        paragraph = self.doc.add_paragraph(text, section=self.sections[s])
+        return self.place(paragraph, before, after)
+
+    def remove(self, n: int) -> None:
+        element = self.element(n)
+        if element.find(_SEC_PR) is not None:
+            raise ValueError(f"paragraph {n} holds the section properties")
+        section = self.sections[self._section_of[n]]
+        section.element.remove(element)
+        section.mark_dirty()
+        del self._elements[n]
+        del self._section_of[n]
+        self.text_changed()
+
+    def replace(self, n: int, find: str, replace: str, count: int = None) -> int:
+        """Replace ``find`` within the runs of paragraph ``n``; returns the number replaced."""
+        replaced = 0
+        for run in self.paragraph(n).runs:
+            remaining = None if count is None else count - replaced
+            if remaining is not None and remaining <= 0:
+                break
+            char_pr = run.char_pr_id_ref
+            here = run.replace_text(find, replace, count=remaining)
+            if here and char_pr is not None:
+                run.char_pr_id_ref = char_pr
+            replaced += here
+        if replaced:
+            self.text_changed()
+        return replaced
@@ -3,7 +3,8 @@
 Analyze HWP/HWPX file structure and extract metadata.
 
 Usage:
-    python hwp_analyze.py <input_file>
+    python hwp_analyze.py <input_file> [--stats] [--stats-file metrics.prom]
+    python hwp_analyze.py <input_file> --profile cpu --profile-dir prof/
 
 Dependencies:
     pip install olefile python-hwpx
@@ -16,6 +17,13 @@ import struct
 import zlib
 from collections import Counter
 
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import hwp_metrics
+import hwp_profile
+
 
 def analyze_hwp(filepath: str) -> dict:
     """Analyze HWP (OLE2 binary) file structure."""
@@ -40,7 +48,8 @@ def analyze_hwp(filepath: str) -> dict:
         # FileHeader
         header = ole.openstream("FileHeader").read()
         sig = header[:32].decode('utf-8', errors='ignore').rstrip('\x00')
-        version = f"{header[32]}.{header[33]}.{header[34]}.{header[35]}"
+        # Stored as a little-endian DWORD 0xMMnnPPrr, e.g. 5.0.3.0 is 00 03 00 05
+        version = f"{header[35]}.{header[34]}.{header[33]}.{header[32]}"
         flags = header[36]
 
         info["metadata"] = {
@@ -100,8 +109,8 @@ def analyze_hwp(filepath: str) -> dict:
                         break
 
                 info["stats"]["total_records"] = sum(tag_counter.values())
-                info["stats"]["has_tables"] = 80 in tag_counter
-                info["stats"]["table_count"] = tag_counter.get(80, 0)
+                info["stats"]["has_tables"] = 77 in tag_counter  # HWPTAG_TABLE
+                info["stats"]["table_count"] = tag_counter.get(77, 0)
                 info["stats"]["paragraph_count"] = tag_counter.get(67, 0)
 
     finally:
@@ -160,20 +169,44 @@ def analyze_hwpx(filepath: str) -> dict:
 def analyze(filepath: str) -> dict:
     """Analyze HWP or HWPX file."""
     ext = os.path.splitext(filepath)[1].lower()
-    if ext == ".hwp":
-        return analyze_hwp(filepath)
-    elif ext == ".hwpx":
-        return analyze_hwpx(filepath)
-    else:
+    if ext not in (".hwp", ".hwpx"):
         raise ValueError(f"Unsupported file extension: {ext}")
+    hwp_metrics.transferred("analyze", "in", hwp_metrics.file_size(filepath))
+    with hwp_metrics.timer("analyze", "total"):
+        return analyze_hwp(filepath) if ext == ".hwp" else analyze_hwpx(filepath)
+
+
+def _pop_option(args: list, name: str):
+    """Remove ``name VALUE`` from ``args`` and return VALUE (None if absent)."""
+    if name not in args:
+        return None
+    i = args.index(name)
+    if i + 1 >= len(args):
+        print(f"Error: {name} needs a value", file=sys.stderr)
+        sys.exit(1)
+    value = args.pop(i + 1)
+    args.pop(i)
+    return value
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python hwp_analyze.py <input_file>", file=sys.stderr)
+    args = sys.argv[1:]
+    stats_file = _pop_option(args, "--stats-file")
+    profile = _pop_option(args, "--profile")
+    profile_dir = _pop_option(args, "--profile-dir") or hwp_profile.DEFAULT_DIR
+    stats = "--stats" in args
+    args = [a for a in args if a != "--stats"]
+    if not args:
+        print("Usage: python hwp_analyze.py <input_file> [--stats] [--stats-file PATH] "
+              "[--profile cpu|mem|both] [--profile-dir DIR]", file=sys.stderr)
+        sys.exit(1)
+    if profile and profile not in hwp_profile.MODES:
+        print(f"Error: --profile must be one of {', '.join(hwp_profile.MODES)}", file=sys.stderr)
         sys.exit(1)
+    hwp_metrics.report_at_exit(stats, stats_file)
+    hwp_profile.profile_until_exit(profile, profile_dir, "analyze")
 
-    filepath = sys.argv[1]
+    filepath = args[0]
     if not os.path.exists(filepath):
         print(f"Error: File not found: {filepath}", file=sys.stderr)
         sys.exit(1)
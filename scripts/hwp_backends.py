@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Backend shoot-out: run every text extraction backend over a corpus and rank them.
+
+The backends are the ones hwp_read can fall back between: pyhwp2md (.hwp and
+.hwpx), python-hwpx (.hwpx), the olefile record parser (.hwp) and pyhwp's
+hwp5txt command (.hwp). For every (document, backend) case ``run`` records the
+run times, throughput (MB/s), peak RSS (including child processes, since
+pyhwp2md and hwp5txt start one) and whether the backend failed. Each case runs
+in a fresh interpreter that first imports the backend, like hwp_bench.
+
+Text fidelity compares a backend's text with a reference, after reducing both
+to plain lines (Markdown headings, emphasis and table pipes removed, one table
+cell per line): lines are aligned first, then unmatched runs of lines are
+compared character by character. The score is ``2 * matched / (len(a) + len(b))``
+(1.0 for identical text). The reference is, in order of preference:
+
+- ``expected``: the generated content of an hwp_bench corpus (the default there);
+- a directory of ``<document>.txt`` ground-truth files;
+- a backend name, e.g. ``--reference olefile`` (the default for plain folders:
+  the first backend of hwp_read.BACKEND_ORDER for the extension).
+
+The report ranks the backends per extension by quality (mean fidelity with
+failures counted as 0, to two decimals) and then throughput. Its ``order``
+is what ``read_file`` takes from ``HWP_BACKEND_ORDER=report.json``.
+
+Usage:
+    python hwp_bench.py corpus bench-corpus --preset quick
+    python hwp_backends.py run bench-corpus -o backends.json
+    python hwp_backends.py run ~/docs --reference olefile --backends olefile,hwp5txt
+    HWP_BACKEND_ORDER=backends.json python hwp_read.py doc.hwp
+"""
+
+import sys
+import os
+import argparse
+import difflib
+import json
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from hwp_bench import MANIFEST, expected_text, extension, peak_rss_mb
+from hwp_read import BACKEND_ORDER, BACKENDS
+
+# backend -> hwp_warmup backends to import before timing
+WARM = {"pyhwp2md": ("pyhwp2md",), "python-hwpx": ("hwpx",), "olefile": ("olefile",),
+        "hwp5txt": ()}
+CASE_TIMEOUT = 600
+# Unmatched runs longer than this (characters, both sides together) are
+# compared word by word; character diffs are quadratic.
+CHAR_DIFF_LIMIT = 20000
+
+_TABLE_RULE = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+_HEADING = re.compile(r"^#{1,6}\s+")
+
+
+def available_backends() -> dict:
+    """Backend -> None when it can run here, else the reason it cannot."""
+    import importlib
+
+    out = {}
+    for name, module in (("pyhwp2md", "pyhwp2md"), ("python-hwpx", "hwpx.document"),
+                         ("olefile", "olefile")):
+        try:
+            importlib.import_module(module)
+            out[name] = None
+        except ImportError as e:
+            out[name] = f"not installed ({e})"
+    out["hwp5txt"] = None if shutil.which("hwp5txt") else "hwp5txt not on PATH"
+    return out
+
+
+def plain_lines(text: str) -> list:
+    """Non-empty lines of ``text`` with Markdown markup removed and table cells split."""
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if _TABLE_RULE.match(line):
+            continue
+        if line.startswith("|"):
+            cells = line.strip("|").split("|")
+        else:
+            cells = [_HEADING.sub("", line)]
+        for cell in cells:
+            cell = " ".join(cell.replace("**", "").split())
+            if cell:
+                lines.append(cell)
+    return lines
+
+
+def _matched(a: list, b: list) -> int:
+    """Characters (line ends included) shared by two runs of lines."""
+    sa, sb = "\n".join(a) + "\n", "\n".join(b) + "\n"
+    if len(sa) + len(sb) > CHAR_DIFF_LIMIT:
+        wa, wb = re.findall(r"\S+|\n", sa), re.findall(r"\S+|\n", sb)
+        blocks = difflib.SequenceMatcher(None, wa, wb, autojunk=False).get_matching_blocks()
+        return sum(len(t) for m in blocks for t in wa[m.a:m.a + m.size])
+    blocks = difflib.SequenceMatcher(None, sa, sb, autojunk=False).get_matching_blocks()
+    return sum(m.size for m in blocks)
+
+
+def fidelity(reference: str, text: str) -> float:
+    """Similarity of ``text`` to ``reference`` in [0, 1], on plain lines (see module doc)."""
+    a, b = plain_lines(reference), plain_lines(text)
+    total = sum(len(line) + 1 for line in a) + sum(len(line) + 1 for line in b)
+    if not total:
+        return 1.0
+    matched = 0
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            matched += sum(len(line) + 1 for line in a[i1:i2])
+        elif tag == "replace":
+            matched += _matched(a[i1:i2], b[j1:j2])
+    return round(min(1.0, 2 * matched / total), 4)
+
+
+def corpus_documents(corpus_dir: str) -> list:
+    """Documents of an hwp_bench corpus (with its specs), or the .hwp/.hwpx files of a folder."""
+    manifest = os.path.join(corpus_dir, MANIFEST)
+    if os.path.exists(manifest):
+        with open(manifest, encoding="utf-8") as f:
+            return [{"name": d["name"], "file": d["file"], "bytes": d["bytes"],
+                     "kind": d["spec"]["kind"], "ext": extension(d["spec"]), "spec": d["spec"]}
+                    for d in json.load(f)["documents"]]
+    if not os.path.isdir(corpus_dir):
+        raise FileNotFoundError(f"Corpus directory not found: {corpus_dir}")
+    docs = []
+    for name in sorted(os.listdir(corpus_dir)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in BACKENDS:
+            docs.append({"name": stem, "file": name, "ext": ext.lower(), "kind": ext.lower()[1:],
+                         "bytes": os.path.getsize(os.path.join(corpus_dir, name))})
+    return docs
+
+
+def peak_rss_with_children_mb() -> float:
+    """Peak RSS of this process or its largest finished child, in MB (None where unsupported)."""
+    own = peak_rss_mb()
+    try:
+        import resource
+    except ImportError:
+        return own
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    children = round(children / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    return max(own or 0, children)
+
+
+def run_case(backend: str, path: str, text_path: str, repeat: int = 3) -> dict:
+    """Extract ``path`` with ``backend`` in this process; the text goes to ``text_path``."""
+    from hwp_read import extract_with
+    from hwp_warmup import warm
+
+    warm(WARM[backend], quiet=True)
+    rss_before = peak_rss_mb()
+    seconds = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        text = extract_with(backend, path)
+        seconds.append(time.perf_counter() - start)
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return {"seconds": [round(s, 5) for s in seconds], "peak_rss_mb": peak_rss_with_children_mb(),
+            "rss_before_mb": rss_before}
+
+
+def _case_in_child(backend: str, path: str, text_path: str, repeat: int, timeout: float) -> dict:
+    cmd = [sys.executable, os.path.abspath(__file__), "case", backend, path, text_path,
+           "--repeat", str(repeat)]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+    if proc.returncode != 0:
+        tail = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        return {"error": f"exit {proc.returncode}: {tail}"[:300]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _reference(reference: str, doc: dict, texts: dict):
+    """Reference text for ``doc`` (None when there is none) and what it came from."""
+    if reference == "auto":
+        if "spec" in doc:
+            reference = "expected"
+        else:
+            reference = BACKEND_ORDER[doc["ext"]][0]
+    if reference == "expected":
+        return (expected_text(doc["spec"]) if "spec" in doc else None), "expected"
+    if reference in BACKENDS[doc["ext"]]:
+        return texts.get(reference), reference
+    path = os.path.join(reference, doc["name"] + ".txt")
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read(), path
+    return None, path
+
+
+def _summarize(cases: list) -> dict:
+    """Per-backend totals over ``cases`` (all of one group)."""
+    out = {}
+    for backend in dict.fromkeys(c["backend"] for c in cases):
+        rows = [c for c in cases if c["backend"] == backend]
+        ok = [c for c in rows if "error" not in c]
+        seconds = sum(c["seconds"]["median"] for c in ok)
+        scored = [c["fidelity"] for c in ok if c.get("fidelity") is not None]
+        failures = len(rows) - len(ok)
+        out[backend] = {
+            "documents": len(rows),
+            "failures": failures,
+            "failure_rate": round(failures / len(rows), 4),
+            "mb_per_s": round(sum(c["bytes"] for c in ok) / seconds / 1e6, 3) if seconds else None,
+            "peak_rss_mb": max((c["peak_rss_mb"] for c in ok if c.get("peak_rss_mb")), default=None),
+            "fidelity": round(statistics.mean(scored), 4) if scored else None,
+            # Failures count as 0; documents without a reference are left out.
+            "quality": (round(sum(scored) / (len(scored) + failures), 4)
+                        if scored or failures else None),
+        }
+    return out
+
+
+def rank(summary: dict) -> list:
+    """Backends best first: quality (two decimals, unscored last), then throughput."""
+    def key(name):
+        s = summary[name]
+        quality = -1 if s["quality"] is None else round(s["quality"], 2)
+        return (-quality, -(s["mb_per_s"] or 0))
+    return sorted(summary, key=key)
+
+
+def run_shootout(corpus_dir: str, backends: list = None, reference: str = "auto",
+                 repeat: int = 3, documents: list = None, isolate: bool = True,
+                 timeout: float = CASE_TIMEOUT, texts_dir: str = None) -> dict:
+    """Run every backend on every document of ``corpus_dir``; returns the report.
+
+    When the reference is a backend's own text, that backend is left unscored
+    and the extension gets no "order": a backend cannot rank itself first.
+    ``texts_dir`` keeps the extracted texts (``<document>.<backend>.txt``);
+    by default they go to a temporary directory.
+    """
+    usable = available_backends()
+    wanted = backends or list(usable)
+    unknown = [b for b in wanted if b not in usable]
+    if unknown:
+        raise ValueError(f"Unknown backend(s) {', '.join(unknown)} (expected {', '.join(usable)})")
+    wanted = [b for b in wanted if usable[b] is None]
+    docs = [d for d in corpus_documents(corpus_dir) if not documents or d["name"] in documents]
+
+    cases, self_referenced = [], set()
+    with tempfile.TemporaryDirectory(prefix="hwp-backends-") as scratch:
+        out_dir = texts_dir or scratch
+        os.makedirs(out_dir, exist_ok=True)
+        for doc in docs:
+            path = os.path.join(corpus_dir, doc["file"])
+            texts, rows = {}, []
+            for backend in (b for b in wanted if b in BACKENDS[doc["ext"]]):
+                print(f"[INFO] {backend} {doc['name']}", file=sys.stderr)
+                text_path = os.path.join(out_dir, f"{doc['name']}.{backend}.txt")
+                if isolate:
+                    case = _case_in_child(backend, path, text_path, repeat, timeout)
+                else:
+                    try:
+                        case = run_case(backend, path, text_path, repeat)
+                    except Exception as e:
+                        case = {"error": f"{type(e).__name__}: {e}"[:300]}
+                row = {"document": doc["name"], "kind": doc["kind"], "ext": doc["ext"],
+                       "bytes": doc["bytes"], "backend": backend}
+                if "error" in case:
+                    row["error"] = case["error"]
+                else:
+                    with open(text_path, encoding="utf-8") as f:
+                        texts[backend] = f.read()
+                    median = statistics.median(case["seconds"])
+                    row.update(seconds={"min": min(case["seconds"]), "median": round(median, 5),
+                                        "max": max(case["seconds"])},
+                               mb_per_s=round(doc["bytes"] / median / 1e6, 3) if median else None,
+                               peak_rss_mb=case["peak_rss_mb"], rss_before_mb=case["rss_before_mb"],
+                               chars=len(texts[backend]))
+                rows.append(row)
+            ref, source = _reference(reference, doc, texts)
+            if source in BACKENDS[doc["ext"]]:
+                self_referenced.add(doc["ext"])
+            for row in rows:
+                if "error" not in row:
+                    row["reference"] = source
+                    row["fidelity"] = (None if ref is None or row["backend"] == source
+                                       else fidelity(ref, texts[row["backend"]]))
+            cases += rows
+
+    summary, by_kind = {}, {}
+    for group, field in ((summary, "ext"), (by_kind, "kind")):
+        for value in dict.fromkeys(c[field] for c in cases):
+            group[value] = _summarize([c for c in cases if c[field] == value])
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus": os.path.abspath(corpus_dir),
+            "reference": reference,
+            "repeat": repeat,
+            "isolated": isolate,
+            "unavailable": {b: why for b, why in usable.items() if why},
+        },
+        "cases": cases,
+        "summary": summary,
+        "by_kind": by_kind,
+        "order": {ext: rank(s) for ext, s in summary.items() if ext not in self_referenced},
+    }
+
+
+def _print_report(report: dict) -> None:
+    print(f"{'ext':<6} {'backend':<12} {'docs':>5} {'fail':>5} {'MB/s':>9} {'RSS MB':>8} "
+          f"{'fidelity':>9} {'quality':>8}")
+    for ext, backends in report["summary"].items():
+        for name in report["order"].get(ext) or rank(backends):
+            s = backends[name]
+            fid = "-" if s["fidelity"] is None else f"{s['fidelity']:.4f}"
+            quality = "-" if s["quality"] is None else f"{s['quality']:.4f}"
+            print(f"{ext:<6} {name:<12} {s['documents']:>5} {s['failures']:>5} "
+                  f"{s['mb_per_s'] or 0:>9.2f} {s['peak_rss_mb'] or 0:>8.1f} {fid:>9} {quality:>8}")
+    for ext in report["summary"]:
+        if ext in report["order"]:
+            print(f"order {ext}: {' > '.join(report['order'][ext])}")
+        else:
+            print(f"[INFO] no order for {ext}: the reference was a backend's own text", file=sys.stderr)
+    for backend, why in report["meta"]["unavailable"].items():
+        print(f"[WARN] {backend} skipped: {why}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the HWP text backends for speed and fidelity")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run every backend on every document and rank them")
+    p_run.add_argument("corpus", help="hwp_bench corpus, or a folder of .hwp/.hwpx files")
+    p_run.add_argument("-o", "--output", help="Write the report JSON here (usable as HWP_BACKEND_ORDER)")
+    p_run.add_argument("--backends", help=f"Comma-separated backends (default: {','.join(WARM)})")
+    p_run.add_argument("--reference", default="auto",
+                       help="expected, a backend name, or a folder of <document>.txt files "
+                            "(default: expected for hwp_bench corpora, else the first default backend; "
+                            "a backend reference is left unscored and sets no order)")
+    p_run.add_argument("--documents", help="Comma-separated document names (default: all)")
+    p_run.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    p_run.add_argument("--timeout", type=float, default=CASE_TIMEOUT,
+                       help=f"Seconds allowed per case (default: {CASE_TIMEOUT})")
+    p_run.add_argument("--texts", metavar="DIR", help="Keep the extracted texts in DIR")
+    p_run.add_argument("--in-process", action="store_true",
+                       help="Run cases in this process (faster; peak RSS is then cumulative)")
+
+    # Internal: one case in a fresh interpreter, used by 'run'.
+    p_case = sub.add_parser("case")
+    p_case.add_argument("backend")
+    p_case.add_argument("path")
+    p_case.add_argument("text_path")
+    p_case.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args()
+    try:
+        if args.command == "run":
+            backends = [b.strip() for b in args.backends.split(",") if b.strip()] if args.backends else None
+            report = run_shootout(args.corpus, backends, args.reference, args.repeat,
+                                  [d.strip() for d in args.documents.split(",")] if args.documents else None,
+                                  not args.in_process, args.timeout, args.texts)
+            _print_report(report)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
+                print(f"Saved to: {args.output}", file=sys.stderr)
+        else:
+            print(json.dumps(run_case(args.backend, args.path, args.text_path, args.repeat)))
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
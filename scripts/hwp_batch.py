@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Run one operation over many HWP/HWPX files on an hwp_pool.Offload.
+
+This is the body of the MCP ``hwp_batch`` tool. Instead of one tool call per
+attachment, a list of paths or a glob is read, analyzed, converted or edited
+with up to the work class's worker count of files in flight. Every result is
+written to a file under ``output_dir``, so the reply stays a compact table of
+status, output path, size, timing and error per file, however large the
+documents are.
+
+Usage:
+    from hwp_batch import expand_inputs, run_batch
+    from hwp_pool import Offload
+
+    inputs = expand_inputs([], "/data/**/*.hwp")
+    summary = await run_batch(Offload(), "convert", inputs, "/tmp/out", {"target_format": "pdf"})
+    summary["rows"]   # [["/data/a.hwp", "ok", "/tmp/out/a.pdf", 48213, 0.82, None], ...]
+"""
+
+import os
+import asyncio
+import glob
+import json
+import tempfile
+import time
+
+# operation -> hwp_pool work class it runs on
+BATCH_OPS = {"read": "read", "analyze": "read", "convert": "convert", "edit": "edit"}
+COLUMNS = ("input", "status", "output", "bytes", "seconds", "error")
+MAX_FILES = 1000
+# Back-off (seconds) while the work class is full of other callers' work.
+BUSY_DELAYS = (0.05, 0.1, 0.2, 0.5, 1, 1, 2, 2, 2, 2, 5, 5, 5, 5, 5)
+ERROR_CHARS = 300
+
+
+def expand_inputs(paths: list = None, pattern: str = "", max_files: int = MAX_FILES) -> list:
+    """Return ``paths`` followed by the files matching ``pattern``, without duplicates.
+
+    ``pattern`` is a glob; ``**`` matches across directories.
+    """
+    inputs = list(paths or [])
+    if pattern:
+        inputs += sorted(p for p in glob.glob(os.path.expanduser(pattern), recursive=True)
+                         if os.path.isfile(p))
+    inputs = list(dict.fromkeys(inputs))
+    if not inputs:
+        raise ValueError("No input files: pass paths or a pattern that matches files")
+    if len(inputs) > max_files:
+        raise ValueError(f"{len(inputs)} files exceed the batch limit of {max_files}")
+    return inputs
+
+
+def _output_ext(operation: str, input_path: str, options: dict) -> str:
+    if operation == "read":
+        return "." + options.get("output_format", "md")
+    if operation == "analyze":
+        return ".json"
+    if operation == "convert":
+        return "." + options["target_format"]
+    return os.path.splitext(input_path)[1]
+
+
+def plan_outputs(operation: str, inputs: list, output_dir: str, options: dict) -> list:
+    """Output path per input: ``output_dir/<name><ext>``, numbered when names collide.
+
+    Names of files already in ``output_dir`` count as taken, so a batch never
+    overwrites them.
+    """
+    taken = set()
+    outputs = []
+    for path in inputs:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        ext = _output_ext(operation, path, options)
+        name, n = stem + ext, 1
+        while name.lower() in taken or os.path.lexists(os.path.join(output_dir, name)):
+            n += 1
+            name = f"{stem}-{n}{ext}"
+        taken.add(name.lower())
+        outputs.append(os.path.join(output_dir, name))
+    return outputs
+
+
+def _run_operation(operation: str, input_path: str, output_path: str, options: dict,
+                   progress) -> None:
+    from hwp_sink import FileSink
+
+    if operation == "read":
+        from hwp_read import write_file, write_json
+
+        output_format = options.get("output_format", "md")
+        writer = write_json if output_format == "json" else write_file
+        with FileSink(output_path) as sink:
+            writer(input_path, sink, output_format, progress=progress)
+    elif operation == "analyze":
+        from hwp_analyze import analyze
+
+        info = analyze(input_path)
+        with FileSink(output_path) as sink:
+            sink.write(json.dumps(info, ensure_ascii=False, indent=2))
+    elif operation == "convert":
+        from hwp_convert import convert_to_odt, convert_to_pdf, write_html, write_markdown, write_text
+
+        target = options["target_format"]
+        if target == "pdf":
+            convert_to_pdf(input_path, output_path, progress=progress)
+        elif target == "odt":
+            convert_to_odt(input_path, output_path, progress)
+        else:
+            writer = {"md": write_markdown, "html": write_html, "txt": write_text}[target]
+            with FileSink(output_path) as sink:
+                writer(input_path, sink, progress=progress)
+    elif "operations" in options:
+        from hwp_edit import apply_edits
+
+        apply_edits(input_path, output_path, options["operations"], progress)
+    else:
+        from hwp_replace import replace_many
+
+        replace_many(input_path, output_path, options["mapping"], options.get("regex", False),
+                     options.get("whole_word", False), options.get("ignore_case", False), progress)
+
+
+def process_file(operation: str, input_path: str, output_path: str, options: dict,
+                 progress=None) -> list:
+    """Run ``operation`` on one file and return its result row (see COLUMNS).
+
+    The operation writes to a temporary name next to ``output_path`` that is
+    renamed on success, so a failure only removes what this call wrote and
+    never touches an existing file. Errors are recorded in the row rather
+    than raised. Runs on a pool worker.
+    """
+    start = time.perf_counter()
+    status, size, error = "ok", None, None
+    # A fresh unique name, so no file a user already has can be overwritten.
+    fd, part = tempfile.mkstemp(dir=os.path.dirname(output_path) or ".", prefix=".part-",
+                                suffix=os.path.splitext(output_path)[1])
+    os.close(fd)
+    try:
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"File not found: {input_path}")
+        _run_operation(operation, input_path, part, options, progress)
+        os.replace(part, output_path)
+        size = os.path.getsize(output_path)
+    except Exception as e:
+        status, error = "error", f"{type(e).__name__}: {e}"[:ERROR_CHARS]
+        if os.path.exists(part):
+            os.remove(part)
+        output_path = None
+    return [input_path, status, output_path, size, round(time.perf_counter() - start, 4), error]
+
+
+def check_options(operation: str, options: dict) -> None:
+    """Raise ValueError if ``options`` do not fit ``operation``."""
+    if operation not in BATCH_OPS:
+        raise ValueError(f"Unknown batch operation {operation!r} (expected one of {', '.join(BATCH_OPS)})")
+    if operation == "read" and options.get("output_format", "md") not in ("md", "txt", "json"):
+        raise ValueError("read: output_format must be 'md', 'txt' or 'json'")
+    if operation == "convert" and options.get("target_format") not in ("pdf", "md", "html", "txt", "odt"):
+        raise ValueError("convert: target_format must be one of pdf, md, html, txt, odt")
+    if operation == "edit":
+        if ("operations" in options) == ("mapping" in options):
+            raise ValueError("edit: needs exactly one of an edit script or a replacement map")
+        if "operations" in options:
+            from hwp_edit import check_operations
+
+            check_operations(options["operations"])
+
+
+async def _ignore(done, total=None, message=None) -> None:
+    """Per-file report: progress is summarised per file, but cancellation still applies."""
+
+
+async def run_batch(offload, operation: str, inputs: list, output_dir: str = "",
+                    options: dict = None, workers: int = 0, report=None) -> dict:
+    """Run ``operation`` over ``inputs`` on ``offload`` and return a summary table.
+
+    At most ``workers`` files (default and maximum: the work class's worker
+    count) are in flight, so a large batch never overflows the class's queue.
+    ``report(done, total, message)`` is awaited after each file. Outputs go to
+    ``output_dir``, or to a new temporary directory when it is empty.
+    """
+    from hwp_pool import ServerBusy
+
+    options = options or {}
+    check_options(operation, options)
+    work_class = BATCH_OPS[operation]
+    limit = offload.stats()[work_class]["workers"]
+    workers = min(workers, limit) if workers > 0 else limit
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    else:
+        output_dir = tempfile.mkdtemp(prefix="hwp-batch-")
+    outputs = plan_outputs(operation, inputs, output_dir, options)
+
+    slots = asyncio.Semaphore(workers)
+    done = 0
+
+    async def one(input_path: str, output_path: str) -> list:
+        nonlocal done
+        async with slots:
+            try:
+                for delay in BUSY_DELAYS + (None,):
+                    try:
+                        row = await offload.run(work_class, process_file, operation, input_path,
+                                                output_path, options, report=_ignore)
+                        break
+                    except ServerBusy:
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+            except Exception as e:
+                # The worker itself failed (busy for too long, process crashed).
+                row = [input_path, "error", None, None, None, f"{type(e).__name__}: {e}"[:ERROR_CHARS]]
+        done += 1
+        if report is not None:
+            try:
+                await report(done, len(inputs), os.path.basename(input_path))
+            except Exception:
+                pass
+        return row
+
+    start = time.perf_counter()
+    rows = await asyncio.gather(*(one(i, o) for i, o in zip(inputs, outputs)))
+    failed = sum(1 for row in rows if row[1] != "ok")
+    return {
+        "operation": operation,
+        "output_dir": output_dir,
+        "total": len(rows),
+        "ok": len(rows) - failed,
+        "failed": failed,
+        "seconds": round(time.perf_counter() - start, 3),
+        "columns": list(COLUMNS),
+        "rows": rows,
+    }
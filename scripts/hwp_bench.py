@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Benchmark the toolkit over a synthetic corpus that scales from 10 to 1M paragraphs.
+
+``corpus`` generates documents with create_hwpx_from_paragraphs: plain
+documents of increasing paragraph counts, a wide and a tall table, and an
+image-heavy file (incompressible BinData members added with HwpxPatch), plus
+binary HWP 5.0 documents of the same paragraph counts written by hwp_synth
+(several sections, tables, images and extended-size records). The corpus is described by a ``manifest.json`` and its content is deterministic,
+so two machines benchmark the same documents; files whose spec is unchanged
+are reused.
+
+``run`` times read, analyze, convert (md/html/pdf), edit and create on every
+document. Each (operation, document) case runs in a fresh interpreter that
+first imports the operation's backends (hwp_warmup), so import time and other
+cases' memory do not leak into the numbers. A case records its run times,
+throughput (paragraphs/s, MB/s), peak RSS and the stage breakdown from
+hwp_metrics, and everything is written to one JSON file.
+
+``compare`` checks a result file against a stored baseline and exits with
+status 1 when a case got slower or bigger than the thresholds allow.
+
+Usage:
+    python hwp_bench.py corpus bench-corpus --preset quick
+    python hwp_bench.py run bench-corpus -o results.json --ops read,convert-md --repeat 3
+    python hwp_bench.py compare baseline.json results.json --threshold 0.2
+
+Presets: quick (10..1k paragraphs), default (10..100k), full (10..1M).
+"""
+
+import sys
+import os
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from hwp_synth import SENTENCES
+
+SIZES = {
+    "quick": (10, 100, 1000),
+    "default": (10, 100, 1000, 10000, 100000),
+    "full": (10, 100, 1000, 10000, 100000, 1000000),
+}
+# preset -> (wide table rows x cols, tall table rows x cols, images, image KB)
+SHAPES = {
+    "quick": ((20, 30), (500, 5), 10, 64),
+    "default": ((50, 60), (5000, 6), 40, 128),
+    "full": ((100, 120), (50000, 8), 200, 256),
+}
+
+# operation -> hwp_pool work class (selects the backends to preload)
+OPS = {
+    "read": "read",
+    "analyze": "read",
+    "convert-md": "convert",
+    "convert-html": "convert",
+    "convert-pdf": "convert",
+    "edit": "edit",
+    "create": "create",
+}
+MANIFEST = "manifest.json"
+CASE_TIMEOUT = 1800
+
+
+def corpus_specs(preset: str = "default") -> list:
+    """Documents in a corpus preset, as spec dicts (``name``, ``kind`` and sizes)."""
+    if preset not in SIZES:
+        raise ValueError(f"Unknown preset {preset!r} (expected {', '.join(SIZES)})")
+    (wide_rows, wide_cols), (tall_rows, tall_cols), images, image_kb = SHAPES[preset]
+    specs = [{"name": f"paragraphs-{n}", "kind": "paragraphs", "paragraphs": n}
+             for n in SIZES[preset]]
+    specs.append({"name": "table-wide", "kind": "table", "paragraphs": 2,
+                  "rows": wide_rows, "cols": wide_cols})
+    specs.append({"name": "table-tall", "kind": "table", "paragraphs": 2,
+                  "rows": tall_rows, "cols": tall_cols})
+    specs.append({"name": f"images-{images}", "kind": "images", "paragraphs": 20,
+                  "images": images, "image_kb": image_kb})
+    specs += [{"name": f"binary-{n}", "kind": "hwp", "paragraphs": n, "sections": 4,
+               "tables": 10, "rows": 10, "cols": 4, "images": 5, "image_kb": image_kb,
+               "long_every": 100}
+              for n in SIZES[preset]]
+    return specs
+
+
+def extension(spec: dict) -> str:
+    return ".hwp" if spec["kind"] == "hwp" else ".hwpx"
+
+
+def _paragraphs(n: int):
+    return [f"{i + 1}. {SENTENCES[i % len(SENTENCES)]}" for i in range(n)]
+
+
+def build(spec: dict, path: str) -> str:
+    """Write the document described by ``spec`` to ``path`` (same content every time)."""
+    from hwp_create import create_hwpx_from_paragraphs
+
+    if spec["kind"] == "hwp":
+        from hwp_synth import synthetic_sections, write_hwp
+
+        rng = random.Random(spec["name"])
+        images = [("png", b"\x89PNG\r\n\x1a\n" + rng.randbytes(spec["image_kb"] * 1024))
+                  for _ in range(spec["images"])]
+        sections = synthetic_sections(spec["paragraphs"], spec["sections"], spec["tables"],
+                                      spec["rows"], spec["cols"], spec["long_every"])
+        return write_hwp(path, sections, images=images)
+
+    title = f"벤치마크 {spec['name']}"
+    tables = None
+    if spec["kind"] == "table":
+        cols = spec["cols"]
+        tables = [{"headers": [f"열{c + 1}" for c in range(cols)],
+                   "rows": ([f"{r + 1}-{c + 1}" for c in range(cols)] for r in range(spec["rows"]))}]
+    create_hwpx_from_paragraphs(path, title, "hwp_bench", _paragraphs(spec["paragraphs"]), tables)
+    if spec["kind"] == "images":
+        from hwp_package import HwpxPatch
+
+        rng = random.Random(spec["name"])
+        patch = HwpxPatch(path)
+        for i in range(spec["images"]):
+            # PNG signature and random (incompressible) payload, like real photos.
+            patch.write(f"BinData/image{i + 1}.png",
+                        b"\x89PNG\r\n\x1a\n" + rng.randbytes(spec["image_kb"] * 1024))
+        patch.save(path)
+    return path
+
+
+def expected_text(spec: dict) -> str:
+    """What a perfect reader extracts from ``build(spec)``: one paragraph or table cell per line."""
+    if spec["kind"] == "hwp":
+        from hwp_synth import synthetic_sections
+
+        lines = []
+        for blocks in synthetic_sections(spec["paragraphs"], spec["sections"], spec["tables"],
+                                         spec["rows"], spec["cols"], spec["long_every"]):
+            for block in blocks:
+                lines += [block] if isinstance(block, str) else [c for row in block for c in row]
+        return "\n".join(line.strip() for line in lines)
+    lines = [f"벤치마크 {spec['name']}"] + _paragraphs(spec["paragraphs"])
+    if spec["kind"] == "table":
+        cols = spec["cols"]
+        lines += [f"열{c + 1}" for c in range(cols)]
+        lines += [f"{r + 1}-{c + 1}" for r in range(spec["rows"]) for c in range(cols)]
+    return "\n".join(lines)
+
+
+def generate_corpus(out_dir: str, preset: str = "default", specs: list = None) -> dict:
+    """Build the corpus in ``out_dir`` and write its manifest; returns the manifest.
+
+    Documents whose spec matches the existing manifest and whose file is still
+    there are kept, so regenerating a large corpus is cheap.
+    """
+    specs = specs or corpus_specs(preset)
+    os.makedirs(out_dir, exist_ok=True)
+    previous = {}
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = {d["name"]: d for d in json.load(f)["documents"]}
+
+    documents = []
+    for spec in specs:
+        path = os.path.join(out_dir, spec["name"] + extension(spec))
+        old = previous.get(spec["name"])
+        if not (old and old["spec"] == spec and os.path.exists(path)
+                and os.path.getsize(path) == old["bytes"]):
+            start = time.perf_counter()
+            build(spec, path)
+            print(f"[INFO] built {spec['name']} in {time.perf_counter() - start:.2f}s",
+                  file=sys.stderr)
+        documents.append({"name": spec["name"], "file": os.path.basename(path),
+                          "bytes": os.path.getsize(path), "spec": spec})
+
+    manifest = {"preset": preset, "documents": documents}
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def load_manifest(corpus_dir: str) -> dict:
+    path = os.path.join(corpus_dir, MANIFEST)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No {MANIFEST} in {corpus_dir}; run 'hwp_bench.py corpus' first")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _operation(op: str, path: str, spec: dict, scratch: str):
+    """Return a no-argument callable that performs ``op`` once."""
+    if op == "read":
+        from hwp_read import read_file
+        return lambda: read_file(path, "md")
+    if op == "analyze":
+        from hwp_analyze import analyze
+        return lambda: analyze(path)
+    if op == "convert-md":
+        from hwp_convert import convert_to_markdown
+        return lambda: convert_to_markdown(path)
+    if op == "convert-html":
+        from hwp_convert import convert_to_html
+        return lambda: convert_to_html(path)
+    if op == "convert-pdf":
+        from hwp_convert import convert_to_pdf_bytes
+        return lambda: convert_to_pdf_bytes(path)
+    if op == "edit" and spec["kind"] == "hwp":
+        # Binary documents are edited in place by the record patcher.
+        from hwp_replace import replace_many
+        out = os.path.join(scratch, "edit.hwp")
+        return lambda: replace_many(path, out, {"예산": "예산안"})
+    if op == "edit":
+        from hwp_edit import apply_edits
+        out = os.path.join(scratch, "edit.hwpx")
+        return lambda: apply_edits(path, out, [{"op": "replace", "find": "예산", "replace": "예산안"}])
+    if op == "create":
+        out = os.path.join(scratch, "create" + extension(spec))
+        return lambda: build(spec, out)
+    raise ValueError(f"Unknown operation {op!r} (expected one of {', '.join(OPS)})")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(op: str, path: str, spec: dict, repeat: int = 3) -> dict:
+    """Time ``op`` on one document in this process and return its measurements."""
+    import hwp_metrics
+    from hwp_warmup import CLASS_BACKENDS, warm
+
+    warm(CLASS_BACKENDS[OPS[op]], quiet=True)
+    with tempfile.TemporaryDirectory(prefix="hwp-bench-") as scratch:
+        fn = _operation(op, path, spec, scratch)
+        rss_before = peak_rss_mb()
+        hwp_metrics.REGISTRY.reset()
+        seconds = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            fn()
+            seconds.append(time.perf_counter() - start)
+    stages = hwp_metrics.summary()["stages"]
+    return {
+        "seconds": [round(s, 5) for s in seconds],
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_before_mb": rss_before,
+        "stages_ms": {name: s["mean_ms"] for name, s in stages.items()},
+    }
+
+
+def _case_in_child(op: str, corpus_dir: str, name: str, repeat: int, timeout: float) -> dict:
+    cmd = [sys.executable, os.path.abspath(__file__), "case", op, corpus_dir, name,
+           "--repeat", str(repeat)]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+    if proc.returncode != 0:
+        tail = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        return {"error": f"exit {proc.returncode}: {tail}"[:300]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(corpus_dir: str, ops: list = None, repeat: int = 3, documents: list = None,
+              isolate: bool = True, timeout: float = CASE_TIMEOUT) -> dict:
+    """Run every operation on every corpus document; returns the result document.
+
+    With ``isolate`` (the default) each case runs in its own interpreter;
+    otherwise in this process, where peak RSS only ever grows.
+    """
+    ops = ops or list(OPS)
+    unknown = [op for op in ops if op not in OPS]
+    if unknown:
+        raise ValueError(f"Unknown operation(s) {', '.join(unknown)} (expected {', '.join(OPS)})")
+    manifest = load_manifest(corpus_dir)
+    docs = [d for d in manifest["documents"] if not documents or d["name"] in documents]
+
+    results = []
+    for doc in docs:
+        path = os.path.join(corpus_dir, doc["file"])
+        spec = doc["spec"]
+        for op in ops:
+            print(f"[INFO] {op} {doc['name']}", file=sys.stderr)
+            if isolate:
+                case = _case_in_child(op, corpus_dir, doc["name"], repeat, timeout)
+            else:
+                try:
+                    case = run_case(op, path, spec, repeat)
+                except Exception as e:
+                    case = {"error": f"{type(e).__name__}: {e}"[:300]}
+            row = {"op": op, "document": doc["name"], "paragraphs": spec["paragraphs"]
+                   + spec.get("rows", 0), "bytes": doc["bytes"], "repeat": repeat}
+            if "error" in case:
+                row["error"] = case["error"]
+            else:
+                median = statistics.median(case["seconds"])
+                row.update(
+                    seconds={"min": min(case["seconds"]), "median": round(median, 5),
+                             "max": max(case["seconds"])},
+                    throughput={"paragraphs_per_s": round(row["paragraphs"] / median, 1) if median else None,
+                                "mb_per_s": round(doc["bytes"] / median / 1e6, 3) if median else None},
+                    peak_rss_mb=case["peak_rss_mb"],
+                    rss_before_mb=case["rss_before_mb"],
+                    stages_ms=case["stages_ms"],
+                )
+            results.append(row)
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "preset": manifest.get("preset"),
+            "repeat": repeat,
+            "isolated": isolate,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.25, rss_threshold: float = 0.25,
+            min_seconds: float = 0.01) -> list:
+    """Compare two result documents case by case.
+
+    A case is a ``regression`` when its median time grew by more than
+    ``threshold`` (and by at least ``min_seconds``, so timer noise on tiny
+    documents is ignored) or its peak RSS grew by more than ``rss_threshold``;
+    ``improved`` when its time shrank by as much. A case that ran in the
+    baseline and now fails is a ``regression`` too (with its ``error``).
+    Other statuses are ``ok``, ``new``, ``missing`` (in the baseline only) and
+    ``error`` (failing in both, or new and failing).
+    """
+    base = {(r["op"], r["document"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        key = (r["op"], r["document"])
+        old = base.pop(key, None)
+        row = {"op": r["op"], "document": r["document"], "status": "ok",
+               "base_s": None, "new_s": None, "change": None, "base_rss_mb": None, "new_rss_mb": None}
+        if "error" in r:
+            broke = old is not None and "error" not in old
+            row.update(status="regression" if broke else "error", error=r["error"])
+        elif old is None or "error" in old:
+            row.update(status="new", new_s=r["seconds"]["median"], new_rss_mb=r["peak_rss_mb"])
+        else:
+            b, n = old["seconds"]["median"], r["seconds"]["median"]
+            row.update(base_s=b, new_s=n, change=round((n - b) / b, 4) if b else None,
+                       base_rss_mb=old.get("peak_rss_mb"), new_rss_mb=r.get("peak_rss_mb"))
+            slower = n > b * (1 + threshold) and n - b >= min_seconds
+            bigger = (row["base_rss_mb"] and row["new_rss_mb"]
+                      and row["new_rss_mb"] > row["base_rss_mb"] * (1 + rss_threshold))
+            if slower or bigger:
+                row["status"] = "regression"
+            elif n < b * (1 - threshold) and b - n >= min_seconds:
+                row["status"] = "improved"
+        rows.append(row)
+    for op, document in base:
+        rows.append({"op": op, "document": document, "status": "missing"})
+    return rows
+
+
+def _print_results(result: dict) -> None:
+    print(f"{'operation':<14} {'document':<20} {'median s':>10} {'para/s':>12} {'MB/s':>9} {'RSS MB':>8}")
+    for r in result["results"]:
+        if "error" in r:
+            print(f"{r['op']:<14} {r['document']:<20} error: {r['error']}")
+            continue
+        t = r["throughput"]
+        print(f"{r['op']:<14} {r['document']:<20} {r['seconds']['median']:>10.4f} "
+              f"{t['paragraphs_per_s'] or 0:>12.0f} {t['mb_per_s'] or 0:>9.2f} {r['peak_rss_mb'] or 0:>8.1f}")
+
+
+def _print_comparison(rows: list) -> None:
+    print(f"{'operation':<14} {'document':<20} {'base s':>9} {'new s':>9} {'change':>8} {'RSS MB':>14}  status")
+    for r in rows:
+        change = f"{r['change']:+.1%}" if r.get("change") is not None else "-"
+        rss = f"{r.get('base_rss_mb') or '-'}→{r.get('new_rss_mb') or '-'}"
+        base_s = f"{r['base_s']:.4f}" if r.get("base_s") is not None else "-"
+        new_s = f"{r['new_s']:.4f}" if r.get("new_s") is not None else "-"
+        print(f"{r['op']:<14} {r['document']:<20} {base_s:>9} {new_s:>9} {change:>8} {rss:>14}  "
+              f"{r['status']}{': ' + r['error'] if r.get('error') else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HWP toolkit on a synthetic corpus")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_corpus = sub.add_parser("corpus", help="Generate (or refresh) a benchmark corpus")
+    p_corpus.add_argument("output", help="Corpus directory")
+    p_corpus.add_argument("--preset", choices=list(SIZES), default="default",
+                          help="Corpus size (default: default, up to 100k paragraphs)")
+
+    p_run = sub.add_parser("run", help="Time every operation on every corpus document")
+    p_run.add_argument("corpus", help="Corpus directory (from 'corpus')")
+    p_run.add_argument("-o", "--output", help="Write the results JSON here (default: stdout table only)")
+    p_run.add_argument("--ops", default=",".join(OPS),
+                       help=f"Comma-separated operations (default: {','.join(OPS)})")
+    p_run.add_argument("--documents", help="Comma-separated document names (default: all)")
+    p_run.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    p_run.add_argument("--timeout", type=float, default=CASE_TIMEOUT,
+                       help=f"Seconds allowed per case (default: {CASE_TIMEOUT})")
+    p_run.add_argument("--in-process", action="store_true",
+                       help="Run cases in this process (faster; peak RSS is then cumulative)")
+
+    p_compare = sub.add_parser("compare", help="Flag regressions against a baseline result file")
+    p_compare.add_argument("baseline", help="Baseline results JSON")
+    p_compare.add_argument("current", help="New results JSON")
+    p_compare.add_argument("--threshold", type=float, default=0.25,
+                           help="Allowed median time increase, as a fraction (default: 0.25)")
+    p_compare.add_argument("--rss-threshold", type=float, default=0.25,
+                           help="Allowed peak RSS increase, as a fraction (default: 0.25)")
+    p_compare.add_argument("--min-seconds", type=float, default=0.01,
+                           help="Ignore time changes smaller than this (default: 0.01)")
+
+    # Internal: one case in a fresh interpreter, used by 'run'.
+    p_case = sub.add_parser("case")
+    p_case.add_argument("op")
+    p_case.add_argument("corpus")
+    p_case.add_argument("document")
+    p_case.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args()
+    try:
+        if args.command == "corpus":
+            manifest = generate_corpus(args.output, args.preset)
+            print(f"Corpus ready: {args.output} ({len(manifest['documents'])} documents)")
+        elif args.command == "run":
+            result = run_suite(args.corpus, [op.strip() for op in args.ops.split(",") if op.strip()],
+                               args.repeat,
+                               [d.strip() for d in args.documents.split(",")] if args.documents else None,
+                               not args.in_process, args.timeout)
+            _print_results(result)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(result, f, ensure_ascii=False, indent=2)
+                print(f"Saved to: {args.output}", file=sys.stderr)
+        elif args.command == "compare":
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+            with open(args.current, encoding="utf-8") as f:
+                current = json.load(f)
+            rows = compare(baseline, current, args.threshold, args.rss_threshold, args.min_seconds)
+            _print_comparison(rows)
+            regressions = sum(1 for r in rows if r["status"] == "regression")
+            if regressions:
+                print(f"{regressions} regression(s)", file=sys.stderr)
+                sys.exit(1)
+        else:
+            doc = next(d for d in load_manifest(args.corpus)["documents"] if d["name"] == args.document)
+            case = run_case(args.op, os.path.join(args.corpus, doc["file"]), doc["spec"], args.repeat)
+            print(json.dumps(case))
+    except (ValueError, FileNotFoundError, StopIteration) as e:
+        print(f"Error: {e or 'unknown document'}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
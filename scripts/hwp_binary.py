@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+In-place text replacement for binary HWP 5.0 files.
+
+Body text lives in ``BodyText/SectionN`` streams as a flat list of records
+(4-byte header: tag, nesting level, size). Each paragraph is a PARA_HEADER
+followed, one level deeper, by PARA_TEXT (UTF-16LE code units with embedded
+controls) and records that address the text by code-unit position:
+PARA_CHAR_SHAPE, PARA_LINE_SEG and PARA_RANGE_TAG.
+
+Replacing text walks the record index of each section and only touches
+PARA_TEXT records that contain a match, so controls (tables, pictures,
+fields) are never decoded. When the text length changes, the record size,
+the character count in PARA_HEADER and every position in the paragraph's
+shape/line/range records are adjusted. Only sections and the preview text
+that actually changed are recompressed; every other OLE stream is written
+back byte for byte (see hwp_ole).
+
+Usage:
+    from hwp_binary import replace_in_hwp
+    from hwp_replace import Replacer
+
+    replace_in_hwp("in.hwp", "out.hwp", Replacer({"old": "new"}))
+
+    hwp_replace.py and hwp_edit.py --replace/--map use this for .hwp inputs.
+
+Dependencies:
+    pip install olefile
+"""
+
+import sys
+import os
+import re
+import struct
+import zlib
+from array import array
+from bisect import bisect_right
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import hwp_metrics
+from hwp_ole import read_streams, write_compound
+
+PARA_HEADER = 66
+PARA_TEXT = 67
+PARA_CHAR_SHAPE = 68
+PARA_LINE_SEG = 69
+PARA_RANGE_TAG = 70
+
+SECTION_RE = re.compile(r"^BodyText/Section\d+$")
+PREVIEW_TEXT = "PrvText"
+
+# Control characters that occupy a single code unit; every other code below
+# 32 is an inline or extended control spanning 8 code units.
+_CHAR_CONTROLS = frozenset([0, 10, 13, *range(24, 32)])
+_CONTROL_RE = re.compile("[\x00-\x1f]")
+_NCHARS_MASK = 0x7FFFFFFF
+
+
+def iter_records(body: bytes):
+    """Yield ``(tag, level, start, data_start, end)`` for each record of a stream."""
+    offset = 0
+    n = len(body)
+    while offset + 4 <= n:
+        hdr = struct.unpack_from("<I", body, offset)[0]
+        tag = hdr & 0x3FF
+        level = (hdr >> 10) & 0x3FF
+        size = hdr >> 20
+        data_start = offset + 4
+        if size == 0xFFF:
+            if offset + 8 > n:
+                break
+            size = struct.unpack_from("<I", body, data_start)[0]
+            data_start += 4
+        end = data_start + size
+        if end > n:
+            raise ValueError(f"Truncated record (tag {tag}) at offset {offset}")
+        yield tag, level, offset, data_start, end
+        offset = end
+
+
+def pack_record(tag: int, level: int, data: bytes) -> bytes:
+    """Return a record header plus ``data``; sizes of 0xFFF and up use the extended form."""
+    size = len(data)
+    if size >= 0xFFF:
+        return struct.pack("<II", tag | (level << 10) | (0xFFF << 20), size) + data
+    return struct.pack("<I", tag | (level << 10) | (size << 20)) + data
+
+
+def _units(data: bytes) -> str:
+    """Decode UTF-16LE so that every code unit is one character (surrogates stay split)."""
+    text = data.decode("utf-16-le", "surrogatepass")
+    if len(text) * 2 == len(data):
+        return text
+    units = array("H", data)
+    if sys.byteorder == "big":
+        units.byteswap()
+    return "".join(map(chr, units))
+
+
+def _encode(units: str) -> bytes:
+    return units.encode("utf-16-le", "surrogatepass")
+
+
+def _segments(text: str):
+    """Yield ``(start, end, is_text)`` spans of a PARA_TEXT in code units."""
+    pos, n = 0, len(text)
+    while pos < n:
+        m = _CONTROL_RE.search(text, pos)
+        if m is None:
+            yield pos, n, True
+            return
+        i = m.start()
+        if i > pos:
+            yield pos, i, True
+        width = 1 if ord(text[i]) in _CHAR_CONTROLS else 8
+        yield i, min(i + width, n), False
+        pos = i + width
+
+
+def _replace_para_text(data: bytes, replacer):
+    """Return ``(new_data, edits)`` for a PARA_TEXT, or None when nothing matches.
+
+    ``edits`` lists ``(old_start, old_end, new_start, new_end)`` per replacement.
+    """
+    text = _units(data)
+    if replacer.pattern.search(text) is None:
+        return None
+    out = []
+    edits = []
+    delta = 0
+    for start, end, is_text in _segments(text):
+        if not is_text:
+            out.append(text[start:end])
+            continue
+        pos = start
+        for s, e, repl in replacer.spans(text[start:end]):
+            if _CONTROL_RE.search(repl):
+                raise ValueError(f"Replacement {repl!r} contains control characters")
+            repl = _units(repl.encode("utf-16-le", "surrogatepass"))
+            out.append(text[pos:start + s])
+            out.append(repl)
+            edits.append((start + s, start + e, start + s + delta, start + s + delta + len(repl)))
+            delta += len(repl) - (e - s)
+            pos = start + e
+        out.append(text[pos:end])
+    if not edits:
+        return None
+    return _encode("".join(out)), edits
+
+
+def _position_map(edits):
+    """Map old code-unit positions to new ones given sorted replacement edits."""
+    starts = [e[0] for e in edits]
+
+    def remap(p: int) -> int:
+        i = bisect_right(starts, p) - 1
+        if i < 0:
+            return p
+        old_s, old_e, new_s, new_e = edits[i]
+        if p < old_e:
+            return new_s + min(p - old_s, new_e - new_s)
+        return new_e + (p - old_e)
+
+    return remap
+
+
+def _remap_char_shapes(data: bytes, remap) -> bytes:
+    pairs = list(struct.iter_unpack("<II", data[:len(data) // 8 * 8]))
+    out = {}
+    for pos, shape in pairs:
+        out[remap(pos)] = shape  # a boundary inside a shortened match collapses onto the next
+    return b"".join(struct.pack("<II", pos, shape) for pos, shape in sorted(out.items()))
+
+
+def _remap_line_segs(data: bytes, remap) -> bytes:
+    buf = bytearray(data)
+    for off in range(0, len(buf) - 35, 36):
+        struct.pack_into("<I", buf, off, remap(struct.unpack_from("<I", buf, off)[0]))
+    return bytes(buf)
+
+
+def _remap_range_tags(data: bytes, remap) -> bytes:
+    buf = bytearray(data)
+    for off in range(0, len(buf) - 11, 12):
+        start, end = struct.unpack_from("<II", buf, off)
+        struct.pack_into("<II", buf, off, remap(start), remap(end))
+    return bytes(buf)
+
+
+def replace_in_section(body: bytes, replacer):
+    """Apply ``replacer`` to every PARA_TEXT of a decompressed section stream.
+
+    Returns the new stream, or None if nothing matched.
+    """
+    records = list(iter_records(body))
+    changed = {}
+    header = None          # index of the current paragraph's PARA_HEADER
+    remap = None
+    for i, (tag, level, _, data_start, end) in enumerate(records):
+        if tag == PARA_HEADER:
+            header, remap = i, None
+            continue
+        if header is None or level != records[header][1] + 1:
+            continue
+        if tag == PARA_TEXT:
+            result = _replace_para_text(body[data_start:end], replacer)
+            if result is None:
+                continue
+            data, edits = result
+            changed[i] = data
+            remap = _position_map(edits)
+            h_start = records[header][3]
+            head = bytearray(body[h_start:records[header][4]])
+            n_chars = struct.unpack_from("<I", head, 0)[0]
+            delta = (len(data) - (end - data_start)) // 2
+            struct.pack_into("<I", head, 0, (n_chars & ~_NCHARS_MASK) | ((n_chars & _NCHARS_MASK) + delta))
+            changed[header] = head
+        elif remap is not None and tag == PARA_CHAR_SHAPE:
+            data = _remap_char_shapes(body[data_start:end], remap)
+            changed[i] = data
+            count = len(data) // 8
+            head = changed[header]
+            if len(head) >= 14 and struct.unpack_from("<H", head, 12)[0] != count:
+                struct.pack_into("<H", head, 12, count)
+        elif remap is not None and tag == PARA_LINE_SEG:
+            changed[i] = _remap_line_segs(body[data_start:end], remap)
+        elif remap is not None and tag == PARA_RANGE_TAG:
+            changed[i] = _remap_range_tags(body[data_start:end], remap)
+
+    if not changed:
+        return None
+    out = []
+    pos = 0
+    for i in sorted(changed):
+        tag, level, start, _, end = records[i]
+        out.append(body[pos:start])
+        out.append(pack_record(tag, level, bytes(changed[i])))
+        pos = end
+    out.append(body[pos:])
+    return b"".join(out)
+
+
+def _file_flags(streams: dict) -> int:
+    header = streams.get("FileHeader")
+    if not header or not header.startswith(b"HWP Document File"):
+        raise ValueError("Not an HWP 5.0 document (missing FileHeader)")
+    flags = struct.unpack_from("<I", header, 36)[0]
+    if flags & 0x2:
+        raise ValueError("Password-protected HWP files cannot be edited")
+    if flags & 0x4:
+        raise ValueError("Distribution (read-only) HWP files cannot be edited")
+    return flags
+
+
+def replace_in_hwp(input_path: str, output_path: str, replacer, skip_unchanged: bool = False,
+                   level: int = 6, progress=None) -> bool:
+    """Apply a compiled hwp_replace.Replacer to a binary HWP file, adding to its counts.
+
+    Only BodyText sections and the preview text with hits are re-encoded.
+    ``output_path`` may equal ``input_path``. With ``skip_unchanged`` nothing
+    is written when there are no hits. ``progress`` (hwp_progress.Progress) is
+    told after each section. Returns True if ``output_path`` was written.
+    """
+    from hwp_progress import as_progress
+
+    progress = as_progress(progress)
+    with hwp_metrics.timer("replace", "open"):
+        streams = read_streams(input_path)
+    hwp_metrics.transferred("replace", "in", hwp_metrics.file_size(input_path))
+    by_name = dict(streams)
+    compressed = _file_flags(by_name) & 0x1
+    total = sum(1 for name, data in streams if data is not None and SECTION_RE.match(name))
+
+    updates = {}
+    done = 0
+    applying = hwp_metrics.Stopwatch("replace", "apply")
+    for name, data in streams:
+        if data is None:
+            continue
+        if SECTION_RE.match(name):
+            progress.check()
+            applying.start()
+            body = zlib.decompress(data, -15) if compressed else data
+            new = replace_in_section(body, replacer)
+            if new is not None:
+                if compressed:
+                    co = zlib.compressobj(level, zlib.DEFLATED, -15)
+                    new = co.compress(new) + co.flush()
+                updates[name] = new
+            applying.stop()
+            done += 1
+            progress(done, total, name)
+        elif name == PREVIEW_TEXT:
+            # The preview repeats the body text, so its hits are not counted again.
+            text = data.decode("utf-16-le", "surrogatepass")
+            preview = replacer.sub(text, counted=False)
+            if preview != text:
+                updates[name] = preview.encode("utf-16-le", "surrogatepass")
+
+    hwp_metrics.observe("replace", "apply", applying.seconds)
+    if skip_unchanged and not updates:
+        return False
+    streams = [(name, updates.get(name, data)) for name, data in streams]
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp = output_path + ".tmp"
+    try:
+        with hwp_metrics.timer("replace", "save"), open(tmp, "wb") as f:
+            write_compound(f, streams)
+        os.replace(tmp, output_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    hwp_metrics.transferred("replace", "out", hwp_metrics.file_size(output_path))
+    return True
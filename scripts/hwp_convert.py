@@ -8,6 +8,8 @@ Usage:
     python hwp_convert.py <input_file> --to html
     python hwp_convert.py <input_file> --to txt
     python hwp_convert.py <input_file> --to odt
+    python hwp_convert.py <input_file> --to pdf --sections 0 --paragraphs 0:40
+    python hwp_convert.py <input_file> --to pdf --stats --stats-file metrics.prom
 
 Dependencies:
     pip install pyhwp2md python-hwpx weasyprint markdown olefile
@@ -16,58 +18,124 @@ Dependencies:
 import sys
 import os
 import argparse
-import subprocess
+from contextlib import contextmanager
 
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
 
-def convert_to_markdown(input_path: str) -> str:
-    """Convert HWP/HWPX to Markdown using pyhwp2md."""
+import hwp_metrics
+import hwp_profile
+from hwp_progress import as_progress
+from hwp_read import Selection, write_file, write_selection
+from hwp_sink import FileSink, MemorySink, open_sink
+
+
+@contextmanager
+def _counted(input_path: str, sink):
+    """Count the input file and what the block writes into ``sink`` (hwp_metrics)."""
+    written = sink.bytes_written
+    hwp_metrics.transferred("convert", "in", hwp_metrics.file_size(input_path))
+    yield
+    hwp_metrics.transferred("convert", "out", sink.bytes_written - written)
+
+
+def _pyhwp2md(input_path: str) -> str:
     from pyhwp2md import convert
-    return convert(input_path)
+    with hwp_metrics.timer("convert", "decode"):
+        content = convert(input_path)
+    hwp_metrics.backend("convert", "pyhwp2md")
+    return content
 
 
-def convert_to_text(input_path: str) -> str:
-    """Convert HWP/HWPX to plain text."""
+def write_markdown(input_path: str, sink, selection: Selection = None,
+                   progress=None) -> None:
+    """Convert HWP/HWPX to Markdown using pyhwp2md, writing into ``sink``.
+
+    With a section/paragraph ``selection`` the native parsers are used instead,
+    since pyhwp2md always converts the whole document.
+    """
+    with _counted(input_path, sink):
+        _write_markdown(input_path, sink, selection, progress)
+
+
+def _write_markdown(input_path: str, sink, selection: Selection = None,
+                    progress=None) -> None:
+    if selection is not None and not selection.is_all:
+        write_selection(input_path, sink, "md", selection, progress)
+        return
+    as_progress(progress).check()
+    sink.write(_pyhwp2md(input_path))
+
+
+def convert_to_markdown(input_path: str, selection: Selection = None,
+                        progress=None) -> str:
+    """Convert HWP/HWPX to Markdown using pyhwp2md."""
+    sink = MemorySink()
+    write_markdown(input_path, sink, selection, progress)
+    return sink.getvalue()
+
+
+def write_text(input_path: str, sink, selection: Selection = None,
+               progress=None) -> None:
+    """Convert HWP/HWPX to plain text, writing into ``sink``."""
+    with _counted(input_path, sink):
+        _write_text(input_path, sink, selection, progress)
+
+
+def _write_text(input_path: str, sink, selection: Selection = None,
+                progress=None) -> None:
+    if selection is not None and not selection.is_all:
+        write_selection(input_path, sink, "txt", selection, progress)
+        return
+
     ext = os.path.splitext(input_path)[1].lower()
+    progress = as_progress(progress)
 
     # Try pyhwp2md first
+    progress.check()
     try:
-        from pyhwp2md import convert
-        return convert(input_path)
+        sink.write(_pyhwp2md(input_path))
+        return
     except Exception:
         pass
 
     # Fallback: hwp5txt for HWP files
     if ext == ".hwp":
+        hwp_metrics.fallback("convert", "pyhwp2md", "hwp5txt")
         try:
-            result = subprocess.run(["hwp5txt", input_path], capture_output=True, text=True, timeout=30)
+            with hwp_metrics.timer("convert", "decode"):
+                result = progress.run(["hwp5txt", input_path], timeout=30, text=True)
             if result.returncode == 0:
-                return result.stdout
+                sink.write(result.stdout)
+                hwp_metrics.backend("convert", "hwp5txt")
+                return
         except Exception:
             pass
 
     # Fallback: olefile parser
+    hwp_metrics.fallback("convert", "hwp5txt" if ext == ".hwp" else "pyhwp2md", "hwp_read")
     try:
-        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-        from hwp_read import read_file
-        return read_file(input_path, "txt")
+        write_file(input_path, sink, "txt", progress=progress)
+        hwp_metrics.backend("convert", "hwp_read")
     except Exception as e:
         raise RuntimeError(f"Failed to convert to text: {e}")
 
 
-def convert_to_html(input_path: str, standalone: bool = True) -> str:
-    """Convert HWP/HWPX to HTML."""
-    import markdown as md_lib
+def convert_to_text(input_path: str, selection: Selection = None,
+                    progress=None) -> str:
+    """Convert HWP/HWPX to plain text."""
+    sink = MemorySink()
+    write_text(input_path, sink, selection, progress)
+    return sink.getvalue()
 
-    md_text = convert_to_markdown(input_path)
-    html_body = md_lib.markdown(md_text, extensions=['tables', 'fenced_code'])
 
-    if standalone:
-        return f"""<!DOCTYPE html>
+HTML_HEAD = """<!DOCTYPE html>
 <html lang="ko">
 <head>
 <meta charset="utf-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>{os.path.basename(input_path)}</title>
+<title>{title}</title>
 <style>
 body {{ font-family: 'Malgun Gothic', 'Noto Sans KR', 'Apple SD Gothic Neo', sans-serif;
        max-width: 800px; margin: 0 auto; padding: 2em; font-size: 11pt; line-height: 1.8; color: #333; }}
@@ -86,33 +154,102 @@ li {{ margin-bottom: 0.3em; }}
 </style>
 </head>
 <body>
-{html_body}
+"""
+
+HTML_TAIL = """
 </body>
 </html>"""
-    return html_body
 
 
-def convert_to_pdf(input_path: str, output_path: str) -> str:
-    """Convert HWP/HWPX to PDF via Markdown → HTML → WeasyPrint."""
+def write_html(input_path: str, sink, standalone: bool = True,
+               selection: Selection = None, progress=None) -> None:
+    """Convert HWP/HWPX to HTML, writing into ``sink``.
+
+    The document head is written before the Markdown is parsed, so a streaming
+    consumer receives the first bytes right away.
+    """
+    with _counted(input_path, sink):
+        _write_html(input_path, sink, standalone, selection, progress)
+
+
+def _write_html(input_path: str, sink, standalone: bool = True,
+                selection: Selection = None, progress=None) -> None:
+    import markdown as md_lib
+
+    if standalone:
+        sink.write(HTML_HEAD.format(title=os.path.basename(input_path)))
+    md_sink = MemorySink()
+    _write_markdown(input_path, md_sink, selection, progress)
+    with hwp_metrics.timer("convert", "html"):
+        html = md_lib.markdown(md_sink.getvalue(), extensions=['tables', 'fenced_code'])
+    sink.write(html)
+    if standalone:
+        sink.write(HTML_TAIL)
+
+
+def convert_to_html(input_path: str, standalone: bool = True,
+                    selection: Selection = None, progress=None) -> str:
+    """Convert HWP/HWPX to HTML."""
+    sink = MemorySink()
+    write_html(input_path, sink, standalone, selection, progress)
+    return sink.getvalue()
+
+
+def write_pdf(input_path: str, sink, selection: Selection = None,
+              progress=None) -> None:
+    """Convert HWP/HWPX to PDF via Markdown → HTML → WeasyPrint, writing into a binary ``sink``.
+
+    Layout and PDF output are separate WeasyPrint steps, so ``progress`` hears
+    about each and cancellation takes effect between them.
+    """
     from weasyprint import HTML
 
-    html_content = convert_to_html(input_path, standalone=True)
-    HTML(string=html_content).write_pdf(output_path)
+    progress = as_progress(progress)
+    hwp_metrics.transferred("convert", "in", hwp_metrics.file_size(input_path))
+    html_sink = MemorySink()
+    _write_html(input_path, html_sink, True, selection, progress)
+    progress(1, 3, "HTML ready")
+    with hwp_metrics.timer("convert", "render"):
+        document = HTML(string=html_sink.getvalue()).render()
+    progress(2, 3, f"{len(document.pages)} pages laid out")
+    start = hwp_metrics.position(sink.stream)
+    with hwp_metrics.timer("convert", "save"):
+        document.write_pdf(sink.stream)
+    hwp_metrics.transferred("convert", "out", hwp_metrics.position(sink.stream) - start)
+    progress(3, 3, "PDF written")
+
+
+def convert_to_pdf(input_path: str, output_path: str, selection: Selection = None,
+                   progress=None) -> str:
+    """Convert HWP/HWPX to PDF via Markdown → HTML → WeasyPrint."""
+    with FileSink(output_path, binary=True) as sink:
+        write_pdf(input_path, sink, selection, progress)
     return output_path
 
 
-def convert_to_odt(input_path: str, output_path: str) -> str:
+def convert_to_pdf_bytes(input_path: str, selection: Selection = None,
+                         progress=None) -> bytes:
+    """Convert HWP/HWPX to PDF in memory and return the PDF bytes."""
+    sink = MemorySink(binary=True)
+    write_pdf(input_path, sink, selection, progress)
+    return sink.getvalue()
+
+
+def convert_to_odt(input_path: str, output_path: str, progress=None) -> str:
     """Convert HWP to ODT using pyhwp's hwp5odt (HWP only)."""
     ext = os.path.splitext(input_path)[1].lower()
     if ext != ".hwp":
         raise ValueError("ODT conversion via hwp5odt is only supported for .hwp files")
 
-    result = subprocess.run(
-        ["hwp5odt", input_path, "--output", output_path],
-        capture_output=True, text=True, timeout=60
-    )
+    hwp_metrics.transferred("convert", "in", hwp_metrics.file_size(input_path))
+    with hwp_metrics.timer("convert", "render"):
+        result = as_progress(progress).run(
+            ["hwp5odt", input_path, "--output", output_path], timeout=60, text=True
+        )
     if result.returncode != 0:
         raise RuntimeError(f"hwp5odt failed: {result.stderr}")
+    hwp_metrics.backend("convert", "hwp5odt")
+    hwp_metrics.transferred("convert", "out", hwp_metrics.file_size(output_path))
     return output_path
 
 
@@ -122,7 +259,15 @@ def main():
     parser.add_argument("--to", required=True, choices=["pdf", "md", "html", "txt", "odt"],
                         help="Target format")
     parser.add_argument("-o", "--output", help="Output file path (auto-generated if omitted)")
+    parser.add_argument("--sections", metavar="RANGE",
+                        help="Only convert these sections, e.g. 0-2 or 0,3,5- (0-based)")
+    parser.add_argument("--paragraphs", metavar="A:B",
+                        help="Only convert top-level paragraphs A..B-1 of the selected sections")
+    hwp_metrics.add_stats_arguments(parser)
+    hwp_profile.add_profile_arguments(parser)
     args = parser.parse_args()
+    hwp_metrics.report_at_exit(args.stats, args.stats_file)
+    hwp_profile.profile_until_exit(args.profile, args.profile_dir, "convert")
 
     if not os.path.exists(args.input):
         print(f"Error: File not found: {args.input}", file=sys.stderr)
@@ -132,34 +277,24 @@ def main():
     ext_map = {"pdf": ".pdf", "md": ".md", "html": ".html", "txt": ".txt", "odt": ".odt"}
     output_path = args.output or (base + ext_map[args.to])
 
+    writers = {"md": (write_markdown, "Markdown saved"),
+               "html": (write_html, "HTML saved"),
+               "txt": (write_text, "Text saved")}
+
     try:
+        selection = Selection.from_specs(args.sections, args.paragraphs)
+        if args.to == "odt" and not selection.is_all:
+            raise ValueError("--sections/--paragraphs are not supported for ODT output")
+
         if args.to == "pdf":
-            convert_to_pdf(args.input, output_path)
+            convert_to_pdf(args.input, output_path, selection)
             print(f"PDF created: {output_path}")
-        elif args.to == "md":
-            content = convert_to_markdown(args.input)
-            if args.output:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                print(f"Markdown saved: {output_path}")
-            else:
-                print(content)
-        elif args.to == "html":
-            content = convert_to_html(args.input)
-            if args.output:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                print(f"HTML saved: {output_path}")
-            else:
-                print(content)
-        elif args.to == "txt":
-            content = convert_to_text(args.input)
+        elif args.to in writers:
+            writer, saved_msg = writers[args.to]
+            with open_sink(args.output) as sink:
+                writer(args.input, sink, selection=selection)
             if args.output:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                print(f"Text saved: {output_path}")
-            else:
-                print(content)
+                print(f"{saved_msg}: {output_path}")
         elif args.to == "odt":
             convert_to_odt(args.input, output_path)
             print(f"ODT created: {output_path}")
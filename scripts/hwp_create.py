@@ -4,8 +4,9 @@ Create HWPX files from text/Markdown content using python-hwpx.
 
 Usage:
     python hwp_create.py <output_file.hwpx> --title "Title" --body "Body text"
-    python hwp_create.py <output_file.hwpx> --markdown <input.md>
+    python hwp_create.py <output_file.hwpx> --markdown <input.md>   # streamed, order kept
     python hwp_create.py <output_file.hwpx> --json <structured_input.json>
+    python hwp_create.py <output_dir> --batch a.md b.md ... --method md2hwp --workers 4
 
 Dependencies:
     pip install python-hwpx
@@ -18,24 +19,35 @@ import json
 import re
 from io import BytesIO
 
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
 
-def create_hwpx_from_paragraphs(output_path: str, title: str = "", author: str = "",
-                                 paragraphs: list = None, tables: list = None):
+import hwp_metrics
+import hwp_profile
+from hwp_table import BulkTables
+
+
+def write_hwpx_from_paragraphs(fileobj, title: str = "", author: str = "",
+                               paragraphs: list = None, tables: list = None) -> None:
     """
-    Create an HWPX file with paragraphs and optional tables.
+    Write an HWPX with paragraphs and optional tables into a binary file object.
 
     Args:
-        output_path: Output .hwpx file path
+        fileobj: Writable binary file object (file, BytesIO, socket wrapper, ...)
         title: Document title (added as first paragraph if provided)
         author: Document author
         paragraphs: List of paragraph strings
-        tables: List of dicts with 'headers' and 'rows' keys
+        tables: List of dicts with 'headers' and 'rows' (any iterable of rows) keys,
+            or 'columns' (dict of header → values) for columnar input
     """
     from hwpx.document import HwpxDocument
     from hwpx.templates import blank_document_bytes
 
-    source = BytesIO(blank_document_bytes())
-    doc = HwpxDocument.open(source)
+    rendering = hwp_metrics.Stopwatch("create", "render")
+    rendering.start()
+    blank = blank_document_bytes()
+    doc = HwpxDocument.open(BytesIO(blank))
     section = doc.sections[0]
 
     if title:
@@ -46,150 +58,301 @@ def create_hwpx_from_paragraphs(output_path: str, title: str = "", author: str =
             if p.strip():
                 doc.add_paragraph(p.strip(), section=section)
 
+    bulk = BulkTables(doc, source=BytesIO(blank))
     if tables:
         for tbl in tables:
             headers = tbl.get("headers", [])
             rows = tbl.get("rows", [])
-            if not headers and rows:
-                headers = [f"Col{i+1}" for i in range(len(rows[0]))]
-            ncols = len(headers)
-            nrows = len(rows) + 1  # +1 for header row
-
-            table = doc.add_table(rows=nrows, cols=ncols, section=section)
-            for ci, h in enumerate(headers):
-                table.set_cell_text(0, ci, str(h))
-            for ri, row in enumerate(rows):
-                for ci, cell in enumerate(row):
-                    if ci < ncols:
-                        table.set_cell_text(ri + 1, ci, str(cell))
+            columns = tbl.get("columns")
+            if not headers and not rows and not columns:
+                continue
+            bulk.add(headers=headers, rows=rows, columns=columns, section=section)
+    rendering.stop()
+    hwp_metrics.observe("create", "render", rendering.seconds)
 
+    start = hwp_metrics.position(fileobj)
+    with hwp_metrics.timer("create", "save"):
+        bulk.write(fileobj)
+    hwp_metrics.backend("create", "python-hwpx")
+    hwp_metrics.transferred("create", "out", hwp_metrics.position(fileobj) - start)
+
+
+def create_hwpx_from_paragraphs(output_path: str, title: str = "", author: str = "",
+                                paragraphs: list = None, tables: list = None):
+    """Create an HWPX file with paragraphs and optional tables (see write_hwpx_from_paragraphs)."""
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-    doc.save(output_path)
+    with open(output_path, 'wb') as f:
+        write_hwpx_from_paragraphs(f, title, author, paragraphs, tables)
     return output_path
 
 
+def create_hwpx_bytes(title: str = "", author: str = "", paragraphs: list = None,
+                      tables: list = None, markdown=None) -> bytes:
+    """
+    Build an HWPX entirely in memory and return its bytes.
+
+    With ``markdown`` (string, open file or iterable of lines) the document is
+    streamed from Markdown as in create_hwpx_from_markdown_stream; otherwise it
+    is built from ``paragraphs`` and ``tables``.
+    """
+    buf = BytesIO()
+    if markdown is not None:
+        write_hwpx_from_markdown_stream(buf, markdown, title, author)
+    else:
+        write_hwpx_from_paragraphs(buf, title, author, paragraphs, tables)
+    return buf.getvalue()
+
+
 def create_hwpx_from_markdown_via_node(output_path: str, markdown_text: str,
-                                        title: str = "Document", author: str = ""):
+                                        title: str = "Document", author: str = "",
+                                        progress=None):
     """
     Create HWPX from Markdown using md2hwp (Node.js).
     Supports headings, bold, italic, tables, and lists.
 
+    Conversions run on a shared pool of long-lived node workers (see hwp_node),
+    so md2hwp is loaded once per worker rather than once per document.
+
     Args:
         output_path: Output .hwpx file path
         markdown_text: Markdown content string
         title: Document title metadata
         author: Document author metadata
+        progress: Optional hwp_progress.Progress; cancelling it kills the worker
     """
-    import subprocess
-    import tempfile
+    from hwp_node import check_md2hwp, get_pool
+
+    check_md2hwp()
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with hwp_metrics.timer("create", "render"):
+        get_pool().convert(markdown_text, output_path, title, author, progress=progress)
+    if not os.path.exists(output_path):
+        raise RuntimeError("md2hwp did not produce output file")
+    hwp_metrics.backend("create", "md2hwp")
+    hwp_metrics.transferred("create", "out", hwp_metrics.file_size(output_path))
+    return output_path
 
-    skill_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    node_modules = os.path.join(skill_dir, "node_modules")
 
-    if not os.path.exists(os.path.join(node_modules, "md2hwp")):
-        raise RuntimeError(
-            "md2hwp not installed. Run: cd {} && npm install md2hwp".format(skill_dir)
-        )
+def create_hwpx_bytes_via_node(markdown_text: str, title: str = "Document",
+                               author: str = "", progress=None) -> bytes:
+    """Convert Markdown with md2hwp and return the HWPX bytes; nothing is written to disk."""
+    from hwp_node import check_md2hwp, get_pool
 
-    # Write markdown to temp file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False, encoding='utf-8') as f:
-        f.write(markdown_text)
-        md_path = f.name
-
-    # Write temp JS script
-    # Note: process.argv[2] = md_path, process.argv[3] = output_path
-    # because process.argv[0]=node, process.argv[1]=script.js
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-        f.write(f"""
-const {{ convertMarkdownToHwp }} = require('{node_modules}/md2hwp');
-const fs = require('fs');
-const mdPath = process.argv[2];
-const outPath = process.argv[3];
-const md = fs.readFileSync(mdPath, 'utf-8');
-(async () => {{
-    const buf = await convertMarkdownToHwp(md, {{
-        title: {json.dumps(title)},
-        author: {json.dumps(author or 'hwp-toolkit')}
-    }});
-    fs.writeFileSync(outPath, buf);
-}})().catch(e => {{ console.error(e); process.exit(1); }});
-""")
-        js_path = f.name
-
-    try:
-        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-        result = subprocess.run(
-            ["node", js_path, md_path, output_path],
-            capture_output=True, text=True, timeout=30
-        )
-        if result.returncode != 0:
-            raise RuntimeError(f"md2hwp failed: {result.stderr}")
-        if not os.path.exists(output_path):
-            raise RuntimeError("md2hwp did not produce output file")
-        return output_path
-    finally:
-        os.unlink(js_path)
-        os.unlink(md_path)
+    check_md2hwp()
+    with hwp_metrics.timer("create", "render"):
+        data = get_pool().convert(markdown_text, None, title, author, progress=progress)
+    hwp_metrics.backend("create", "md2hwp")
+    hwp_metrics.transferred("create", "out", len(data))
+    return data
 
 
-def parse_markdown_to_structure(md_text: str) -> dict:
-    """Parse simple Markdown into paragraphs and tables for python-hwpx."""
-    paragraphs = []
-    tables = []
-    current_table_lines = []
+def create_batch_from_markdown(output_dir: str, markdown_files: list, title: str = "",
+                               author: str = "", method: str = "python-hwpx",
+                               workers: int = 2):
+    """
+    Create one HWPX per Markdown file in ``output_dir``; yields (md_path, result).
+
+    ``result`` is the output path, or the exception raised for that file. With
+    ``method="md2hwp"`` the files are spread across ``workers`` node workers.
+    Inputs with the same file name get numbered outputs (``name-2.hwpx``).
+    """
+    taken = set()
+
+    def target(md_path):
+        stem = os.path.splitext(os.path.basename(md_path))[0]
+        name, n = stem, 1
+        while name.lower() in taken:
+            n += 1
+            name = f"{stem}-{n}"
+        taken.add(name.lower())
+        return os.path.join(output_dir, name + ".hwpx"), title or stem
+
+    if method == "md2hwp":
+        from hwp_node import Md2HwpPool, check_md2hwp
+
+        check_md2hwp()
+        os.makedirs(output_dir, exist_ok=True)
+        sources = {}
+        unreadable = []
+
+        def specs():
+            for md_path in markdown_files:
+                try:
+                    with open(md_path, 'r', encoding='utf-8') as f:
+                        md_text = f.read()
+                except (OSError, UnicodeDecodeError) as e:
+                    unreadable.append((md_path, e))
+                    continue
+                out, doc_title = target(md_path)
+                sources[out] = md_path
+                yield md_text, out, doc_title, author
+
+        with Md2HwpPool(workers) as pool:
+            for spec, result in pool.map(specs()):
+                while unreadable:
+                    yield unreadable.pop(0)
+                yield sources[spec[1]], result
+        yield from unreadable
+        return
+
+    for md_path in markdown_files:
+        try:
+            out, doc_title = target(md_path)
+            with open(md_path, 'r', encoding='utf-8') as f:
+                result = create_hwpx_from_markdown_stream(out, f, doc_title, author)
+            yield md_path, result
+        except Exception as e:
+            yield md_path, e
+
+
+BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+ITALIC_RE = re.compile(r'\*(.*?)\*')
+LIST_RE = re.compile(r'^[-*+]\s+')
+HEADING_RE = re.compile(r'^#+\s*')
+
+
+def _strip_inline(text: str) -> str:
+    if '*' not in text:
+        return text
+    return ITALIC_RE.sub(r'\1', BOLD_RE.sub(r'\1', text))
+
+
+def _is_separator_row(cells: list) -> bool:
+    return all(set(c.strip()) <= {'-', ':', ' '} for c in cells)
+
+
+def iter_markdown_blocks(lines):
+    """
+    Parse Markdown in a single pass and yield block events in document order.
+
+    ``lines`` is any iterable of lines (e.g. an open file) or a whole string.
+    Events are dicts with a ``type`` key:
+
+        {"type": "heading", "level": 2, "text": "..."}
+        {"type": "paragraph", "text": "..."}
+        {"type": "list_item", "text": "..."}
+        {"type": "table_start", "headers": [...]}
+        {"type": "table_row", "cells": [...]}
+        {"type": "table_end"}
+
+    Only the current line is held, so arbitrarily long input streams through.
+    A lone ``|`` line with no second table line is dropped, as before.
+    """
+    if isinstance(lines, str):
+        lines = lines.split('\n')
 
-    for line in md_text.split('\n'):
+    table_head = None     # first line of a table not yet known to be one
+    in_table = False
+
+    for line in lines:
         stripped = line.strip()
 
         # Table line
         if '|' in stripped and stripped.startswith('|'):
-            current_table_lines.append(stripped)
+            cells = [c.strip() for c in stripped.strip('|').split('|')]
+            if in_table:
+                if not _is_separator_row(cells):
+                    yield {"type": "table_row", "cells": cells}
+            elif table_head is None:
+                table_head = cells
+            else:
+                yield {"type": "table_start", "headers": table_head}
+                table_head, in_table = None, True
+                if not _is_separator_row(cells):
+                    yield {"type": "table_row", "cells": cells}
             continue
 
         # End of table
-        if current_table_lines:
-            tbl = _parse_md_table(current_table_lines)
-            if tbl:
-                tables.append(tbl)
-            current_table_lines = []
+        if in_table:
+            yield {"type": "table_end"}
+            in_table = False
+        table_head = None
 
         # Heading → plain text (python-hwpx doesn't support heading styles easily)
         if stripped.startswith('#'):
-            text = re.sub(r'^#+\s*', '', stripped)
-            paragraphs.append(text)
+            level = len(stripped) - len(stripped.lstrip('#'))
+            yield {"type": "heading", "level": level, "text": HEADING_RE.sub('', stripped)}
+        elif LIST_RE.match(stripped):
+            yield {"type": "list_item", "text": _strip_inline(LIST_RE.sub('', stripped))}
         elif stripped:
-            # Remove basic markdown formatting
-            text = re.sub(r'\*\*(.*?)\*\*', r'\1', stripped)
-            text = re.sub(r'\*(.*?)\*', r'\1', text)
-            text = re.sub(r'^[-*+]\s+', '', text)
-            paragraphs.append(text)
+            yield {"type": "paragraph", "text": _strip_inline(stripped)}
 
-    if current_table_lines:
-        tbl = _parse_md_table(current_table_lines)
-        if tbl:
-            tables.append(tbl)
+    if in_table:
+        yield {"type": "table_end"}
 
-    return {"paragraphs": paragraphs, "tables": tables}
 
+def write_markdown_blocks(writer, events) -> None:
+    """Feed ``iter_markdown_blocks`` events into an ``HwpxStreamWriter`` in order.
 
-def _parse_md_table(lines: list) -> dict:
-    """Parse Markdown table lines into headers and rows."""
-    if len(lines) < 2:
-        return None
-    cells = []
-    for line in lines:
-        row = [c.strip() for c in line.strip('|').split('|')]
-        cells.append(row)
-
-    # Skip separator line (---|----|---)
-    headers = cells[0]
-    rows = []
-    for row in cells[1:]:
-        if all(set(c.strip()) <= {'-', ':', ' '} for c in row):
-            continue
-        rows.append(row)
+    Table rows are pulled from the event stream while the table is written, so
+    a table is never collected into a list here.
+    """
+    events = iter(events)
+
+    def table_rows():
+        for event in events:
+            if event["type"] == "table_end":
+                return
+            yield event["cells"]
+
+    for event in events:
+        if event["type"] == "table_start":
+            writer.add_table(event["headers"], table_rows())
+        elif event["type"] in ("heading", "paragraph", "list_item"):
+            writer.add_paragraph(event["text"])
 
-    return {"headers": headers, "rows": rows}
+
+def write_hwpx_from_markdown_stream(fileobj, source, title: str = "", author: str = "") -> None:
+    """
+    Write an HWPX from Markdown into a binary file object, block by block.
+
+    Unlike parsing into paragraphs and tables first, headings, paragraphs, lists
+    and tables keep their original order, and memory stays flat regardless of
+    input size.
+
+    Args:
+        fileobj: Writable binary file object
+        source: Open text file, any iterable of lines, or a Markdown string
+        title: Document title (added as first paragraph if provided)
+        author: Document author
+    """
+    from hwp_writer import HwpxStreamWriter
+
+    start = hwp_metrics.position(fileobj)
+    with hwp_metrics.timer("create", "stream"), HwpxStreamWriter(fileobj) as writer:
+        if title:
+            writer.add_paragraph(title)
+        write_markdown_blocks(writer, iter_markdown_blocks(source))
+    hwp_metrics.backend("create", "stream")
+    hwp_metrics.transferred("create", "out", hwp_metrics.position(fileobj) - start)
+
+
+def create_hwpx_from_markdown_stream(output_path: str, source, title: str = "",
+                                     author: str = ""):
+    """Create an HWPX file from Markdown in document order (see write_hwpx_from_markdown_stream)."""
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, 'wb') as out:
+        write_hwpx_from_markdown_stream(out, source, title, author)
+    return output_path
+
+
+def parse_markdown_to_structure(md_text: str) -> dict:
+    """Parse simple Markdown into paragraphs and tables for python-hwpx.
+
+    Tables are returned separately, so document order between paragraphs and
+    tables is lost; use ``create_hwpx_from_markdown_stream`` to keep it.
+    """
+    paragraphs = []
+    tables = []
+    for event in iter_markdown_blocks(md_text):
+        kind = event["type"]
+        if kind == "table_start":
+            tables.append({"headers": event["headers"], "rows": []})
+        elif kind == "table_row":
+            tables[-1]["rows"].append(event["cells"])
+        elif kind != "table_end":
+            paragraphs.append(event["text"])
+    return {"paragraphs": paragraphs, "tables": tables}
 
 
 def main():
@@ -203,32 +366,45 @@ def main():
     parser.add_argument("--json", help="Path to JSON file with structured content")
     parser.add_argument("--method", choices=["python-hwpx", "md2hwp"], default="python-hwpx",
                         help="Creation method (default: python-hwpx)")
+    parser.add_argument("--batch", nargs='+', metavar="MD_FILE",
+                        help="Convert many Markdown files; OUTPUT is then a directory")
+    parser.add_argument("--workers", type=int, default=2,
+                        help="Node workers for --batch with --method md2hwp (default: 2)")
+    hwp_metrics.add_stats_arguments(parser)
+    hwp_profile.add_profile_arguments(parser)
     args = parser.parse_args()
+    hwp_metrics.report_at_exit(args.stats, args.stats_file)
+    hwp_profile.profile_until_exit(args.profile, args.profile_dir, "create")
+
+    if args.batch:
+        failed = 0
+        for md_path, result in create_batch_from_markdown(
+                args.output, args.batch, args.title, args.author, args.method, args.workers):
+            if isinstance(result, Exception):
+                failed += 1
+                print(f"[WARN] {md_path}: {result}", file=sys.stderr)
+            else:
+                print(f"Created: {result}")
+        sys.exit(1 if failed else 0)
 
     if not args.output.endswith('.hwpx'):
         args.output += '.hwpx'
 
     # Determine content source
     if args.markdown:
-        with open(args.markdown, 'r', encoding='utf-8') as f:
-            md_text = f.read()
         if args.method == "md2hwp":
+            with open(args.markdown, 'r', encoding='utf-8') as f:
+                md_text = f.read()
             create_hwpx_from_markdown_via_node(args.output, md_text, args.title, args.author)
         else:
-            struct = parse_markdown_to_structure(md_text)
-            create_hwpx_from_paragraphs(
-                args.output, args.title, args.author,
-                struct["paragraphs"], struct["tables"]
-            )
+            with open(args.markdown, 'r', encoding='utf-8') as f:
+                create_hwpx_from_markdown_stream(args.output, f, args.title, args.author)
     elif args.markdown_text:
         if args.method == "md2hwp":
             create_hwpx_from_markdown_via_node(args.output, args.markdown_text, args.title, args.author)
         else:
-            struct = parse_markdown_to_structure(args.markdown_text)
-            create_hwpx_from_paragraphs(
-                args.output, args.title, args.author,
-                struct["paragraphs"], struct["tables"]
-            )
+            create_hwpx_from_markdown_stream(args.output, args.markdown_text.split('\n'),
+                                             args.title, args.author)
     elif args.json:
         with open(args.json, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -1,78 +1,391 @@
 #!/usr/bin/env python3
 """
-Edit HWPX files: text replacement, add paragraphs, add tables, add memos.
+Edit HWPX files: text replacement, add paragraphs, add tables, add memos, and
+edit scripts that apply many of these in one load/save. Text replacement
+(--replace, --map) also works on binary .hwp files, patched in place.
 
 Usage:
     python hwp_edit.py <input.hwpx> <output.hwpx> --replace "old" "new"
     python hwp_edit.py <input.hwpx> <output.hwpx> --add-paragraph "New paragraph text"
+    python hwp_edit.py <input.hwpx> <output.hwpx> --add-paragraph "Inserted" --after 3
+    python hwp_edit.py <input.hwpx> <output.hwpx> --add-memo "Check this" --match "budget"
     python hwp_edit.py <input.hwpx> <output.hwpx> --add-table '{"headers":["A","B"],"rows":[["1","2"]]}'
+    python hwp_edit.py <input.hwpx> <output.hwpx> --script edits.json
+    python hwp_edit.py <input.hwpx> <output.hwpx> --map terms.json
+    python hwp_edit.py <input.hwp> <output.hwp> --replace "old" "new"
+    python hwp_edit.py --batch <input_dir> <output_dir> --map terms.json --workers 8 --report report.jsonl
+    python hwp_edit.py <input.hwpx> <output.hwpx> --script edits.json --stats
 
 Dependencies:
-    pip install python-hwpx gethwp
+    pip install python-hwpx
 """
 
 import sys
 import os
 import argparse
 import json
+import shutil
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import hwp_metrics
+import hwp_profile
+from hwp_package import save_document
 
 
 def replace_text(input_path: str, output_path: str, find: str, replace: str) -> str:
-    """Replace text in HWPX file using gethwp."""
-    import gethwp
-    gethwp.change_word(input_path, output_path, find, replace)
+    """Replace text in an HWPX or binary HWP file.
+
+    Only run text is touched (never markup or controls), and only the sections
+    that contain a match are rewritten; everything else is copied verbatim.
+    """
+    from hwp_replace import replace_many
+
+    replace_many(input_path, output_path, {find: replace})
     return output_path
 
 
-def add_paragraph(input_path: str, output_path: str, text: str) -> str:
-    """Add a paragraph to an existing HWPX file."""
+def add_paragraph(input_path: str, output_path: str, text: str,
+                  before: int = None, after: int = None) -> str:
+    """Add a paragraph to an existing HWPX file.
+
+    By default it is appended to the first section; ``before``/``after`` place
+    it next to paragraph N instead (numbered across sections).
+    """
     from hwpx.document import HwpxDocument
+    from hwp_address import ParagraphIndex
 
     doc = HwpxDocument.open(input_path)
-    section = doc.sections[0]
-    doc.add_paragraph(text, section=section)
-    doc.save(output_path)
-    return output_path
+    ParagraphIndex(doc).insert(text, before=before, after=after)
+    return save_document(doc, output_path, source=input_path)
 
 
-def add_table(input_path: str, output_path: str, headers: list, rows: list) -> str:
-    """Add a table to an existing HWPX file."""
+def add_table(input_path: str, output_path: str, headers: list, rows) -> str:
+    """Add a table to an existing HWPX file.
+
+    ``rows`` may be any iterable (e.g. a generator over a CSV reader); the table
+    XML is streamed into the saved section by hwp_table.BulkTables.
+    """
     from hwpx.document import HwpxDocument
+    from hwp_table import BulkTables
 
     doc = HwpxDocument.open(input_path)
-    section = doc.sections[0]
+    tables = BulkTables(doc, source=input_path)
+    tables.add(headers=headers, rows=rows, section=doc.sections[0])
+    return tables.save(output_path)
 
-    ncols = len(headers)
-    nrows = len(rows) + 1
 
-    table = doc.add_table(rows=nrows, cols=ncols, section=section)
-    for ci, h in enumerate(headers):
-        table.set_cell_text(0, ci, str(h))
-    for ri, row in enumerate(rows):
-        for ci, cell in enumerate(row):
-            if ci < ncols:
-                table.set_cell_text(ri + 1, ci, str(cell))
+def add_memo(input_path: str, output_path: str, memo_text: str, para_index: int = 0,
+             match: str = None) -> str:
+    """Add a memo (comment) to a paragraph in an HWPX file.
+
+    The paragraph is ``para_index``, or the first one containing ``match``.
+    """
+    from hwpx.document import HwpxDocument
+    from hwp_address import ParagraphIndex
+
+    doc = HwpxDocument.open(input_path)
+    index = ParagraphIndex(doc)
+    doc.add_memo_with_anchor(memo_text, paragraph=index.paragraph(_memo_target(index, para_index, match)),
+                             memo_shape_id_ref="0")
+    return save_document(doc, output_path, source=input_path)
+
+
+def _memo_target(index, para_index: int = 0, match: str = None) -> int:
+    if match is None:
+        return para_index
+    found = index.find(match)
+    if found is None:
+        raise ValueError(f"add_memo: no paragraph contains {match!r}")
+    return found[0]
+
+
+EDIT_OPS = ("replace", "add_paragraph", "add_table", "add_memo", "delete")
 
-    doc.save(output_path)
-    return output_path
 
+def _check_operation(i: int, op: dict) -> None:
+    name = op.get("op")
+    if name not in EDIT_OPS:
+        raise ValueError(f"Operation {i}: unknown op {name!r} (expected one of {', '.join(EDIT_OPS)})")
+    required = {"replace": ("find",), "add_paragraph": ("text",), "add_memo": ("text",),
+                "delete": ("para_index",)}.get(name, ())
+    missing = [key for key in required if key not in op]
+    if name == "add_table" and not any(k in op for k in ("headers", "rows", "columns")):
+        missing.append("headers/rows")
+    if missing:
+        raise ValueError(f"Operation {i} ({name}): missing {', '.join(missing)}")
+    if name == "replace" and not op["find"]:
+        raise ValueError(f"Operation {i} (replace): find must not be empty")
 
-def add_memo(input_path: str, output_path: str, memo_text: str, para_index: int = 0) -> str:
-    """Add a memo (comment) to a paragraph in an HWPX file."""
+
+def check_operations(operations: list) -> None:
+    """Raise ValueError for the first malformed operation of an edit script."""
+    for i, op in enumerate(operations):
+        _check_operation(i, op)
+
+
+def apply_edits(input_path: str, output_path: str, operations: list, progress=None) -> list:
+    """Apply a list of edit operations with one load and one save.
+
+    Each operation is a dict with an ``op`` key:
+
+        {"op": "replace", "find": "old", "replace": "new"}
+        {"op": "replace", "find": "old", "replace": "new", "para_index": 4}
+        {"op": "add_paragraph", "text": "...", "section": 0}
+        {"op": "add_paragraph", "text": "...", "after": 2}
+        {"op": "add_table", "headers": [...], "rows": [[...]], "before": 5}
+        {"op": "add_memo", "text": "...", "para_index": 0}
+        {"op": "add_memo", "text": "...", "match": "검토 대상"}
+        {"op": "delete", "para_index": 3}
+
+    Paragraphs are numbered across sections, and ``before``/``after`` insert
+    next to paragraph N rather than at the end of ``section``. Operations run
+    in order, so a paragraph number refers to the paragraphs as they are after
+    the preceding operations. One hwp_address.ParagraphIndex serves the whole
+    script, so addressing a paragraph never walks the document. All operations
+    are validated first and the output is only written once every one has
+    succeeded. ``replace`` works on text runs (python-hwpx
+    ``replace_text_in_runs``), so a match split across differently formatted
+    runs is not replaced.
+
+    Returns one result dict per operation, e.g. ``{"op": "replace", "count": 2}``.
+    ``progress`` (hwp_progress.Progress) is told after each operation; a
+    cancelled script stops before the output is written.
+    """
     from hwpx.document import HwpxDocument
+    from hwp_address import ParagraphIndex
+    from hwp_progress import as_progress
+    from hwp_table import BulkTables
 
-    doc = HwpxDocument.open(input_path)
-    paragraphs = list(doc.paragraphs)
-    if para_index < len(paragraphs):
-        doc.add_memo_with_anchor(memo_text, paragraph=paragraphs[para_index], memo_shape_id_ref="0")
-    doc.save(output_path)
-    return output_path
+    check_operations(operations)
+    progress = as_progress(progress)
+    with hwp_metrics.timer("edit", "open"):
+        doc = HwpxDocument.open(input_path)
+    hwp_metrics.transferred("edit", "in", hwp_metrics.file_size(input_path))
+    tables = BulkTables(doc, source=input_path)
+    with hwp_metrics.timer("edit", "apply"):
+        results = apply_operations(doc, ParagraphIndex(doc), tables, operations, progress)
+    progress.check()
+    with hwp_metrics.timer("edit", "save"):
+        tables.save(output_path)
+    hwp_metrics.transferred("edit", "out", hwp_metrics.file_size(output_path))
+    return results
+
+
+def apply_operations(doc, index, tables, operations: list, progress=None) -> list:
+    """Apply checked edit operations (see apply_edits) to an open document.
+
+    ``index`` is the document's hwp_address.ParagraphIndex and ``tables`` its
+    hwp_table.BulkTables; both stay valid for further operations, which is how
+    hwp_session chains edits on a cached document. Nothing is saved.
+    """
+    from hwp_progress import as_progress
+
+    progress = as_progress(progress)
+    results = []
+    for i, op in enumerate(operations):
+        progress.check()
+        name = op["op"]
+        where = {"before": op.get("before"), "after": op.get("after")}
+        if name == "replace":
+            if "para_index" in op:
+                count = index.replace(op["para_index"], op["find"], op.get("replace", ""))
+            else:
+                count = doc.replace_text_in_runs(op["find"], op.get("replace", ""))
+                index.text_changed()
+            results.append({"op": name, "count": count})
+        elif name == "add_paragraph":
+            n = index.insert(op["text"], section=op.get("section", 0), **where)
+            results.append({"op": name, "para_index": n})
+        elif name == "add_table":
+            placeholder = tables.add(headers=op.get("headers"), rows=op.get("rows"),
+                                     columns=op.get("columns"),
+                                     section=index.sections[op.get("section", 0)])
+            n = index.place(placeholder, **where)
+            results.append({"op": name, "para_index": n})
+        elif name == "add_memo":
+            n = _memo_target(index, op.get("para_index", 0), op.get("match"))
+            doc.add_memo_with_anchor(op["text"], paragraph=index.paragraph(n), memo_shape_id_ref="0")
+            results.append({"op": name, "para_index": n})
+        elif name == "delete":
+            index.remove(op["para_index"])
+            results.append({"op": name, "para_index": op["para_index"]})
+        progress(i + 1, len(operations), name)
+
+    return results
+
+
+def load_edit_script(path: str) -> list:
+    """Read a JSON list of operations from ``path`` ("-" for stdin)."""
+    if path == "-":
+        operations = json.load(sys.stdin)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            operations = json.load(f)
+    if not isinstance(operations, list):
+        raise ValueError("Edit script must be a JSON list of operations")
+    return operations
+
+
+def iter_hwpx_files(root: str, exclude: str = None):
+    """Yield every .hwpx file under ``root`` in a stable (sorted) order.
+
+    The directory ``exclude`` (e.g. an output folder inside ``root``) is not entered.
+    """
+    exclude = os.path.realpath(exclude) if exclude else None
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames
+                             if os.path.realpath(os.path.join(dirpath, d)) != exclude)
+        for name in sorted(filenames):
+            if name.lower().endswith(".hwpx"):
+                yield os.path.join(dirpath, name)
+
+
+_batch_operations = None
+_batch_replacer = None
+
+
+def _init_batch(operations, mapping, regex, whole_word, ignore_case) -> None:
+    """Compile the replacer once per worker process (large maps are costly to build)."""
+    from hwp_replace import Replacer
+
+    global _batch_operations, _batch_replacer
+    _batch_operations = operations
+    _batch_replacer = None
+    if mapping:
+        _batch_replacer = Replacer(mapping, regex, whole_word, ignore_case)
+    elif operations and all(op["op"] == "replace" and op["find"] for op in operations):
+        # Only used to pre-scan: a script of pure replaces cannot change a file
+        # in which none of its find strings occur.
+        _batch_replacer = Replacer({op["find"]: "" for op in operations})
+
+
+def _edit_file(args) -> dict:
+    from hwp_replace import replace_with, scan
+
+    input_path, output_path, name, copy_unmatched = args
+    result = {"input": name, "output": output_path, "status": "ok"}
+    start = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        if _batch_operations is None:
+            _batch_replacer.reset()
+            written = replace_with(input_path, output_path, _batch_replacer, skip_unchanged=True)
+            hits = {k: v for k, v in _batch_replacer.counts.items() if v}
+            result.update(total=sum(hits.values()), counts=hits)
+        else:
+            written = _batch_replacer is None or scan(input_path, _batch_replacer)
+            if written:
+                result["results"] = apply_edits(input_path, output_path, _batch_operations)
+        if not written:
+            result["status"] = "skipped"
+            if copy_unmatched and os.path.abspath(input_path) != os.path.abspath(output_path):
+                shutil.copy2(input_path, output_path)
+            else:
+                result["output"] = None
+    except Exception as e:
+        result.update(status="error", output=None, error=str(e))
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def edit_batch(input_dir: str, output_dir: str, operations: list = None, mapping: dict = None,
+               regex: bool = False, whole_word: bool = False, ignore_case: bool = False,
+               workers: int = None, copy_unmatched: bool = False):
+    """Apply an edit script or a replacement map to every HWPX file under ``input_dir``.
+
+    Outputs mirror the input tree under ``output_dir`` (which may equal
+    ``input_dir`` to edit in place). Files are processed by a process pool
+    (``workers`` processes, default CPU count) with a bounded number in flight.
+    Files with no match are skipped: a replacement map is applied in memory and
+    only saved on a hit, and a script made only of ``replace`` operations is
+    pre-scanned with hwp_replace.scan before the document is parsed. Skipped
+    files are copied unchanged when ``copy_unmatched`` is set.
+
+    Yields one result dict per file as it completes. What the workers record
+    in hwp_metrics is merged into this process's registry.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from hwp_pool import _in_worker, _worker_metrics
+
+    if (operations is None) == (mapping is None):
+        raise ValueError("edit_batch needs exactly one of operations or mapping")
+    if operations is not None:
+        check_operations(operations)
+    if not os.path.isdir(input_dir):
+        raise NotADirectoryError(f"Not a directory: {input_dir}")
+
+    initargs = (operations, mapping, regex, whole_word, ignore_case)
+    # An output folder inside the input tree must not feed its own results back in.
+    same = os.path.realpath(output_dir) == os.path.realpath(input_dir)
+    jobs = (
+        (path, os.path.join(output_dir, rel), rel, copy_unmatched)
+        for path in iter_hwpx_files(input_dir, None if same else output_dir)
+        for rel in [os.path.relpath(path, input_dir)]
+    )
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_batch(*initargs)
+        for job in jobs:
+            yield _edit_file(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch,
+                             initargs=initargs) as pool:
+        pending = set()
+        for job in jobs:
+            fut = pool.submit(_in_worker, _edit_file, (job,), {})
+            fut.add_done_callback(_worker_metrics)
+            pending.add(fut)
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()[0]
+        for fut in pending:
+            yield fut.result()[0]
+
+
+def _run_batch(args) -> None:
+    if args.map:
+        from hwp_replace import load_mapping
+        operations, mapping = None, load_mapping(args.map)
+    elif args.replace:
+        operations, mapping = None, {args.replace[0]: args.replace[1]}
+    elif args.script:
+        operations, mapping = load_edit_script(args.script), None
+    else:
+        print("Error: --batch supports --replace, --map or --script", file=sys.stderr)
+        sys.exit(1)
+
+    tally = {"ok": 0, "skipped": 0, "error": 0}
+    report = open(args.report, "w", encoding="utf-8") if args.report else None
+    try:
+        for result in edit_batch(args.input, args.output, operations, mapping, args.regex,
+                                 args.whole_word, args.ignore_case, args.workers,
+                                 args.copy_unmatched):
+            tally[result["status"]] += 1
+            if report:
+                report.write(json.dumps(result, ensure_ascii=False) + "\n")
+            if result["status"] == "error":
+                print(f"[WARN] {result['input']}: {result['error']}", file=sys.stderr)
+    finally:
+        if report:
+            report.close()
+
+    print(f"Edited {tally['ok']} files into {args.output} "
+          f"({tally['skipped']} without matches, {tally['error']} failed)")
+    if tally["error"]:
+        sys.exit(1)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Edit HWPX files")
-    parser.add_argument("input", help="Input HWPX file")
-    parser.add_argument("output", help="Output HWPX file")
+    parser.add_argument("input", help="Input HWPX file (directory with --batch)")
+    parser.add_argument("output", help="Output HWPX file (directory with --batch)")
 
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--replace", nargs=2, metavar=("FIND", "REPLACE"),
@@ -83,19 +396,59 @@ def main():
                        help='Add a table: --add-table \'{"headers":["A","B"],"rows":[["1","2"]]}\'')
     group.add_argument("--add-memo", nargs='+', metavar=("TEXT", "PARA_INDEX"),
                        help="Add a memo: --add-memo 'comment text' [paragraph_index]")
+    group.add_argument("--script", metavar="EDITS_JSON",
+                       help="Apply a JSON list of operations in one load/save ('-' reads stdin)")
+    group.add_argument("--map", metavar="TERMS",
+                       help="Replace every term of a JSON/CSV/TSV find→replace map in one pass")
+    parser.add_argument("--before", type=int, metavar="N",
+                        help="--add-paragraph: insert before paragraph N instead of appending")
+    parser.add_argument("--after", type=int, metavar="N",
+                        help="--add-paragraph: insert after paragraph N instead of appending")
+    parser.add_argument("--match", metavar="TEXT",
+                        help="--add-memo: attach to the first paragraph containing TEXT")
+    parser.add_argument("--regex", action="store_true", help="--map: treat find strings as regular expressions")
+    parser.add_argument("--whole-word", action="store_true", help="--map: only match whole words")
+    parser.add_argument("--ignore-case", action="store_true", help="--map: case-insensitive matching")
 
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--batch", action="store_true",
+                       help="Edit every .hwpx under the input directory into a mirrored output tree")
+    batch.add_argument("--workers", type=int, default=None,
+                       help="Worker processes (default: CPU count)")
+    batch.add_argument("--report", metavar="JSONL", help="Write one JSON result line per file")
+    batch.add_argument("--copy-unmatched", action="store_true",
+                       help="Copy files without matches to the output tree unchanged")
+
+    hwp_metrics.add_stats_arguments(parser)
+    hwp_profile.add_profile_arguments(parser)
     args = parser.parse_args()
+    hwp_metrics.report_at_exit(args.stats, args.stats_file)
+    hwp_profile.profile_until_exit(args.profile, args.profile_dir, "edit")
 
     if not os.path.exists(args.input):
         print(f"Error: File not found: {args.input}", file=sys.stderr)
         sys.exit(1)
 
+    if args.batch:
+        try:
+            _run_batch(args)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
     try:
-        if args.replace:
+        if args.map:
+            from hwp_replace import load_mapping, replace_many
+
+            counts = replace_many(args.input, args.output, load_mapping(args.map),
+                                  args.regex, args.whole_word, args.ignore_case)
+            print(f"Replaced {sum(counts.values())} occurrences in {args.output}")
+        elif args.replace:
             replace_text(args.input, args.output, args.replace[0], args.replace[1])
             print(f"Replaced '{args.replace[0]}' → '{args.replace[1]}' in {args.output}")
         elif args.add_paragraph:
-            add_paragraph(args.input, args.output, args.add_paragraph)
+            add_paragraph(args.input, args.output, args.add_paragraph, args.before, args.after)
             print(f"Added paragraph to {args.output}")
         elif args.add_table:
             tbl = json.loads(args.add_table)
@@ -104,8 +457,15 @@ def main():
         elif args.add_memo:
             memo_text = args.add_memo[0]
             para_idx = int(args.add_memo[1]) if len(args.add_memo) > 1 else 0
-            add_memo(args.input, args.output, memo_text, para_idx)
-            print(f"Added memo to paragraph {para_idx} in {args.output}")
+            add_memo(args.input, args.output, memo_text, para_idx, args.match)
+            target = f"first paragraph containing '{args.match}'" if args.match else f"paragraph {para_idx}"
+            print(f"Added memo to {target} in {args.output}")
+        elif args.script:
+            results = apply_edits(args.input, args.output, load_edit_script(args.script))
+            for i, result in enumerate(results):
+                detail = ", ".join(f"{k}={v}" for k, v in result.items() if k != "op")
+                print(f"  [{i}] {result['op']}" + (f" ({detail})" if detail else ""))
+            print(f"Applied {len(results)} operations to {args.output}")
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
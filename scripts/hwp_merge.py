@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Mail merge: render many HWPX documents from one template and a data file.
+
+The template is an ordinary HWPX whose text contains ``{{field}}`` placeholders.
+It is compiled once: every ZIP member without placeholders is kept as raw
+compressed bytes and copied verbatim into each output, and each section XML
+that has placeholders is split into literal segments and field slots. Rendering
+a row then only joins strings and deflates the substituted sections.
+
+Usage:
+    python hwp_merge.py <template.hwpx> <rows.csv|rows.jsonl> -o <output_dir>
+    python hwp_merge.py template.hwpx rows.csv -o out --name "{id}_{이름}.hwpx" --workers 8
+
+Dependencies:
+    (none beyond the standard library)
+"""
+
+import sys
+import os
+import argparse
+import csv
+import json
+import re
+import tempfile
+import zlib
+from xml.sax.saxutils import escape
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from hwp_zip import ZipWriter, compress, read_raw_members
+
+PLACEHOLDER_RE = re.compile(r"\{\{\s*([^{}<>\s]+)\s*\}\}")
+TAG_RE = re.compile(r"<[^>]*>")
+SECTION_RE = re.compile(r"^Contents/section\d+\.xml$")
+PREVIEW_TEXT = "Preview/PrvText.txt"
+# Placeholders may sit inside attribute values, so quotes are escaped too.
+ATTR_ENTITIES = {'"': "&quot;", "'": "&apos;"}
+
+
+class CompiledTemplate:
+    """A template HWPX split into verbatim members and substitutable parts.
+
+    ``parts`` maps a member name to its segment list, where even positions are
+    literal strings and odd positions are field names.
+    """
+
+    def __init__(self, members: list, parts: dict, level: int = 6):
+        self.members = members
+        self.parts = parts
+        self.level = level
+
+    @property
+    def fields(self) -> set:
+        return {seg for segs in self.parts.values() for seg in segs[1::2]}
+
+    def render_part(self, name: str, row: dict) -> bytes:
+        """Substitute ``row`` into one templated member and return its bytes."""
+        segments = self.parts[name]
+        xml = name != PREVIEW_TEXT
+        out = []
+        for i, seg in enumerate(segments):
+            if i % 2 == 0:
+                out.append(seg)
+                continue
+            if seg not in row:
+                raise KeyError(f"Missing field: {seg}")
+            value = "" if row[seg] is None else str(row[seg])
+            out.append(escape(value, ATTR_ENTITIES) if xml else value)
+        return "".join(out).encode("utf-8")
+
+    def render(self, row: dict, fileobj) -> None:
+        """Write the merged document for ``row`` into a binary file object."""
+        with ZipWriter(fileobj) as zw:
+            for member in self.members:
+                if member.name not in self.parts:
+                    zw.write_raw(member)
+                    continue
+                data = self.render_part(member.name, row)
+                zw.write_compressed(
+                    member.name, compress(data, member.compress_type, self.level),
+                    zlib.crc32(data), len(data), member.compress_type,
+                    member.date_time, member.external_attr,
+                )
+
+    def render_to(self, row: dict, output_path: str) -> str:
+        """Render into a temp file next to ``output_path`` and move it into place.
+
+        A row that fails partway (e.g. a missing field) leaves no file behind.
+        """
+        folder = os.path.dirname(output_path) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self.render(row, f)
+            os.replace(tmp, output_path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return output_path
+
+
+def _split_placeholders(text: str) -> list:
+    segments = []
+    pos = 0
+    for m in PLACEHOLDER_RE.finditer(text):
+        segments.append(text[pos:m.start()])
+        segments.append(m.group(1))
+        pos = m.end()
+    segments.append(text[pos:])
+    return segments
+
+
+def compile_template(template_path: str, level: int = 6) -> CompiledTemplate:
+    """Compile a template HWPX with ``{{field}}`` placeholders.
+
+    Placeholders must sit inside a single text run; one that Hangul split across
+    runs (e.g. because part of it is formatted differently) cannot be matched
+    and is reported on stderr.
+    """
+    members = read_raw_members(template_path, preload=True)
+    parts = {}
+    for member in members:
+        if not (SECTION_RE.match(member.name) or member.name == PREVIEW_TEXT):
+            continue
+        text = member.read().decode("utf-8", errors="replace")
+        segments = _split_placeholders(text)
+        if len(segments) > 1:
+            parts[member.name] = segments
+            member.data = None  # regenerated per row; drop the raw copy
+        literal_text = "".join(TAG_RE.sub("", s) for s in segments[::2])
+        if "{{" in literal_text and member.name != PREVIEW_TEXT:
+            print(f"[WARN] {member.name}: unmatched '{{{{' — placeholder split across runs?",
+                  file=sys.stderr)
+    if not parts:
+        raise ValueError(f"No {{{{field}}}} placeholders found in {template_path}")
+    return CompiledTemplate(members, parts, level)
+
+
+def iter_rows(data_path: str):
+    """Yield rows from a CSV (header row required) or JSONL file.
+
+    JSONL lines that are not objects are yielded as parsed; merge reports them
+    as errors on their own row.
+    """
+    ext = os.path.splitext(data_path)[1].lower()
+    with open(data_path, "r", encoding="utf-8-sig", newline="") as f:
+        if ext == ".csv":
+            yield from csv.DictReader(f)
+        elif ext in (".jsonl", ".ndjson"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Unsupported data file extension: {ext}")
+
+
+_worker_template = None
+
+
+def _init_worker(template: CompiledTemplate) -> None:
+    global _worker_template
+    _worker_template = template
+
+
+def _render_row(args) -> dict:
+    index, row, output_path = args
+    try:
+        _worker_template.render_to(row, output_path)
+        return {"index": index, "output": output_path, "status": "ok"}
+    except Exception as e:
+        return {"index": index, "output": None, "status": "error", "error": str(e)}
+
+
+def _output_name(pattern: str, index: int, row: dict) -> str:
+    try:
+        return pattern.format_map({**row, "_index": index})
+    except KeyError as e:
+        raise ValueError(f"Missing field in name pattern: {e.args[0]}") from None
+    except (IndexError, ValueError) as e:
+        raise ValueError(f"Bad name pattern {pattern!r}: {e}") from None
+
+
+def _plan_outputs(rows, output_dir: str, pattern: str):
+    """Yield ``(index, row, output_path, error)`` per row.
+
+    Names that resolve outside ``output_dir`` are rejected, and a name already
+    used by an earlier row is numbered (``name-2.hwpx``) instead of overwriting it.
+    """
+    root = os.path.realpath(output_dir)
+    taken = set()
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict):
+            yield i, row, None, f"Row is not an object: {type(row).__name__}"
+            continue
+        try:
+            name = _output_name(pattern, i, row)
+        except ValueError as e:
+            yield i, row, None, str(e)
+            continue
+        path = os.path.realpath(os.path.join(root, name))
+        if path == root or os.path.commonpath([root, path]) != root:
+            yield i, row, None, f"Output name outside output directory: {name}"
+            continue
+        stem, ext = os.path.splitext(path)
+        n = 1
+        while os.path.normcase(path) in taken:
+            n += 1
+            path = f"{stem}-{n}{ext}"
+        taken.add(os.path.normcase(path))
+        yield i, row, os.path.join(output_dir, os.path.relpath(path, root)), None
+
+
+def merge(template_path: str, data_path: str, output_dir: str,
+          name_pattern: str = "{_index:05d}.hwpx", workers: int = None,
+          level: int = 6):
+    """Render one HWPX per data row into ``output_dir``; yields a result dict per row.
+
+    Rows are rendered by a process pool (``workers`` processes, default CPU
+    count). The compiled template is sent to each worker once, and at most a
+    few rows per worker are in flight, so the data file is streamed.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    template = compile_template(template_path, level)
+    planned = _plan_outputs(iter_rows(data_path), output_dir, name_pattern)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(template)
+        for index, row, output_path, error in planned:
+            if error:
+                yield {"index": index, "output": None, "status": "error", "error": error}
+            else:
+                yield _render_row((index, row, output_path))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(template,)) as pool:
+        pending = set()
+        for index, row, output_path, error in planned:
+            if error:
+                yield {"index": index, "output": None, "status": "error", "error": error}
+                continue
+            pending.add(pool.submit(_render_row, (index, row, output_path)))
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+        for fut in pending:
+            yield fut.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render HWPX documents from a template and data rows")
+    parser.add_argument("template", help="Template HWPX containing {{field}} placeholders")
+    parser.add_argument("data", help="CSV (with header) or JSONL file, one document per row")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for generated files")
+    parser.add_argument("--name", default="{_index:05d}.hwpx",
+                        help="Output file name pattern using row fields (default: {_index:05d}.hwpx)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--level", type=int, default=6, choices=range(0, 10), metavar="0-9",
+                        help="Deflate level for regenerated sections (default: 6)")
+    args = parser.parse_args()
+
+    for path in (args.template, args.data):
+        if not os.path.exists(path):
+            print(f"Error: File not found: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    ok = failed = 0
+    try:
+        for result in merge(args.template, args.data, args.output_dir,
+                            args.name, args.workers, args.level):
+            if result["status"] == "ok":
+                ok += 1
+            else:
+                failed += 1
+                print(f"[WARN] row {result['index']}: {result['error']}", file=sys.stderr)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Rendered {ok} documents to {args.output_dir}" + (f" ({failed} failed)" if failed else ""))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Runtime metrics: per-stage latency histograms, backend fallbacks, bytes, caches.
+
+The pipelines record into a process-wide registry as they work:
+
+- ``timer(op, stage)`` / ``observe``: how long each stage took, e.g.
+  ("read", "decompress"), ("convert", "render"), ("edit", "save");
+- ``fallback(op, from_backend, to_backend)`` when a parser fails and the next
+  one takes over, and ``backend(op, name)`` for the one that produced output;
+- ``transferred(op, direction, n)``: bytes read from inputs and written out;
+- ``cache(name, hit)``: lookups in caches and reuse paths (open sessions,
+  ZIP members copied without recompression).
+
+Recording is a dict update under a lock, cheap enough for per-section calls.
+Timed stages are also named spans: while a profiler samples (hwp_profile),
+``spans()`` tells which stages a thread is inside.
+hwp_pool ships what a process-pool worker recorded during a call back to the
+server process, so one registry covers every worker. ``summary`` condenses a
+snapshot (counts, mean/p50/p95/max per stage, hit rates), and
+``to_prometheus`` renders the Prometheus text exposition format.
+
+Usage:
+    import hwp_metrics
+
+    with hwp_metrics.timer("read", "open"):
+        ole = olefile.OleFileIO(path)
+    hwp_metrics.fallback("read", "pyhwp2md", "olefile")
+
+    hwp_metrics.summary()                         # JSON-friendly dict
+    hwp_metrics.write_prometheus("/var/lib/node_exporter/hwp.prom")
+
+    python hwp_read.py doc.hwp --stats            # any of the five scripts: summary on stderr
+    python hwp_convert.py doc.hwpx --to pdf --stats-file hwp.prom
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Registry:
+    """Thread-safe store of stage histograms and labelled counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}     # (op, stage) -> [bucket counts..., +Inf count, sum, max]
+        self._counters = {}   # (name, ((label, value), ...)) -> number
+
+    def observe(self, op: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            h = self._stages.get((op, stage))
+            if h is None:
+                h = self._stages[(op, stage)] = [0] * (len(BUCKETS) + 1) + [0.0, 0.0]
+            h[bisect_left(BUCKETS, seconds)] += 1
+            h[-2] += seconds
+            h[-1] = max(h[-1], seconds)
+
+    @contextmanager
+    def timer(self, op: str, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(op, stage, time.perf_counter() - start)
+
+    def inc(self, name: str, labels: dict, amount: float = 1) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def snapshot(self) -> dict:
+        """Everything recorded so far as plain data (picklable, JSON-serializable)."""
+        with self._lock:
+            return {
+                "stages": [[op, stage, list(h)] for (op, stage), h in self._stages.items()],
+                "counters": [[name, dict(labels), value]
+                             for (name, labels), value in self._counters.items()],
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def take(self) -> dict:
+        """Snapshot and reset in one step (what a pool worker sends back per call)."""
+        with self._lock:
+            snap = {
+                "stages": [[op, stage, h] for (op, stage), h in self._stages.items()],
+                "counters": [[name, dict(labels), value]
+                             for (name, labels), value in self._counters.items()],
+            }
+            self._stages = {}
+            self._counters = {}
+        return snap
+
+    def merge(self, snapshot: dict) -> None:
+        """Add a snapshot taken in another process."""
+        with self._lock:
+            for op, stage, other in snapshot.get("stages", ()):
+                h = self._stages.get((op, stage))
+                if h is None:
+                    self._stages[(op, stage)] = list(other)
+                    continue
+                for i in range(len(BUCKETS) + 2):
+                    h[i] += other[i]
+                h[-1] = max(h[-1], other[-1])
+            for name, labels, value in snapshot.get("counters", ()):
+                key = (name, tuple(sorted(labels.items())))
+                self._counters[key] = self._counters.get(key, 0) + value
+
+
+REGISTRY = Registry()
+observe = REGISTRY.observe
+
+# Open spans per thread id, kept only while tracing (a profile is running).
+_spans = {}
+_tracing = False
+
+
+def trace(enabled: bool) -> None:
+    """Start or stop keeping the stack of open spans for every thread."""
+    global _tracing
+    _tracing = enabled
+    if not enabled:
+        _spans.clear()
+
+
+def spans(thread_id: int = None) -> tuple:
+    """Names of the spans ``thread_id`` (default: this thread) is inside, outermost first."""
+    return tuple(_spans.get(threading.get_ident() if thread_id is None else thread_id, ()))
+
+
+def _enter(name: str) -> bool:
+    if not _tracing:
+        return False
+    _spans.setdefault(threading.get_ident(), []).append(name)
+    return True
+
+
+def _exit() -> None:
+    stack = _spans.get(threading.get_ident())
+    if stack:
+        stack.pop()
+
+
+@contextmanager
+def span(op: str, stage: str):
+    """Mark a named stage for profiles without recording its time."""
+    entered = _enter(f"{op}.{stage}")
+    try:
+        yield
+    finally:
+        if entered:
+            _exit()
+
+
+@contextmanager
+def timer(op: str, stage: str):
+    """Record how long the block took as stage ``op.stage`` (also a span)."""
+    with span(op, stage), REGISTRY.timer(op, stage):
+        yield
+
+
+class Stopwatch:
+    """Accumulate time across pauses, e.g. a generator's work between its yields.
+
+    With ``op`` and ``stage``, the running periods are also spans of that name.
+    """
+
+    def __init__(self, op: str = None, stage: str = None):
+        self.seconds = 0.0
+        self._start = None
+        self._name = f"{op}.{stage}" if op else None
+        self._entered = False
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+        if self._name:
+            self._entered = _enter(self._name)
+
+    def stop(self) -> None:
+        if self._start is not None:
+            self.seconds += time.perf_counter() - self._start
+            self._start = None
+            if self._entered:
+                _exit()
+                self._entered = False
+
+
+def fallback(op: str, from_backend: str, to_backend: str) -> None:
+    """Count ``op`` giving up on ``from_backend`` and trying ``to_backend``."""
+    REGISTRY.inc("fallbacks", {"op": op, "from": from_backend, "to": to_backend})
+
+
+def backend(op: str, name: str) -> None:
+    """Count ``op`` being served by backend ``name``."""
+    REGISTRY.inc("backend", {"op": op, "backend": name})
+
+
+def transferred(op: str, direction: str, nbytes: int) -> None:
+    """Count ``nbytes`` read (``direction="in"``) or written (``"out"``) by ``op``.
+
+    Text output is counted as the characters written to the sink.
+    """
+    if nbytes:
+        REGISTRY.inc("bytes", {"op": op, "direction": direction}, nbytes)
+
+
+def file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+def position(stream) -> int:
+    """``stream.tell()``, or 0 for streams that cannot tell (pipes, stdout)."""
+    try:
+        return stream.tell()
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+def cache(name: str, hit: bool, count: int = 1) -> None:
+    """Count ``count`` lookups in cache ``name`` that hit (or missed)."""
+    if count:
+        REGISTRY.inc("cache", {"cache": name, "result": "hit" if hit else "miss"}, count)
+
+
+def _quantile(h: list, q: float) -> float:
+    """Estimate quantile ``q`` by linear interpolation inside the bucket, like Prometheus."""
+    count = sum(h[:len(BUCKETS) + 1])
+    if not count:
+        return 0.0
+    rank = q * count
+    seen = 0
+    for i, n in enumerate(h[:len(BUCKETS) + 1]):
+        if seen + n >= rank and n:
+            lower = BUCKETS[i - 1] if i else 0.0
+            upper = BUCKETS[i] if i < len(BUCKETS) else h[-1]
+            return min(lower + (upper - lower) * (rank - seen) / n, h[-1])
+        seen += n
+    return h[-1]
+
+
+def summary(snapshot: dict = None) -> dict:
+    """Condense a snapshot (default: the registry) for people and tool replies."""
+    snapshot = snapshot or REGISTRY.snapshot()
+    stages = {}
+    for op, stage, h in sorted(snapshot["stages"], key=lambda s: (s[0], s[1])):
+        count = sum(h[:len(BUCKETS) + 1])
+        stages[f"{op}.{stage}"] = {
+            "count": count,
+            "total_s": round(h[-2], 4),
+            "mean_ms": round(h[-2] / count * 1000, 3) if count else 0,
+            "p50_ms": round(_quantile(h, 0.5) * 1000, 3),
+            "p95_ms": round(_quantile(h, 0.95) * 1000, 3),
+            "max_ms": round(h[-1] * 1000, 3),
+        }
+    out = {"stages": stages, "fallbacks": {}, "backends": {}, "bytes": {}, "caches": {}}
+    for name, labels, value in sorted(snapshot["counters"], key=lambda c: (c[0], sorted(c[1].items()))):
+        if name == "fallbacks":
+            out["fallbacks"][f"{labels['op']}: {labels['from']} -> {labels['to']}"] = value
+        elif name == "backend":
+            out["backends"][f"{labels['op']}: {labels['backend']}"] = value
+        elif name == "bytes":
+            out["bytes"][f"{labels['op']}.{labels['direction']}"] = value
+        elif name == "cache":
+            entry = out["caches"].setdefault(labels["cache"], {"hits": 0, "misses": 0})
+            entry["hits" if labels["result"] == "hit" else "misses"] += value
+    for entry in out["caches"].values():
+        lookups = entry["hits"] + entry["misses"]
+        entry["hit_rate"] = round(entry["hits"] / lookups, 4) if lookups else None
+    return out
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    # Sorted by name, with the histogram's "le" last as Prometheus prints it.
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                    for k, v in sorted(labels.items(), key=lambda kv: (kv[0] == "le", kv[0])))
+    return "{" + body + "}"
+
+
+def _number(value) -> str:
+    """Exact sample value: integers as integers, other floats via ``repr``."""
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+_COUNTER_HELP = {
+    "fallbacks": ("hwp_fallbacks_total", "Times an operation fell back to the next backend"),
+    "backend": ("hwp_backend_total", "Operations served by each backend"),
+    "bytes": ("hwp_bytes_total", "Bytes read from inputs and written to outputs"),
+    "cache": ("hwp_cache_lookups_total", "Cache and reuse lookups by result"),
+}
+
+
+def to_prometheus(snapshot: dict = None) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    snapshot = snapshot or REGISTRY.snapshot()
+    lines = ["# HELP hwp_stage_seconds Time spent per operation stage",
+             "# TYPE hwp_stage_seconds histogram"]
+    for op, stage, h in sorted(snapshot["stages"], key=lambda s: (s[0], s[1])):
+        labels = {"op": op, "stage": stage}
+        cumulative = 0
+        for bound, n in zip(BUCKETS + ("+Inf",), h[:len(BUCKETS) + 1]):
+            cumulative += n
+            lines.append(f"hwp_stage_seconds_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+        lines.append(f"hwp_stage_seconds_sum{_labels(labels)} {h[-2]:.6f}")
+        lines.append(f"hwp_stage_seconds_count{_labels(labels)} {cumulative}")
+    for name, (metric, help_text) in _COUNTER_HELP.items():
+        rows = [(labels, value) for n, labels, value in snapshot["counters"] if n == name]
+        if not rows:
+            continue
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        for labels, value in sorted(rows, key=lambda r: sorted(r[0].items())):
+            lines.append(f"{metric}{_labels(labels)} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str, snapshot: dict = None) -> None:
+    """Write ``to_prometheus`` atomically, for node_exporter's textfile collector."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(to_prometheus(snapshot))
+    os.replace(tmp, path)
+
+
+def start_dump(path: str, interval: float = 15.0) -> threading.Thread:
+    """Rewrite the Prometheus file at ``path`` every ``interval`` seconds and at exit."""
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                write_prometheus(path)
+            except OSError as e:
+                print(f"[WARN] metrics dump to {path} failed: {e}", file=sys.stderr)
+
+    atexit.register(write_prometheus, path)
+    thread = threading.Thread(target=loop, name="hwp-metrics-dump", daemon=True)
+    thread.start()
+    return thread
+
+
+def add_stats_arguments(parser) -> None:
+    """Add ``--stats`` and ``--stats-file`` to a script's argument parser."""
+    parser.add_argument("--stats", action="store_true",
+                        help="Print stage timings, fallbacks and byte counts as JSON to stderr")
+    parser.add_argument("--stats-file", metavar="PATH",
+                        help="Write the metrics in Prometheus text format to PATH")
+
+
+def report_at_exit(stats: bool = False, stats_file: str = None) -> None:
+    """Report the metrics when the script exits, including on errors (sys.exit)."""
+    def report():
+        if stats:
+            print(json.dumps(summary(), ensure_ascii=False, indent=2), file=sys.stderr)
+        if stats_file:
+            write_prometheus(stats_file)
+
+    if stats or stats_file:
+        atexit.register(report)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Persistent Node.js workers for md2hwp conversions.
+
+Each worker is one ``node md2hwp_worker.js`` process that loads md2hwp once
+and then serves conversions over a JSON-lines protocol on stdin/stdout. A
+small pool of workers lets many documents be converted without paying the
+node start-up and ``require`` cost per document.
+
+Usage:
+    from hwp_node import Md2HwpPool
+
+    with Md2HwpPool(size=4) as pool:
+        pool.convert("# 제목", output_path="out.hwpx", title="제목")
+        data = pool.convert("본문")          # bytes when no output path is given
+
+Dependencies:
+    node, npm install md2hwp
+"""
+
+import os
+import json
+import atexit
+import base64
+import itertools
+import queue
+import subprocess
+import threading
+import time
+
+from hwp_progress import POLL_INTERVAL, as_progress
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NODE_MODULES = os.path.join(SKILL_DIR, "node_modules")
+WORKER_JS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "md2hwp_worker.js")
+
+
+def check_md2hwp(node_modules: str = NODE_MODULES) -> None:
+    """Raise RuntimeError with install instructions if md2hwp is missing."""
+    if not os.path.exists(os.path.join(node_modules, "md2hwp")):
+        raise RuntimeError(
+            "md2hwp not installed. Run: cd {} && npm install md2hwp".format(SKILL_DIR)
+        )
+
+
+class Md2HwpWorker:
+    """One long-lived node process running md2hwp_worker.js."""
+
+    def __init__(self, node_modules: str = NODE_MODULES, node: str = "node",
+                 startup_timeout: float = 30):
+        self._ids = itertools.count(1)
+        self._responses = queue.Queue()
+        self.proc = subprocess.Popen(
+            [node, WORKER_JS, node_modules],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding="utf-8", bufsize=1,
+        )
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+        ready = self._get(startup_timeout)
+        if not ready.get("ready"):
+            self.close()
+            raise RuntimeError(f"md2hwp worker failed to start: {ready.get('error')}")
+
+    def _read_loop(self) -> None:
+        for line in self.proc.stdout:
+            try:
+                self._responses.put(json.loads(line))
+            except ValueError:
+                continue
+        self._responses.put(None)  # EOF: worker exited
+
+    def _get(self, timeout: float, progress=None) -> dict:
+        progress = as_progress(progress)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                msg = self._responses.get(timeout=min(POLL_INTERVAL, max(0, deadline - time.monotonic())))
+                break
+            except queue.Empty:
+                if progress.cancelled:
+                    # The request cannot be withdrawn; the pool replaces the dead worker.
+                    self.proc.kill()
+                    self.proc.wait()
+                    progress.check()
+                if time.monotonic() >= deadline:
+                    self.close()
+                    raise RuntimeError(f"md2hwp worker timed out after {timeout}s")
+        if msg is None:
+            self.close()
+            raise RuntimeError("md2hwp worker exited unexpectedly")
+        return msg
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def convert(self, markdown_text: str, output_path: str = None, title: str = "Document",
+                author: str = "", timeout: float = 30, progress=None):
+        """Convert one Markdown document; returns ``output_path`` or the HWPX bytes.
+
+        Cancelling ``progress`` (hwp_progress.Progress) kills the worker.
+        """
+        req_id = next(self._ids)
+        request = {"id": req_id, "markdown": markdown_text, "title": title,
+                   "author": author or "hwp-toolkit"}
+        if output_path:
+            request["output"] = os.path.abspath(output_path)
+        try:
+            self.proc.stdin.write(json.dumps(request, ensure_ascii=False) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self.close()
+            raise RuntimeError("md2hwp worker exited unexpectedly")
+
+        while True:
+            msg = self._get(timeout, progress)
+            if msg.get("id") == req_id:
+                break
+        if not msg.get("ok"):
+            raise RuntimeError(f"md2hwp failed: {msg.get('error')}")
+        if output_path:
+            return output_path
+        return base64.b64decode(msg["data"])
+
+    def close(self) -> None:
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=5)
+            except Exception:
+                self.proc.kill()
+                self.proc.wait()
+
+
+class Md2HwpPool:
+    """A small pool of Md2HwpWorker processes, started lazily and shared by threads."""
+
+    def __init__(self, size: int = 2, node_modules: str = NODE_MODULES, node: str = "node"):
+        self.size = max(1, size)
+        self.node_modules = node_modules
+        self.node = node
+        self._idle = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self) -> Md2HwpWorker:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                start = self._started < self.size
+                if start:
+                    self._started += 1
+            if start:
+                try:
+                    return Md2HwpWorker(self.node_modules, self.node)
+                except Exception:
+                    with self._lock:
+                        self._started -= 1
+                    raise
+            # Pool is full: wait for a release, re-checking in case a worker died
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+    def _release(self, worker: Md2HwpWorker) -> None:
+        if worker.alive and not self._closed:
+            self._idle.put(worker)
+        else:
+            worker.close()
+            with self._lock:
+                self._started -= 1
+
+    def convert(self, markdown_text: str, output_path: str = None, title: str = "Document",
+                author: str = "", timeout: float = 30, progress=None):
+        """Convert on the next idle worker, starting one if the pool is not full."""
+        if self._closed:
+            raise RuntimeError("Md2HwpPool is closed")
+        worker = self._acquire()
+        try:
+            return worker.convert(markdown_text, output_path, title, author, timeout, progress)
+        finally:
+            self._release(worker)
+
+    def map(self, jobs, timeout: float = 30):
+        """Run ``(markdown_text, output_path, title, author)`` jobs across the pool.
+
+        Yields ``(job, result_or_exception)`` in completion order. ``jobs`` is
+        consumed lazily, with about two jobs per worker in flight.
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        def run(job):
+            md, out, title, author = job
+            return self.convert(md, out, title, author, timeout)
+
+        def outcome(fut):
+            exc = fut.exception()
+            return exc if exc else fut.result()
+
+        with ThreadPoolExecutor(max_workers=self.size) as ex:
+            pending = {}
+            for job in jobs:
+                pending[ex.submit(run, job)] = job
+                if len(pending) >= self.size * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        yield pending.pop(fut), outcome(fut)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield pending.pop(fut), outcome(fut)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_pool(size: int = None) -> Md2HwpPool:
+    """Return the process-wide shared pool (size from HWP_MD2HWP_WORKERS, default 2)."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            size = size or int(os.environ.get("HWP_MD2HWP_WORKERS", "2"))
+            _default_pool = Md2HwpPool(size)
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Minimal OLE2 compound file (CFB) writer for HWP 5.0 containers.
+
+olefile reads compound files but can only overwrite a stream with one of the
+same size, which rules out editing compressed BodyText streams. This module
+lays out a fresh version 3 compound file (512-byte sectors, 64-byte mini
+sectors below the 4096-byte cutoff) from a list of streams. Stream bytes are
+written exactly as given, so streams that were not edited are carried over
+from the source file without being decompressed or recompressed.
+
+Usage:
+    from hwp_ole import read_streams, write_compound
+
+    streams = read_streams("in.hwp")              # [(path, bytes), ...]
+    streams = [(p, new if p == "BodyText/Section0" else d) for p, d in streams]
+    with open("out.hwp", "wb") as f:
+        write_compound(f, streams)
+
+Dependencies:
+    pip install olefile   (read_streams only)
+"""
+
+import struct
+
+SECTOR = 512
+MINI_SECTOR = 64
+MINI_CUTOFF = 4096
+SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+FREESECT = 0xFFFFFFFF
+ENDOFCHAIN = 0xFFFFFFFE
+FATSECT = 0xFFFFFFFD
+DIFSECT = 0xFFFFFFFC
+NOSTREAM = 0xFFFFFFFF
+
+_STORAGE, _STREAM, _ROOT = 1, 2, 5
+_BLACK = 1
+_PER_SECTOR = SECTOR // 4
+_HEADER_DIFAT = 109
+
+
+def read_streams(path: str) -> list:
+    """Return ``[(path, bytes), ...]`` for every stream of a compound file.
+
+    Storages without streams are kept as ``(path, None)`` entries.
+    """
+    import olefile
+
+    ole = olefile.OleFileIO(path)
+    try:
+        result = []
+        for entry in ole.listdir(streams=True, storages=True):
+            name = "/".join(entry)
+            if ole.get_type(name) == olefile.STGTY_STREAM:
+                result.append((name, ole.openstream(name).read()))
+            else:
+                result.append((name, None))
+        return result
+    finally:
+        ole.close()
+
+
+def _sectors(size: int, unit: int = SECTOR) -> int:
+    return (size + unit - 1) // unit
+
+
+def _sort_key(name: str):
+    # CFB orders siblings by name length first, then by upper-cased name.
+    return (len(name), name.upper())
+
+
+class _Entry:
+    __slots__ = ("name", "kind", "data", "size", "children", "sid", "start", "left", "right", "child")
+
+    def __init__(self, name, kind, data=None):
+        self.name = name
+        self.kind = kind
+        self.data = data
+        self.size = len(data) if data is not None else 0
+        self.children = {}
+        self.sid = self.left = self.right = self.child = NOSTREAM
+        self.start = ENDOFCHAIN
+
+
+def _build_tree(streams) -> list:
+    root = _Entry("Root Entry", _ROOT)
+    for path, data in streams:
+        parts = path.split("/")
+        node = root
+        for part in parts[:-1]:
+            node = node.children.setdefault(part, _Entry(part, _STORAGE))
+        leaf = parts[-1]
+        if len(leaf) > 31:
+            raise ValueError(f"OLE entry name longer than 31 characters: {leaf!r}")
+        if data is None:
+            node.children.setdefault(leaf, _Entry(leaf, _STORAGE))
+        else:
+            node.children[leaf] = _Entry(leaf, _STREAM, bytes(data))
+
+    entries = []
+
+    def number(node):
+        node.sid = len(entries)
+        entries.append(node)
+        kids = sorted(node.children.values(), key=lambda e: _sort_key(e.name))
+        for kid in kids:
+            number(kid)
+        node.child = _balanced(kids)
+
+    number(root)
+    return entries
+
+
+def _balanced(siblings) -> int:
+    """Link ``siblings`` (sorted) into a balanced binary tree; return the root SID.
+
+    Every node is black. The result is a valid search tree, which is what
+    readers (including Hangul) rely on; the colors are not checked.
+    """
+    if not siblings:
+        return NOSTREAM
+    mid = len(siblings) // 2
+    node = siblings[mid]
+    node.left = _balanced(siblings[:mid])
+    node.right = _balanced(siblings[mid + 1:])
+    return node.sid
+
+
+def _dir_entry(e: _Entry) -> bytes:
+    name = e.name.encode("utf-16-le")
+    return struct.pack(
+        "<64sHBBIII16sIQQIQ",
+        name, len(name) + 2, e.kind, _BLACK, e.left, e.right, e.child,
+        b"\0" * 16, 0, 0, 0, e.start, e.size,
+    )
+
+
+def write_compound(fileobj, streams) -> None:
+    """Write ``streams`` (``[(path, bytes or None), ...]``) as a compound file.
+
+    Paths use "/" between storages; ``None`` data creates an empty storage.
+    """
+    entries = _build_tree(streams)
+    root = entries[0]
+    big = [e for e in entries if e.kind == _STREAM and e.size >= MINI_CUTOFF]
+    small = [e for e in entries if e.kind == _STREAM and 0 < e.size < MINI_CUTOFF]
+
+    # Mini stream: small streams packed into 64-byte mini sectors, held in
+    # regular sectors owned by the root entry.
+    minifat = []
+    for e in small:
+        e.start = len(minifat)
+        n = _sectors(e.size, MINI_SECTOR)
+        minifat.extend(range(e.start + 1, e.start + n))
+        minifat.append(ENDOFCHAIN)
+    mini_size = len(minifat) * MINI_SECTOR
+
+    n_dir = _sectors(len(entries) * 128)
+    n_minifat = _sectors(len(minifat) * 4)
+    n_mini = _sectors(mini_size)
+    n_data = n_dir + n_minifat + n_mini + sum(_sectors(e.size) for e in big)
+
+    n_fat = n_difat = 0
+    while True:
+        fat_needed = _sectors(n_data + n_fat + n_difat, _PER_SECTOR)
+        difat_needed = _sectors(max(0, fat_needed - _HEADER_DIFAT), _PER_SECTOR - 1)
+        if (fat_needed, difat_needed) == (n_fat, n_difat):
+            break
+        n_fat, n_difat = fat_needed, difat_needed
+
+    fat = [FATSECT] * n_fat + [DIFSECT] * n_difat
+    fat_start = 0
+    difat_start = n_fat
+
+    def chain(count: int) -> int:
+        if count == 0:
+            return ENDOFCHAIN
+        start = len(fat)
+        fat.extend(range(start + 1, start + count))
+        fat.append(ENDOFCHAIN)
+        return start
+
+    dir_start = chain(n_dir)
+    minifat_start = chain(n_minifat) if n_minifat else ENDOFCHAIN
+    root.start = chain(n_mini) if n_mini else ENDOFCHAIN
+    for e in big:
+        e.start = chain(_sectors(e.size))
+    fat.extend([FREESECT] * (n_fat * _PER_SECTOR - len(fat)))
+
+    fat_sids = list(range(fat_start, fat_start + n_fat))
+    header = struct.pack(
+        "<8s16sHHHHH6sIIIIIIIII",
+        SIGNATURE, b"\0" * 16, 0x003E, 0x0003, 0xFFFE, 9, 6, b"\0" * 6,
+        0, n_fat, dir_start, 0, MINI_CUTOFF,
+        minifat_start, n_minifat,
+        difat_start if n_difat else ENDOFCHAIN, n_difat,
+    )
+    head_difat = fat_sids[:_HEADER_DIFAT]
+    header += struct.pack(f"<{_HEADER_DIFAT}I", *(head_difat + [FREESECT] * (_HEADER_DIFAT - len(head_difat))))
+    fileobj.write(header)
+
+    def pad(data: bytes, unit: int = SECTOR) -> bytes:
+        rem = len(data) % unit
+        return data + b"\0" * (unit - rem) if rem else data
+
+    # FAT sectors
+    fileobj.write(struct.pack(f"<{len(fat)}I", *fat))
+    # DIFAT sectors: 127 FAT sector numbers each, then the next DIFAT sector.
+    rest = fat_sids[_HEADER_DIFAT:]
+    for i in range(n_difat):
+        ids = rest[i * (_PER_SECTOR - 1):(i + 1) * (_PER_SECTOR - 1)]
+        ids += [FREESECT] * (_PER_SECTOR - 1 - len(ids))
+        nxt = difat_start + i + 1 if i + 1 < n_difat else ENDOFCHAIN
+        fileobj.write(struct.pack(f"<{_PER_SECTOR}I", *ids, nxt))
+    # Directory; the root entry's stream is the mini stream.
+    root.size = mini_size
+    fileobj.write(pad(b"".join(_dir_entry(e) for e in entries)))
+    # Mini FAT and mini stream
+    if n_minifat:
+        fileobj.write(pad(struct.pack(f"<{len(minifat)}I", *minifat)))
+    if n_mini:
+        fileobj.write(pad(b"".join(pad(e.data, MINI_SECTOR) for e in small)))
+    for e in big:
+        fileobj.write(pad(e.data))
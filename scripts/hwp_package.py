@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+HWPX packaging: write python-hwpx documents with a per-entry compression policy.
+
+python-hwpx saves through ``zipfile`` with one compression setting, deflating
+every part again on every save, already-compressed images included, and sorts
+members so ``mimetype`` is not first. Here a document is written by taking
+python-hwpx's updated parts (``doc.oxml.serialize()``) and deciding per entry:
+
+- parts whose bytes match the source HWPX member are raw-copied, compressed
+  data and all, without inflating or deflating;
+- ``mimetype`` and already-compressed images are stored;
+- other parts (XML) are deflated at the policy level, and parts larger than
+  ``parallel_threshold`` are split into chunks deflated on a thread pool.
+
+HwpxPatch edits an existing file without python-hwpx at all: it tracks which
+members were written or removed and streams every other member verbatim.
+
+Usage:
+    python hwp_package.py repack <input.hwpx> <output.hwpx> [--level 9] [--workers 4]
+    python hwp_package.py bench <input.hwpx> [--levels 1,6,9] [--repeat 3]
+    python hwp_package.py patch <input.hwpx> <output.hwpx> --set Contents/section0.xml=new.xml
+
+    from hwp_package import CompressionPolicy, save_document
+    save_document(doc, "out.hwpx", source="in.hwpx", policy=CompressionPolicy(level=9))
+
+Dependencies:
+    pip install python-hwpx
+"""
+
+import sys
+import os
+import argparse
+import fnmatch
+import mimetypes
+import re
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import hwp_metrics
+from hwp_zip import ZipWriter, read_raw_members
+
+MIMETYPE = "mimetype"
+SECTION_RE = re.compile(r"^Contents/section\d+\.xml$")
+# Formats that are already compressed; deflating them again costs time for ~0 gain.
+STORE_PATTERNS = ("mimetype", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp",
+                  "*.zip", "*.ole", "*.mp3", "*.mp4")
+PARALLEL_THRESHOLD = 1 << 20
+CHUNK_SIZE = 1 << 20
+WINDOW = 32768
+
+
+class CompressionPolicy:
+    """Decides how each ZIP entry is compressed.
+
+    ``store`` patterns (fnmatch, case-insensitive) are written uncompressed;
+    ``levels`` maps patterns to deflate levels overriding ``level``.
+    """
+
+    def __init__(self, level: int = 6, store: tuple = STORE_PATTERNS, levels: dict = None):
+        self.level = level
+        self.store = tuple(p.lower() for p in store)
+        self.levels = {p.lower(): lv for p, lv in (levels or {}).items()}
+
+    def method(self, name: str) -> tuple:
+        """Return ``(compress_type, level)`` for the entry ``name``."""
+        lower = name.lower()
+        if any(fnmatch.fnmatchcase(lower, p) for p in self.store):
+            return zipfile.ZIP_STORED, 0
+        for pattern, level in self.levels.items():
+            if fnmatch.fnmatchcase(lower, pattern):
+                return zipfile.ZIP_DEFLATED, level
+        return zipfile.ZIP_DEFLATED, self.level
+
+
+def _deflate_chunk(data: bytes, start: int, end: int, level: int, last: bool) -> bytes:
+    if start:
+        co = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=data[max(0, start - WINDOW):start])
+    else:
+        co = zlib.compressobj(level, zlib.DEFLATED, -15)
+    out = co.compress(data[start:end])
+    return out + co.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def parallel_deflate(data: bytes, level: int, pool, chunk_size: int = CHUNK_SIZE):
+    """Deflate ``data`` in chunks on ``pool``; returns a list of futures of raw deflate pieces.
+
+    Each chunk is primed with the previous 32 KiB as a preset dictionary and
+    ends on a sync flush, so the concatenated pieces form one valid deflate
+    stream (the pigz scheme) at nearly the single-stream ratio.
+    """
+    view = memoryview(data)
+    starts = range(0, max(len(data), 1), chunk_size)
+    return [pool.submit(_deflate_chunk, view, s, min(s + chunk_size, len(data)), level,
+                        s + chunk_size >= len(data))
+            for s in starts]
+
+
+def document_parts(doc) -> dict:
+    """Apply pending python-hwpx changes and return the package's ``{name: bytes}``."""
+    package = doc.package
+    for name, payload in doc.oxml.serialize().items():
+        package.set_part(name, payload)
+    doc.oxml.reset_dirty()
+    return {name: package.get_part(name) for name in package.part_names()}
+
+
+def write_parts(parts: dict, fileobj, source=None, policy: CompressionPolicy = None,
+                workers: int = None, parallel_threshold: int = PARALLEL_THRESHOLD,
+                stream_parts: dict = None) -> dict:
+    """Write ``parts`` as an HWPX ZIP into a binary file object.
+
+    Args:
+        parts: Mapping of member name to bytes, in the desired member order
+        source: Original HWPX (path, binary file object, or list of RawMember);
+            members whose bytes are unchanged and whose compression matches the
+            policy are raw-copied
+        policy: CompressionPolicy (default: level 6, images and mimetype stored)
+        workers: Threads for parallel deflate (default: CPU count; 1 disables chunking)
+        parallel_threshold: Parts at least this large are deflated in chunks
+        stream_parts: Mapping of member name to a callable taking the part bytes
+            and returning an iterable of output byte chunks, for parts that are
+            rewritten while being written
+
+    Returns counts of ``raw``, ``stored``, ``deflated`` and ``streamed`` entries.
+    """
+    policy = policy or CompressionPolicy()
+    stream_parts = stream_parts or {}
+    originals = {m.name: m for m in _source_members(source)}
+    names = sorted(parts, key=lambda n: n != MIMETYPE)   # stable: mimetype first
+    stats = {"raw": 0, "stored": 0, "deflated": 0, "streamed": 0}
+
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool, ZipWriter(fileobj) as zw:
+        # Decide raw copies, then submit every large deflate up front so the
+        # chunks compress while earlier members are being written
+        reuse = {name for name in names if name not in stream_parts
+                 and _unchanged(originals.get(name), parts[name], policy.method(name)[0])}
+        pending = {}
+        for name in names:
+            data = parts[name]
+            compress_type, level = policy.method(name)
+            if (workers < 2 or name in stream_parts or name in reuse
+                    or compress_type != zipfile.ZIP_DEFLATED or len(data) < parallel_threshold):
+                continue
+            pending[name] = parallel_deflate(data, level, pool)
+
+        for name in names:
+            data = parts[name]
+            compress_type, level = policy.method(name)
+            original = originals.get(name)
+            date_time = original.date_time if original else (1980, 1, 1, 0, 0, 0)
+            external_attr = original.external_attr if original else 0
+            if name in stream_parts:
+                zw.write_iter(name, stream_parts[name](data), compress_type, level,
+                              date_time, external_attr)
+                stats["streamed"] += 1
+            elif name in reuse:
+                zw.write_raw(original)
+                stats["raw"] += 1
+            elif name in pending:
+                payload = b"".join(f.result() for f in pending.pop(name))
+                zw.write_compressed(name, payload, zlib.crc32(data), len(data),
+                                    compress_type, date_time, external_attr)
+                stats["deflated"] += 1
+            else:
+                zw.write(name, data, compress_type, level, date_time, external_attr)
+                stats["stored" if compress_type == zipfile.ZIP_STORED else "deflated"] += 1
+    if originals:
+        # Members copied from the source without recompressing count as hits.
+        hwp_metrics.cache("package_members", True, stats["raw"])
+        hwp_metrics.cache("package_members", False, len(names) - stats["raw"])
+    return stats
+
+
+def _source_members(source) -> list:
+    if source is None:
+        return []
+    if isinstance(source, list):
+        return source
+    return read_raw_members(source, preload=True)
+
+
+def _unchanged(original, data: bytes, compress_type: int) -> bool:
+    return (original is not None and original.compress_type == compress_type
+            and original.file_size == len(data) and original.crc == zlib.crc32(data))
+
+
+@contextmanager
+def atomic_write(path: str):
+    """Open ``path + ".tmp"`` for binary writing and move it over ``path`` on success.
+
+    ``path`` is only replaced once the block finishes, so an error midway
+    (or ``path`` being the input being read) never destroys the existing file.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def save_document(doc, destination, source=None, policy: CompressionPolicy = None,
+                  workers: int = None, stream_parts: dict = None):
+    """Save a python-hwpx document to a path or binary file object through ``write_parts``.
+
+    Pass the file the document was opened from as ``source`` to raw-copy the
+    parts that did not change.
+    """
+    parts = document_parts(doc)
+    source = _source_members(source)   # read before ``destination`` may truncate it
+    if hasattr(destination, "write"):
+        write_parts(parts, destination, source, policy, workers, stream_parts=stream_parts)
+        return destination
+    with atomic_write(destination) as f:
+        write_parts(parts, f, source, policy, workers, stream_parts=stream_parts)
+    return destination
+
+
+class HwpxPatch:
+    """Edit an HWPX at the ZIP-member level, rewriting only the members that change.
+
+    Members are indexed lazily (no data is read up front). ``write`` and
+    ``remove`` record changes; ``save`` streams every untouched member's
+    compressed bytes straight from the source file and compresses only the
+    changed ones, so the cost of an edit follows the size of the change rather
+    than the size of the file. ``Contents/content.hpf`` is only regenerated
+    when members are added or removed.
+
+        patch = HwpxPatch("big.hwpx")
+        xml = patch.read_text("Contents/section0.xml")
+        patch.write("Contents/section0.xml", xml.replace("초안", "최종"))
+        patch.save("big.hwpx")          # in place: written to a temp file, then swapped
+    """
+
+    MANIFEST = "Contents/content.hpf"
+
+    def __init__(self, source: str):
+        self.source = source
+        self.members = read_raw_members(source)
+        self._index = {m.name: m for m in self.members}
+        self._changes = {}
+        self._removed = set()
+
+    @property
+    def names(self) -> list:
+        names = [m.name for m in self.members if m.name not in self._removed]
+        return names + [n for n in self._changes if n not in self._index]
+
+    @property
+    def modified(self) -> set:
+        return set(self._changes) | self._removed
+
+    def section_names(self) -> list:
+        sections = [n for n in self.names if SECTION_RE.match(n)]
+        return sorted(sections, key=lambda n: int(re.search(r"\d+", n).group()))
+
+    def read(self, name: str) -> bytes:
+        if name in self._changes:
+            return self._changes[name]
+        if name in self._removed or name not in self._index:
+            raise KeyError(f"No such member: {name}")
+        return self._index[name].read()
+
+    def read_text(self, name: str) -> str:
+        return self.read(name).decode("utf-8")
+
+    def write(self, name: str, data) -> None:
+        """Replace (or add) member ``name``; no-op writes are not recorded."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        original = self._index.get(name)
+        if (original is not None and name not in self._removed and name not in self._changes
+                and _unchanged(original, data, original.compress_type)):
+            return
+        self._removed.discard(name)
+        self._changes[name] = data
+
+    def remove(self, name: str) -> None:
+        self._changes.pop(name, None)
+        if name in self._index:
+            self._removed.add(name)
+
+    def _sync_manifest(self) -> None:
+        added = [n for n in self._changes if n not in self._index and n != self.MANIFEST]
+        if not (added or self._removed) or self.MANIFEST not in self._index:
+            return
+        hpf = self.read_text(self.MANIFEST)
+        for name in self._removed:
+            m = re.search(r'<opf:item\b[^>]*\bhref="' + re.escape(name) + r'"[^>]*/>', hpf)
+            if not m:
+                continue
+            item_id = re.search(r'\bid="([^"]*)"', m.group()).group(1)
+            hpf = hpf.replace(m.group(), "")
+            hpf = re.sub(r'<opf:itemref\b[^>]*\bidref="' + re.escape(item_id) + r'"[^>]*/>', "", hpf)
+        items = []
+        for name in added:
+            if f'href="{name}"' in hpf or not name.startswith("BinData/"):
+                continue
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            item_id = os.path.splitext(os.path.basename(name))[0]
+            items.append(f'<opf:item id="{escape(item_id)}" href="{escape(name)}" '
+                         f'media-type="{media_type}" isEmbeded="1"/>')
+        if items:
+            hpf = hpf.replace("</opf:manifest>", "".join(items) + "</opf:manifest>", 1)
+        self.write(self.MANIFEST, hpf)
+
+    def save(self, output_path: str = None, policy: CompressionPolicy = None) -> dict:
+        """Write the patched archive (default: over the source); returns entry counts."""
+        policy = policy or CompressionPolicy()
+        self._sync_manifest()
+        output_path = output_path or self.source
+        in_place = os.path.exists(output_path) and os.path.samefile(output_path, self.source)
+        target = output_path + ".tmp" if in_place else output_path
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+        stats = {"raw": 0, "rewritten": 0, "removed": len(self._removed)}
+        try:
+            with open(target, "wb") as f, ZipWriter(f) as zw:
+                for name in sorted(self.names, key=lambda n: n != MIMETYPE):
+                    original = self._index.get(name)
+                    if name not in self._changes:
+                        zw.write_raw(original)
+                        stats["raw"] += 1
+                        continue
+                    compress_type, level = policy.method(name)
+                    zw.write(name, self._changes[name], compress_type, level,
+                             original.date_time if original else (1980, 1, 1, 0, 0, 0),
+                             original.external_attr if original else 0)
+                    stats["rewritten"] += 1
+            if in_place:
+                os.replace(target, output_path)
+        except BaseException:
+            if in_place and os.path.exists(target):
+                os.remove(target)
+            raise
+        hwp_metrics.cache("package_members", True, stats["raw"])
+        hwp_metrics.cache("package_members", False, stats["rewritten"])
+        return stats
+
+
+def repack(input_path: str, output_path: str, policy: CompressionPolicy = None,
+           workers: int = None, reuse: bool = True) -> dict:
+    """Rewrite an HWPX with ``policy``; with ``reuse`` matching members are raw-copied."""
+    members = read_raw_members(input_path, preload=True)
+    parts = {m.name: m.read() for m in members}
+    # The preloaded members are the raw-copy source: ``output_path`` may be ``input_path``.
+    with atomic_write(output_path) as f:
+        return write_parts(parts, f, members if reuse else None, policy, workers)
+
+
+def bench(input_path: str, levels=(1, 6, 9), repeat: int = 3, workers: int = None) -> list:
+    """Time saving ``input_path`` under several policies; returns result dicts.
+
+    Compares python-hwpx's own ``doc.save`` with full re-packing at each level
+    (``reuse=False``) and with raw-copying of unchanged members.
+    """
+    from hwpx.document import HwpxDocument
+
+    members = read_raw_members(input_path, preload=True)
+    parts = {m.name: m.read() for m in members}
+    results = []
+
+    def measure(label, fn):
+        best = None
+        for _ in range(repeat):
+            buf = BytesIO()
+            start = time.perf_counter()
+            fn(buf)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results.append({"mode": label, "seconds": round(best, 4), "bytes": len(buf.getvalue())})
+
+    doc = HwpxDocument.open(input_path)
+    measure("python-hwpx save", doc.save)
+    for level in levels:
+        policy = CompressionPolicy(level=level)
+        measure(f"repack level={level}",
+                lambda buf, p=policy: write_parts(parts, buf, None, p, workers))
+        measure(f"repack level={level} serial",
+                lambda buf, p=policy: write_parts(parts, buf, None, p, 1))
+    measure("raw-copy unchanged",
+            lambda buf: write_parts(parts, buf, input_path, CompressionPolicy(), workers))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-package or patch HWPX files")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_repack = sub.add_parser("repack", help="Rewrite an HWPX with a compression policy")
+    p_repack.add_argument("input", help="Input HWPX file")
+    p_repack.add_argument("output", help="Output HWPX file")
+    p_repack.add_argument("--level", type=int, default=6, choices=range(0, 10), metavar="0-9",
+                          help="Deflate level for XML parts (default: 6)")
+    p_repack.add_argument("--store", action="append", default=[], metavar="PATTERN",
+                          help="Extra glob of entries to store uncompressed (repeatable)")
+    p_repack.add_argument("--no-reuse", action="store_true",
+                          help="Recompress every entry instead of raw-copying matching ones")
+    p_repack.add_argument("--workers", type=int, default=None, help="Deflate threads")
+
+    p_bench = sub.add_parser("bench", help="Compare save time and output size across policies")
+    p_bench.add_argument("input", help="Input HWPX file")
+    p_bench.add_argument("--levels", default="1,6,9", help="Comma-separated deflate levels")
+    p_bench.add_argument("--repeat", type=int, default=3, help="Runs per mode; best is reported")
+    p_bench.add_argument("--workers", type=int, default=None, help="Deflate threads")
+
+    p_patch = sub.add_parser("patch", help="Replace or remove members, copying the rest verbatim")
+    p_patch.add_argument("input", help="Input HWPX file")
+    p_patch.add_argument("output", help="Output HWPX file (may be the input)")
+    p_patch.add_argument("--set", action="append", default=[], metavar="MEMBER=FILE",
+                         help="Replace or add MEMBER with the contents of FILE (repeatable)")
+    p_patch.add_argument("--remove", action="append", default=[], metavar="MEMBER",
+                         help="Remove MEMBER (repeatable)")
+
+    args = parser.parse_args()
+    if not os.path.exists(args.input):
+        print(f"Error: File not found: {args.input}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.command == "repack":
+            policy = CompressionPolicy(args.level, STORE_PATTERNS + tuple(args.store))
+            stats = repack(args.input, args.output, policy, args.workers, not args.no_reuse)
+            print(f"Repacked: {args.output} ({os.path.getsize(args.input)} → "
+                  f"{os.path.getsize(args.output)} bytes; "
+                  + ", ".join(f"{k} {v}" for k, v in stats.items() if v) + ")")
+        elif args.command == "patch":
+            patch = HwpxPatch(args.input)
+            for spec in args.set:
+                name, _, path = spec.partition("=")
+                with open(path, "rb") as f:
+                    patch.write(name, f.read())
+            for name in args.remove:
+                patch.remove(name)
+            stats = patch.save(args.output)
+            print(f"Patched: {args.output} (rewritten {stats['rewritten']}, "
+                  f"copied {stats['raw']}, removed {stats['removed']})")
+        else:
+            levels = [int(x) for x in args.levels.split(",") if x.strip()]
+            print(f"{'mode':<28} {'seconds':>9} {'bytes':>12}")
+            for r in bench(args.input, levels, args.repeat, args.workers):
+                print(f"{r['mode']:<28} {r['seconds']:>9.4f} {r['bytes']:>12}")
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
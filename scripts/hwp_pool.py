@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Worker-pool offload with per-class concurrency limits for async servers.
+
+The MCP tools do CPU-heavy parsing, PDF rendering and subprocess calls. Run
+inline on the event loop, one large conversion blocks every other request.
+An Offload sends each call to a thread pool (light or I/O-bound work) or a
+process pool (CPU-bound work) chosen by its work class. Each class has its own
+limit on calls running at once and on calls waiting for a slot. A call that
+would exceed the queue depth fails at once with ServerBusy instead of piling
+up, so the server stays responsive and callers can retry.
+
+Limits come from the defaults below, overridable per class with the
+environment variables ``HWP_MCP_<CLASS>_WORKERS`` and ``HWP_MCP_<CLASS>_QUEUE``
+(e.g. ``HWP_MCP_CONVERT_WORKERS=4``).
+
+A call made with ``report=`` (an async ``report(done, total, message)``, such
+as an MCP Context's ``report_progress``) hands ``fn`` a hwp_progress.Progress
+as its ``progress`` argument and forwards what it reports. If the awaiting task
+is cancelled, the Progress is cancelled so the work stops at its next
+checkpoint, and its slot is only freed once it has. Work still running after
+``cancel_grace`` seconds has its external programs killed and, in a process
+class, its worker process too; the pool is replaced, and calls that shared the
+killed pool are run again on the new one.
+
+Usage:
+    from hwp_pool import Offload
+
+    offload = Offload()
+    text = await offload.run("read", read_file, path, "md")
+    pdf = await offload.run("convert", convert_to_pdf, path, out, report=ctx.report_progress)
+    offload.stats()   # {"read": {"kind": "thread", "workers": 4, "running": 1, ...}, ...}
+"""
+
+import os
+import asyncio
+import multiprocessing
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import hwp_metrics
+from hwp_progress import Progress
+
+# class -> (executor kind, concurrent workers, waiting calls allowed)
+DEFAULT_CLASSES = {
+    "read": ("thread", 4, 32),
+    "create": ("thread", 4, 16),
+    "edit": ("process", 2, 16),
+    "convert": ("process", 2, 8),
+    "session": ("thread", 4, 32),
+}
+
+# Seconds cancelled work may take to reach a checkpoint before it is killed.
+CANCEL_GRACE = 3.0
+# Seconds to wait for the last progress notifications of a finished call.
+FLUSH_TIMEOUT = 5.0
+
+
+class ServerBusy(RuntimeError):
+    """Raised when a work class already has its maximum number of calls waiting."""
+
+
+class _WorkClass:
+    def __init__(self, name: str, kind: str, workers: int, queue: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"{name}: executor kind must be 'thread' or 'process', not {kind!r}")
+        if workers < 1 or queue < 0:
+            raise ValueError(f"{name}: workers must be >= 1 and queue >= 0")
+        self.name = name
+        self.kind = kind
+        self.workers = workers
+        self.queue = queue
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.generation = 0     # bumped whenever the executor is replaced
+        self.culled = set()     # generations shut down to kill a cancelled call's worker
+        self.initializer = None  # (fn, args) run by every new worker, see Offload.prestart
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                fn, args = self.initializer or (None, ())
+                if self.kind == "process":
+                    # spawn: forking a process that runs an event loop and threads is unsafe.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                        initializer=fn, initargs=args)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix=f"hwp-{self.name}",
+                        initializer=fn, initargs=args)
+            return self._executor
+
+    def reset(self, wait: bool = False, cancel_futures: bool = None) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            self.generation += 1
+            executor.shutdown(wait=wait,
+                              cancel_futures=not wait if cancel_futures is None else cancel_futures)
+
+    def slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        return self._slots
+
+
+def _kill(pid: int) -> None:
+    try:
+        os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+    except OSError:
+        pass  # already gone
+
+
+def _in_worker(fn, args, kwargs):
+    """Run ``fn`` in a pool worker process and return ``(result, metrics)``.
+
+    The metrics are what the worker recorded during the call (hwp_metrics);
+    if ``fn`` raises, they travel on the exception instead. A reporting call
+    first tells the parent which process it runs in.
+    """
+    if "progress" in kwargs:
+        kwargs["progress"].send("start", os.getpid())
+    hwp_metrics.REGISTRY.reset()
+    try:
+        result = fn(*args, **kwargs)
+    except BaseException as e:
+        e.hwp_metrics = hwp_metrics.REGISTRY.take()
+        raise
+    return result, hwp_metrics.REGISTRY.take()
+
+
+def _worker_metrics(future) -> None:
+    """Merge the metrics a finished process-pool call sent back."""
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is None:
+        hwp_metrics.REGISTRY.merge(future.result()[1])
+    elif getattr(exc, "hwp_metrics", None):
+        hwp_metrics.REGISTRY.merge(exc.hwp_metrics)
+
+
+class _Call:
+    """Progress forwarding and process tracking for one ``Offload.run(report=...)`` call.
+
+    Thread classes get a Progress whose events are posted straight to the event
+    loop. Process classes get one backed by a multiprocessing manager queue and
+    event, which a pump thread drains onto the loop. Progress updates are sent
+    to ``report`` in order by a single forwarder task.
+    """
+
+    def __init__(self, loop, report, manager=None):
+        self.loop = loop
+        self.report = report
+        self.worker = None      # pid of the pool process running the call
+        self.children = set()   # pids of programs started with progress.run
+        self._updates = asyncio.Queue()
+        self._forwarder = loop.create_task(self._forward())
+        if manager is None:
+            self._events = None
+            self.progress = Progress(events=self)
+        else:
+            self._events = manager.Queue()
+            self.progress = Progress(events=self._events, flag=manager.Event())
+            threading.Thread(target=self._pump, daemon=True).start()
+
+    def put(self, event) -> None:
+        """Events of a thread-class Progress, sent from the worker thread."""
+        self.loop.call_soon_threadsafe(self._handle, event)
+
+    def _pump(self) -> None:
+        while True:
+            try:
+                event = self._events.get()
+                self.loop.call_soon_threadsafe(self._handle, event)
+            except Exception:
+                return  # manager or loop shut down
+            if event is None:
+                return
+
+    def _handle(self, event) -> None:
+        if event is None or event[0] == "progress":
+            self._updates.put_nowait(None if event is None else event[1:])
+        elif event[0] == "start":
+            self.worker = event[1]
+        elif event[0] == "child":
+            self.children.add(event[1])
+        elif event[0] == "child_exit":
+            self.children.discard(event[1])
+
+    async def _forward(self) -> None:
+        while True:
+            update = await self._updates.get()
+            if update is None:
+                return
+            try:
+                await self.report(*update)
+            except Exception:
+                pass  # a client that went away must not fail the work
+
+    def close(self) -> None:
+        """Mark the end of the call's events; the forwarder stops after the last one."""
+        if self._events is None:
+            self._handle(None)
+            return
+        try:
+            self._events.put(None)
+        except Exception:
+            self._handle(None)
+
+    async def flush(self) -> None:
+        self.close()
+        await asyncio.wait({self._forwarder}, timeout=FLUSH_TIMEOUT)
+
+    def cancel(self) -> None:
+        self._forwarder.cancel()
+        try:
+            self.progress.cancel()
+        except Exception:
+            pass  # manager gone; the kill after the grace period still applies
+
+    def kill_children(self) -> None:
+        for pid in list(self.children):
+            _kill(pid)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, not {value!r}") from None
+
+
+class Offload:
+    """Run blocking calls off the event loop, limited per work class."""
+
+    def __init__(self, classes: dict = None, cancel_grace: float = CANCEL_GRACE):
+        self.cancel_grace = cancel_grace
+        self._manager = None
+        self._classes = {}
+        for name, (kind, workers, queue) in (classes or DEFAULT_CLASSES).items():
+            prefix = f"HWP_MCP_{name.upper()}_"
+            self._classes[name] = _WorkClass(
+                name, kind,
+                _env_int(prefix + "WORKERS", workers),
+                _env_int(prefix + "QUEUE", queue),
+            )
+
+    def _progress_manager(self):
+        if self._manager is None:
+            # Started once per server, on the first reporting call to a process class.
+            self._manager = multiprocessing.get_context("spawn").Manager()
+        return self._manager
+
+    async def run(self, work_class: str, fn, *args, report=None, **kwargs):
+        """Await ``fn(*args, **kwargs)`` on the executor of ``work_class``.
+
+        For process classes ``fn`` and its arguments must be picklable
+        (module-level functions and plain data). With ``report``, ``fn`` also
+        receives ``progress=`` and cancelling the caller stops the work.
+        """
+        wc = self._classes[work_class]
+        slots = wc.slots()
+        if slots.locked() and wc.waiting >= wc.queue:
+            wc.rejected += 1
+            raise ServerBusy(
+                f"All '{work_class}' workers are busy ({wc.running}/{wc.workers} running, "
+                f"{wc.waiting}/{wc.queue} waiting); retry shortly"
+            )
+        wc.waiting += 1
+        queued = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            wc.waiting -= 1
+        started = time.perf_counter()
+        hwp_metrics.observe(work_class, "queue", started - queued)
+        wc.running += 1
+        call = None
+        handed_off = False
+        try:
+            loop = asyncio.get_running_loop()
+            process = wc.kind == "process"
+            if report is not None:
+                call = _Call(loop, report, self._progress_manager() if process else None)
+                kwargs["progress"] = call.progress
+            if process:
+                task = partial(_in_worker, fn, args, kwargs)
+            else:
+                task = partial(fn, *args, **kwargs)
+            for attempt in (0, 1):
+                generation = wc.generation
+                submitted = wc.executor().submit(task)
+                future = asyncio.wrap_future(submitted)
+                if process:
+                    future.add_done_callback(_worker_metrics)
+                try:
+                    # Shielded: a cancelled caller must not orphan work still running.
+                    result = await (future if call is None else asyncio.shield(future))
+                    if call is not None:
+                        await call.flush()
+                    return result[0] if process else result
+                except asyncio.CancelledError:
+                    if call is None or future.done():
+                        raise
+                    # Every further await here would be cancelled too; clean up in a task.
+                    submitted.cancel()  # succeeds only if the work has not started
+                    call.cancel()
+                    loop.create_task(self._finish_cancelled(wc, slots, call, future, generation))
+                    handed_off = True
+                    raise
+                except BrokenProcessPool:
+                    if call is not None:
+                        call.kill_children()
+                    if attempt == 0 and generation in wc.culled:
+                        continue  # the pool was shut down to kill another call's worker
+                    if generation == wc.generation:
+                        # A worker died (crash, OOM kill); start a fresh pool for later calls.
+                        wc.reset()
+                    raise
+        finally:
+            if not handed_off:
+                if call is not None:
+                    call.close()
+                wc.running -= 1
+                wc.completed += 1
+                slots.release()
+                hwp_metrics.observe(work_class, "total", time.perf_counter() - started)
+
+    async def _finish_cancelled(self, wc, slots, call, future, generation) -> None:
+        """Wait for cancelled work to stop, killing it after the grace period, then free its slot."""
+        try:
+            await asyncio.wait({future}, timeout=self.cancel_grace)
+            if not future.done():
+                call.kill_children()
+                if call.worker is not None:
+                    if generation == wc.generation:
+                        # Killing a worker breaks its pool; retire the pool first so new
+                        # calls go to a fresh one and its other calls are run again.
+                        wc.culled.add(generation)
+                        wc.reset(cancel_futures=False)
+                    _kill(call.worker)
+                await asyncio.wait({future})
+            if not future.cancelled():
+                future.exception()  # retrieved; the caller is gone
+        finally:
+            call.close()
+            wc.running -= 1
+            wc.cancelled += 1
+            slots.release()
+
+    def prestart(self, work_class: str, initializer=None, initargs: tuple = ()) -> list:
+        """Start every worker of ``work_class`` now instead of on first use.
+
+        ``initializer(*initargs)`` runs once in each worker, including workers
+        of pools started later to replace a broken one; it must not raise.
+        Returns the futures of the start-up tasks.
+        """
+        wc = self._classes[work_class]
+        if initializer is not None:
+            wc.initializer = (initializer, initargs)
+        started = wc._executor is not None
+        executor = wc.executor()
+        if started and initializer is not None:
+            # Existing workers never ran the initializer; run it as a task instead.
+            return [executor.submit(initializer, *initargs) for _ in range(wc.workers)]
+        return [executor.submit(os.getpid) for _ in range(wc.workers)]
+
+    def stats(self) -> dict:
+        return {
+            name: {"kind": wc.kind, "workers": wc.workers, "queue": wc.queue,
+                   "running": wc.running, "waiting": wc.waiting,
+                   "completed": wc.completed, "rejected": wc.rejected,
+                   "cancelled": wc.cancelled}
+            for name, wc in self._classes.items()
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        for wc in self._classes.values():
+            wc.reset(wait)
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
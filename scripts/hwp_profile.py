@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Profile one command: cProfile stats, sampled stacks and tracemalloc allocations.
+
+``--profile cpu|mem|both`` on hwp_read, hwp_convert, hwp_analyze, hwp_edit
+and hwp_create (and the ``profile`` option of the MCP tools) runs the work
+under a ``Profile`` and writes, into ``--profile-dir`` (default hwp-profile/):
+
+- ``<name>.pstats``: cProfile stats, for ``python -m pstats`` or snakeviz (cpu);
+- ``<name>.cpu.collapsed``: stacks sampled every 5 ms, one ``frame;frame;... count``
+  line per distinct stack, the input of flamegraph.pl and speedscope (cpu);
+- ``<name>.mem.collapsed``: live allocations by traceback, weighted by bytes (mem);
+- ``<name>.json``: the hottest functions, time per stage span, the largest
+  allocations, peak traced memory and the hwp_metrics stage summary.
+
+Sampled stacks start with the hwp_metrics stages the thread was inside, e.g.
+``[read.open];main;write_file;...`` and ``[convert.render];...``, so the
+flamegraph splits time by pipeline stage. Profiles are taken one at a time per
+process: cProfile and tracemalloc cannot tell two concurrent calls apart.
+
+Usage:
+    python hwp_read.py big.hwp --profile cpu
+    python hwp_convert.py doc.hwpx --to pdf --profile both --profile-dir prof/
+    flamegraph.pl prof/convert-*.cpu.collapsed > convert.svg
+
+    from hwp_profile import Profile
+    with Profile("both", "prof", "read") as prof:
+        read_file("big.hwp", "md")
+    prof.report["files"]
+"""
+
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from itertools import count
+
+import hwp_metrics
+
+MODES = ("cpu", "mem", "both")
+DEFAULT_DIR = "hwp-profile"
+SAMPLE_INTERVAL = 0.005
+TOP = 25
+TRACEBACK_FRAMES = 25
+
+# cProfile and tracemalloc see the whole process; one profile at a time.
+_lock = threading.Lock()
+_sequence = count(1)
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _since(before: dict, after: dict) -> dict:
+    """The part of snapshot ``after`` recorded since ``before`` (max is the later one's)."""
+    old = {(op, stage): h for op, stage, h in before["stages"]}
+    stages = []
+    for op, stage, h in after["stages"]:
+        prev = old.get((op, stage))
+        delta = list(h) if prev is None else [a - b for a, b in zip(h[:-1], prev[:-1])] + [h[-1]]
+        if sum(delta[:len(hwp_metrics.BUCKETS) + 1]):
+            stages.append([op, stage, delta])
+    old = {(name, tuple(sorted(labels.items()))): v for name, labels, v in before["counters"]}
+    counters = []
+    for name, labels, value in after["counters"]:
+        delta = value - old.get((name, tuple(sorted(labels.items()))), 0)
+        if delta:
+            counters.append([name, labels, delta])
+    return {"stages": stages, "counters": counters}
+
+
+class Profile:
+    """Profile the calling thread between ``start()`` and ``stop()`` (or ``with``).
+
+    Args:
+        mode: "cpu" (cProfile and sampled stacks), "mem" (tracemalloc) or "both"
+        out_dir: Directory for the output files (created if missing)
+        label: Start of the file names, usually the command ("read", "convert")
+        interval: Seconds between stack samples
+        top: Functions and allocations listed in the JSON report
+    """
+
+    def __init__(self, mode: str, out_dir: str = DEFAULT_DIR, label: str = "hwp",
+                 interval: float = SAMPLE_INTERVAL, top: int = TOP):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode {mode!r} (expected {', '.join(MODES)})")
+        self.mode = mode
+        self.cpu = mode in ("cpu", "both")
+        self.mem = mode in ("mem", "both")
+        self.out_dir = out_dir
+        self.name = f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_sequence)}"
+        self.interval = interval
+        self.top = top
+        self.report = None
+        self._profiler = None
+        self._sampler = None
+        self._samples = Counter()
+        self._stopped = threading.Event()
+
+    def start(self) -> "Profile":
+        _lock.acquire()
+        self._thread = threading.get_ident()
+        self._metrics = hwp_metrics.REGISTRY.snapshot()
+        hwp_metrics.trace(True)
+        if self.mem:
+            self._own_tracemalloc = not tracemalloc.is_tracing()
+            if self._own_tracemalloc:
+                tracemalloc.start(TRACEBACK_FRAMES)
+            tracemalloc.reset_peak()
+        if self.cpu:
+            self._sampler = threading.Thread(target=self._sample, name="hwp-profile-sampler",
+                                             daemon=True)
+            self._sampler.start()
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._started = time.perf_counter()
+        return self
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                stages = [f"[{s}]" for s in hwp_metrics.spans(self._thread)]
+                self._samples[";".join(stages + stack[::-1])] += 1
+
+    def stop(self) -> dict:
+        """Stop profiling, write the files and return the report (also ``self.report``)."""
+        try:
+            wall = time.perf_counter() - self._started
+            if self._profiler is not None:
+                self._stopped.set()
+                self._sampler.join()
+                self._profiler.disable()
+            snapshot = peak = None
+            if self.mem:
+                peak = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot().filter_traces((
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, __file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+                ))
+                if self._own_tracemalloc:
+                    tracemalloc.stop()
+            hwp_metrics.trace(False)
+            stages = _since(self._metrics, hwp_metrics.REGISTRY.snapshot())
+            self.report = self._write(wall, snapshot, peak, stages)
+            return self.report
+        finally:
+            _lock.release()
+
+    def _path(self, suffix: str) -> str:
+        return os.path.join(self.out_dir, self.name + suffix)
+
+    def _write(self, wall: float, snapshot, peak: int, stages: dict) -> dict:
+        os.makedirs(self.out_dir, exist_ok=True)
+        report = {"name": self.name, "mode": self.mode, "wall_s": round(wall, 4), "files": {},
+                  "stages": hwp_metrics.summary(stages)["stages"]}
+        if self.cpu:
+            report["cpu"] = self._cpu_report()
+            self._profiler.dump_stats(self._path(".pstats"))
+            with open(self._path(".cpu.collapsed"), "w", encoding="utf-8") as f:
+                for stack, n in sorted(self._samples.items()):
+                    f.write(f"{stack} {n}\n")
+            report["files"]["pstats"] = self._path(".pstats")
+            report["files"]["cpu_collapsed"] = self._path(".cpu.collapsed")
+        if self.mem:
+            report["memory"] = self._mem_report(snapshot, peak)
+            with open(self._path(".mem.collapsed"), "w", encoding="utf-8") as f:
+                for stat in snapshot.statistics("traceback"):
+                    # Tracebacks run from the outermost frame to the allocating line.
+                    frames = [f"{os.path.basename(fr.filename)}:{fr.lineno}" for fr in stat.traceback]
+                    f.write(f"{';'.join(frames)} {stat.size}\n")
+            report["files"]["mem_collapsed"] = self._path(".mem.collapsed")
+        report["files"]["json"] = self._path(".json")
+        with open(self._path(".json"), "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+    def _cpu_report(self) -> dict:
+        import pstats
+
+        stats = pstats.Stats(self._profiler).stats
+        hottest = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:self.top]
+        by_span = Counter()
+        for stack, count in self._samples.items():
+            stages = [frame[1:-1] for frame in stack.split(";") if frame.startswith("[")]
+            by_span[" > ".join(stages) or "(no stage)"] += count
+        total = sum(by_span.values())
+        return {
+            "functions": [{"function": f"{func} ({os.path.basename(path)}:{line})",
+                           "calls": calls, "primitive_calls": primitive,
+                           "tottime_s": round(tottime, 4), "cumtime_s": round(cumtime, 4)}
+                          for (path, line, func), (primitive, calls, tottime, cumtime, _) in hottest],
+            "samples": total,
+            "interval_s": self.interval,
+            "spans": {name: {"samples": n, "share": round(n / total, 4)}
+                      for name, n in by_span.most_common()},
+        }
+
+    def _mem_report(self, snapshot, peak: int) -> dict:
+        stats = snapshot.statistics("traceback")
+        return {
+            "peak_mb": round(peak / 2**20, 3),
+            "live_mb": round(sum(s.size for s in stats) / 2**20, 3),
+            "allocations": [{"location": f"{stat.traceback[-1].filename}:{stat.traceback[-1].lineno}",
+                             "size_kb": round(stat.size / 1024, 1), "count": stat.count,
+                             "traceback": [f"{os.path.basename(fr.filename)}:{fr.lineno}"
+                                           for fr in stat.traceback]}
+                            for stat in stats[:self.top]],
+        }
+
+    def __enter__(self) -> "Profile":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def profiled(mode: str, out_dir: str, label: str, fn, *args, **kwargs):
+    """Call ``fn(*args, **kwargs)`` under a Profile; returns ``(result, report)``.
+
+    Module-level so it can be sent to process-pool workers (hwp_pool).
+    """
+    prof = Profile(mode, out_dir, label)
+    with prof:
+        result = fn(*args, **kwargs)
+    return result, prof.report
+
+
+def add_profile_arguments(parser) -> None:
+    """Add ``--profile`` and ``--profile-dir`` to a script's argument parser."""
+    parser.add_argument("--profile", choices=MODES,
+                        help="Profile the command: cProfile and sampled stacks (cpu), "
+                             "tracemalloc allocations (mem), or both")
+    parser.add_argument("--profile-dir", default=DEFAULT_DIR, metavar="DIR",
+                        help=f"Directory for the profile files (default: {DEFAULT_DIR})")
+
+
+def profile_until_exit(mode: str, out_dir: str = DEFAULT_DIR, label: str = "hwp"):
+    """Start profiling now and write the files when the script exits (also on sys.exit)."""
+    if not mode:
+        return None
+    prof = Profile(mode, out_dir, label)
+
+    def finish():
+        report = prof.stop()
+        print(f"[INFO] profile written: {', '.join(report['files'].values())}", file=sys.stderr)
+
+    prof.start()
+    atexit.register(finish)
+    return prof
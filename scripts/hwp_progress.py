@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Progress reporting and cooperative cancellation for long-running pipelines.
+
+Reads, conversions and edits take an optional ``progress`` argument and call
+it at natural checkpoints: a section parsed, pages rendered, an operation
+applied. Each call also checks whether the caller has cancelled the work and,
+if so, raises Cancelled, so the work stops at the next checkpoint instead of
+running to the end. External programs (hwp5odt, hwp5txt) are started through
+``progress.run``, which kills them as soon as cancellation is requested.
+
+Pipelines call ``as_progress(progress)`` so that passing nothing costs nothing.
+hwp_pool.Offload creates the Progress objects for MCP calls and forwards
+their events to the client.
+
+Usage:
+    from hwp_progress import Cancelled, Progress
+
+    progress = Progress(events=queue.SimpleQueue())
+    threading.Thread(target=convert_to_pdf, args=("in.hwpx", "out.pdf"),
+                     kwargs={"progress": progress}).start()
+    progress.cancel()       # the conversion raises Cancelled at its next checkpoint
+"""
+
+import subprocess
+import threading
+import time
+
+# How often a running external program is checked for cancellation (seconds).
+POLL_INTERVAL = 0.1
+
+
+class Cancelled(BaseException):
+    """Raised at a checkpoint once the caller has cancelled the work.
+
+    Like asyncio.CancelledError it is not an Exception, so the pipelines'
+    ``except Exception`` fallbacks (pyhwp2md → python-hwpx → olefile) do not
+    swallow it and carry on with the next parser.
+    """
+
+
+class Progress:
+    """Progress sink and cancellation flag handed to a pipeline.
+
+    ``events`` is anything with ``put``; it receives ``("progress", done, total,
+    message)`` for each checkpoint and ``("child", pid)`` / ``("child_exit", pid)``
+    around external programs. ``flag`` is anything with ``is_set``/``set``: a
+    threading.Event by default, or a multiprocessing manager's Event proxy so
+    that the Progress can be sent to a worker process.
+    """
+
+    def __init__(self, events=None, flag=None):
+        self.events = events
+        self.flag = flag if flag is not None else threading.Event()
+
+    def __call__(self, done: float, total: float = None, message: str = None) -> None:
+        """Report ``done`` out of ``total`` units of work; raises Cancelled if cancelled."""
+        self.check()
+        self.send("progress", done, total, message)
+
+    def send(self, *event) -> None:
+        if self.events is not None:
+            self.events.put(event)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.flag.is_set()
+
+    def cancel(self) -> None:
+        self.flag.set()
+
+    def check(self) -> None:
+        """Raise Cancelled if the work has been cancelled."""
+        if self.flag.is_set():
+            raise Cancelled("Cancelled by the caller")
+
+    def run(self, args: list, timeout: float = None, **kwargs) -> subprocess.CompletedProcess:
+        """Like ``subprocess.run(args, capture_output=True, timeout=timeout)``, but the
+        program is killed and Cancelled raised as soon as the work is cancelled."""
+        self.check()
+        with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              **kwargs) as proc:
+            self.send("child", proc.pid)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            try:
+                while True:
+                    try:
+                        stdout, stderr = proc.communicate(timeout=POLL_INTERVAL)
+                        break
+                    except subprocess.TimeoutExpired:
+                        if self.cancelled:
+                            proc.kill()
+                            proc.communicate()
+                            raise Cancelled(f"Cancelled by the caller; {args[0]} was stopped")
+                        if deadline is not None and time.monotonic() > deadline:
+                            proc.kill()
+                            proc.communicate()
+                            raise subprocess.TimeoutExpired(args, timeout)
+            finally:
+                self.send("child_exit", proc.pid)
+        return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+
+
+def as_progress(progress) -> Progress:
+    """Return ``progress``, or a silent Progress that is never cancelled if it is None."""
+    return progress if progress is not None else Progress()
@@ -4,6 +4,13 @@ Read HWP/HWPX files and extract text content as Markdown.
 
 Usage:
     python hwp_read.py <input_file> [-o output_file] [--format md|txt|json]
+    python hwp_read.py <input_file> --sections 0-2 --paragraphs 0:50
+    python hwp_read.py <input_file> --max-chars 20000 [--cursor 3.120]
+    python hwp_read.py <input_file> --stats            # stage timings etc. on stderr
+
+Backends are tried in the order of BACKEND_ORDER (pyhwp2md first, then olefile
+for .hwp or python-hwpx for .hwpx). Set HWP_BACKEND_ORDER to a report written
+by ``hwp bench-backends`` to use the order it measured on your documents instead.
 
 Dependencies:
     pip install pyhwp2md olefile python-hwpx
@@ -13,42 +20,244 @@ import sys
 import os
 import argparse
 import json
+import tempfile
+from functools import lru_cache
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import hwp_metrics
+import hwp_profile
+from hwp_sink import MemorySink, Sink, StreamSink, encoded_size, open_sink
+
+
+# Backends able to read each extension, and the order write_file tries them in.
+# The default keeps pyhwp2md first so --format md output is unchanged; a
+# measured order (HWP_BACKEND_ORDER) can put the olefile parser first.
+BACKENDS = {
+    ".hwp": ("olefile", "pyhwp2md", "hwp5txt"),
+    ".hwpx": ("pyhwp2md", "python-hwpx"),
+}
+BACKEND_ORDER = {
+    ".hwp": ("pyhwp2md", "olefile"),
+    ".hwpx": ("pyhwp2md", "python-hwpx"),
+}
+HWP5TXT_TIMEOUT = 60
+# Parsers that write paragraph by paragraph (buffered when a fallback follows them).
+STREAMING_BACKENDS = ("olefile", "python-hwpx")
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+COPY_CHUNK_CHARS = 1 << 20
+
+_order_override = None
 
 
 def read_hwpx_with_pyhwp2md(filepath: str) -> str:
-    """Read HWP or HWPX file using pyhwp2md (primary method)."""
+    """Read HWP or HWPX file using pyhwp2md."""
     from pyhwp2md import convert
     return convert(filepath)
 
 
-def read_hwp_with_olefile(filepath: str) -> str:
+def read_hwp_with_hwp5txt(filepath: str, progress=None) -> str:
+    """Read an HWP file with pyhwp's hwp5txt command."""
+    from hwp_progress import as_progress
+
+    result = as_progress(progress).run(["hwp5txt", filepath], timeout=HWP5TXT_TIMEOUT, text=True)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(f"hwp5txt exited with {result.returncode}: {lines[-1] if lines else ''}")
+    return result.stdout
+
+
+def check_backend_order(order: dict) -> dict:
+    """Validate ``{".hwp": [backend, ...], ...}`` and return it with tuple values."""
+    checked = {}
+    for ext, names in order.items():
+        if ext not in BACKENDS:
+            raise ValueError(f"Unknown extension in backend order: {ext!r}")
+        unknown = [n for n in names if n not in BACKENDS[ext]]
+        if unknown or not names:
+            raise ValueError(f"Backends for {ext} must be some of {', '.join(BACKENDS[ext])}, "
+                             f"got {list(names)!r}")
+        checked[ext] = tuple(names)
+    return checked
+
+
+def load_backend_order(path: str) -> dict:
+    """Backend order from an ``hwp bench-backends`` report (its "order") or a bare mapping."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return check_backend_order(data.get("order", data) if isinstance(data, dict) else {})
+
+
+@lru_cache(maxsize=None)
+def _env_backend_order(path: str) -> dict:
+    try:
+        return load_backend_order(path)
+    except (OSError, ValueError) as e:
+        print(f"[WARN] HWP_BACKEND_ORDER ignored ({e})", file=sys.stderr)
+        return {}
+
+
+def set_backend_order(order: dict = None) -> None:
+    """Use ``order`` for every later read in this process; None goes back to the default."""
+    global _order_override
+    _order_override = None if order is None else check_backend_order(order)
+
+
+def backend_order(ext: str) -> tuple:
+    """Backends write_file tries for ``ext``: set_backend_order, then HWP_BACKEND_ORDER, then
+    BACKEND_ORDER."""
+    order = _order_override
+    if order is None:
+        path = os.environ.get("HWP_BACKEND_ORDER")
+        order = _env_backend_order(path) if path else {}
+    return order.get(ext) or BACKEND_ORDER.get(ext, ("pyhwp2md",))
+
+
+class Selection:
+    """Section/paragraph range filter for partial reads.
+
+    ``sections`` is a list of half-open ``(start, stop)`` intervals (``stop`` may be
+    None for "to the end"); ``paragraphs`` is a single ``(start, stop)`` interval.
+    Paragraph indices count top-level paragraphs across the *selected* sections,
+    so sections outside the range never have to be decompressed or parsed.
+    """
+
+    def __init__(self, sections: list = None, paragraphs: tuple = None):
+        self.sections = sections
+        self.paragraphs = paragraphs
+
+    @classmethod
+    def from_specs(cls, sections: str = None, paragraphs: str = None):
+        """Build a Selection from CLI-style specs, e.g. ``"0-2,5"`` and ``"10:20"``."""
+        return cls(parse_sections(sections) if sections else None,
+                   parse_paragraphs(paragraphs) if paragraphs else None)
+
+    @property
+    def is_all(self) -> bool:
+        return self.sections is None and self.paragraphs is None
+
+    def wants_section(self, idx: int) -> bool:
+        if self.sections is None:
+            return True
+        return any(start <= idx and (stop is None or idx < stop) for start, stop in self.sections)
+
+    def sections_done(self, idx: int) -> bool:
+        """True once no selected section is at or after ``idx``."""
+        if self.sections is None:
+            return False
+        return all(stop is not None and stop <= idx for _, stop in self.sections)
+
+    def wants_paragraph(self, idx: int) -> bool:
+        if self.paragraphs is None:
+            return True
+        start, stop = self.paragraphs
+        return start <= idx and (stop is None or idx < stop)
+
+    def paragraphs_done(self, idx: int) -> bool:
+        """True once paragraph ``idx`` is past the selected paragraph range."""
+        if self.paragraphs is None:
+            return False
+        stop = self.paragraphs[1]
+        return stop is not None and idx >= stop
+
+
+def parse_sections(spec: str) -> list:
+    """Parse ``"0-2,5,7-"`` into ``[(0, 3), (5, 6), (7, None)]``."""
+    ranges = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                lo, hi = part.split('-', 1)
+                start = int(lo) if lo.strip() else 0
+                stop = int(hi) + 1 if hi.strip() else None
+            else:
+                start = int(part)
+                stop = start + 1
+        except ValueError:
+            raise ValueError(f"Invalid section range: {spec!r}")
+        if start < 0 or (stop is not None and stop <= start):
+            raise ValueError(f"Invalid section range: {spec!r}")
+        ranges.append((start, stop))
+    if not ranges:
+        raise ValueError(f"Invalid section range: {spec!r}")
+    return ranges
+
+
+def parse_paragraphs(spec: str) -> tuple:
+    """Parse ``"A:B"`` (slice semantics, either side optional) or ``"N"`` into ``(start, stop)``."""
+    try:
+        if ':' in spec:
+            lo, hi = spec.split(':', 1)
+            start = int(lo) if lo.strip() else 0
+            stop = int(hi) if hi.strip() else None
+        else:
+            start = int(spec)
+            stop = start + 1
+    except ValueError:
+        raise ValueError(f"Invalid paragraph range: {spec!r}")
+    if start < 0 or (stop is not None and stop < start):
+        raise ValueError(f"Invalid paragraph range: {spec!r}")
+    return (start, stop)
+
+
+def read_hwp_with_olefile(filepath: str, selection: Selection = None) -> str:
     """Read HWP (binary OLE2) file using olefile-based parser (fallback)."""
+    return "\n".join(iter_hwp_with_olefile(filepath, selection))
+
+
+def iter_hwp_with_olefile(filepath: str, selection: Selection = None, progress=None):
+    """Yield non-empty paragraph texts from an HWP file, one section at a time.
+
+    With a ``selection``, BodyText streams outside the section range are neither
+    read nor decompressed, and iteration stops after the last wanted paragraph.
+    ``progress`` (hwp_progress.Progress) is told after each section.
+    """
     import struct
     import zlib
     import olefile
+    from hwp_progress import as_progress
 
     if not olefile.isOleFile(filepath):
         raise ValueError(f"Not a valid HWP file: {filepath}")
 
-    ole = olefile.OleFileIO(filepath)
+    selection = selection or Selection()
+    progress = as_progress(progress)
+    with hwp_metrics.timer("read", "open"):
+        ole = olefile.OleFileIO(filepath)
+    inflating = hwp_metrics.Stopwatch("read", "decompress")
+    decoding = hwp_metrics.Stopwatch("read", "decode")
     try:
         header = ole.openstream("FileHeader").read()
         is_compressed = header[36] & 1
+        total = sum(1 for entry in ole.listdir() if entry[0] == "BodyText")
 
-        all_text = []
         section_idx = 0
-        while True:
+        para_idx = -1
+        while not selection.sections_done(section_idx):
             stream_name = f"BodyText/Section{section_idx}"
             if not ole.exists(stream_name):
                 break
+            if not selection.wants_section(section_idx):
+                section_idx += 1
+                continue
+            progress.check()
+            inflating.start()
             body = ole.openstream(stream_name).read()
             if is_compressed:
                 body = zlib.decompress(body, -15)
+            inflating.stop()
 
+            decoding.start()
             offset = 0
             while offset < len(body) - 4:
                 hdr = struct.unpack('<I', body[offset:offset + 4])[0]
                 tag = hdr & 0x3FF
+                level = (hdr >> 10) & 0x3FF
                 size = (hdr >> 20) & 0xFFF
                 if size == 0xFFF:
                     if offset + 8 > len(body):
@@ -60,20 +269,29 @@ def read_hwp_with_olefile(filepath: str) -> str:
                 if data_off + size > len(body):
                     break
 
-                if tag == 67:  # PARA_TEXT
+                if tag == 66 and level == 0:  # top-level PARA_HEADER
+                    para_idx += 1
+                    if selection.paragraphs_done(para_idx):
+                        return
+                elif tag == 67 and selection.wants_paragraph(para_idx):  # PARA_TEXT
                     data = body[data_off:data_off + size]
                     text = _decode_hwp_text(data)
                     if text.strip():
-                        all_text.append(text)
+                        decoding.stop()
+                        yield text
+                        decoding.start()
 
                 offset = data_off + size
                 if offset <= data_off:
                     break
+            decoding.stop()
             section_idx += 1
-
-        return "\n".join(all_text)
+            progress(section_idx, total, f"section {section_idx}/{total}")
     finally:
         ole.close()
+        decoding.stop()
+        hwp_metrics.observe("read", "decompress", inflating.seconds)
+        hwp_metrics.observe("read", "decode", decoding.seconds)
 
 
 def _decode_hwp_text(data: bytes) -> str:
@@ -103,70 +321,483 @@ def _decode_hwp_text(data: bytes) -> str:
 
 def read_hwpx_with_python_hwpx(filepath: str) -> str:
     """Read HWPX file using python-hwpx (structured access)."""
+    return "\n".join(iter_hwpx_with_python_hwpx(filepath))
+
+
+def iter_hwpx_with_python_hwpx(filepath: str):
+    """Yield non-empty, stripped paragraph texts from an HWPX file."""
     from hwpx.document import HwpxDocument
     doc = HwpxDocument.open(filepath)
-    texts = []
     for para in doc.paragraphs:
         t = para.text if hasattr(para, 'text') else str(para)
         if t and t.strip():
-            texts.append(t.strip())
-    return "\n".join(texts)
+            yield t.strip()
 
 
-def read_file(filepath: str, output_format: str = "md") -> str:
-    """Read HWP or HWPX file and return content in specified format."""
+HP_NS = "{http://www.hancom.co.kr/hwpml/2011/paragraph}"
+
+
+def iter_hwpx_blocks(filepath: str, selection: Selection = None, progress=None):
+    """Yield top-level blocks from HWPX section XML entries in document order.
+
+    Paragraphs are yielded as strings and tables as lists of rows. Each
+    ``Contents/sectionN.xml`` entry is parsed incrementally, and entries outside
+    the ``selection`` are never inflated. ``progress`` is told after each section.
+    """
+    import re
+    import zipfile
+    from hwp_progress import as_progress
+
+    selection = selection or Selection()
+    progress = as_progress(progress)
+    with hwp_metrics.timer("read", "open"):
+        zf = zipfile.ZipFile(filepath)
+    decoding = hwp_metrics.Stopwatch("read", "decode")
+    try:
+        names = set(zf.namelist())
+        total = sum(1 for n in names if re.fullmatch(r"Contents/section\d+\.xml", n))
+        section_idx = 0
+        para_idx = -1
+        while not selection.sections_done(section_idx):
+            name = f"Contents/section{section_idx}.xml"
+            if name not in names:
+                break
+            if not selection.wants_section(section_idx):
+                section_idx += 1
+                continue
+
+            progress.check()
+            decoding.start()
+            with zf.open(name) as fh:
+                for elem in _iter_section_paragraphs(fh):
+                    para_idx += 1
+                    if selection.paragraphs_done(para_idx):
+                        return
+                    if selection.wants_paragraph(para_idx):
+                        blocks = list(_paragraph_blocks(elem))
+                        decoding.stop()
+                        yield from blocks
+                        decoding.start()
+            decoding.stop()
+            section_idx += 1
+            progress(section_idx, total, f"section {section_idx}/{total}")
+    finally:
+        zf.close()
+        decoding.stop()
+        hwp_metrics.observe("read", "decode", decoding.seconds)
+
+
+def _iter_section_paragraphs(fh):
+    """Yield the top-level ``hp:p`` elements of a section XML stream as they are parsed.
+
+    Each element is detached from the tree once the consumer moves on, so
+    memory stays bounded by one paragraph.
+    """
+    from xml.etree import ElementTree as ET
+
+    depth = 0
+    root = None
+    for event, elem in ET.iterparse(fh, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1 or elem.tag != HP_NS + "p":
+            continue
+        yield elem
+        root.remove(elem)
+
+
+def iter_hwpx_paragraphs(filepath: str, start: tuple = (0, 0)):
+    """Yield ``(section, paragraph, blocks)`` for each top-level paragraph of an
+    HWPX file, starting at position ``start``.
+
+    ``paragraph`` counts within its section, and ``blocks`` are as in
+    ``iter_hwpx_blocks`` (possibly empty). Sections before ``start`` are never
+    inflated, so resuming late in a document does not re-parse earlier sections.
+    """
+    import zipfile
+
+    section, first = start
+    with zipfile.ZipFile(filepath) as zf:
+        names = set(zf.namelist())
+        while f"Contents/section{section}.xml" in names:
+            with zf.open(f"Contents/section{section}.xml") as fh:
+                for para, elem in enumerate(_iter_section_paragraphs(fh)):
+                    if para >= first:
+                        yield section, para, list(_paragraph_blocks(elem))
+            section += 1
+            first = 0
+
+
+def iter_hwp_paragraphs(filepath: str, start: tuple = (0, 0)):
+    """Yield ``(section, paragraph, texts)`` for each top-level paragraph of an
+    HWP file, starting at position ``start``.
+
+    ``texts`` are the non-empty texts of the paragraph and of the paragraphs
+    nested in it (table cells, text boxes). BodyText streams before ``start``
+    are neither read nor decompressed.
+    """
+    import zlib
+    import olefile
+    from hwp_binary import PARA_HEADER, PARA_TEXT, iter_records
+
+    if not olefile.isOleFile(filepath):
+        raise ValueError(f"Not a valid HWP file: {filepath}")
+
+    ole = olefile.OleFileIO(filepath)
+    try:
+        flags = ole.openstream("FileHeader").read()[36]
+        if flags & 0x6:
+            raise ValueError("Encrypted or distribution HWP files cannot be read")
+        section, first = start
+        while ole.exists(f"BodyText/Section{section}"):
+            body = ole.openstream(f"BodyText/Section{section}").read()
+            if flags & 0x1:
+                body = zlib.decompress(body, -15)
+            para = -1
+            texts = None
+            for tag, level, _, data_start, end in iter_records(body):
+                if tag == PARA_HEADER and level == 0:
+                    if texts is not None and para >= first:
+                        yield section, para, texts
+                    para += 1
+                    texts = []
+                elif tag == PARA_TEXT and texts is not None and para >= first:
+                    text = _decode_hwp_text(body[data_start:end])
+                    if text:
+                        texts.append(text)
+            if texts is not None and para >= first:
+                yield section, para, texts
+            section += 1
+            first = 0
+    finally:
+        ole.close()
+
+
+def _paragraph_blocks(para):
+    """Split a top-level ``hp:p`` element into its text and any tables it anchors."""
+    texts = []
+    tables = []
+    for run in para.findall(HP_NS + "run"):
+        for child in run:
+            if child.tag == HP_NS + "t":
+                texts.append("".join(child.itertext()))
+            elif child.tag == HP_NS + "tbl":
+                tables.append([
+                    [" ".join("".join(t.itertext()).strip() for t in tc.iter(HP_NS + "t")).strip()
+                     for tc in tr.findall(HP_NS + "tc")]
+                    for tr in child.findall(HP_NS + "tr")
+                ])
+    text = "".join(texts).strip()
+    if text:
+        yield text
+    yield from tables
+
+
+def _format_table(rows: list, output_format: str) -> str:
+    """Render table rows as a Markdown table, or tab-separated lines for txt."""
+    if output_format == "txt":
+        return "\n".join("\t".join(row) for row in rows)
+    lines = ["| " + " | ".join(c.replace("|", "\\|") for c in row) + " |" for row in rows]
+    if lines:
+        lines.insert(1, "| " + " | ".join("---" for _ in rows[0]) + " |")
+    return "\n".join(lines)
+
+
+def _write_blocks(blocks, sink, output_format: str) -> None:
+    """Write paragraph/table blocks, separated as Markdown paragraphs or text lines."""
+    sep = "\n" if output_format == "txt" else "\n\n"
+    first = True
+    for block in blocks:
+        if not first:
+            sink.write(sep)
+        sink.write(block if isinstance(block, str) else _format_table(block, output_format))
+        first = False
+
+
+def write_selection(filepath: str, sink, output_format: str = "md",
+                    selection: Selection = None, progress=None) -> None:
+    """Write only the selected sections/paragraphs of an HWP or HWPX file.
+
+    pyhwp2md always converts the whole document, so partial reads go through the
+    native parsers, which skip sections outside the range entirely.
+    """
     ext = os.path.splitext(filepath)[1].lower()
+    if ext == ".hwpx":
+        _write_blocks(iter_hwpx_blocks(filepath, selection, progress), sink, output_format)
+    elif ext == ".hwp":
+        _write_blocks(iter_hwp_with_olefile(filepath, selection, progress), sink, output_format)
+    else:
+        raise ValueError(f"Unsupported file extension: {ext}")
 
-    # Try pyhwp2md first (handles both HWP and HWPX)
+
+def parse_cursor(cursor: str) -> tuple:
+    """Parse a page cursor ``"S.P"`` (section, paragraph within it) into ``(S, P)``."""
+    if not cursor:
+        return (0, 0)
     try:
-        content = read_hwpx_with_pyhwp2md(filepath)
-        if content and content.strip():
-            if output_format == "txt":
-                return content
-            return content
-    except Exception as e:
-        print(f"[INFO] pyhwp2md failed ({e}), trying fallback...", file=sys.stderr)
-
-    # Fallback methods
+        section, paragraph = (int(x) for x in cursor.split("."))
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if section < 0 or paragraph < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return (section, paragraph)
+
+
+def page_blocks(paragraphs, output_format: str = "md", max_chars: int = 0,
+                max_paragraphs: int = 0) -> tuple:
+    """Render ``(section, paragraph, blocks)`` items into one page.
+
+    The page ends before the paragraph that would take it past ``max_chars``
+    characters or ``max_paragraphs`` paragraphs (0: no limit), but always holds
+    at least one paragraph. Returns ``(content, next_cursor)``; ``next_cursor``
+    is None at the end of the document. Items after the page are not consumed
+    beyond the first one.
+    """
+    sep = "\n" if output_format == "txt" else "\n\n"
+    parts = []
+    size = 0
+    count = 0
+    for section, para, blocks in paragraphs:
+        rendered = [b if isinstance(b, str) else _format_table(b, output_format) for b in blocks]
+        grown = size + sum(len(r) for r in rendered) + len(sep) * (len(rendered) - (not parts))
+        if count and ((max_paragraphs and count >= max_paragraphs)
+                      or (max_chars and rendered and grown > max_chars)):
+            return sep.join(parts), f"{section}.{para}"
+        if rendered:
+            parts.extend(rendered)
+            size = grown
+        count += 1
+    return sep.join(parts), None
+
+
+def read_page(filepath: str, output_format: str = "md", cursor: str = "",
+              max_chars: int = 0, max_paragraphs: int = 0) -> dict:
+    """Read one page of an HWP or HWPX file starting at ``cursor``.
+
+    Only the sections from the cursor on are parsed, and parsing stops once
+    the page is full, so the first page of a large document costs about as
+    much as the page itself. Pass the returned ``next_cursor`` to read on.
+    Pages use the same block rendering as partial reads.
+
+    Returns ``{"source", "cursor", "content", "next_cursor"}``.
+    """
+    ext = os.path.splitext(filepath)[1].lower()
+    start = parse_cursor(cursor)
     if ext == ".hwpx":
-        try:
-            return read_hwpx_with_python_hwpx(filepath)
-        except Exception as e:
-            print(f"[WARN] python-hwpx failed: {e}", file=sys.stderr)
+        paragraphs = iter_hwpx_paragraphs(filepath, start)
     elif ext == ".hwp":
+        paragraphs = iter_hwp_paragraphs(filepath, start)
+    else:
+        raise ValueError(f"Unsupported file extension: {ext}")
+    try:
+        content, next_cursor = page_blocks(paragraphs, output_format, max_chars, max_paragraphs)
+    finally:
+        paragraphs.close()
+    return {"source": filepath, "cursor": f"{start[0]}.{start[1]}", "content": content,
+            "next_cursor": next_cursor}
+
+
+def _write_lines(lines, sink) -> None:
+    """Write lines to a sink separated by newlines, one chunk per line."""
+    first = True
+    for line in lines:
+        if not first:
+            sink.write("\n")
+        sink.write(line)
+        first = False
+
+
+def _write_backend(name: str, filepath: str, sink, progress) -> bool:
+    """Write ``filepath`` into ``sink`` with one backend; False if it produced no text.
+
+    pyhwp2md and hwp5txt return the whole document, so blank output counts as a
+    failure; the streaming parsers may legitimately read an empty document.
+    """
+    if name in ("pyhwp2md", "hwp5txt"):
+        with hwp_metrics.timer("read", "decode"):
+            if name == "pyhwp2md":
+                content = read_hwpx_with_pyhwp2md(filepath)
+            else:
+                content = read_hwp_with_hwp5txt(filepath, progress)
+        if not (content and content.strip()):
+            return False
+        sink.write(content)
+        progress(1, 1, f"converted with {name}")
+    elif name == "python-hwpx":
+        with hwp_metrics.timer("read", "decode"):
+            _write_lines(iter_hwpx_with_python_hwpx(filepath), sink)
+    elif name == "olefile":
+        _write_lines(iter_hwp_with_olefile(filepath, progress=progress), sink)
+    else:
+        raise ValueError(f"Unknown backend: {name!r}")
+    return True
+
+
+def _write_buffered(name: str, filepath: str, sink, progress) -> bool:
+    """``_write_backend`` through a spool file, copied into ``sink`` only on success."""
+    with tempfile.SpooledTemporaryFile(SPOOL_MAX_BYTES, mode="w+", encoding="utf-8") as spool:
+        if not _write_backend(name, filepath, StreamSink(spool, binary=False), progress):
+            return False
+        spool.seek(0)
+        for chunk in iter(lambda: spool.read(COPY_CHUNK_CHARS), ""):
+            sink.write(chunk)
+    return True
+
+
+def extract_with(backend: str, filepath: str, progress=None) -> str:
+    """Text of ``filepath`` from one backend, without fallback (for comparing backends)."""
+    from hwp_progress import as_progress
+
+    ext = os.path.splitext(filepath)[1].lower()
+    if backend not in BACKENDS.get(ext, ()):
+        raise ValueError(f"{backend} cannot read {ext or 'extensionless'} files")
+    sink = MemorySink()
+    if not _write_backend(backend, filepath, sink, as_progress(progress)):
+        raise RuntimeError(f"{backend} returned no text")
+    return sink.getvalue()
+
+
+def write_file(filepath: str, sink, output_format: str = "md",
+               selection: Selection = None, progress=None) -> None:
+    """Read HWP or HWPX file and write its content into ``sink`` incrementally.
+
+    Backends are tried in ``backend_order(ext)``. pyhwp2md and hwp5txt produce
+    the whole document at once, so their result is written as a single chunk;
+    the olefile and python-hwpx parsers stream paragraph by paragraph. A
+    streaming parser with another backend after it writes into a spool file
+    first, copied into ``sink`` only once it succeeds, so a parser that fails
+    midway never leaves partial text ahead of the fallback's output.
+    A non-trivial ``selection`` is handled by ``write_selection``.
+    ``progress`` (hwp_progress.Progress) is told as sections are read.
+    """
+    from hwp_progress import as_progress
+
+    if selection is not None and not selection.is_all:
+        write_selection(filepath, sink, output_format, selection, progress)
+        return
+
+    ext = os.path.splitext(filepath)[1].lower()
+    progress = as_progress(progress)
+    hwp_metrics.transferred("read", "in", hwp_metrics.file_size(filepath))
+    written = sink.bytes_written
+
+    order = backend_order(ext)
+    for i, name in enumerate(order):
+        following = order[i + 1] if i + 1 < len(order) else None
+        if i:
+            hwp_metrics.fallback("read", order[i - 1], name)
+        progress.check()
         try:
-            return read_hwp_with_olefile(filepath)
+            if following and name in STREAMING_BACKENDS:
+                ok = _write_buffered(name, filepath, sink, progress)
+            else:
+                ok = _write_backend(name, filepath, sink, progress)
+            if ok:
+                hwp_metrics.backend("read", name)
+                hwp_metrics.transferred("read", "out", sink.bytes_written - written)
+                return
+            reason = "no text"
         except Exception as e:
-            print(f"[WARN] olefile parser failed: {e}", file=sys.stderr)
+            reason = str(e)
+        if following:
+            print(f"[INFO] {name} failed ({reason}), trying {following}...", file=sys.stderr)
+        else:
+            print(f"[WARN] {name} failed: {reason}", file=sys.stderr)
 
     raise RuntimeError(f"Failed to read file: {filepath}")
 
 
+class _JsonStringSink(Sink):
+    """Sink wrapper that escapes each chunk as part of a JSON string literal."""
+
+    def __init__(self, target):
+        super().__init__()
+        self._target = target
+
+    def write(self, data) -> None:
+        if data:
+            self._target.write(json.dumps(data, ensure_ascii=False)[1:-1])
+            self.bytes_written += encoded_size(data)
+
+
+def write_json(filepath: str, sink, output_format: str = "md",
+               selection: Selection = None, progress=None) -> None:
+    """Write ``{"source": ..., "content": ...}`` JSON into ``sink``, streaming the content."""
+    sink.write('{\n  "source": ' + json.dumps(filepath, ensure_ascii=False) + ',\n  "content": "')
+    write_file(filepath, _JsonStringSink(sink), output_format, selection, progress)
+    sink.write('"\n}')
+
+
+def read_file(filepath: str, output_format: str = "md", selection: Selection = None) -> str:
+    """Read HWP or HWPX file and return content in specified format."""
+    sink = MemorySink()
+    write_file(filepath, sink, output_format, selection)
+    return sink.getvalue()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Read HWP/HWPX files and extract text")
     parser.add_argument("input", help="Input HWP or HWPX file path")
     parser.add_argument("-o", "--output", help="Output file path (default: stdout)")
     parser.add_argument("--format", choices=["md", "txt", "json"], default="md",
                         help="Output format (default: md)")
+    parser.add_argument("--sections", metavar="RANGE",
+                        help="Only read these sections, e.g. 0-2 or 0,3,5- (0-based)")
+    parser.add_argument("--paragraphs", metavar="A:B",
+                        help="Only read top-level paragraphs A..B-1 of the selected sections")
+    paging = parser.add_argument_group("paging")
+    paging.add_argument("--cursor", metavar="S.P",
+                        help="Start a page at paragraph P of section S (from a previous page)")
+    paging.add_argument("--max-chars", type=int, default=0, metavar="N",
+                        help="End the page before it exceeds N characters")
+    paging.add_argument("--max-paragraphs", type=int, default=0, metavar="N",
+                        help="End the page after N top-level paragraphs")
+    hwp_metrics.add_stats_arguments(parser)
+    hwp_profile.add_profile_arguments(parser)
     args = parser.parse_args()
+    hwp_metrics.report_at_exit(args.stats, args.stats_file)
+    hwp_profile.profile_until_exit(args.profile, args.profile_dir, "read")
 
     if not os.path.exists(args.input):
         print(f"Error: File not found: {args.input}", file=sys.stderr)
         sys.exit(1)
 
-    content = read_file(args.input, args.format)
+    try:
+        selection = Selection.from_specs(args.sections, args.paragraphs)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.cursor or args.max_chars or args.max_paragraphs:
+        if not selection.is_all:
+            print("Error: --cursor/--max-chars/--max-paragraphs cannot be combined with "
+                  "--sections/--paragraphs", file=sys.stderr)
+            sys.exit(1)
+        try:
+            page = read_page(args.input, args.format, args.cursor or "", args.max_chars,
+                             args.max_paragraphs)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        with open_sink(args.output) as sink:
+            sink.write(json.dumps(page, ensure_ascii=False, indent=2) if args.format == "json"
+                       else page["content"])
+        if page["next_cursor"]:
+            print(f"[INFO] next page: --cursor {page['next_cursor']}", file=sys.stderr)
+        return
 
-    if args.format == "json":
-        output = json.dumps({"source": args.input, "content": content}, ensure_ascii=False, indent=2)
-    else:
-        output = content
+    with open_sink(args.output) as sink:
+        if args.format == "json":
+            write_json(args.input, sink, args.format, selection)
+        else:
+            write_file(args.input, sink, args.format, selection)
 
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(output)
         print(f"Saved to: {args.output}", file=sys.stderr)
-    else:
-        print(output)
 
 
 if __name__ == "__main__":
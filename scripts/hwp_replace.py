@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Dictionary-driven find/replace over HWPX text in a single pass.
+
+All patterns are compiled into one regular expression. Literal patterns are
+folded into a character trie first and emitted as nested groups, so the regex
+engine walks the trie (an Aho-Corasick style automaton) instead of trying
+thousands of alternatives at every position; the longest pattern wins at each
+position. Every section XML is scanned once: only the character data of
+``hp:t`` runs is rewritten, markup is copied through untouched, and members
+without hits are copied as raw compressed bytes. Binary .hwp files are
+patched in place by hwp_binary.
+
+Usage:
+    python hwp_replace.py <input.hwpx> <output.hwpx> --map terms.json
+    python hwp_replace.py in.hwpx out.hwpx --map terms.csv --whole-word --ignore-case
+    python hwp_replace.py in.hwpx out.hwpx --map patterns.json --regex
+    python hwp_replace.py in.hwp out.hwp --map terms.json
+
+    terms.json: {"홍길동": "[이름]", "010-1234-5678": "[전화]"}
+    terms.csv / terms.tsv: two columns, find and replace (no header)
+
+Dependencies:
+    pip install olefile   (.hwp input only)
+"""
+
+import sys
+import os
+import argparse
+import csv
+import html
+import json
+import re
+from xml.sax.saxutils import escape
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import hwp_metrics
+from hwp_package import HwpxPatch
+
+HP_URI = "http://www.hancom.co.kr/hwpml/2011/paragraph"
+SECTION_RE = re.compile(r"^Contents/section\d+\.xml$")
+PREVIEW_TEXT = "Preview/PrvText.txt"
+# A numbered backreference (\1, (?(1)...)) not preceded by an escaping backslash.
+NUMBERED_REF_RE = re.compile(r"(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?\(\d)")
+WRAPPER_GROUP_RE = re.compile(r"^_p\d+$")
+
+
+def _trie_pattern(words: list) -> str:
+    """Build a regex matching any of ``words``, longest first at each position."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def emit(node) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + emit(child) for ch, child in node.items() if ch != ""]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if end else group
+
+    return emit(trie)
+
+
+class Replacer:
+    """A compiled set of find → replace patterns.
+
+    ``sub(text)`` replaces all matches in one scan and adds them to ``counts``
+    (keyed by the original pattern strings).
+    """
+
+    def __init__(self, mapping: dict, regex: bool = False, whole_word: bool = False,
+                 ignore_case: bool = False):
+        mapping = {k: v for k, v in mapping.items() if k}
+        if not mapping:
+            raise ValueError("No patterns to replace")
+        self.mapping = mapping
+        self.regex = regex
+        self.ignore_case = ignore_case
+        self.counts = dict.fromkeys(mapping, 0)
+        flags = re.IGNORECASE if ignore_case else 0
+
+        wrap = r"(?<!\w)(?:{})(?!\w)" if whole_word else "{}"
+        if regex:
+            self._patterns = list(mapping)
+            _check_regex_patterns(self._patterns, [re.compile(p, flags) for p in self._patterns])
+            # Each pattern on its own, wrapped like the combined one, so re-matching
+            # it where the combined pattern matched finds the same span.
+            self._singles = [re.compile(wrap.format(p), flags) for p in self._patterns]
+            body = "|".join(f"(?P<_p{i}>{p})" for i, p in enumerate(self._patterns))
+        else:
+            self._lookup = {self._key(k): k for k in mapping}
+            body = _trie_pattern(list(self._lookup))
+        self.pattern = re.compile(wrap.format(body), flags)
+
+    def _key(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def _replace(self, m) -> str:
+        if self.regex:
+            if m.start() == m.end():
+                return ""  # zero-width match (e.g. a lone lookahead): nothing to replace
+            i = int(m.lastgroup[2:])
+            pattern = self._patterns[i]
+            self.counts[pattern] += 1
+            # Re-match in the original string so lookarounds and anchors keep their
+            # context; the single pattern's groups then expand the replacement.
+            single = self._singles[i].match(m.string, m.start())
+            return single.expand(self.mapping[pattern]) if single else m.group()
+        pattern = self._lookup[self._key(m.group())]
+        self.counts[pattern] += 1
+        return self.mapping[pattern]
+
+    def sub(self, text: str, counted: bool = True) -> str:
+        """Replace every match in ``text``; ``counted=False`` leaves ``counts`` unchanged."""
+        if counted:
+            return self.pattern.sub(self._replace, text)
+        counts = dict(self.counts)
+        try:
+            return self.pattern.sub(self._replace, text)
+        finally:
+            self.counts = counts
+
+    def spans(self, text: str):
+        """Yield ``(start, end, replacement)`` for each match in ``text``, counting it."""
+        for m in self.pattern.finditer(text):
+            if m.start() < m.end():
+                yield m.start(), m.end(), self._replace(m)
+
+    def reset(self) -> None:
+        """Zero the hit counts so the compiled pattern can be reused for another file."""
+        self.counts = dict.fromkeys(self.mapping, 0)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+def _check_regex_patterns(patterns: list, compiled: list) -> None:
+    """Reject regex patterns that cannot share one combined expression.
+
+    Each pattern becomes one named alternative, so numbered backreferences
+    inside a pattern would point at the wrong group and group names must be
+    unique across patterns. Patterns that match the empty string are rejected
+    too, since they would insert the replacement at every position.
+    Groups may still be referenced from the replacement (``\\1``, ``\\g<name>``).
+    """
+    names = set()
+    for pattern, single in zip(patterns, compiled):
+        if single.fullmatch(""):
+            raise ValueError(f"Regex pattern matches the empty string: {pattern!r}")
+        if NUMBERED_REF_RE.search(pattern):
+            raise ValueError(f"Numbered backreferences are not supported inside patterns: "
+                             f"{pattern!r} (use (?P<name>...) and (?P=name))")
+        for name in single.groupindex:
+            if name in names or WRAPPER_GROUP_RE.match(name):
+                raise ValueError(f"Group name used more than once or reserved: {name!r}")
+            names.add(name)
+
+
+def _text_pattern(xml: str):
+    m = re.search(r'xmlns:([\w.-]+)="' + re.escape(HP_URI) + '"', xml)
+    p = re.escape(m.group(1) if m else "hp")
+    return re.compile(rf"(<{p}:t(?:\s[^>]*)?>)(.*?)(</{p}:t>)", re.DOTALL)
+
+
+def replace_in_section(xml: str, replacer: Replacer) -> str:
+    """Apply ``replacer`` to the character data of every ``hp:t`` in a section XML.
+
+    Inline elements inside a run (tabs, line breaks) split the text; matches do
+    not cross them, nor run or paragraph boundaries. Text is matched with all
+    entities and character references decoded, and only text that changed is
+    re-escaped; everything else is copied through as written.
+    """
+    def chars(text):
+        if not text:
+            return text
+        decoded = html.unescape(text) if "&" in text else text
+        replaced = replacer.sub(decoded)
+        return escape(replaced) if replaced != decoded else text
+
+    def run(m):
+        inner = m.group(2)
+        if "<" in inner:
+            parts = re.split(r"(<[^>]*>)", inner)
+            parts[::2] = [chars(t) for t in parts[::2]]
+            inner = "".join(parts)
+        else:
+            inner = chars(inner)
+        return m.group(1) + inner + m.group(3)
+
+    return _text_pattern(xml).sub(run, xml)
+
+
+def is_hwp(path: str) -> bool:
+    return path.lower().endswith(".hwp")
+
+
+def _text_members(patch):
+    return [name for name in patch.names if SECTION_RE.match(name) or name == PREVIEW_TEXT]
+
+
+def scan(input_path: str, replacer: Replacer) -> bool:
+    """Cheaply check whether ``replacer`` could match anything in an HWPX file.
+
+    Each section is searched as a whole (markup included, entities decoded), so
+    this never misses a match that ``replace_many`` would make, may report a
+    few that it would not, and stops at the first hit without building output.
+    """
+    patch = HwpxPatch(input_path)
+    return any(replacer.pattern.search(html.unescape(patch.read_text(name)))
+               for name in _text_members(patch))
+
+
+def replace_with(input_path: str, output_path: str, replacer: Replacer,
+                 skip_unchanged: bool = False, progress=None) -> bool:
+    """Apply a compiled ``replacer`` to an HWPX file, adding to its counts.
+
+    With ``skip_unchanged`` nothing is written when there are no hits.
+    Binary .hwp files are patched record by record (hwp_binary).
+    ``progress`` (hwp_progress.Progress) is told after each text member.
+    Returns True if ``output_path`` was written.
+    """
+    from hwp_progress import as_progress
+
+    if is_hwp(input_path):
+        from hwp_binary import replace_in_hwp
+
+        return replace_in_hwp(input_path, output_path, replacer, skip_unchanged,
+                              progress=progress)
+    progress = as_progress(progress)
+    with hwp_metrics.timer("replace", "open"):
+        patch = HwpxPatch(input_path)
+    hwp_metrics.transferred("replace", "in", hwp_metrics.file_size(input_path))
+    members = _text_members(patch)
+    applying = hwp_metrics.Stopwatch("replace", "apply")
+    for done, name in enumerate(members, 1):
+        progress.check()
+        applying.start()
+        before = replacer.total
+        text = patch.read_text(name)
+        if name == PREVIEW_TEXT:
+            # The preview repeats the body text: rewrite it without counting hits twice.
+            preview = replacer.sub(text, counted=False)
+            if preview != text:
+                patch.write(name, preview)
+        else:
+            text = replace_in_section(text, replacer)
+            if replacer.total != before:
+                patch.write(name, text)
+        applying.stop()
+        progress(done, len(members), name)
+    hwp_metrics.observe("replace", "apply", applying.seconds)
+    if skip_unchanged and not patch.modified:
+        return False
+    with hwp_metrics.timer("replace", "save"):
+        patch.save(output_path)
+    hwp_metrics.transferred("replace", "out", hwp_metrics.file_size(output_path))
+    return True
+
+
+def replace_many(input_path: str, output_path: str, mapping: dict, regex: bool = False,
+                 whole_word: bool = False, ignore_case: bool = False, progress=None) -> dict:
+    """Replace every pattern in ``mapping`` throughout an HWPX file.
+
+    Section text and the preview text are rewritten through HwpxPatch, so all
+    other members, and sections with no hits, are copied as raw compressed
+    bytes. ``output_path`` may equal ``input_path``.
+
+    Returns per-pattern hit counts.
+    """
+    replacer = Replacer(mapping, regex, whole_word, ignore_case)
+    replace_with(input_path, output_path, replacer, progress=progress)
+    return replacer.counts
+
+
+def load_mapping(path: str) -> dict:
+    """Read find → replace pairs from a JSON object or a two-column CSV/TSV file."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if ext == ".json":
+            mapping = json.load(f)
+            if not isinstance(mapping, dict):
+                raise ValueError("Replacement map JSON must be an object of find → replace")
+            return {str(k): str(v) for k, v in mapping.items()}
+        if ext in (".csv", ".tsv"):
+            reader = csv.reader(f, delimiter="\t" if ext == ".tsv" else ",")
+            return {row[0]: row[1] if len(row) > 1 else "" for row in reader if row and row[0]}
+    raise ValueError(f"Unsupported replacement map extension: {ext}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replace many terms in an HWPX/HWP file in one pass")
+    parser.add_argument("input", help="Input HWPX or HWP file")
+    parser.add_argument("output", help="Output file (same format as the input)")
+    parser.add_argument("--map", required=True, dest="mapping",
+                        help="Replacement map: JSON object, or CSV/TSV with find,replace columns")
+    parser.add_argument("--regex", action="store_true", help="Treat find strings as regular expressions")
+    parser.add_argument("--whole-word", action="store_true", help="Only match whole words")
+    parser.add_argument("--ignore-case", action="store_true", help="Case-insensitive matching")
+    parser.add_argument("--report", help="Write per-pattern hit counts as JSON to this file")
+    args = parser.parse_args()
+
+    for path in (args.input, args.mapping):
+        if not os.path.exists(path):
+            print(f"Error: File not found: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        counts = replace_many(args.input, args.output, load_mapping(args.mapping),
+                              args.regex, args.whole_word, args.ignore_case)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(counts, f, ensure_ascii=False, indent=2)
+    hit = {k: v for k, v in counts.items() if v}
+    print(f"Replaced {sum(hit.values())} occurrences of {len(hit)}/{len(counts)} patterns in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
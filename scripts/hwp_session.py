@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Open-document sessions: parse a document once, then read, search, analyze and
+edit it many times.
+
+Every stateless tool call re-opens and re-parses its input. An agent that
+reads a report, searches it, and then edits it three times parses it five
+times. A SessionStore keeps parsed documents in memory under a handle. HWPX
+documents are held as a python-hwpx document with its hwp_address.ParagraphIndex
+and hwp_table.BulkTables, so chained edits reuse one model. Binary HWP
+documents are read-only here and are held as their list of paragraph texts.
+
+Memory is bounded. Each loaded document is charged an estimate of its parsed
+size, and when the total exceeds the budget the least recently used documents
+are unloaded. Their handles stay valid: the next call re-parses the file. Only
+documents without unsaved edits are unloaded, so edits are never lost; they
+reach disk only through an explicit ``save`` (or ``close(save=True)``). A clean
+document whose file changed on disk is re-parsed on its next use.
+
+Limits come from ``HWP_MCP_SESSION_MB`` (memory budget, default 512) and
+``HWP_MCP_SESSIONS`` (open handles, default 64).
+
+Usage:
+    from hwp_session import SessionStore
+
+    store = SessionStore()
+    handle = store.open("report.hwpx").handle
+    with store.use(handle) as session:
+        session.search("예산")
+        session.edit([{"op": "replace", "find": "초안", "replace": "최종"}])
+        session.save()
+    store.close(handle)
+
+Dependencies:
+    pip install python-hwpx olefile
+"""
+
+import sys
+import os
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from uuid import uuid4
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import hwp_metrics
+from hwp_pool import _env_int
+
+DEFAULT_BUDGET_MB = 512
+DEFAULT_MAX_SESSIONS = 64
+# A parsed XML tree takes several times the size of the XML it came from.
+TREE_OVERHEAD = 6
+
+
+class Session:
+    """One open document: its path, its parsed model while loaded, and whether
+    it has unsaved edits. Use through ``SessionStore.use``, which loads the
+    model and holds the session's lock."""
+
+    def __init__(self, handle: str, path: str):
+        self.handle = handle
+        self.path = path
+        self.kind = "hwp" if path.lower().endswith(".hwp") else "hwpx"
+        self.dirty = False
+        self.cost = 0
+        self.lock = threading.RLock()
+        self.doc = self.index = self.tables = None
+        self._hwp = None        # [(section, paragraph, texts), ...]
+        self._mtime = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.doc is not None or self._hwp is not None
+
+    def stale(self) -> bool:
+        """True if the file changed on disk since it was loaded (and there are no edits to keep)."""
+        if not self.loaded or self.dirty:
+            return False
+        try:
+            return os.stat(self.path).st_mtime_ns != self._mtime
+        except OSError:
+            return False
+
+    def load(self) -> None:
+        mtime = os.stat(self.path).st_mtime_ns
+        if self.kind == "hwpx":
+            import zipfile
+            from hwpx.document import HwpxDocument
+            from hwp_address import ParagraphIndex
+            from hwp_table import BulkTables
+
+            with zipfile.ZipFile(self.path) as zf:
+                xml_size = sum(i.file_size for i in zf.infolist() if i.filename.endswith(".xml"))
+            self.doc = HwpxDocument.open(self.path)
+            self.index = ParagraphIndex(self.doc)
+            self.tables = BulkTables(self.doc, source=self.path)
+            self.cost = xml_size * TREE_OVERHEAD
+        else:
+            from hwp_read import iter_hwp_paragraphs
+
+            self._hwp = list(iter_hwp_paragraphs(self.path))
+            self.cost = sum(64 + sum(2 * len(t) for t in texts) for _, _, texts in self._hwp)
+        self._mtime = mtime
+
+    def unload(self) -> None:
+        self.doc = self.index = self.tables = self._hwp = None
+        self.cost = 0
+
+    # -- paragraphs --------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.index) if self.kind == "hwpx" else len(self._hwp)
+
+    @property
+    def section_count(self) -> int:
+        if self.kind == "hwpx":
+            return len(self.index.sections)
+        return self._hwp[-1][0] + 1 if self._hwp else 0
+
+    def locate(self, n: int) -> tuple:
+        """(section, paragraph within that section) of paragraph ``n``."""
+        return self.index.locate(n) if self.kind == "hwpx" else self._hwp[n][:2]
+
+    def section_of(self, n: int) -> int:
+        return self.locate(n)[0]
+
+    def text(self, n: int) -> str:
+        if self.kind == "hwp":
+            return " ".join(self._hwp[n][2])
+        text = self.index.text(n)
+        # A table queued by an edit shows as empty until save splices it in.
+        return "" if self.tables.is_placeholder(text) else text
+
+    def blocks(self, n: int) -> list:
+        """Paragraph ``n`` as hwp_read blocks: its text, then the rows of each table it holds."""
+        if self.kind == "hwp":
+            return list(self._hwp[n][2])
+        from hwp_read import _paragraph_blocks
+
+        if self.tables.is_placeholder(self.index.text(n)):
+            return []
+        return list(_paragraph_blocks(self.index.element(n)))
+
+    def selected(self, selection=None):
+        """Yield the numbers of the paragraphs an hwp_read.Selection picks.
+
+        As in hwp_read, the paragraph range counts paragraphs of the selected
+        sections only.
+        """
+        picked = -1
+        for n in range(len(self)):
+            s = self.section_of(n)
+            if selection is None:
+                yield n
+                continue
+            if selection.sections_done(s):
+                return
+            if not selection.wants_section(s):
+                continue
+            picked += 1
+            if selection.paragraphs_done(picked):
+                return
+            if selection.wants_paragraph(picked):
+                yield n
+
+    # -- operations --------------------------------------------------------
+
+    def read(self, sink, output_format: str = "md", selection=None) -> None:
+        """Write the selected paragraphs into ``sink`` as Markdown or plain text.
+
+        Output is built from paragraph blocks like hwp_read's partial reads,
+        so headings and styles are not rendered as by pyhwp2md.
+        """
+        from hwp_read import _write_blocks
+
+        _write_blocks((b for n in self.selected(selection) for b in self.blocks(n)),
+                      sink, output_format)
+
+    def iter_paragraphs(self, start: tuple = (0, 0)):
+        """Yield ``(section, paragraph, blocks)`` from position ``start`` on, as
+        hwp_read.iter_hwpx_paragraphs does for a file."""
+        if self.kind == "hwpx":
+            first = self.index.seek(*start)
+        else:
+            first = bisect_left(self._hwp, tuple(start), key=lambda item: item[:2])
+        for n in range(first, len(self)):
+            yield (*self.locate(n), self.blocks(n))
+
+    def read_page(self, output_format: str = "md", cursor: str = "", max_chars: int = 0,
+                  max_paragraphs: int = 0) -> dict:
+        """One page of the cached document, like hwp_read.read_page.
+
+        Cursors are positions, so after edits that add or remove paragraphs a
+        cursor from an earlier page may skip or repeat paragraphs.
+        """
+        from hwp_read import page_blocks, parse_cursor
+
+        start = parse_cursor(cursor)
+        content, next_cursor = page_blocks(self.iter_paragraphs(start), output_format,
+                                           max_chars, max_paragraphs)
+        return {"source": self.path, "session": self.handle, "cursor": f"{start[0]}.{start[1]}",
+                "content": content, "next_cursor": next_cursor}
+
+    def paragraphs(self, selection=None) -> list:
+        """``[{"index", "section", "text"}, ...]`` for the selected paragraphs;
+        tables held by a paragraph are listed under ``"tables"``."""
+        result = []
+        for n in self.selected(selection):
+            item = {"index": n, "section": self.section_of(n), "text": self.text(n)}
+            tables = [b for b in self.blocks(n) if not isinstance(b, str)]
+            if tables:
+                item["tables"] = tables
+            result.append(item)
+        return result
+
+    def search(self, text: str, limit: int = 50) -> list:
+        """Return up to ``limit`` matches as ``{"para_index", "offset", "text"}``."""
+        if not text:
+            raise ValueError("search text must be a non-empty string")
+        if self.kind == "hwpx":
+            matches = self.index.find_all(text)
+        else:
+            matches = ((n, m) for n in range(len(self)) for m in _offsets(self.text(n), text))
+        result = []
+        for n, offset in matches:
+            if len(result) >= limit:
+                break
+            result.append({"para_index": n, "offset": offset, "text": self.text(n)})
+        return result
+
+    def analyze(self) -> dict:
+        info = {
+            "session": self.handle, "path": self.path, "format": self.kind.upper(),
+            "dirty": self.dirty, "section_count": self.section_count,
+            "paragraph_count": len(self),
+            "char_count": sum(len(self.text(n)) for n in range(len(self))),
+        }
+        if self.kind == "hwpx":
+            from hwp_table import HP_URI
+
+            tag = f"{{{HP_URI}}}tbl"
+            info["table_count"] = sum(1 for n in range(len(self))
+                                      for _ in self.index.element(n).iter(tag))
+            info["pending_tables"] = self.tables.pending
+        return info
+
+    def edit(self, operations: list) -> list:
+        """Apply hwp_edit operations to the cached document; nothing is written until ``save``.
+
+        Operations run in order. If one fails, those before it stay applied
+        (the session is not rolled back) and the error says how many did.
+        """
+        if self.kind != "hwpx":
+            raise ValueError("Binary .hwp sessions are read-only; use hwp_edit on the file instead")
+        from hwp_edit import apply_operations, check_operations
+
+        check_operations(operations)
+        results = []
+        for i, op in enumerate(operations):
+            try:
+                results.extend(apply_operations(self.doc, self.index, self.tables, [op]))
+            except Exception as e:
+                raise ValueError(f"Operation {i} ({op['op']}) failed: {e}; "
+                                 f"{i} earlier operation(s) were applied and are unsaved") from e
+            finally:
+                if results:
+                    self.dirty = True
+        return results
+
+    def save(self, output_path: str = None) -> str:
+        """Write the document to ``output_path`` (default: its own path).
+
+        The session then refers to the written file. Members that did not
+        change are raw-copied from the previous file.
+        """
+        target = os.path.abspath(output_path) if output_path else self.path
+        if self.kind == "hwp":
+            if target != self.path:
+                import shutil
+
+                shutil.copyfile(self.path, target)
+        else:
+            from hwp_table import BulkTables
+
+            spliced = self.tables.pending
+            self.tables.save(target)
+            if spliced:
+                # Queued tables only exist in the written file; re-parse it on next use.
+                self.unload()
+            else:
+                self.tables = BulkTables(self.doc, source=target)
+        self.path = target
+        self.dirty = False
+        self._mtime = os.stat(target).st_mtime_ns
+        return target
+
+
+def _offsets(haystack: str, needle: str):
+    pos = haystack.find(needle)
+    while pos >= 0:
+        yield pos
+        pos = haystack.find(needle, pos + len(needle))
+
+
+class SessionStore:
+    """Handles to open documents with a memory-bounded LRU of their parsed models."""
+
+    def __init__(self, budget_mb: int = None, max_sessions: int = None):
+        if budget_mb is None:
+            budget_mb = _env_int("HWP_MCP_SESSION_MB", DEFAULT_BUDGET_MB)
+        if max_sessions is None:
+            max_sessions = _env_int("HWP_MCP_SESSIONS", DEFAULT_MAX_SESSIONS)
+        self.budget = budget_mb * 1024 * 1024
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()     # least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def open(self, path: str) -> Session:
+        """Open ``path`` (.hwpx, or .hwp read-only) and return its loaded session."""
+        path = os.path.abspath(path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in (".hwp", ".hwpx"):
+            raise ValueError(f"Unsupported file extension: {ext}")
+        session = Session(uuid4().hex[:12], path)
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                raise RuntimeError(f"Too many open sessions ({self.max_sessions}); close one first")
+            self._sessions[session.handle] = session
+        try:
+            with self.use(session.handle):
+                pass
+        except Exception:
+            self._drop(session.handle)
+            raise
+        return session
+
+    def _get(self, handle: str) -> Session:
+        with self._lock:
+            session = self._sessions.get(handle)
+            if session is None:
+                raise ValueError(f"Unknown or closed session: {handle!r}")
+            self._sessions.move_to_end(handle)
+            return session
+
+    def _drop(self, handle: str) -> None:
+        with self._lock:
+            self._sessions.pop(handle, None)
+
+    @contextmanager
+    def use(self, handle: str):
+        """Lock session ``handle`` with its model loaded, re-parsing it if it was evicted."""
+        session = self._get(handle)
+        with session.lock:
+            if session.loaded and not session.stale():
+                self.hits += 1
+                hwp_metrics.cache("session", True)
+            else:
+                self.misses += 1
+                hwp_metrics.cache("session", False)
+                session.unload()
+                with hwp_metrics.timer("session", "load"):
+                    session.load()
+            yield session
+        self._trim()
+
+    def _trim(self) -> None:
+        """Unload clean, idle documents, least recently used first, until within budget."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        total = sum(s.cost for s in sessions)
+        for session in sessions:
+            if total <= self.budget:
+                break
+            if session.dirty or not session.loaded or not session.lock.acquire(blocking=False):
+                continue
+            try:
+                if not session.dirty:
+                    total -= session.cost
+                    session.unload()
+                    self.evictions += 1
+            finally:
+                session.lock.release()
+
+    def close(self, handle: str, save: bool = False, output_path: str = None) -> dict:
+        """Close a session, saving it first if ``save``; unsaved edits are otherwise discarded."""
+        session = self._get(handle)
+        with session.lock:
+            result = {"session": handle, "path": session.path, "discarded": False}
+            if save:
+                if not session.loaded:
+                    session.load()
+                result["path"] = session.save(output_path)
+            elif session.dirty:
+                result["discarded"] = True
+            session.unload()
+            self._drop(handle)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            "sessions": len(sessions),
+            "loaded": sum(1 for s in sessions if s.loaded),
+            "dirty": sum(1 for s in sessions if s.dirty),
+            "bytes": sum(s.cost for s in sessions),
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
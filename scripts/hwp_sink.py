@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Output sinks that converters write into incrementally.
+
+A sink wraps a destination (file, stdout, or memory) so that readers and
+converters can emit output chunk by chunk while they parse, instead of
+building one large string and writing it at the end.
+
+Usage:
+    from hwp_sink import FileSink, MemorySink, open_sink
+
+    with open_sink("out.md") as sink:       # FileSink, or StdoutSink if path is None
+        write_markdown("doc.hwpx", sink)
+
+    sink = MemorySink()
+    write_markdown("doc.hwpx", sink)
+    text = sink.getvalue()
+
+    write_pdf("doc.hwpx", StreamSink(response_body))   # any binary file object
+"""
+
+import io
+import os
+import sys
+
+
+class Sink:
+    """Base class for output sinks.
+
+    Text sinks accept ``str`` chunks; binary sinks (``binary=True``) accept
+    ``bytes``. ``stream`` exposes the underlying file object for libraries
+    that want to write to a file-like target themselves (e.g. WeasyPrint).
+    ``bytes_written`` counts encoded bytes (UTF-8 for text chunks).
+    """
+
+    binary = False
+
+    def __init__(self):
+        self.bytes_written = 0
+        self.closed = False
+
+    @property
+    def stream(self):
+        raise NotImplementedError
+
+    def write(self, data) -> None:
+        """Write one chunk to the destination."""
+        if data:
+            self.stream.write(data)
+            self.bytes_written += encoded_size(data)
+
+    def writelines(self, chunks) -> None:
+        """Write every chunk from an iterable."""
+        for chunk in chunks:
+            self.write(chunk)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class FileSink(Sink):
+    """Sink that writes to a file on disk (UTF-8 for text output).
+
+    Output goes to ``path + ".tmp"`` and replaces ``path`` on ``close()``, so
+    an existing file is left untouched until the output is complete. Leaving
+    the ``with`` block on an exception calls ``discard()`` instead.
+    """
+
+    def __init__(self, path: str, binary: bool = False):
+        super().__init__()
+        self.path = path
+        self.binary = binary
+        self.tmp_path = path + ".tmp"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if binary:
+            self._fh = open(self.tmp_path, "wb")
+        else:
+            self._fh = open(self.tmp_path, "w", encoding="utf-8")
+
+    @property
+    def stream(self):
+        return self._fh
+
+    def close(self) -> None:
+        if not self.closed:
+            self._fh.close()
+            os.replace(self.tmp_path, self.path)
+        super().close()
+
+    def discard(self) -> None:
+        """Close without touching ``path`` and remove the partial output."""
+        if not self.closed:
+            self._fh.close()
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+        super().close()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+        return False
+
+
+class StdoutSink(Sink):
+    """Sink that writes to standard output, flushing after every chunk.
+
+    Flushing per chunk is what lets a downstream pipe see the first bytes
+    while the rest of the document is still being parsed.
+    """
+
+    def __init__(self, binary: bool = False, newline: bool = True):
+        super().__init__()
+        self.binary = binary
+        self._newline = newline
+
+    @property
+    def stream(self):
+        return sys.stdout.buffer if self.binary else sys.stdout
+
+    def write(self, data) -> None:
+        if data:
+            super().write(data)
+            self.flush()
+
+    def close(self) -> None:
+        # Match print(): text output on stdout ends with a newline.
+        if not self.closed and not self.binary and self._newline:
+            self.stream.write("\n")
+            self.flush()
+        super().close()
+
+
+class MemorySink(Sink):
+    """Sink that collects output in memory; use ``getvalue()`` to retrieve it."""
+
+    def __init__(self, binary: bool = False):
+        super().__init__()
+        self.binary = binary
+        self._buf = io.BytesIO() if binary else io.StringIO()
+
+    @property
+    def stream(self):
+        return self._buf
+
+    def getvalue(self):
+        return self._buf.getvalue()
+
+
+class StreamSink(Sink):
+    """Sink over a caller-owned file object (socket file, HTTP response, BytesIO...).
+
+    ``close()`` only flushes; the stream stays open for its owner. ``binary``
+    defaults to whether ``fileobj`` is a text stream.
+    """
+
+    def __init__(self, fileobj, binary: bool = None):
+        super().__init__()
+        self._fh = fileobj
+        self.binary = not isinstance(fileobj, io.TextIOBase) if binary is None else binary
+
+    @property
+    def stream(self):
+        return self._fh
+
+    def close(self) -> None:
+        if not self.closed:
+            self.flush()
+        super().close()
+
+
+def encoded_size(data) -> int:
+    """Size in bytes of a chunk as written: ``len`` for bytes, UTF-8 length for text."""
+    return len(data) if isinstance(data, (bytes, bytearray)) else len(data.encode("utf-8"))
+
+
+def open_sink(path: str = None, binary: bool = False) -> Sink:
+    """Return a FileSink for ``path``, or a StdoutSink when ``path`` is empty."""
+    if path:
+        return FileSink(path, binary=binary)
+    return StdoutSink(binary=binary)
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Write synthetic binary HWP 5.0 documents (OLE2) for benchmarks and fuzzing.
+
+The toolkit only creates HWPX, so the olefile-based parsers (hwp_read's
+``iter_hwp_with_olefile``, ``analyze_hwp``, hwp_binary's record patcher) had
+nothing to run on but proprietary samples. This writer emits small but
+structurally valid HWP 5.0 files:
+
+- ``FileHeader`` (signature, version 5.0.3.0, compression flag), ``DocInfo``
+  (document properties, ID mappings and one BIN_DATA record per image) and an
+  empty ``\x05HwpSummaryInformation`` property set;
+- ``BodyText/SectionN`` streams, raw-deflated or stored, made of
+  PARA_HEADER / PARA_TEXT / PARA_CHAR_SHAPE / PARA_LINE_SEG records, with
+  tables as a ``tbl `` extended control followed by CTRL_HEADER, TABLE and a
+  LIST_HEADER plus paragraphs per cell, nested one level deeper. The first
+  paragraph of a section carries the ``secd`` and ``cold`` controls (page,
+  footnote and column definitions), as pyhwp requires;
+- ``BinData/BINxxxx.<ext>`` streams and the ``PrvText`` preview.
+
+Text longer than 2046 characters gets a PARA_TEXT over 4094 bytes, which is
+written in the extended-size record form. A document is described as a list of
+sections, each a list of blocks: a string is a paragraph, a list of rows is a
+table (the same shapes hwp_read's parsers yield).
+
+Usage:
+    python hwp_synth.py out.hwp --paragraphs 100000 --sections 4 --tables 10 --images 5
+    python hwp_synth.py out.hwp --paragraphs 50 --uncompressed
+
+    from hwp_synth import write_hwp, synthetic_sections
+    write_hwp("doc.hwp", [["첫 단락", [["A", "B"], ["1", "2"]]], ["둘째 구역"]])
+    write_hwp("big.hwp", synthetic_sections(paragraphs=10**6, sections=8, tables=100))
+"""
+
+import sys
+import os
+import argparse
+import random
+import struct
+import uuid
+import zlib
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from hwp_binary import PARA_CHAR_SHAPE, PARA_HEADER, PARA_LINE_SEG, PARA_TEXT, pack_record
+from hwp_ole import write_compound
+
+SIGNATURE = b"HWP Document File"
+VERSION = 0x05000300            # 5.0.3.0, stored as a little-endian DWORD
+FLAG_COMPRESSED = 0x1
+
+# DocInfo and BodyText record tags (HWPTAG_BEGIN = 16)
+DOCUMENT_PROPERTIES = 16
+ID_MAPPINGS = 17
+BIN_DATA = 18
+CTRL_HEADER = 71
+LIST_HEADER = 72
+PAGE_DEF = 73
+FOOTNOTE_SHAPE = 74
+PAGE_BORDER_FILL = 75
+TABLE = 77
+
+# Control ids as stored (little-endian DWORDs, so they read backwards)
+TABLE_ID = b" lbt"
+SECTION_ID = b"dces"
+COLUMNS_ID = b"dloc"
+
+
+def _control(code: int, ctrl_id: bytes) -> str:
+    """An extended control in PARA_TEXT: the code, the control id, 8 reserved bytes, the code."""
+    return chr(code) + ctrl_id.decode("utf-16-le") + "\x00" * 4 + chr(code)
+
+
+TABLE_CONTROL = _control(11, TABLE_ID)
+# Section and column definitions open the first paragraph of every section.
+SECTION_CONTROLS = _control(2, SECTION_ID) + _control(2, COLUMNS_ID)
+PARA_END = "\r"
+SUMMARY_INFORMATION = "\x05HwpSummaryInformation"
+_SUMMARY_FMTID = uuid.UUID("9FA2B660-1061-11D4-B4C6-006097C09D8C")
+_TABLE_MASK = 1 << 11           # PARA_HEADER control mask bits
+_SECTION_MASK = 1 << 2
+_NEW_SECTION = 0x3              # PARA_HEADER split flags: new section, new column definition
+
+SENTENCES = (
+    "예산 집행 현황과 다음 분기 계획을 보고합니다.",
+    "사업별 추진 실적은 아래 표와 같습니다.",
+    "세부 내용은 담당 부서와 협의하여 확정할 예정입니다.",
+    "The quarterly figures are summarised in the attached table.",
+)
+
+
+def _deflate(data: bytes, level: int = 6) -> bytes:
+    co = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return co.compress(data) + co.flush()
+
+
+def _section_definition(level: int) -> bytes:
+    """CTRL_HEADER records of the section and column definitions (A4 portrait, one column)."""
+    section_def = struct.pack("<IHHHIH4HII", 0, 1134, 0, 0, 8000, 0, 0, 0, 0, 0, 0, 0)
+    page = struct.pack("<10I", 59528, 84188, 8504, 8504, 5668, 4252, 4252, 4252, 0, 0)
+    footnote = struct.pack("<I3HH5HBBI", 0, 0, 0, 0, 0, 0, 850, 567, 283, 0, 1, 1, 0)
+    border_fill = struct.pack("<I4HH", 1, 1417, 1417, 1417, 1417, 1)
+    columns = struct.pack("<HHHBBI", (1 << 2) | (1 << 12), 0, 0, 0, 0, 0)
+    return (pack_record(CTRL_HEADER, level + 1, SECTION_ID + section_def)
+            + pack_record(PAGE_DEF, level + 2, page)
+            + b"".join(pack_record(FOOTNOTE_SHAPE, level + 2, footnote) for _ in range(2))
+            + b"".join(pack_record(PAGE_BORDER_FILL, level + 2, border_fill) for _ in range(3))
+            + pack_record(CTRL_HEADER, level + 1, COLUMNS_ID + columns))
+
+
+def _para_header(units: bytes, controls: int, shapes: int, first: bool) -> bytes:
+    if first:
+        controls |= _SECTION_MASK
+    return struct.pack("<IIHBBHHHI", len(units) // 2, controls, 0, 0, _NEW_SECTION if first else 0,
+                       shapes, 0, 1, 0)
+
+
+_LINE_SEG = struct.pack("<I8i", 0, 0, 1000, 1000, 850, 600, 0, 42520, 0x60000)
+
+
+def paragraph(text: str, level: int = 0, shapes=((0, 0),), controls: int = 0,
+              first: bool = False) -> bytes:
+    """Records of one paragraph: PARA_HEADER, PARA_TEXT, PARA_CHAR_SHAPE, PARA_LINE_SEG.
+
+    ``text`` may contain controls (e.g. TABLE_CONTROL); the paragraph end
+    mark is appended. ``shapes`` are (position, char shape id) pairs. The
+    ``first`` paragraph of a section also carries the section definition.
+    """
+    units = ((SECTION_CONTROLS if first else "") + text + PARA_END).encode("utf-16-le")
+    return (pack_record(PARA_HEADER, level, _para_header(units, controls, len(shapes), first))
+            + pack_record(PARA_TEXT, level + 1, units)
+            + pack_record(PARA_CHAR_SHAPE, level + 1, b"".join(struct.pack("<II", *s) for s in shapes))
+            + pack_record(PARA_LINE_SEG, level + 1, _LINE_SEG)
+            + (_section_definition(level) if first else b""))
+
+
+def table(rows: list, level: int = 0, caption: str = "", first: bool = False) -> bytes:
+    """Records of a paragraph holding a table of ``rows`` (lists of cell strings).
+
+    The paragraph's text is ``caption`` plus the table control; each cell is a
+    LIST_HEADER followed by one paragraph, two levels below the paragraph.
+    """
+    n_rows = len(rows)
+    n_cols = max((len(r) for r in rows), default=0)
+    units = ((SECTION_CONTROLS if first else "") + caption + TABLE_CONTROL + PARA_END).encode("utf-16-le")
+    out = [
+        pack_record(PARA_HEADER, level, _para_header(units, _TABLE_MASK, 1, first)),
+        pack_record(PARA_TEXT, level + 1, units),
+        pack_record(PARA_CHAR_SHAPE, level + 1, struct.pack("<II", 0, 0)),
+        pack_record(PARA_LINE_SEG, level + 1, _LINE_SEG),
+        _section_definition(level) if first else b"",
+        # Control id, object attributes, offsets, size, z-order, margins, instance id,
+        # and an empty description
+        pack_record(CTRL_HEADER, level + 1, TABLE_ID + struct.pack("<IiiIIhh4hIhH", 0, 0, 0,
+                                                                     n_cols * 4000, n_rows * 1000,
+                                                                     0, 0, 0, 0, 0, 0, 0, 0, 0)),
+        # Attributes, rows, columns, cell spacing, inner margins, cells per row, border fill,
+        # no zones
+        pack_record(TABLE, level + 2, struct.pack("<IHHH4H", 0, n_rows, n_cols, 0, 510, 510, 141, 141)
+                    + struct.pack(f"<{n_rows}H", *([n_cols] * n_rows)) + struct.pack("<HH", 1, 0)),
+    ]
+    for r, row in enumerate(rows):
+        for c in range(n_cols):
+            cell = row[c] if c < len(row) else ""
+            # Paragraph count, list attributes, column/row address, spans, size, margins,
+            # border fill, width
+            out.append(pack_record(LIST_HEADER, level + 2,
+                                   struct.pack("<HHIHHHHii4HHi", 1, 0, 0, c, r, 1, 1, 4000, 1000,
+                                               510, 510, 141, 141, 1, 4000)))
+            out.append(paragraph(cell, level + 2))
+    return b"".join(out)
+
+
+def section(blocks) -> bytes:
+    """BodyText records of one section; blocks are paragraph strings or tables (lists of rows).
+
+    The first block carries the section definition; an empty section gets one
+    empty paragraph for it.
+    """
+    blocks = list(blocks) or [""]
+    return b"".join(paragraph(b, first=i == 0) if isinstance(b, str) else table(b, first=i == 0)
+                    for i, b in enumerate(blocks))
+
+
+def _doc_info(n_sections: int, images: list, compressed: bool) -> bytes:
+    props = struct.pack("<H6H3I", n_sections, 1, 1, 1, 1, 1, 1, 0, 0, 0)
+    mappings = struct.pack("<18i", len(images), *([0] * 17))
+    records = [pack_record(DOCUMENT_PROPERTIES, 0, props), pack_record(ID_MAPPINGS, 0, mappings)]
+    for i, (ext, _) in enumerate(images, 1):
+        name = ext.encode("utf-16-le")
+        # Embedded binary (type 1), compressed like the document (0 = follow storage default)
+        records.append(pack_record(BIN_DATA, 1, struct.pack("<HHH", 0x1, i, len(ext)) + name))
+    body = b"".join(records)
+    return _deflate(body) if compressed else body
+
+
+def _summary_information() -> bytes:
+    """An OLE property set with the HWP summary format id and no properties."""
+    header = struct.pack("<HHI16sI", 0xFFFE, 0, 0x00020006, bytes(16), 1)
+    return header + _SUMMARY_FMTID.bytes_le + struct.pack("<III", 48, 8, 0)
+
+
+def bin_data_name(index: int, ext: str) -> str:
+    """Stream name of the ``index``-th (1-based) embedded binary."""
+    return f"BinData/BIN{index:04X}.{ext}"
+
+
+def hwp_streams(sections: list, compressed: bool = True, preview: str = None,
+                images: list = None, level: int = 6) -> list:
+    """OLE streams ``[(path, bytes), ...]`` of a document (see write_hwp)."""
+    images = images or []
+    flags = FLAG_COMPRESSED if compressed else 0
+    header = SIGNATURE.ljust(32, b"\0") + struct.pack("<II", VERSION, flags)
+    streams = [
+        ("FileHeader", header.ljust(256, b"\0")),
+        ("DocInfo", _doc_info(len(sections), images, compressed)),
+        (SUMMARY_INFORMATION, _summary_information()),
+    ]
+    for i, blocks in enumerate(sections):
+        body = blocks if isinstance(blocks, bytes) else section(blocks)
+        streams.append((f"BodyText/Section{i}", _deflate(body, level) if compressed else body))
+    for i, (ext, data) in enumerate(images, 1):
+        streams.append((bin_data_name(i, ext), _deflate(data, level) if compressed else data))
+    if preview is None:
+        first = next((b for blocks in sections if not isinstance(blocks, bytes)
+                      for b in blocks if isinstance(b, str)), "")
+        preview = first[:1024]
+    streams.append(("PrvText", preview.encode("utf-16-le")))
+    return streams
+
+
+def write_hwp(target, sections: list, compressed: bool = True, preview: str = None,
+              images: list = None, level: int = 6):
+    """Write an HWP 5.0 file to a path or binary file object.
+
+    Args:
+        target: Output path or writable binary file object
+        sections: One entry per BodyText section: a list of blocks (paragraph
+            strings and tables as lists of rows), or ready-made record bytes
+        compressed: Raw-deflate DocInfo, BodyText and BinData (the FileHeader flag)
+        preview: PrvText content (default: the first paragraph)
+        images: ``[(ext, bytes), ...]`` stored as BinData/BIN0001.<ext>, ...
+        level: Deflate level
+
+    Returns ``target``.
+    """
+    streams = hwp_streams(sections, compressed, preview, images, level)
+    if hasattr(target, "write"):
+        write_compound(target, streams)
+        return target
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    with open(target, "wb") as f:
+        write_compound(f, streams)
+    return target
+
+
+def synthetic_sections(paragraphs: int = 100, sections: int = 1, tables: int = 0,
+                       table_rows: int = 10, table_cols: int = 4, long_every: int = 0,
+                       seed: int = 0) -> list:
+    """Blocks for a generated document of ``paragraphs`` paragraphs over ``sections`` sections.
+
+    ``tables`` tables of ``table_rows`` x ``table_cols`` are spread evenly
+    through the text. Every ``long_every``-th paragraph is longer than 2046
+    characters, so its PARA_TEXT uses the extended record size.
+    """
+    rng = random.Random(seed)
+    blocks = []
+    table_at = set(range(0, paragraphs, max(1, paragraphs // tables))) if tables else set()
+    for i in range(paragraphs):
+        text = f"{i + 1}. {SENTENCES[rng.randrange(len(SENTENCES))]}"
+        if long_every and (i + 1) % long_every == 0:
+            text = (text + " ") * (2100 // len(text) + 1)
+        blocks.append(text)
+        if tables and i in table_at:
+            blocks.append([[f"{i + 1}-{r + 1}-{c + 1}" for c in range(table_cols)]
+                           for r in range(table_rows)])
+            tables -= 1
+    per = -(-len(blocks) // max(1, sections)) or 1
+    out = [blocks[i:i + per] for i in range(0, len(blocks), per)]
+    return out + [[] for _ in range(sections - len(out))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic HWP 5.0 document")
+    parser.add_argument("output", help="Output .hwp path")
+    parser.add_argument("--paragraphs", type=int, default=100, help="Paragraph count (default: 100)")
+    parser.add_argument("--sections", type=int, default=1, help="BodyText sections (default: 1)")
+    parser.add_argument("--tables", type=int, default=0, help="Tables spread through the text")
+    parser.add_argument("--table-size", default="10x4", metavar="ROWSxCOLS",
+                        help="Rows and columns per table (default: 10x4)")
+    parser.add_argument("--images", type=int, default=0, help="Embedded BinData images")
+    parser.add_argument("--image-kb", type=int, default=64, help="Size of each image (default: 64)")
+    parser.add_argument("--long-every", type=int, default=0, metavar="N",
+                        help="Make every Nth paragraph long enough for an extended-size record")
+    parser.add_argument("--uncompressed", action="store_true", help="Store streams uncompressed")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    try:
+        rows, cols = (int(x) for x in args.table_size.lower().split("x"))
+    except ValueError:
+        print(f"Error: --table-size must look like 10x4, got {args.table_size!r}", file=sys.stderr)
+        sys.exit(1)
+    rng = random.Random(args.seed)
+    images = [("png", b"\x89PNG\r\n\x1a\n" + rng.randbytes(args.image_kb * 1024))
+              for _ in range(args.images)]
+    sections = synthetic_sections(args.paragraphs, args.sections, args.tables, rows, cols,
+                                  args.long_every, args.seed)
+    write_hwp(args.output, sections, not args.uncompressed, images=images)
+    print(f"Created: {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
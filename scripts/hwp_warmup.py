@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Preload heavy conversion backends before the first request needs them.
+
+The pipelines import pyhwp2md, python-hwpx, WeasyPrint and markdown lazily,
+so the first PDF conversion pays for importing WeasyPrint (cairo, pango) and
+for fontconfig's font discovery, often several seconds. WarmUp does that work
+at server start on a background thread: it starts the worker pools with
+``warm`` as their initializer, so every worker process imports its backends
+(and renders a one-line Korean PDF to prime the font cache) before its first
+call, and imports the thread classes' backends in the server process itself.
+
+Which backends are loaded is set with ``HWP_MCP_WARMUP``: ``all`` (default),
+``none``, or a comma-separated list such as ``weasyprint,markdown``. Import
+timings are kept per process and reported by ``timings()``.
+
+Usage:
+    python hwp_warmup.py                     # import every backend and print timings
+    python hwp_warmup.py weasyprint hwpx
+
+    from hwp_warmup import WarmUp
+    warmup = WarmUp(offload)
+    warmup.start()          # returns at once
+    warmup.status()         # {"state": "running", "backends": [...], ...}
+"""
+
+import sys
+import os
+import contextlib
+import importlib
+import json
+import threading
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+# backend name -> module to import
+BACKENDS = {
+    "pyhwp2md": "pyhwp2md",
+    "hwpx": "hwpx.document",
+    "olefile": "olefile",
+    "markdown": "markdown",
+    "weasyprint": "weasyprint",
+}
+
+# hwp_pool work class -> backends its calls use
+CLASS_BACKENDS = {
+    "read": ("pyhwp2md", "hwpx", "olefile"),
+    "create": ("hwpx", "markdown"),
+    "edit": ("hwpx", "olefile"),
+    "convert": ("pyhwp2md", "hwpx", "olefile", "markdown", "weasyprint"),
+    "session": ("hwpx", "olefile"),
+}
+
+_timings = {}
+_timings_lock = threading.Lock()
+
+
+def selected_backends(spec: str = None) -> list:
+    """Parse a ``HWP_MCP_WARMUP`` value (the environment when ``spec`` is None)."""
+    if spec is None:
+        spec = os.environ.get("HWP_MCP_WARMUP", "all")
+    spec = spec.strip().lower()
+    if spec in ("", "all"):
+        return list(BACKENDS)
+    if spec in ("none", "off", "0"):
+        return []
+    names = [name.strip() for name in spec.split(",") if name.strip()]
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown:
+        raise ValueError(f"HWP_MCP_WARMUP: unknown backend(s) {', '.join(unknown)} "
+                         f"(expected {', '.join(BACKENDS)}, 'all' or 'none')")
+    return names
+
+
+def _prime_fonts() -> None:
+    """Render a tiny PDF in the toolkit's style so fontconfig scans the fonts now."""
+    from weasyprint import HTML
+    from hwp_convert import HTML_HEAD, HTML_TAIL
+
+    HTML(string=HTML_HEAD.format(title="warm-up") + "<p>한글 글꼴 warm-up</p>" + HTML_TAIL).write_pdf()
+
+
+PRIMERS = {"weasyprint": _prime_fonts}
+
+
+def warm(backends, quiet: bool = False) -> dict:
+    """Import ``backends`` (and run their primers) in this process; never raises.
+
+    Used as a pool initializer, where an exception would break the pool. A
+    backend that is already loaded costs nothing. With ``quiet``, anything
+    printed meanwhile goes to stderr: a worker of a stdio MCP server shares
+    its stdout, which carries the protocol, and WeasyPrint prints its
+    missing-library banner there. Returns ``timings()``.
+    """
+    with contextlib.redirect_stdout(sys.stderr) if quiet else contextlib.nullcontext():
+        _warm(backends)
+    return timings()
+
+
+def _warm(backends) -> None:
+    for name in backends:
+        with _timings_lock:
+            if name in _timings:
+                continue
+        start = time.perf_counter()
+        entry = {"ok": True, "error": None}
+        try:
+            importlib.import_module(BACKENDS[name])
+            entry["import_seconds"] = round(time.perf_counter() - start, 4)
+            if name in PRIMERS:
+                primed = time.perf_counter()
+                PRIMERS[name]()
+                entry["prime_seconds"] = round(time.perf_counter() - primed, 4)
+        except Exception as e:
+            entry.update(ok=False, error=f"{type(e).__name__}: {e}")
+        entry["seconds"] = round(time.perf_counter() - start, 4)
+        with _timings_lock:
+            _timings[name] = entry
+
+
+def timings() -> dict:
+    """Backends loaded by ``warm`` in this process, with their timings."""
+    with _timings_lock:
+        return {"pid": os.getpid(), "backends": dict(_timings)}
+
+
+class WarmUp:
+    """Background warm-up of an hwp_pool.Offload's work classes."""
+
+    def __init__(self, offload, backends: list = None):
+        self.offload = offload
+        self.backends = selected_backends() if backends is None else list(backends)
+        self.state = "idle"
+        self.started = None
+        self.seconds = None
+        self.error = None
+        self._thread = None
+
+    def _class_backends(self, work_class: str) -> list:
+        wanted = CLASS_BACKENDS.get(work_class, tuple(BACKENDS))
+        return [name for name in self.backends if name in wanted]
+
+    def start(self) -> None:
+        """Warm up on a daemon thread; returns at once."""
+        if self._thread is not None or not self.backends:
+            self.state = self.state if self.backends else "off"
+            return
+        self.state = "running"
+        self.started = time.time()
+        self._thread = threading.Thread(target=self._run, name="hwp-warmup", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            futures = []
+            in_process = set()
+            for name, stats in self.offload.stats().items():
+                backends = self._class_backends(name)
+                if not backends:
+                    continue
+                if stats["kind"] == "process":
+                    futures += self.offload.prestart(name, warm, (backends, True))
+                else:
+                    in_process.update(backends)
+            warm([name for name in self.backends if name in in_process])
+            for fut in futures:
+                fut.result()
+            self.state = "done"
+        except Exception as e:
+            self.state = "failed"
+            self.error = f"{type(e).__name__}: {e}"
+        self.seconds = round(time.perf_counter() - start, 3)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the warm-up has finished; returns False on timeout."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def status(self) -> dict:
+        return {"state": self.state, "backends": self.backends, "started": self.started,
+                "seconds": self.seconds, "error": self.error}
+
+
+def main():
+    names = sys.argv[1:] or list(BACKENDS)
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown:
+        print(f"Error: unknown backend(s): {', '.join(unknown)} (expected {', '.join(BACKENDS)})",
+              file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(warm(names), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Streaming HWPX writer: append paragraphs and tables in document order.
+
+The blank python-hwpx template is split once into verbatim ZIP members and the
+body of ``Contents/section0.xml``. A writer copies the members as-is, opens the
+section as a deflate stream, and serializes each paragraph or table the moment
+it is added, so neither the document tree nor the section XML is ever held in
+memory and blocks land in exactly the order they were written.
+
+Usage:
+    from hwp_writer import HwpxStreamWriter
+
+    with open("out.hwpx", "wb") as f, HwpxStreamWriter(f) as w:
+        w.add_paragraph("제목")
+        w.add_table(["이름", "나이"], row_iterator)
+        w.add_paragraph("본문")
+
+Dependencies:
+    pip install python-hwpx
+"""
+
+import sys
+import os
+import re
+import zipfile
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from hwp_table import HP_URI, PARA_ATTRS, iter_table_xml, new_id
+from hwp_zip import ZipWriter, read_raw_members
+
+SECTION = "Contents/section0.xml"
+HEADER = "Contents/header.xml"
+
+
+@lru_cache(maxsize=1)
+def _template():
+    """Return (members, header_xml, border_fill_id, section_head, section_tail, prefix).
+
+    ``header_xml`` is the template header with python-hwpx's basic solid border
+    fill added, which table cells reference.
+    """
+    from hwpx.document import HwpxDocument
+    from hwpx.templates import blank_document_bytes
+
+    blank = blank_document_bytes()
+    doc = HwpxDocument.open(BytesIO(blank))
+    border_fill = str(doc.oxml.ensure_basic_border_fill())
+    buf = BytesIO()
+    doc.save(buf)
+    with zipfile.ZipFile(buf) as zf:
+        header = zf.read(HEADER)
+
+    members = read_raw_members(BytesIO(blank))
+    section = next(m for m in members if m.name == SECTION).read().decode("utf-8")
+    cut = section.rindex("</")
+    m = re.search(r'xmlns:([\w.-]+)="' + re.escape(HP_URI) + '"', section)
+    prefix = m.group(1) if m else "hp"
+    return (members, header, border_fill, section[:cut].encode("utf-8"),
+            section[cut:].encode("utf-8"), prefix)
+
+
+class HwpxStreamWriter:
+    """Write a single-section HWPX to a binary file object block by block."""
+
+    def __init__(self, fileobj, level: int = 6):
+        members, header, self._border_fill, head, self._tail, self._p = _template()
+        self._zw = ZipWriter(fileobj)
+        self._rest = []
+        self._section = None
+        for member in members:
+            if self._section is not None:
+                self._rest.append(member)
+            elif member.name == HEADER:
+                self._zw.write(member.name, header, member.compress_type, level,
+                               member.date_time, member.external_attr)
+            elif member.name == SECTION:
+                self._section = self._zw.open(member.name, member.compress_type, level,
+                                              member.date_time, member.external_attr)
+                self._section.write(head)
+            else:
+                self._zw.write_raw(member)
+        self.paragraphs = 0
+        self.tables = 0
+
+    def add_paragraph(self, text: str) -> None:
+        p = self._p
+        self._section.write(
+            f'<{p}:p id="{new_id()}" {PARA_ATTRS}><{p}:run charPrIDRef="0">'
+            f'<{p}:t>{escape(text)}</{p}:t></{p}:run></{p}:p>'.encode("utf-8")
+        )
+        self.paragraphs += 1
+
+    def add_table(self, headers: list = None, rows=None, columns=None, width: int = None) -> None:
+        """Write a table now; ``rows`` may be a generator and is consumed here."""
+        p = self._p
+        self._section.write(f'<{p}:p id="{new_id()}" {PARA_ATTRS}><{p}:run charPrIDRef="0">'
+                            .encode("utf-8"))
+        for chunk in iter_table_xml(headers, rows, columns, self._border_fill, p, width):
+            self._section.write(chunk.encode("utf-8"))
+        self._section.write(f"</{p}:run></{p}:p>".encode("utf-8"))
+        self.tables += 1
+
+    def close(self) -> None:
+        if self._section is None or self._section.closed:
+            return
+        self._section.write(self._tail)
+        self._section.close()
+        for member in self._rest:
+            self._zw.write_raw(member)
+        self._zw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        return False
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Minimal ZIP reader/writer for HWPX packages.
+
+The standard ``zipfile`` module can only copy a member by inflating it and
+deflating it again. HWPX outputs are mostly copies of an input package with one
+or two regenerated parts, so this module reads members as raw compressed bytes
+and writes them back verbatim, recompressing only the parts that changed.
+
+Usage:
+    from hwp_zip import ZipWriter, read_raw_members
+
+    members = read_raw_members("template.hwpx")
+    with open("out.hwpx", "wb") as f, ZipWriter(f) as zw:
+        for m in members:
+            if m.name == "Contents/section0.xml":
+                zw.write(m.name, new_xml, date_time=m.date_time)
+            else:
+                zw.write_raw(m)
+"""
+
+import os
+import struct
+import zipfile
+import zlib
+
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+DATA_DESCRIPTOR = struct.Struct("<4s3L")
+CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+END_RECORD = struct.Struct("<4s4H2LH")
+
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+COPY_CHUNK = 1 << 20
+
+
+class RawMember:
+    """One ZIP member as stored: metadata plus its compressed bytes.
+
+    ``data`` holds the compressed bytes when preloaded; otherwise they are read
+    on demand from ``source`` at ``data_offset``.
+    """
+
+    __slots__ = ("name", "compress_type", "crc", "compress_size", "file_size",
+                 "date_time", "flag_bits", "external_attr", "data", "source", "data_offset")
+
+    def __init__(self, name, compress_type, crc, compress_size, file_size, date_time,
+                 flag_bits=0, external_attr=0, data=None, source=None, data_offset=0):
+        self.name = name
+        self.compress_type = compress_type
+        self.crc = crc
+        self.compress_size = compress_size
+        self.file_size = file_size
+        self.date_time = date_time
+        self.flag_bits = flag_bits
+        self.external_attr = external_attr
+        self.data = data
+        self.source = source
+        self.data_offset = data_offset
+
+    def iter_raw(self, chunk_size: int = COPY_CHUNK):
+        """Yield the compressed bytes of this member in chunks."""
+        if self.data is not None:
+            yield self.data
+            return
+        with open(self.source, "rb") as fh:
+            fh.seek(self.data_offset)
+            remaining = self.compress_size
+            while remaining > 0:
+                chunk = fh.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise zipfile.BadZipFile(f"Truncated member: {self.name}")
+                remaining -= len(chunk)
+                yield chunk
+
+    def read_raw(self) -> bytes:
+        return b"".join(self.iter_raw())
+
+    def read(self) -> bytes:
+        """Return the uncompressed content."""
+        raw = self.read_raw()
+        if self.compress_type == zipfile.ZIP_STORED:
+            return raw
+        if self.compress_type == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(raw, -15)
+        raise NotImplementedError(f"Unsupported compression for {self.name}: {self.compress_type}")
+
+
+def read_raw_members(source, preload: bool = False) -> list:
+    """Return the members of a ZIP file in archive order as RawMember objects.
+
+    ``source`` is a path or a seekable binary file object. With ``preload=True``
+    (implied for file objects) the compressed bytes are read into memory, which
+    makes the members picklable and independent of the source.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        return _read_members(source, None, preload=True)
+    with open(source, "rb") as fh:
+        return _read_members(fh, os.fspath(source), preload)
+
+
+def _read_members(fh, path, preload: bool) -> list:
+    members = []
+    with zipfile.ZipFile(fh) as zf:
+        infos = zf.infolist()
+    for info in infos:
+        fh.seek(info.header_offset)
+        header = LOCAL_HEADER.unpack(fh.read(LOCAL_HEADER.size))
+        if header[0] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+        name_len, extra_len = header[9], header[10]
+        data_offset = info.header_offset + LOCAL_HEADER.size + name_len + extra_len
+        member = RawMember(
+            info.filename, info.compress_type, info.CRC, info.compress_size,
+            info.file_size, info.date_time, info.flag_bits, info.external_attr,
+            source=path, data_offset=data_offset,
+        )
+        if preload:
+            fh.seek(data_offset)
+            member.data = fh.read(info.compress_size)
+        members.append(member)
+    return members
+
+
+def _dos_datetime(date_time) -> tuple:
+    year, month, day, hour, minute, second = date_time
+    dosdate = (max(year, 1980) - 1980) << 9 | month << 5 | day
+    dostime = hour << 11 | minute << 5 | (second // 2)
+    return dostime, dosdate
+
+
+def compress(data: bytes, compress_type: int = zipfile.ZIP_DEFLATED, level: int = 6) -> bytes:
+    """Compress ``data`` as a raw ZIP member payload."""
+    if compress_type == zipfile.ZIP_STORED:
+        return data
+    if compress_type == zipfile.ZIP_DEFLATED:
+        co = zlib.compressobj(level, zlib.DEFLATED, -15)
+        return co.compress(data) + co.flush()
+    raise NotImplementedError(f"Unsupported compression: {compress_type}")
+
+
+class ZipWriter:
+    """Sequential ZIP writer supporting raw member copy.
+
+    Only what HWPX needs is implemented: stored and deflated members, no
+    encryption and no ZIP64 (members and archives must stay below 4 GiB).
+    """
+
+    def __init__(self, fileobj):
+        self.fp = fileobj
+        self._central = []
+        self._offset = 0
+        self._names = set()
+
+    def _begin(self, name: str, flag_bits: int):
+        if name in self._names:
+            raise ValueError(f"Duplicate ZIP member: {name}")
+        if self._offset > 0xFFFFFFFF:
+            raise ValueError("ZIP64 archives are not supported")
+        self._names.add(name)
+        encoded = name.encode("utf-8")
+        if not name.isascii():
+            flag_bits |= FLAG_UTF8
+        return encoded, flag_bits
+
+    def _local_header(self, encoded, flag_bits, compress_type, dostime, dosdate,
+                      crc, compress_size, file_size) -> bytes:
+        return LOCAL_HEADER.pack(
+            b"PK\x03\x04", 20, flag_bits, compress_type, dostime, dosdate,
+            crc, compress_size, file_size, len(encoded), 0,
+        ) + encoded
+
+    def _finish(self, encoded, flag_bits, compress_type, dostime, dosdate,
+                crc, compress_size, file_size, external_attr, header_offset) -> None:
+        if compress_size > 0xFFFFFFFF or file_size > 0xFFFFFFFF:
+            raise ValueError("ZIP64 archives are not supported")
+        self._central.append(CENTRAL_HEADER.pack(
+            b"PK\x01\x02", 20, 20, flag_bits, compress_type, dostime, dosdate,
+            crc, compress_size, file_size, len(encoded), 0, 0, 0, 0,
+            external_attr, header_offset,
+        ) + encoded)
+
+    def _write_entry(self, name, compress_type, crc, compress_size, file_size,
+                     date_time, flag_bits, external_attr, chunks) -> None:
+        encoded, flag_bits = self._begin(name, flag_bits & ~FLAG_DATA_DESCRIPTOR)
+        dostime, dosdate = _dos_datetime(date_time)
+
+        header_offset = self._offset
+        header = self._local_header(encoded, flag_bits, compress_type, dostime, dosdate,
+                                    crc, compress_size, file_size)
+        self.fp.write(header)
+        written = 0
+        for chunk in chunks:
+            self.fp.write(chunk)
+            written += len(chunk)
+        if written != compress_size:
+            raise zipfile.BadZipFile(f"Size mismatch while writing {name}")
+        self._offset += len(header) + compress_size
+        self._finish(encoded, flag_bits, compress_type, dostime, dosdate,
+                     crc, compress_size, file_size, external_attr, header_offset)
+
+    def open(self, name: str, compress_type: int = zipfile.ZIP_DEFLATED, level: int = 6,
+             date_time=(1980, 1, 1, 0, 0, 0), external_attr: int = 0) -> "_MemberWriter":
+        """Start a member that is written incrementally; call ``close()`` on the result.
+
+        The member is never held in memory as a whole. On seekable outputs the
+        local header is patched afterwards; otherwise a data descriptor is used.
+        """
+        if compress_type not in (zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED):
+            raise NotImplementedError(f"Unsupported compression: {compress_type}")
+        return _MemberWriter(self, name, compress_type, level, date_time, external_attr)
+
+    def write_iter(self, name: str, chunks, compress_type: int = zipfile.ZIP_DEFLATED,
+                   level: int = 6, date_time=(1980, 1, 1, 0, 0, 0),
+                   external_attr: int = 0) -> None:
+        """Compress and write a member from an iterable of byte chunks."""
+        member = self.open(name, compress_type, level, date_time, external_attr)
+        for chunk in chunks:
+            member.write(chunk)
+        member.close()
+
+    def write_raw(self, member: RawMember) -> None:
+        """Copy a member's compressed bytes verbatim."""
+        self._write_entry(member.name, member.compress_type, member.crc, member.compress_size,
+                          member.file_size, member.date_time, member.flag_bits,
+                          member.external_attr, member.iter_raw())
+
+    def write_compressed(self, name: str, payload: bytes, crc: int, file_size: int,
+                         compress_type: int = zipfile.ZIP_DEFLATED,
+                         date_time=(1980, 1, 1, 0, 0, 0), external_attr: int = 0) -> None:
+        """Write an already-compressed payload (e.g. deflated in another process)."""
+        self._write_entry(name, compress_type, crc, len(payload), file_size,
+                          date_time, 0, external_attr, [payload])
+
+    def write(self, name: str, data: bytes, compress_type: int = zipfile.ZIP_DEFLATED,
+              level: int = 6, date_time=(1980, 1, 1, 0, 0, 0), external_attr: int = 0) -> None:
+        """Compress and write ``data`` as member ``name``."""
+        self.write_compressed(name, compress(data, compress_type, level), zlib.crc32(data),
+                              len(data), compress_type, date_time, external_attr)
+
+    def close(self) -> None:
+        """Write the central directory and end record."""
+        if self._central is None:
+            return
+        start = self._offset
+        size = 0
+        for record in self._central:
+            self.fp.write(record)
+            size += len(record)
+        if len(self._central) > 0xFFFF:
+            raise ValueError("ZIP64 archives are not supported")
+        self.fp.write(END_RECORD.pack(
+            b"PK\x05\x06", 0, 0, len(self._central), len(self._central), size, start, 0,
+        ))
+        self._central = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        return False
+
+
+class _MemberWriter:
+    """File-like handle for one member being streamed into a ZipWriter."""
+
+    def __init__(self, zw: ZipWriter, name, compress_type, level, date_time, external_attr):
+        self._zw = zw
+        self._fp = zw.fp
+        self._seekable = hasattr(self._fp, "seekable") and self._fp.seekable()
+        flag_bits = 0 if self._seekable else FLAG_DATA_DESCRIPTOR
+        self._encoded, self._flag_bits = zw._begin(name, flag_bits)
+        self._compress_type = compress_type
+        self._dostime, self._dosdate = _dos_datetime(date_time)
+        self._external_attr = external_attr
+        self._header_offset = zw._offset
+        self._header_pos = self._fp.tell() if self._seekable else None
+        self._header = zw._local_header(self._encoded, self._flag_bits, compress_type,
+                                        self._dostime, self._dosdate, 0, 0, 0)
+        self._fp.write(self._header)
+        self._co = zlib.compressobj(level, zlib.DEFLATED, -15) \
+            if compress_type == zipfile.ZIP_DEFLATED else None
+        self.crc = self.file_size = self.compress_size = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self.crc = zlib.crc32(data, self.crc)
+        self.file_size += len(data)
+        out = self._co.compress(data) if self._co else data
+        if out:
+            self._fp.write(out)
+            self.compress_size += len(out)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self._co:
+            out = self._co.flush()
+            self._fp.write(out)
+            self.compress_size += len(out)
+
+        zw = self._zw
+        if self._seekable:
+            end = self._fp.tell()
+            self._fp.seek(self._header_pos)
+            self._fp.write(zw._local_header(self._encoded, self._flag_bits, self._compress_type,
+                                            self._dostime, self._dosdate, self.crc,
+                                            self.compress_size, self.file_size))
+            self._fp.seek(end)
+            zw._offset += len(self._header) + self.compress_size
+        else:
+            self._fp.write(DATA_DESCRIPTOR.pack(b"PK\x07\x08", self.crc,
+                                                self.compress_size, self.file_size))
+            zw._offset += len(self._header) + self.compress_size + DATA_DESCRIPTOR.size
+        zw._finish(self._encoded, self._flag_bits, self._compress_type, self._dostime,
+                   self._dosdate, self.crc, self.compress_size, self.file_size,
+                   self._external_attr, self._header_offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
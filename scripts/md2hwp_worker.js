@@ -0,0 +1,64 @@
+#!/usr/bin/env node
+/*
+ * Long-lived md2hwp worker speaking JSON lines over stdin/stdout.
+ *
+ * Usage: node md2hwp_worker.js <node_modules_dir>
+ *
+ * On startup one line is written: {"ready": true} once md2hwp is loaded, or
+ * {"ready": false, "error": "..."} before exiting.
+ *
+ * Request  (one per line): {"id": 1, "markdown": "...", "title": "...", "author": "...",
+ *                           "output": "/path/out.hwpx"}   // "output" optional
+ * Response (one per line): {"id": 1, "ok": true, "size": 1234}            // written to output
+ *                          {"id": 1, "ok": true, "data": "<base64>"}      // no output given
+ *                          {"id": 1, "ok": false, "error": "..."}
+ */
+
+const fs = require('fs');
+const path = require('path');
+const readline = require('readline');
+
+function send(msg) {
+    process.stdout.write(JSON.stringify(msg) + '\n');
+}
+
+let convertMarkdownToHwp;
+try {
+    ({ convertMarkdownToHwp } = require(path.join(process.argv[2] || 'node_modules', 'md2hwp')));
+} catch (e) {
+    send({ ready: false, error: String(e && e.message || e) });
+    process.exit(1);
+}
+send({ ready: true });
+
+async function handle(req) {
+    try {
+        const buf = await convertMarkdownToHwp(req.markdown || '', {
+            title: req.title || 'Document',
+            author: req.author || 'hwp-toolkit',
+        });
+        if (req.output) {
+            fs.mkdirSync(path.dirname(req.output), { recursive: true });
+            fs.writeFileSync(req.output, buf);
+            send({ id: req.id, ok: true, size: buf.length });
+        } else {
+            send({ id: req.id, ok: true, data: Buffer.from(buf).toString('base64') });
+        }
+    } catch (e) {
+        send({ id: req.id, ok: false, error: String(e && e.stack || e) });
+    }
+}
+
+const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+rl.on('line', (line) => {
+    if (!line.trim()) return;
+    let req;
+    try {
+        req = JSON.parse(line);
+    } catch (e) {
+        send({ id: null, ok: false, error: 'Invalid JSON request: ' + e.message });
+        return;
+    }
+    handle(req);
+});
+rl.on('close', () => process.exit(0));
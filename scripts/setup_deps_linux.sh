@@ -8,7 +8,7 @@ echo "=== HWP Toolkit: Installing Dependencies (Linux) ==="
 
 # Python packages
 echo "[1/3] Installing Python packages..."
-sudo pip3 install olefile pyhwp pyhwp2md python-hwpx gethwp weasyprint markdown 2>&1 | tail -10
+sudo pip3 install olefile pyhwp pyhwp2md python-hwpx weasyprint markdown 2>&1 | tail -10
 
 # Node.js md2hwp (install in skill directory)
 SKILL_DIR="$(cd "$(dirname "$0")/.." && pwd)"
@@ -48,7 +48,6 @@ echo "Installed tools:"
 echo "  ✓ pyhwp (hwp5txt, hwp5html, hwp5odt)"
 echo "  ✓ pyhwp2md (HWP/HWPX → Markdown)"
 echo "  ✓ python-hwpx (HWPX read/write/edit)"
-echo "  ✓ gethwp (HWP/HWPX text extraction)"
 echo "  ✓ weasyprint (HTML → PDF conversion)"
 echo "  ✓ markdown (Markdown processing)"
 echo "  ✓ md2hwp (Markdown → HWPX via Node.js)"
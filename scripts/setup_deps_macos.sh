@@ -8,7 +8,7 @@ echo "=== HWP Toolkit: Installing Dependencies (macOS) ==="
 
 # Python packages
 echo "[1/3] Installing Python packages..."
-pip3 install --user olefile pyhwp pyhwp2md python-hwpx gethwp weasyprint markdown 2>&1 | tail -10
+pip3 install --user olefile pyhwp pyhwp2md python-hwpx weasyprint markdown 2>&1 | tail -10
 
 # Node.js md2hwp (install in skill directory)
 SKILL_DIR="$(cd "$(dirname "$0")/.." && pwd)"
@@ -28,7 +28,7 @@ else
     echo "  NOTE: unhwp is not available as a pre-built binary for macOS."
     echo "  If you need unhwp, install it via cargo:"
     echo "    cargo install unhwp"
-    echo "  Or use the Python-based tools instead (pyhwp2md, gethwp)."
+    echo "  Or use the Python-based tools instead (pyhwp2md, python-hwpx)."
 fi
 
 echo ""
@@ -37,7 +37,6 @@ echo "Installed tools:"
 echo "  ✓ pyhwp (hwp5txt, hwp5html, hwp5odt)"
 echo "  ✓ pyhwp2md (HWP/HWPX → Markdown)"
 echo "  ✓ python-hwpx (HWPX read/write/edit)"
-echo "  ✓ gethwp (HWP/HWPX text extraction)"
 echo "  ✓ weasyprint (HTML → PDF conversion)"
 echo "  ✓ markdown (Markdown processing)"
 echo "  ✓ md2hwp (Markdown → HWPX via Node.js)"
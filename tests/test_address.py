@@ -0,0 +1,72 @@
+"""
+hwp_address.py 테스트.
+
+- ParagraphIndex: 섹션 전체 단락 번호, 문자 오프셋 검색
+- insert / place / remove / replace: 편집 후에도 색인 유지
+"""
+
+import pytest
+
+from hwp_address import ParagraphIndex
+
+
+@pytest.fixture
+def doc(base_hwpx):
+    from hwpx.document import HwpxDocument
+
+    return HwpxDocument.open(base_hwpx)
+
+
+def _texts(doc):
+    return [p.text for p in doc.paragraphs]
+
+
+class TestLookup:
+    def test_matches_document_paragraphs(self, doc):
+        index = ParagraphIndex(doc)
+        assert len(index) == len(doc.paragraphs)
+        assert [index.text(i) for i in range(len(index))] == _texts(doc)
+        assert index.locate(len(index) - 1) == (0, len(index) - 1)
+
+    def test_find_and_offsets(self, doc):
+        index = ParagraphIndex(doc)
+        n = _texts(doc).index("두 번째 단락입니다.")
+        assert index.find("번째 단락") == (n - 1, 2)
+        assert index.find("번째 단락", start=n) == (n, 2)
+        assert index.at(index.offset(n) + 3) == (n, 3)
+        assert len(list(index.find_all("단락"))) == 3
+        assert index.find("없는 말") is None
+
+    def test_out_of_range(self, doc):
+        index = ParagraphIndex(doc)
+        with pytest.raises(IndexError):
+            index.paragraph(len(index))
+
+
+class TestEdits:
+    def test_insert_before_and_after(self, doc):
+        index = ParagraphIndex(doc)
+        n = _texts(doc).index("두 번째 단락입니다.")
+        assert index.insert("앞", before=n) == n
+        assert index.insert("뒤", after=n + 1) == n + 2
+        texts = _texts(doc)
+        assert texts[n:n + 3] == ["앞", "두 번째 단락입니다.", "뒤"]
+        assert [index.text(i) for i in range(len(index))] == texts
+
+    def test_section_properties_paragraph_stays_first(self, doc):
+        with pytest.raises(ValueError):
+            ParagraphIndex(doc).insert("x", before=0)
+
+    def test_replace_within_one_paragraph(self, doc):
+        index = ParagraphIndex(doc)
+        n = _texts(doc).index("세 번째 단락입니다.")
+        assert index.replace(n, "단락", "문단") == 1
+        assert _texts(doc).count("세 번째 문단입니다.") == 1
+        assert index.find("문단") == (n, 5)
+
+    def test_remove_keeps_numbering(self, doc):
+        index = ParagraphIndex(doc)
+        n = _texts(doc).index("두 번째 단락입니다.")
+        index.remove(n)
+        assert index.text(n) == "세 번째 단락입니다."
+        assert [index.text(i) for i in range(len(index))] == _texts(doc)
@@ -2,12 +2,34 @@
 hwp_analyze.py 테스트.
 
 - analyze_hwpx: HWPX ZIP 구조 분석
+- analyze_hwp: HWP 5.0 버전 표기, 표 레코드(HWPTAG_TABLE) 수
 - analyze: 확장자 자동 감지 디스패처
 """
 
+import struct
+import zlib
+
 import pytest
 
-from hwp_analyze import analyze, analyze_hwpx
+from hwp_analyze import analyze, analyze_hwp, analyze_hwpx
+from hwp_binary import PARA_HEADER, PARA_TEXT, pack_record
+from hwp_ole import write_compound
+
+TABLE = 77  # HWPTAG_TABLE
+SHAPE_COMPONENT_ELLIPSE = 80
+
+
+def _write_hwp(path, body: bytes, version: int = 0x05000300) -> str:
+    header = b"HWP Document File".ljust(32, b"\0") + struct.pack("<II", version, 1)
+    deflate = lambda data: zlib.compress(data)[2:-4]
+    streams = [
+        ("FileHeader", header.ljust(256, b"\0")),
+        ("DocInfo", deflate(b"")),
+        ("BodyText/Section0", deflate(body)),
+    ]
+    with open(path, "wb") as f:
+        write_compound(f, streams)
+    return path
 
 
 class TestAnalyzeHwpx:
@@ -53,6 +75,28 @@ class TestAnalyzeHwpx:
         assert result["stats"]["image_count"] >= 0
 
 
+class TestAnalyzeHwp:
+    @pytest.fixture
+    def hwp_file(self, tmp_path):
+        text = "표 앞\r".encode("utf-16-le")
+        body = (pack_record(PARA_HEADER, 0, bytes(22)) + pack_record(PARA_TEXT, 1, text)
+                + pack_record(TABLE, 2, bytes(18)) + pack_record(TABLE, 2, bytes(18))
+                + pack_record(SHAPE_COMPONENT_ELLIPSE, 2, bytes(4)))
+        return _write_hwp(str(tmp_path / "doc.hwp"), body)
+
+    def test_version_is_little_endian(self, hwp_file):
+        result = analyze_hwp(hwp_file)
+        assert result["metadata"]["version"] == "5.0.3.0"
+        assert result["metadata"]["compressed"] is True
+
+    def test_tables_counted_by_table_tag(self, hwp_file):
+        stats = analyze_hwp(hwp_file)["stats"]
+        assert stats["has_tables"] is True
+        assert stats["table_count"] == 2
+        assert stats["paragraph_count"] == 1
+        assert stats["total_records"] == 5
+
+
 class TestAnalyzeDispatcher:
     def test_hwpx_dispatches_correctly(self, base_hwpx):
         result = analyze(base_hwpx)
@@ -0,0 +1,227 @@
+"""
+hwp_backends.py 테스트.
+
+- fidelity: 같은 텍스트 1.0, Markdown 제목·표 정규화, 누락·표 칸 붙음 감점, 긴 구간의 단어 단위 비교
+- run_shootout: 백엔드별 시간·처리량·RSS·실패·충실도, 확장자/종류별 요약과 순위
+- 기준 텍스트: 코퍼스 생성 내용(expected), 백엔드, 정답 텍스트 폴더
+- 읽기 백엔드 순서: 기본값(pyhwp2md 먼저), set_backend_order, HWP_BACKEND_ORDER 보고서, 대체 경로
+- 명령줄: hwp bench-backends
+"""
+
+import json
+import os
+import subprocess
+
+import pytest
+
+import hwp_backends
+import hwp_metrics
+import hwp_read
+from hwp_backends import available_backends, fidelity, plain_lines, rank, run_shootout
+from hwp_bench import expected_text, generate_corpus
+from hwp_read import (
+    check_backend_order, extract_with, load_backend_order, read_file, set_backend_order,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPECS = [
+    {"name": "paragraphs-10", "kind": "paragraphs", "paragraphs": 10},
+    {"name": "binary-30", "kind": "hwp", "paragraphs": 30, "sections": 2, "tables": 2,
+     "rows": 2, "cols": 3, "images": 1, "image_kb": 4, "long_every": 10},
+]
+USABLE = available_backends()
+
+
+def _needs(*backends):
+    missing = [b for b in backends if USABLE[b]]
+    return pytest.mark.skipif(bool(missing), reason=f"{', '.join(missing)} 사용 불가")
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    out = str(tmp_path_factory.mktemp("backends"))
+    generate_corpus(out, "quick", SPECS)
+    return out
+
+
+@pytest.fixture
+def order():
+    hwp_metrics.REGISTRY.reset()
+    yield
+    set_backend_order(None)
+    hwp_metrics.REGISTRY.reset()
+
+
+class TestFidelity:
+    def test_identical_and_empty(self):
+        assert fidelity("가\n나", "가\n나") == 1.0
+        assert fidelity("", "") == 1.0
+        assert fidelity("가\n나", "") == 0.0
+
+    def test_markdown_normalized(self):
+        text = "# 제목\n\n| 가 | 나 |\n| --- | :---: |\n| 다 | **라** |\n"
+        assert plain_lines(text) == ["제목", "가", "나", "다", "라"]
+        assert fidelity("제목\n가\n나\n다\n라", text) == 1.0
+
+    def test_missing_and_glued(self):
+        lines = [f"{i}. 문단 내용" for i in range(10)]
+        half = fidelity("\n".join(lines), "\n".join(lines[:5]))
+        assert 0.6 < half < 0.7
+        glued = fidelity("표 앞\n1-1\n1-2\n1-3", "표 앞\n1-11-21-3")
+        assert 0.8 < glued < 1.0
+
+    def test_long_runs_by_word(self, monkeypatch):
+        monkeypatch.setattr(hwp_backends, "CHAR_DIFF_LIMIT", 10)
+        assert 0.4 < fidelity("하나 둘 셋 넷", "하나 둘 다섯 넷") < 1.0
+
+    def test_rank(self):
+        summary = {"slow": {"quality": 0.991, "mb_per_s": 1.0},
+                   "fast": {"quality": 0.994, "mb_per_s": 9.0},
+                   "lossy": {"quality": 0.5, "mb_per_s": 50.0},
+                   "unscored": {"quality": None, "mb_per_s": 99.0}}
+        assert rank(summary) == ["fast", "slow", "lossy", "unscored"]
+
+
+class TestShootout:
+    @_needs("olefile", "python-hwpx")
+    def test_report(self, corpus, tmp_path):
+        report = run_shootout(corpus, ["olefile", "python-hwpx"], repeat=2, isolate=False,
+                              texts_dir=str(tmp_path))
+        cases = {(c["document"], c["backend"]): c for c in report["cases"]}
+        assert set(cases) == {("binary-30", "olefile"), ("paragraphs-10", "python-hwpx")}
+        case = cases["binary-30", "olefile"]
+        assert case["fidelity"] == 1.0 and case["reference"] == "expected"
+        assert case["seconds"]["min"] <= case["seconds"]["median"] <= case["seconds"]["max"]
+        assert case["mb_per_s"] > 0 and case["peak_rss_mb"] > 0
+        with open(tmp_path / "binary-30.olefile.txt", encoding="utf-8") as f:
+            assert f.read() == expected_text(SPECS[1])
+
+        summary = report["summary"][".hwp"]["olefile"]
+        assert summary["documents"] == 1 and summary["failure_rate"] == 0
+        assert summary["quality"] == 1.0
+        assert report["by_kind"]["hwp"]["olefile"]["documents"] == 1
+        assert report["order"] == {".hwpx": ["python-hwpx"], ".hwp": ["olefile"]}
+
+    @_needs("olefile", "pyhwp2md", "hwp5txt")
+    def test_lossy_backends_ranked_last(self, corpus):
+        report = run_shootout(corpus, ["pyhwp2md", "hwp5txt", "olefile"], repeat=1,
+                              documents=["binary-30"], isolate=False)
+        summary = report["summary"][".hwp"]
+        # hwp5txt prints tables as a placeholder; pyhwp2md stops reading text after a table.
+        assert summary["hwp5txt"]["fidelity"] < 1.0 and summary["pyhwp2md"]["fidelity"] < 0.9
+        assert summary["olefile"]["fidelity"] == 1.0
+        assert report["order"][".hwp"] == ["olefile", "hwp5txt", "pyhwp2md"]
+
+    @_needs("olefile")
+    def test_failures_counted(self, tmp_path):
+        folder = tmp_path / "docs"
+        folder.mkdir()
+        (folder / "broken.hwp").write_bytes(b"not an ole file")
+        report = run_shootout(str(folder), ["olefile"], repeat=1, isolate=False)
+        assert "error" in report["cases"][0]
+        assert report["summary"][".hwp"]["olefile"]["failure_rate"] == 1.0
+        assert report["summary"][".hwp"]["olefile"]["quality"] == 0.0
+
+    @_needs("olefile")
+    def test_reference_folder(self, corpus, tmp_path):
+        truth = tmp_path / "truth"
+        truth.mkdir()
+        (truth / "binary-30.txt").write_text("전혀 다른 내용", encoding="utf-8")
+        report = run_shootout(corpus, ["olefile"], str(truth), repeat=1, isolate=False)
+        case = report["cases"][0]
+        assert case["reference"] == str(truth / "binary-30.txt") and case["fidelity"] < 0.1
+
+    @_needs("olefile", "pyhwp2md")
+    def test_reference_backend_unscored(self, corpus, tmp_path):
+        folder = tmp_path / "docs"
+        folder.mkdir()
+        with open(os.path.join(corpus, "binary-30.hwp"), "rb") as f:
+            (folder / "plain.hwp").write_bytes(f.read())
+        # 일반 폴더의 auto 기준은 기본 순서의 첫 백엔드(pyhwp2md)이므로 스스로 1.0을 받으면 안 된다.
+        report = run_shootout(str(folder), ["pyhwp2md", "olefile"], repeat=1, isolate=False)
+        cases = {c["backend"]: c for c in report["cases"]}
+        assert cases["pyhwp2md"]["reference"] == "pyhwp2md"
+        assert cases["pyhwp2md"]["fidelity"] is None
+        assert cases["olefile"]["fidelity"] is not None
+        assert report["summary"][".hwp"]["pyhwp2md"]["quality"] is None
+        assert report["order"] == {}
+
+    def test_unknown_backend(self, corpus):
+        with pytest.raises(ValueError):
+            run_shootout(corpus, ["word"])
+
+
+class TestReadOrder:
+    @_needs("pyhwp2md")
+    def test_default_reads_hwp_with_pyhwp2md(self, corpus, order):
+        assert hwp_read.BACKEND_ORDER[".hwp"] == ("pyhwp2md", "olefile")
+        assert "1. " in read_file(os.path.join(corpus, "binary-30.hwp"), "txt")
+        assert hwp_metrics.summary()["backends"] == {"read: pyhwp2md": 1}
+
+    def test_set_order_and_fallback(self, corpus, order, monkeypatch):
+        path = os.path.join(corpus, "binary-30.hwp")
+        monkeypatch.setattr(hwp_read, "read_hwp_with_hwp5txt", lambda p, progress=None: "hwp5txt 결과")
+        set_backend_order({".hwp": ["hwp5txt", "olefile"]})
+        assert read_file(path, "txt") == "hwp5txt 결과"
+
+        def broken(p, progress=None):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(hwp_read, "read_hwp_with_hwp5txt", broken)
+        assert "30. " in read_file(path, "txt")
+        out = hwp_metrics.summary()
+        assert out["fallbacks"] == {"read: hwp5txt -> olefile": 1}
+        assert out["backends"] == {"read: hwp5txt": 1, "read: olefile": 1}
+
+    def test_failed_stream_leaves_no_partial_text(self, corpus, order, monkeypatch):
+        def half_read(p, progress=None):
+            yield "첫 구역 단락"
+            raise RuntimeError("손상된 구역")
+
+        monkeypatch.setattr(hwp_read, "iter_hwp_with_olefile", half_read)
+        monkeypatch.setattr(hwp_read, "read_hwp_with_hwp5txt", lambda p, progress=None: "첫 구역 단락")
+        set_backend_order({".hwp": ["olefile", "hwp5txt"]})
+        assert read_file(os.path.join(corpus, "binary-30.hwp"), "txt") == "첫 구역 단락"
+        assert hwp_metrics.summary()["fallbacks"] == {"read: olefile -> hwp5txt": 1}
+
+    def test_order_from_report(self, corpus, order, monkeypatch, tmp_path):
+        report = tmp_path / "report.json"
+        report.write_text(json.dumps({"order": {".hwp": ["hwp5txt", "olefile"]}}), encoding="utf-8")
+        assert load_backend_order(str(report)) == {".hwp": ("hwp5txt", "olefile")}
+        monkeypatch.setattr(hwp_read, "read_hwp_with_hwp5txt", lambda p, progress=None: "보고서 순서")
+        monkeypatch.setenv("HWP_BACKEND_ORDER", str(report))
+        assert read_file(os.path.join(corpus, "binary-30.hwp"), "txt") == "보고서 순서"
+
+    def test_bad_report_ignored(self, corpus, order, monkeypatch, tmp_path, capsys):
+        report = tmp_path / "bad.json"
+        report.write_text(json.dumps({"order": {".hwp": ["word"]}}), encoding="utf-8")
+        monkeypatch.setenv("HWP_BACKEND_ORDER", str(report))
+        assert read_file(os.path.join(corpus, "binary-30.hwp"), "txt")
+        assert hwp_read.backend_order(".hwp") == hwp_read.BACKEND_ORDER[".hwp"]
+        assert "HWP_BACKEND_ORDER ignored" in capsys.readouterr().err
+
+    def test_invalid_orders(self):
+        with pytest.raises(ValueError):
+            check_backend_order({".hwp": ["python-hwpx"]})
+        with pytest.raises(ValueError):
+            check_backend_order({".doc": ["olefile"]})
+        with pytest.raises(ValueError):
+            set_backend_order({".hwpx": []})
+        with pytest.raises(ValueError):
+            extract_with("olefile", "doc.hwpx")
+
+
+@_needs("olefile")
+class TestCommandLine:
+    def test_wrapper(self, corpus, tmp_path):
+        out = tmp_path / "report.json"
+        result = subprocess.run(
+            ["bash", os.path.join(ROOT, "hwp"), "bench-backends", corpus, "--backends", "olefile",
+             "--repeat", "1", "-o", str(out)],
+            capture_output=True, text=True, timeout=120)
+        assert result.returncode == 0, result.stderr
+        assert "order .hwp: olefile" in result.stdout
+        report = json.loads(out.read_text(encoding="utf-8"))
+        assert report["meta"]["isolated"] is True
+        assert report["cases"][0]["fidelity"] == 1.0
+        assert load_backend_order(str(out)) == {".hwp": ("olefile",)}
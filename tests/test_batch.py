@@ -0,0 +1,136 @@
+"""
+hwp_batch.py 테스트.
+
+- 입력 목록/glob 확장, 출력 이름 충돌 시 번호 붙이기 (이미 있는 파일 포함)
+- 여러 파일 읽기/변환/편집: 결과는 파일로, 응답은 파일별 상태 표
+- 실패한 파일은 그 행에만 기록, 동시 실행 수는 작업 분류의 작업자 수 이하
+- process_file: 임시 이름에 쓰고 성공 시 이름 바꾸기, 실패해도 기존 파일은 그대로
+"""
+
+import asyncio
+import json
+import os
+import shutil
+
+import pytest
+
+from hwp_batch import COLUMNS, expand_inputs, plan_outputs, process_file, run_batch
+from hwp_pool import Offload
+from hwp_read import read_file
+
+CLASSES = {"read": ("thread", 2, 4), "convert": ("thread", 2, 4), "edit": ("thread", 2, 4)}
+
+
+@pytest.fixture
+def inputs(base_hwpx, tmp_path):
+    paths = []
+    for sub in ("a", "b"):
+        os.makedirs(tmp_path / sub)
+        paths.append(str(tmp_path / sub / "doc.hwpx"))
+        shutil.copy(base_hwpx, paths[-1])
+    return paths
+
+
+def _run(operation, inputs, output_dir, options=None, **kwargs):
+    offload = Offload(CLASSES)
+    try:
+        return asyncio.run(run_batch(offload, operation, inputs, output_dir, options, **kwargs))
+    finally:
+        offload.shutdown()
+
+
+def _rows(summary):
+    return [dict(zip(summary["columns"], row)) for row in summary["rows"]]
+
+
+class TestInputs:
+    def test_glob_and_dedupe(self, inputs, tmp_path):
+        found = expand_inputs([inputs[1]], str(tmp_path / "**" / "*.hwpx"))
+        assert found == [inputs[1], inputs[0]]
+        with pytest.raises(ValueError):
+            expand_inputs([], str(tmp_path / "*.none"))
+        with pytest.raises(ValueError):
+            expand_inputs(inputs, max_files=1)
+
+    def test_output_names_numbered(self, inputs, tmp_path):
+        outputs = plan_outputs("convert", inputs, str(tmp_path / "out"), {"target_format": "txt"})
+        assert [os.path.basename(p) for p in outputs] == ["doc.txt", "doc-2.txt"]
+
+    def test_existing_files_not_reused(self, inputs, tmp_path):
+        out = tmp_path / "out"
+        out.mkdir()
+        (out / "doc.txt").write_text("기존", encoding="utf-8")
+        outputs = plan_outputs("convert", inputs, str(out), {"target_format": "txt"})
+        assert [os.path.basename(p) for p in outputs] == ["doc-2.txt", "doc-3.txt"]
+
+
+class TestProcessFile:
+    def test_failure_keeps_existing_output(self, tmp_path):
+        existing = tmp_path / "a.md"
+        existing.write_text("사용자 파일", encoding="utf-8")
+        row = process_file("read", str(tmp_path / "a.hwpx"), str(existing), {})
+        assert row[1] == "error" and row[2] is None
+        assert existing.read_text(encoding="utf-8") == "사용자 파일"
+
+    def test_failed_conversion_leaves_nothing(self, tmp_path):
+        broken = tmp_path / "broken.hwpx"
+        broken.write_bytes(b"not a zip")
+        row = process_file("read", str(broken), str(tmp_path / "broken.md"), {})
+        assert row[1] == "error"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["broken.hwpx"]
+
+    def test_similar_names_untouched(self, base_hwpx, tmp_path):
+        other = tmp_path / "doc.part.txt"
+        other.write_text("사용자 파일", encoding="utf-8")
+        assert process_file("read", base_hwpx, str(tmp_path / "doc.txt"), {})[1] == "ok"
+        assert process_file("read", str(tmp_path / "none.hwpx"), str(tmp_path / "x.txt"), {})[1] == "error"
+        assert other.read_text(encoding="utf-8") == "사용자 파일"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["doc.part.txt", "doc.txt"]
+
+    def test_output_renamed_into_place(self, base_hwpx, tmp_path):
+        out = tmp_path / "doc.txt"
+        row = process_file("read", base_hwpx, str(out), {"output_format": "txt"})
+        assert row[1:4] == ["ok", str(out), out.stat().st_size]
+        assert [p.name for p in tmp_path.iterdir()] == ["doc.txt"]
+
+
+class TestRunBatch:
+    def test_read_writes_files_and_reports(self, inputs, tmp_path):
+        out = str(tmp_path / "out")
+        seen = []
+
+        async def report(done, total=None, message=None):
+            seen.append((done, total))
+
+        missing = str(tmp_path / "missing.hwpx")
+        summary = _run("read", inputs + [missing], out, {"output_format": "txt"}, report=report)
+        assert summary["columns"] == list(COLUMNS)
+        assert (summary["total"], summary["ok"], summary["failed"]) == (3, 2, 1)
+        rows = _rows(summary)
+        assert rows[2]["status"] == "error" and "FileNotFoundError" in rows[2]["error"]
+        for row in rows[:2]:
+            with open(row["output"], encoding="utf-8") as f:
+                assert "두 번째 단락입니다." in f.read()
+            assert row["bytes"] == os.path.getsize(row["output"])
+        assert sorted(seen) == [(1, 3), (2, 3), (3, 3)]
+
+    def test_edit_script(self, inputs, tmp_path):
+        ops = [{"op": "replace", "find": "첫 번째", "replace": "1번"}]
+        summary = _run("edit", inputs, str(tmp_path / "out"), {"operations": ops})
+        assert summary["failed"] == 0
+        for row in _rows(summary):
+            assert "1번 단락입니다." in read_file(row["output"], "txt")
+
+    def test_analyze_to_temp_dir(self, inputs):
+        summary = _run("analyze", inputs[:1], "")
+        row = _rows(summary)[0]
+        assert os.path.dirname(row["output"]) == summary["output_dir"]
+        with open(row["output"], encoding="utf-8") as f:
+            assert json.load(f)["format"] == "HWPX"
+        shutil.rmtree(summary["output_dir"])
+
+    def test_invalid_options(self, inputs, tmp_path):
+        with pytest.raises(ValueError):
+            _run("convert", inputs, str(tmp_path), {"target_format": "docx"})
+        with pytest.raises(ValueError):
+            _run("edit", inputs, str(tmp_path), {})
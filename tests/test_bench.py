@@ -0,0 +1,126 @@
+"""
+hwp_bench.py 테스트.
+
+- 합성 코퍼스: 문서 크기별 생성(HWPX, hwp_synth의 바이너리 HWP), manifest 기록, 같은 명세의 파일 재사용
+- run_suite: 작업별 시간·처리량·최대 RSS·단계별 시간 기록 (별도 프로세스 실행 포함)
+- compare: 기준 결과 대비 느려짐/메모리 증가, 새로 실패한 경우를 회귀로 표시 (종료 코드 1)
+"""
+
+import copy
+import json
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from hwp_bench import build, compare, corpus_specs, generate_corpus, run_suite
+from hwp_read import extract_with, read_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPECS = [
+    {"name": "paragraphs-10", "kind": "paragraphs", "paragraphs": 10},
+    {"name": "table-wide", "kind": "table", "paragraphs": 2, "rows": 3, "cols": 12},
+    {"name": "images-3", "kind": "images", "paragraphs": 20, "images": 3, "image_kb": 4},
+    {"name": "binary-30", "kind": "hwp", "paragraphs": 30, "sections": 2, "tables": 2,
+     "rows": 2, "cols": 3, "images": 1, "image_kb": 4, "long_every": 10},
+]
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    out = str(tmp_path_factory.mktemp("corpus"))
+    generate_corpus(out, "quick", SPECS)
+    return out
+
+
+class TestCorpus:
+    def test_presets(self):
+        names = [s["name"] for s in corpus_specs("full")]
+        assert names[0] == "paragraphs-10" and "paragraphs-1000000" in names
+        with pytest.raises(ValueError):
+            corpus_specs("huge")
+
+    def test_documents(self, corpus):
+        text = read_file(os.path.join(corpus, "paragraphs-10.hwpx"), "txt")
+        assert "10. " in text and "11. " not in text
+        assert "3-12" in read_file(os.path.join(corpus, "table-wide.hwpx"), "txt")
+        with zipfile.ZipFile(os.path.join(corpus, "images-3.hwpx")) as zf:
+            assert sum(n.startswith("BinData/") for n in zf.namelist()) == 3
+        text = extract_with("olefile", os.path.join(corpus, "binary-30.hwp"))
+        assert "30. " in text and "1-2-3" in text
+
+    def test_unchanged_files_reused(self, corpus, tmp_path):
+        path = os.path.join(corpus, "paragraphs-10.hwpx")
+        mtime = os.stat(path).st_mtime_ns
+        manifest = generate_corpus(corpus, "quick", SPECS)
+        assert os.stat(path).st_mtime_ns == mtime
+        assert [d["name"] for d in manifest["documents"]] == [s["name"] for s in SPECS]
+        # The same spec always produces the same content.
+        again = build(SPECS[2], str(tmp_path / "again.hwpx"))
+        original = os.path.join(corpus, "images-3.hwpx")
+        assert read_file(again, "txt") == read_file(original, "txt")
+        with zipfile.ZipFile(again) as a, zipfile.ZipFile(original) as b:
+            assert a.read("BinData/image2.png") == b.read("BinData/image2.png")
+
+
+class TestRun:
+    def test_in_process(self, corpus):
+        result = run_suite(corpus, ["read", "edit", "create"], repeat=2,
+                           documents=["paragraphs-10"], isolate=False)
+        rows = {r["op"]: r for r in result["results"]}
+        assert set(rows) == {"read", "edit", "create"}
+        read = rows["read"]
+        assert read["seconds"]["min"] <= read["seconds"]["median"] <= read["seconds"]["max"]
+        assert read["throughput"]["paragraphs_per_s"] > 0
+        assert "read.decode" in read["stages_ms"]
+        assert result["meta"]["repeat"] == 2
+
+    def test_binary_document(self, corpus):
+        result = run_suite(corpus, ["read", "analyze", "edit"], repeat=1,
+                           documents=["binary-30"], isolate=False)
+        assert [r.get("error") for r in result["results"]] == [None, None, None]
+
+    def test_isolated_case(self, corpus):
+        result = run_suite(corpus, ["analyze"], repeat=1, documents=["table-wide"])
+        row = result["results"][0]
+        assert "error" not in row, row
+        assert row["peak_rss_mb"] is None or row["peak_rss_mb"] > 0
+
+    def test_unknown_operation(self, corpus):
+        with pytest.raises(ValueError):
+            run_suite(corpus, ["print"], isolate=False)
+
+
+class TestCompare:
+    def test_flags_regressions(self):
+        def case(op, seconds, rss=50.0):
+            return {"op": op, "document": "d", "seconds": {"median": seconds}, "peak_rss_mb": rss}
+
+        base = {"results": [case("read", 1.0), case("edit", 1.0), case("create", 0.001),
+                            case("analyze", 1.0), case("convert-md", 1.0)]}
+        new = copy.deepcopy(base)
+        new["results"][0]["seconds"]["median"] = 1.5        # slower
+        new["results"][1]["peak_rss_mb"] = 80.0             # bigger
+        new["results"][2]["seconds"]["median"] = 0.003      # noise on a tiny case
+        new["results"][3]["seconds"]["median"] = 0.5        # faster
+        del new["results"][4]
+        new["results"].append({"op": "convert-pdf", "document": "d", "error": "no pango"})
+        status = {r["op"]: r["status"] for r in compare(base, new, threshold=0.25)}
+        assert status == {"read": "regression", "edit": "regression", "create": "ok",
+                          "analyze": "improved", "convert-md": "missing", "convert-pdf": "error"}
+
+    def test_new_error_is_regression(self, tmp_path):
+        base = {"results": [{"op": "read", "document": "d", "seconds": {"median": 1.0},
+                             "peak_rss_mb": 50.0}]}
+        new = {"results": [{"op": "read", "document": "d", "error": "boom"}]}
+        rows = compare(base, new)
+        assert rows[0]["status"] == "regression" and rows[0]["error"] == "boom"
+        for name, doc in (("base.json", base), ("new.json", new)):
+            (tmp_path / name).write_text(json.dumps(doc), encoding="utf-8")
+        result = subprocess.run(
+            [sys.executable, os.path.join(ROOT, "scripts", "hwp_bench.py"), "compare",
+             str(tmp_path / "base.json"), str(tmp_path / "new.json")],
+            capture_output=True, text=True, timeout=60)
+        assert result.returncode == 1 and "1 regression(s)" in result.stderr
@@ -0,0 +1,89 @@
+"""
+hwp_binary.py / hwp_ole.py 테스트.
+
+- write_compound: OLE2 컨테이너 쓰기 (olefile로 다시 읽기)
+- replace_in_section: PARA_TEXT 치환, 레코드 크기/글자 수/위치 보정, 컨트롤 보존
+- replace_in_hwp: 변경된 BodyText 스트림만 다시 압축, 나머지 스트림 그대로 복사
+"""
+
+import struct
+import zlib
+
+import pytest
+
+from hwp_binary import (
+    PARA_CHAR_SHAPE, PARA_HEADER, PARA_TEXT, iter_records, replace_in_hwp, replace_in_section,
+)
+from hwp_ole import read_streams, write_compound
+from hwp_read import read_hwp_with_olefile
+from hwp_replace import Replacer, replace_many
+from hwp_synth import TABLE_CONTROL, paragraph, write_hwp
+
+
+@pytest.fixture
+def hwp_file(tmp_path):
+    section0 = (paragraph("첫 번째 단락입니다.")
+                + paragraph("표 앞" + TABLE_CONTROL + "표 뒤 단락", shapes=((0, 0), (3, 1), (12, 2))))
+    return write_hwp(str(tmp_path / "doc.hwp"), [section0, paragraph("두 번째 구역의 단락")],
+                     preview="미리보기", images=[("png", b"\x89PNG" + bytes(range(256)) * 40)])
+
+
+def _section(path, name="BodyText/Section0"):
+    return zlib.decompress(dict(read_streams(path))[name], -15)
+
+
+class TestCompound:
+    def test_round_trip(self, tmp_path):
+        streams = [("A", b"x" * 10), ("Big", bytes(range(256)) * 100),
+                   ("S/Inner", b"y" * 5000), ("Empty", b"")]
+        path = str(tmp_path / "c.ole")
+        with open(path, "wb") as f:
+            write_compound(f, streams)
+        assert {k: v for k, v in read_streams(path) if v is not None} == dict(streams)
+
+
+class TestReplaceInSection:
+    def test_sizes_counts_and_positions_fixed(self, hwp_file):
+        body = replace_in_section(_section(hwp_file), Replacer({"표 앞": "표의 앞쪽", "단락": "문단"}))
+        records = list(iter_records(body))
+        headers = [body[d:e] for t, _, _, d, e in records if t == PARA_HEADER]
+        texts = [body[d:e] for t, _, _, d, e in records if t == PARA_TEXT]
+        shapes = [body[d:e] for t, _, _, d, e in records if t == PARA_CHAR_SHAPE]
+
+        text = texts[1].decode("utf-16-le")
+        assert text == "표의 앞쪽" + TABLE_CONTROL + "표 뒤 문단\r"
+        assert struct.unpack_from("<I", headers[1])[0] == len(text)
+        # Shape boundaries after the first replacement shift by its growth (+2).
+        assert list(struct.iter_unpack("<II", shapes[1])) == [(0, 0), (5, 1), (14, 2)]
+
+    def test_controls_untouched(self, hwp_file):
+        # The control id inside the table control is not text.
+        assert replace_in_section(_section(hwp_file), Replacer({TABLE_CONTROL[1:3]: "x"})) is None
+
+    def test_control_characters_rejected(self, hwp_file):
+        with pytest.raises(ValueError):
+            replace_in_section(_section(hwp_file), Replacer({"단락": "a\nb"}))
+
+
+class TestReplaceInHwp:
+    def test_only_changed_sections_rewritten(self, hwp_file, tmp_path):
+        out = str(tmp_path / "out.hwp")
+        replacer = Replacer({"첫 번째": "1번", "미리보기": "미리 보기"})
+        assert replace_in_hwp(hwp_file, out, replacer)
+        before, after = dict(read_streams(hwp_file)), dict(read_streams(out))
+        assert before.keys() == after.keys()
+        changed = {k for k in before if before[k] != after[k]}
+        assert changed == {"BodyText/Section0", "PrvText"}
+        assert "1번 단락입니다." in read_hwp_with_olefile(out)
+        # Hits in the preview are not counted: it repeats the body text.
+        assert replacer.counts == {"첫 번째": 1, "미리보기": 0}
+
+    def test_replace_many_dispatches_hwp_in_place(self, hwp_file):
+        counts = replace_many(hwp_file, hwp_file, {"구역": "섹션", "없음": "x"})
+        assert counts == {"구역": 1, "없음": 0}
+        assert "두 번째 섹션의 단락" in read_hwp_with_olefile(hwp_file)
+
+    def test_skip_unchanged(self, hwp_file, tmp_path):
+        out = tmp_path / "none.hwp"
+        assert not replace_in_hwp(hwp_file, str(out), Replacer({"없음": "x"}), skip_unchanged=True)
+        assert not out.exists()
@@ -146,3 +146,10 @@ class TestConvertToPdf:
         with open(out, "rb") as f:
             header = f.read(5)
         assert header == b"%PDF-"
+
+    def test_pdf_bytes_in_memory(self, base_hwpx):
+        from hwp_convert import convert_to_pdf_bytes
+
+        data = convert_to_pdf_bytes(base_hwpx)
+        assert data.startswith(b"%PDF-")
+        assert data.rstrip().endswith(b"%%EOF")
@@ -4,6 +4,10 @@ hwp_create.py 테스트.
 - create_hwpx_from_paragraphs: 일반 텍스트/단락으로 HWPX 생성
 - create_hwpx_from_markdown_via_node: md2hwp Node.js 경유 생성 (Node 필요)
 - parse_markdown_to_structure: Markdown 파싱 유틸
+- iter_markdown_blocks / create_hwpx_from_markdown_stream: 순서 보존 스트리밍 생성
+- create_hwpx_bytes: 파일 없이 메모리에서 생성
+- create_batch_from_markdown: 같은 이름 입력은 번호 붙은 출력, 읽기 실패는 파일별 결과
+- Md2HwpPool.map: 작업을 워커당 두 개 정도만 미리 꺼냄
 """
 
 import os
@@ -15,6 +19,8 @@ from hwp_create import (
     create_hwpx_from_paragraphs,
     create_hwpx_from_markdown_via_node,
     parse_markdown_to_structure,
+    iter_markdown_blocks,
+    create_hwpx_from_markdown_stream,
 )
 
 
@@ -124,6 +130,74 @@ class TestParseMarkdown:
         assert result["tables"] == []
 
 
+# ---------------------------------------------------------------------------
+# iter_markdown_blocks / create_hwpx_from_markdown_stream
+# ---------------------------------------------------------------------------
+
+ORDERED_MD = "# 제목\n앞 문단\n\n| A | B |\n|---|---|\n| 1 | 2 |\n\n- 항목\n뒤 문단"
+
+
+class TestMarkdownStream:
+    def test_events_in_document_order(self):
+        kinds = [e["type"] for e in iter_markdown_blocks(ORDERED_MD)]
+        assert kinds == ["heading", "paragraph", "table_start", "table_row",
+                         "table_end", "list_item", "paragraph"]
+
+    def test_accepts_line_iterator(self):
+        lines = iter(["## 소제목", "| X |", "|---|"])
+        events = list(iter_markdown_blocks(lines))
+        assert events[0] == {"type": "heading", "level": 2, "text": "소제목"}
+        assert events[1] == {"type": "table_start", "headers": ["X"]}
+        assert events[-1] == {"type": "table_end"}
+
+    def test_table_kept_between_paragraphs(self, tmp_hwpx):
+        from hwpx.document import HwpxDocument
+
+        create_hwpx_from_markdown_stream(tmp_hwpx, ORDERED_MD, title="T")
+        doc = HwpxDocument.open(tmp_hwpx)
+        texts = [p.text for p in doc.paragraphs if p.text or p.tables]
+        assert texts[:3] == ["T", "제목", "앞 문단"]
+        assert texts[-2:] == ["항목", "뒤 문단"]
+        table = next(t for p in doc.paragraphs for t in p.tables)
+        assert (table.row_count, table.column_count) == (2, 2)
+        assert table.cell(1, 1).text == "2"
+
+    def test_from_file_handle(self, tmp_hwpx, sample_md):
+        with open(sample_md, encoding="utf-8") as f:
+            create_hwpx_from_markdown_stream(tmp_hwpx, f, title="샘플")
+        with zipfile.ZipFile(tmp_hwpx) as zf:
+            assert zf.namelist()[0] == "mimetype"
+            assert zf.testzip() is None
+
+
+class TestCreateInMemory:
+    def test_bytes_from_paragraphs(self):
+        import io
+        from hwp_create import create_hwpx_bytes
+
+        data = create_hwpx_bytes(title="제목", paragraphs=["본문"],
+                                 tables=[{"headers": ["A"], "rows": [["1"]]}])
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert zf.namelist()[0] == "mimetype"
+            assert "본문" in zf.read("Contents/section0.xml").decode("utf-8")
+
+    def test_bytes_from_markdown(self):
+        import io
+        from hwpx.document import HwpxDocument
+        from hwp_create import create_hwpx_bytes
+
+        data = create_hwpx_bytes(markdown=ORDERED_MD)
+        texts = [p.text for p in HwpxDocument.open(io.BytesIO(data)).paragraphs]
+        assert "뒤 문단" in texts
+
+    def test_write_to_file_object(self, tmp_hwpx):
+        from hwp_create import write_hwpx_from_paragraphs
+
+        with open(tmp_hwpx, "wb") as f:
+            write_hwpx_from_paragraphs(f, paragraphs=["하나", "둘"])
+        assert zipfile.is_zipfile(tmp_hwpx)
+
+
 # ---------------------------------------------------------------------------
 # create_hwpx_from_paragraphs (Markdown 경유)
 # ---------------------------------------------------------------------------
@@ -163,3 +237,91 @@ class TestCreateViaMd2Hwp:
             md_text = f.read()
         create_hwpx_from_markdown_via_node(tmp_hwpx, md_text, title="샘플", author="이영준")
         assert os.path.exists(tmp_hwpx)
+
+    def test_persistent_pool_many_documents(self, tmp_path):
+        """하나의 워커 풀로 여러 문서를 연속 생성."""
+        from hwp_node import Md2HwpPool
+
+        with Md2HwpPool(size=2) as pool:
+            outs = [
+                pool.convert(f"# 문서 {i}\n본문", str(tmp_path / f"doc{i}.hwpx"), title=f"문서 {i}")
+                for i in range(4)
+            ]
+        for out in outs:
+            assert zipfile.is_zipfile(out)
+
+    def test_pool_returns_bytes_without_output_path(self):
+        from hwp_node import Md2HwpPool
+
+        with Md2HwpPool(size=1) as pool:
+            data = pool.convert("본문", title="메모리")
+        assert data[:2] == b"PK"
+
+    def test_batch_creation(self, tmp_path, sample_md):
+        from hwp_create import create_batch_from_markdown
+
+        results = list(create_batch_from_markdown(
+            str(tmp_path / "out"), [sample_md], method="md2hwp", workers=1
+        ))
+        assert len(results) == 1
+        assert not isinstance(results[0][1], Exception)
+
+    def test_batch_unreadable_file_reported(self, tmp_path, sample_md):
+        from hwp_create import create_batch_from_markdown
+
+        missing = str(tmp_path / "missing.md")
+        results = dict(create_batch_from_markdown(
+            str(tmp_path / "out"), [missing, sample_md], method="md2hwp", workers=1
+        ))
+        assert isinstance(results[missing], OSError)
+        assert zipfile.is_zipfile(results[sample_md])
+
+
+class TestCreateBatch:
+    def test_batch_python_hwpx(self, tmp_path, sample_md):
+        from hwp_create import create_batch_from_markdown
+
+        results = dict(create_batch_from_markdown(str(tmp_path / "out"), [sample_md]))
+        assert results[sample_md] == str(tmp_path / "out" / "sample.hwpx")
+        assert zipfile.is_zipfile(results[sample_md])
+
+    def test_same_stem_numbered(self, tmp_path, sample_md):
+        from hwp_create import create_batch_from_markdown
+        from hwp_read import read_file
+
+        other = tmp_path / "b" / "sample.md"
+        other.parent.mkdir()
+        other.write_text("# 다른 문서\n본문", encoding="utf-8")
+        results = dict(create_batch_from_markdown(str(tmp_path / "out"), [sample_md, str(other)]))
+        assert results[sample_md] == str(tmp_path / "out" / "sample.hwpx")
+        assert results[str(other)] == str(tmp_path / "out" / "sample-2.hwpx")
+        assert "다른 문서" in read_file(results[str(other)], "txt")
+
+    def test_missing_file_reported(self, tmp_path, sample_md):
+        from hwp_create import create_batch_from_markdown
+
+        missing = str(tmp_path / "missing.md")
+        results = dict(create_batch_from_markdown(str(tmp_path / "out"), [missing, sample_md]))
+        assert isinstance(results[missing], OSError)
+        assert zipfile.is_zipfile(results[sample_md])
+
+
+class TestMd2HwpPoolMap:
+    def test_jobs_consumed_lazily(self):
+        """작업 생성기를 한 번에 다 꺼내지 않고 워커당 두 개 정도만 진행."""
+        from hwp_node import Md2HwpPool
+
+        pulled = []
+
+        def jobs():
+            for i in range(20):
+                pulled.append(i)
+                yield f"# {i}", None, str(i), ""
+
+        pool = Md2HwpPool(size=2)
+        pool.convert = lambda md, out, title, author, timeout: md.encode("utf-8")
+        results = pool.map(jobs())
+        job, data = next(results)
+        assert data == job[0].encode("utf-8")
+        assert len(pulled) <= 2 * 2 + 1
+        assert len([job] + list(results)) == 20
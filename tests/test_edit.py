@@ -4,14 +4,19 @@ hwp_edit.py 테스트.
 - replace_text: 텍스트 치환
 - add_paragraph: 단락 추가
 - add_table: 표 추가
+- apply_edits: 작업 목록을 한 번의 열기/저장으로 적용
+- edit_batch: 디렉터리 트리 일괄 편집, 사전 검사로 미적중 파일 건너뛰기, 빈 작업 목록,
+  입력 폴더 안의 출력 폴더는 다시 읽지 않음
 """
 
 import os
+import re
+import shutil
 import zipfile
 
 import pytest
 
-from hwp_edit import replace_text, add_paragraph, add_table
+from hwp_edit import replace_text, add_paragraph, add_table, apply_edits, edit_batch
 from hwp_read import read_file
 from hwp_analyze import analyze
 
@@ -105,3 +110,130 @@ class TestAddTable:
         out = str(tmp_path / "header_only.hwpx")
         add_table(base_hwpx, out, ["A", "B", "C"], [])
         assert os.path.exists(out)
+
+    def test_in_place(self, base_hwpx, tmp_path):
+        """입력과 출력이 같은 파일이어도 원본을 잃지 않음."""
+        path = str(tmp_path / "same.hwpx")
+        shutil.copy(base_hwpx, path)
+        add_table(path, path, ["열1"], [["값1"]])
+        assert "첫 번째 단락입니다." in read_file(path, "txt")
+        with zipfile.ZipFile(path) as zf:
+            assert re.search(rb"<\w+:tbl ", zf.read("Contents/section0.xml"))
+
+class TestApplyEdits:
+    def _paragraphs(self, path):
+        from hwpx.document import HwpxDocument
+
+        return HwpxDocument.open(path).paragraphs
+
+    def test_operations_applied_in_order(self, base_hwpx, tmp_path):
+        out = str(tmp_path / "scripted.hwpx")
+        results = apply_edits(base_hwpx, out, [
+            {"op": "replace", "find": "첫 번째", "replace": "1번"},
+            {"op": "add_paragraph", "text": "스크립트 단락"},
+            {"op": "add_table", "headers": ["A", "B"], "rows": [["1", "2"]]},
+            {"op": "delete", "para_index": 3},
+        ])
+        assert results[0] == {"op": "replace", "count": 1}
+        paragraphs = self._paragraphs(out)
+        texts = [p.text for p in paragraphs]
+        assert "1번 단락입니다." in texts
+        assert "두 번째 단락입니다." not in texts
+        assert "스크립트 단락" in texts
+        assert any(p.tables for p in paragraphs)
+
+    def test_invalid_operation_writes_nothing(self, base_hwpx, tmp_path):
+        out = str(tmp_path / "never.hwpx")
+        with pytest.raises(ValueError):
+            apply_edits(base_hwpx, out, [{"op": "add_paragraph", "text": "x"}, {"op": "bogus"}])
+        assert not os.path.exists(out)
+
+    def test_failed_operation_writes_nothing(self, base_hwpx, tmp_path):
+        out = str(tmp_path / "never.hwpx")
+        with pytest.raises(IndexError):
+            apply_edits(base_hwpx, out, [{"op": "delete", "para_index": 999}])
+        assert not os.path.exists(out)
+
+    def test_positional_operations(self, base_hwpx, tmp_path):
+        out = str(tmp_path / "positioned.hwpx")
+        texts = [p.text for p in self._paragraphs(base_hwpx)]
+        second = texts.index("두 번째 단락입니다.")
+        results = apply_edits(base_hwpx, out, [
+            {"op": "add_paragraph", "text": "삽입", "before": second},
+            {"op": "replace", "find": "단락", "replace": "문단", "para_index": second + 1},
+            {"op": "add_table", "headers": ["A"], "rows": [["1"]], "after": second + 1},
+            {"op": "add_memo", "text": "확인", "match": "세 번째"},
+        ])
+        assert results[0] == {"op": "add_paragraph", "para_index": second}
+        assert results[1]["count"] == 1
+        assert results[3]["para_index"] == second + 3
+        paragraphs = self._paragraphs(out)
+        assert [p.text for p in paragraphs][second:second + 2] == ["삽입", "두 번째 문단입니다."]
+        assert paragraphs[second + 2].tables
+        assert "첫 번째 단락입니다." in [p.text for p in paragraphs]
+
+    def test_in_place(self, base_hwpx, tmp_path):
+        path = str(tmp_path / "same.hwpx")
+        shutil.copy(base_hwpx, path)
+        apply_edits(path, path, [{"op": "add_table", "headers": ["A"], "rows": [["1"]]},
+                                 {"op": "replace", "find": "세 번째", "replace": "3번"}])
+        paragraphs = self._paragraphs(path)
+        assert "3번 단락입니다." in [p.text for p in paragraphs]
+        assert any(p.tables for p in paragraphs)
+
+    def test_section_properties_paragraph_protected(self, base_hwpx, tmp_path):
+        with pytest.raises(ValueError):
+            apply_edits(base_hwpx, str(tmp_path / "x.hwpx"), [{"op": "delete", "para_index": 0}])
+
+
+class TestEditBatch:
+    @pytest.fixture
+    def tree(self, base_hwpx, tmp_path):
+        root = tmp_path / "in"
+        (root / "sub").mkdir(parents=True)
+        shutil.copy(base_hwpx, root / "a.hwpx")
+        shutil.copy(base_hwpx, root / "sub" / "b.hwpx")
+        replace_text(base_hwpx, str(root / "sub" / "c.hwpx"), "첫 번째", "하나")
+        (root / "notes.txt").write_text("첫 번째", encoding="utf-8")
+        return str(root)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_map_mirrors_tree_and_skips_unmatched(self, tree, tmp_path, workers):
+        out = str(tmp_path / "out")
+        results = {r["input"]: r for r in edit_batch(tree, out, mapping={"첫 번째": "1번"},
+                                                     workers=workers)}
+        assert set(results) == {"a.hwpx", os.path.join("sub", "b.hwpx"), os.path.join("sub", "c.hwpx")}
+        assert results["a.hwpx"]["counts"] == {"첫 번째": 1}
+        assert results[os.path.join("sub", "c.hwpx")]["status"] == "skipped"
+        assert "1번" in read_file(os.path.join(out, "sub", "b.hwpx"), "txt")
+        assert not os.path.exists(os.path.join(out, "sub", "c.hwpx"))
+
+    def test_replace_script_prescanned(self, tree, tmp_path):
+        out = str(tmp_path / "out")
+        ops = [{"op": "replace", "find": "첫 번째", "replace": "1번"}]
+        results = {r["input"]: r for r in edit_batch(tree, out, operations=ops, workers=1,
+                                                     copy_unmatched=True)}
+        assert results["a.hwpx"]["results"] == [{"op": "replace", "count": 1}]
+        skipped = results[os.path.join("sub", "c.hwpx")]
+        assert skipped["status"] == "skipped" and os.path.exists(skipped["output"])
+
+    def test_errors_reported_per_file(self, tree, tmp_path):
+        with open(os.path.join(tree, "broken.hwpx"), "wb") as f:
+            f.write(b"not a zip")
+        results = list(edit_batch(tree, str(tmp_path / "out"), mapping={"단락": "문단"}, workers=1))
+        broken = next(r for r in results if r["input"] == "broken.hwpx")
+        assert broken["status"] == "error"
+        assert sum(r["status"] == "ok" for r in results) == 3
+
+    def test_scripts_without_finds(self, tree, tmp_path):
+        results = list(edit_batch(tree, str(tmp_path / "out"), operations=[], workers=2))
+        assert [r["status"] for r in results] == ["ok"] * 3
+        with pytest.raises(ValueError, match="find"):
+            list(edit_batch(tree, str(tmp_path / "out"), operations=[{"op": "replace", "find": ""}]))
+
+    def test_output_inside_input_not_walked(self, tree):
+        out = os.path.join(tree, "out")
+        first = list(edit_batch(tree, out, mapping={"단락": "문단"}, workers=1))
+        second = list(edit_batch(tree, out, mapping={"단락": "문단"}, workers=1))
+        assert len(first) == len(second) == 3
+        assert not any(r["input"].startswith("out") for r in second)
@@ -0,0 +1,115 @@
+"""
+hwp_merge.py 테스트.
+
+- compile_template: 자리표시자 컴파일
+- merge: CSV/JSONL 행으로 문서 일괄 생성
+- 출력 이름: 폴더 밖 경로 거부, 없는 필드는 해당 행 오류, 중복 이름 번호 붙이기
+- 실패한 행은 파일을 남기지 않음, 객체가 아닌 행과 _index 열도 해당 행에서만 처리
+- hwp_zip: 변경 없는 ZIP 멤버의 원본 바이트 복사
+"""
+
+import json
+import zipfile
+
+import pytest
+
+from hwp_merge import compile_template, merge
+from hwp_read import read_file
+
+
+@pytest.fixture()
+def template_hwpx(tmp_path):
+    from hwp_create import create_hwpx_from_paragraphs
+
+    out = str(tmp_path / "template.hwpx")
+    create_hwpx_from_paragraphs(out, title="{{이름}} 님께", paragraphs=["금액: {{amount}}원", "고정 문구"])
+    return out
+
+
+class TestCompileTemplate:
+    def test_fields_detected(self, template_hwpx):
+        template = compile_template(template_hwpx)
+        assert template.fields == {"이름", "amount"}
+        assert list(template.parts) == ["Contents/section0.xml"]
+
+    def test_no_placeholders_raises(self, base_hwpx):
+        with pytest.raises(ValueError, match="placeholders"):
+            compile_template(base_hwpx)
+
+    def test_values_are_xml_escaped(self, template_hwpx):
+        template = compile_template(template_hwpx)
+        xml = template.render_part("Contents/section0.xml", {"이름": "<A&B>", "amount": "1"})
+        assert b"&lt;A&amp;B&gt;" in xml
+
+    def test_quotes_escaped_for_attributes(self, template_hwpx):
+        template = compile_template(template_hwpx)
+        xml = template.render_part("Contents/section0.xml", {"이름": "\"a\" 'b'", "amount": "1"})
+        assert "&quot;a&quot; &apos;b&apos;".encode() in xml
+
+
+class TestMerge:
+    def test_csv_rows_rendered(self, template_hwpx, tmp_path):
+        data = tmp_path / "rows.csv"
+        data.write_text("id,이름,amount\n1,홍길동,1000\n2,김철수,2000\n", encoding="utf-8")
+        out_dir = tmp_path / "out"
+        results = list(merge(template_hwpx, str(data), str(out_dir), "{id}.hwpx", workers=1))
+        assert [r["status"] for r in results] == ["ok", "ok"]
+        content = read_file(str(out_dir / "2.hwpx"), "md")
+        assert "김철수 님께" in content
+        assert "2000원" in content
+
+    def test_jsonl_with_process_pool(self, template_hwpx, tmp_path):
+        data = tmp_path / "rows.jsonl"
+        data.write_text(
+            "\n".join(json.dumps({"이름": f"사용자{i}", "amount": i}, ensure_ascii=False)
+                      for i in range(6)),
+            encoding="utf-8",
+        )
+        results = list(merge(template_hwpx, str(data), str(tmp_path / "out"), workers=2))
+        assert len(results) == 6
+        assert all(r["status"] == "ok" for r in results)
+
+    def test_unchanged_members_copied_verbatim(self, template_hwpx, tmp_path):
+        data = tmp_path / "rows.jsonl"
+        data.write_text(json.dumps({"이름": "a", "amount": 1}), encoding="utf-8")
+        result = next(merge(template_hwpx, str(data), str(tmp_path / "out"), workers=1))
+        with zipfile.ZipFile(template_hwpx) as src, zipfile.ZipFile(result["output"]) as dst:
+            assert dst.testzip() is None
+            assert dst.namelist() == src.namelist()
+            for info in src.infolist():
+                if info.filename != "Contents/section0.xml":
+                    assert dst.getinfo(info.filename).compress_size == info.compress_size
+                    assert dst.read(info.filename) == src.read(info.filename)
+
+    def test_missing_field_reports_error(self, template_hwpx, tmp_path):
+        data = tmp_path / "rows.jsonl"
+        data.write_text(json.dumps({"이름": "a"}), encoding="utf-8")
+        results = list(merge(template_hwpx, str(data), str(tmp_path / "out"), workers=1))
+        assert results[0]["status"] == "error" and results[0]["output"] is None
+        assert "amount" in results[0]["error"]
+        assert list((tmp_path / "out").iterdir()) == []
+
+    def test_output_names_checked_per_row(self, template_hwpx, tmp_path):
+        data = tmp_path / "rows.jsonl"
+        rows = [{"id": "a", "이름": "x", "amount": 1},
+                {"id": "../../escape", "이름": "y", "amount": 2},
+                {"이름": "z", "amount": 3},
+                {"id": "a", "이름": "w", "amount": 4}]
+        data.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in rows), encoding="utf-8")
+        out_dir = tmp_path / "out"
+        results = list(merge(template_hwpx, str(data), str(out_dir), "{id}.hwpx", workers=1))
+        assert [r["status"] for r in results] == ["ok", "error", "error", "ok"]
+        assert "outside" in results[1]["error"]
+        assert "id" in results[2]["error"]
+        assert sorted(p.name for p in out_dir.iterdir()) == ["a-2.hwpx", "a.hwpx"]
+        assert "w 님께" in read_file(str(out_dir / "a-2.hwpx"), "md")
+        assert not (tmp_path.parent / "escape.hwpx").exists()
+
+    def test_odd_rows_reported_per_row(self, template_hwpx, tmp_path):
+        data = tmp_path / "rows.jsonl"
+        data.write_text('[1, 2]\n{"_index": "x", "이름": "a", "amount": 1}\n', encoding="utf-8")
+        out_dir = tmp_path / "out"
+        results = list(merge(template_hwpx, str(data), str(out_dir), workers=1))
+        assert [r["status"] for r in results] == ["error", "ok"]
+        assert "not an object" in results[0]["error"]
+        assert [p.name for p in out_dir.iterdir()] == ["00001.hwpx"]
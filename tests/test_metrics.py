@@ -0,0 +1,118 @@
+"""
+hwp_metrics.py 테스트.
+
+- Registry: 히스토그램/카운터 기록, take(스냅샷 후 초기화), merge
+- summary: 단계별 count/p50/p95/max, 캐시 적중률 / Prometheus 텍스트 형식 (큰 값도 정확히)
+- 파이프라인 계측: 읽기 단계·바이트·백엔드, 폴백 카운터, ZIP 멤버 재사용 캐시
+- 프로세스 풀 작업자가 기록한 지표가 서버 프로세스로 합쳐짐 (실패한 호출 포함)
+"""
+
+import asyncio
+
+import pytest
+
+import hwp_metrics
+import hwp_read
+from hwp_analyze import analyze
+from hwp_edit import apply_edits
+from hwp_metrics import Registry, summary, to_prometheus
+from hwp_pool import Offload
+from hwp_read import read_file
+
+
+@pytest.fixture
+def registry():
+    hwp_metrics.REGISTRY.reset()
+    yield hwp_metrics.REGISTRY
+    hwp_metrics.REGISTRY.reset()
+
+
+class TestRegistry:
+    def test_summary_and_merge(self):
+        reg = Registry()
+        for seconds in (0.002, 0.004, 0.2):
+            reg.observe("read", "decode", seconds)
+        reg.inc("cache", {"cache": "session", "result": "hit"}, 3)
+        reg.inc("cache", {"cache": "session", "result": "miss"})
+
+        other = Registry()
+        other.observe("read", "decode", 0.003)
+        other.inc("fallbacks", {"op": "read", "from": "pyhwp2md", "to": "olefile"})
+        reg.merge(other.take())
+        assert other.snapshot() == {"stages": [], "counters": []}
+
+        out = summary(reg.snapshot())
+        stage = out["stages"]["read.decode"]
+        assert stage["count"] == 4 and stage["max_ms"] == 200.0
+        assert 2.5 <= stage["p50_ms"] <= 5 and stage["p95_ms"] <= 200
+        assert out["fallbacks"] == {"read: pyhwp2md -> olefile": 1}
+        assert out["caches"]["session"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+
+    def test_prometheus_format(self):
+        reg = Registry()
+        reg.observe("convert", "render", 0.3)
+        reg.inc("bytes", {"op": "convert", "direction": "out"}, 1234)
+        text = to_prometheus(reg.snapshot())
+        assert "# TYPE hwp_stage_seconds histogram" in text
+        assert 'hwp_stage_seconds_bucket{op="convert",stage="render",le="0.25"} 0' in text
+        assert 'hwp_stage_seconds_bucket{op="convert",stage="render",le="+Inf"} 1' in text
+        assert 'hwp_stage_seconds_count{op="convert",stage="render"} 1' in text
+        assert 'hwp_bytes_total{direction="out",op="convert"} 1234' in text
+
+    def test_prometheus_values_exact(self):
+        reg = Registry()
+        reg.inc("bytes", {"op": "read", "direction": "in"}, 1234567)
+        reg.inc("bytes", {"op": "read", "direction": "out"}, 2.5)
+        text = to_prometheus(reg.snapshot())
+        assert 'hwp_bytes_total{direction="in",op="read"} 1234567\n' in text
+        assert 'hwp_bytes_total{direction="out",op="read"} 2.5\n' in text
+
+
+class TestPipelines:
+    def test_read_records_stages_and_bytes(self, registry, base_hwpx):
+        read_file(base_hwpx, "md", hwp_read.Selection.from_specs("0"))
+        content = read_file(base_hwpx, "txt")
+        out = summary()
+        assert {"read.open", "read.decode"} <= set(out["stages"])
+        assert out["bytes"]["read.out"] == len(content.encode("utf-8"))
+        assert out["bytes"]["read.in"] > 0
+        assert out["backends"] == {"read: pyhwp2md": 1}
+
+    def test_fallback_counted(self, registry, base_hwpx, monkeypatch):
+        def broken(filepath):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(hwp_read, "read_hwpx_with_pyhwp2md", broken)
+        assert "두 번째 단락입니다." in read_file(base_hwpx, "txt")
+        out = summary()
+        assert out["fallbacks"] == {"read: pyhwp2md -> python-hwpx": 1}
+        assert out["backends"] == {"read: python-hwpx": 1}
+
+    def test_edit_stages_and_member_reuse(self, registry, base_hwpx, tmp_path):
+        apply_edits(base_hwpx, str(tmp_path / "out.hwpx"),
+                    [{"op": "replace", "find": "첫 번째", "replace": "1번"}])
+        out = summary()
+        assert {"edit.open", "edit.apply", "edit.save"} <= set(out["stages"])
+        assert out["caches"]["package_members"]["hits"] > 0
+
+
+class TestWorkers:
+    def test_process_metrics_merged(self, registry, base_hwpx, tmp_path):
+        offload = Offload({"cpu": ("process", 1, 4)})
+
+        async def main():
+            await offload.run("cpu", read_file, base_hwpx, "txt")
+            with pytest.raises(ValueError):
+                await offload.run("cpu", analyze, str(tmp_path / "doc.txt"))
+            with pytest.raises(FileNotFoundError):
+                await offload.run("cpu", analyze, str(tmp_path / "missing.hwpx"))
+
+        try:
+            asyncio.run(main())
+        finally:
+            offload.shutdown()
+        out = summary()
+        assert out["backends"] == {"read: pyhwp2md": 1}
+        assert out["stages"]["read.decode"]["count"] == 1
+        assert out["stages"]["analyze.total"]["count"] == 1
+        assert out["stages"]["cpu.total"]["count"] == 3
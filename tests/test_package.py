@@ -0,0 +1,162 @@
+"""
+hwp_package.py 테스트.
+
+- CompressionPolicy: 항목별 압축 정책 (이미지/mimetype 무압축)
+- parallel_deflate: 청크 병렬 압축 결과가 단일 deflate 스트림인지
+- save_document / repack: 변경 없는 항목 원본 복사, 제자리 저장, 쓰는 중 실패해도 원본 유지
+- HwpxPatch: 변경된 항목만 다시 쓰는 부분 저장, manifest 동기화
+"""
+
+import shutil
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import hwp_package
+from hwp_package import (
+    CompressionPolicy, HwpxPatch, bench, parallel_deflate, repack, save_document,
+)
+
+
+class TestCompressionPolicy:
+    def test_images_and_mimetype_stored(self):
+        policy = CompressionPolicy()
+        assert policy.method("mimetype") == (zipfile.ZIP_STORED, 0)
+        assert policy.method("BinData/image1.PNG") == (zipfile.ZIP_STORED, 0)
+        assert policy.method("Contents/section0.xml") == (zipfile.ZIP_DEFLATED, 6)
+
+    def test_level_overrides(self):
+        policy = CompressionPolicy(level=1, levels={"Contents/section*.xml": 9})
+        assert policy.method("Contents/section3.xml") == (zipfile.ZIP_DEFLATED, 9)
+        assert policy.method("Contents/header.xml") == (zipfile.ZIP_DEFLATED, 1)
+
+
+class TestParallelDeflate:
+    def test_chunks_form_one_stream(self):
+        data = b"".join(b"<hp:p>%d</hp:p>" % i for i in range(200000))
+        with ThreadPoolExecutor(4) as pool:
+            pieces = parallel_deflate(data, 6, pool, chunk_size=256 * 1024)
+            out = b"".join(f.result() for f in pieces)
+        assert len(pieces) > 1
+        assert zlib.decompress(out, -15) == data
+
+
+class TestSaveDocument:
+    def test_unchanged_members_raw_copied(self, base_hwpx, tmp_path):
+        out = str(tmp_path / "repacked.hwpx")
+        stats = repack(base_hwpx, out)
+        assert stats["deflated"] == 0 and stats["raw"] > 0
+        with zipfile.ZipFile(out) as zf:
+            assert zf.testzip() is None
+            assert zf.infolist()[0].filename == "mimetype"
+            assert zf.infolist()[0].compress_type == zipfile.ZIP_STORED
+
+    def test_parallel_repack_without_reuse(self, base_hwpx, tmp_path):
+        out = str(tmp_path / "full.hwpx")
+        stats = repack(base_hwpx, out, CompressionPolicy(level=9), workers=4, reuse=False)
+        assert stats["raw"] == 0
+        with zipfile.ZipFile(base_hwpx) as a, zipfile.ZipFile(out) as b:
+            assert sorted(a.namelist()) == sorted(b.namelist())
+            for name in a.namelist():
+                assert a.read(name) == b.read(name)
+
+    def test_repack_in_place(self, base_hwpx, tmp_path):
+        path = str(tmp_path / "doc.hwpx")
+        shutil.copy(base_hwpx, path)
+        stats = repack(path, path)
+        assert stats["raw"] > 0
+        with zipfile.ZipFile(base_hwpx) as a, zipfile.ZipFile(path) as b:
+            assert b.testzip() is None
+            assert sorted(a.namelist()) == sorted(b.namelist())
+            for name in a.namelist():
+                assert a.read(name) == b.read(name)
+
+    @pytest.mark.parametrize("save", ["repack", "save_document"])
+    def test_failed_in_place_save_keeps_original(self, base_hwpx, tmp_path, monkeypatch, save):
+        from hwpx.document import HwpxDocument
+
+        path = str(tmp_path / "doc.hwpx")
+        shutil.copy(base_hwpx, path)
+        original = open(path, "rb").read()
+        doc = HwpxDocument.open(path)
+
+        def broken(parts, fileobj, *args, **kwargs):
+            fileobj.write(b"PK partial")
+            raise OSError("disk full")
+
+        monkeypatch.setattr(hwp_package, "write_parts", broken)
+        with pytest.raises(OSError):
+            if save == "repack":
+                repack(path, path)
+            else:
+                save_document(doc, path, source=path)
+        assert open(path, "rb").read() == original
+        assert [p.name for p in tmp_path.iterdir()] == ["doc.hwpx"]
+
+    def test_save_in_place(self, base_hwpx, tmp_path):
+        from hwpx.document import HwpxDocument
+
+        path = str(tmp_path / "doc.hwpx")
+        shutil.copy(base_hwpx, path)
+        doc = HwpxDocument.open(path)
+        doc.add_paragraph("추가된 단락", section=doc.sections[0])
+        save_document(doc, path, source=path)
+        texts = [p.text for p in HwpxDocument.open(path).paragraphs]
+        assert texts[-1] == "추가된 단락"
+
+    def test_bench_reports_sizes(self, base_hwpx):
+        results = bench(base_hwpx, levels=(1,), repeat=1)
+        assert {r["mode"] for r in results} >= {"python-hwpx save", "raw-copy unchanged"}
+        assert all(r["bytes"] > 0 for r in results)
+
+
+class TestHwpxPatch:
+    SECTION = "Contents/section0.xml"
+
+    def test_only_modified_member_rewritten(self, base_hwpx, tmp_path):
+        out = str(tmp_path / "patched.hwpx")
+        patch = HwpxPatch(base_hwpx)
+        patch.write(self.SECTION, patch.read_text(self.SECTION).replace("첫 번째", "1번"))
+        assert patch.modified == {self.SECTION}
+        stats = patch.save(out)
+        assert stats["rewritten"] == 1
+        with zipfile.ZipFile(base_hwpx) as a, zipfile.ZipFile(out) as b:
+            for info in a.infolist():
+                if info.filename == self.SECTION:
+                    assert "1번" in b.read(self.SECTION).decode("utf-8")
+                else:
+                    assert b.getinfo(info.filename).CRC == info.CRC
+
+    def test_unchanged_write_not_recorded(self, base_hwpx):
+        patch = HwpxPatch(base_hwpx)
+        patch.write(self.SECTION, patch.read(self.SECTION))
+        assert patch.modified == set()
+
+    def test_in_place_save(self, base_hwpx, tmp_path):
+        path = str(tmp_path / "doc.hwpx")
+        shutil.copy(base_hwpx, path)
+        patch = HwpxPatch(path)
+        patch.write(self.SECTION, patch.read_text(self.SECTION).replace("세 번째", "3번"))
+        patch.save()
+        with zipfile.ZipFile(path) as zf:
+            assert zf.testzip() is None
+            assert "3번" in zf.read(self.SECTION).decode("utf-8")
+        assert not (tmp_path / "doc.hwpx.tmp").exists()
+
+    def test_manifest_follows_added_and_removed_members(self, base_hwpx, tmp_path):
+        added = str(tmp_path / "added.hwpx")
+        patch = HwpxPatch(base_hwpx)
+        patch.write("BinData/image9.png", b"\x89PNG fake")
+        patch.save(added)
+        with zipfile.ZipFile(added) as zf:
+            assert 'href="BinData/image9.png"' in zf.read("Contents/content.hpf").decode("utf-8")
+
+        removed = str(tmp_path / "removed.hwpx")
+        patch = HwpxPatch(added)
+        patch.remove("BinData/image9.png")
+        patch.save(removed)
+        with zipfile.ZipFile(removed) as zf:
+            assert "BinData/image9.png" not in zf.namelist()
+            assert "image9" not in zf.read("Contents/content.hpf").decode("utf-8")
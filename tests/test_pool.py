@@ -0,0 +1,85 @@
+"""
+hwp_pool.py 테스트.
+
+- Offload: 작업 분류별 동시 실행 수 제한과 대기열 초과 시 ServerBusy
+- 프로세스 풀 실행, 작업자 비정상 종료 후 풀 재생성
+- 환경 변수로 제한 재정의
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from hwp_pool import Offload, ServerBusy
+
+
+class TestLimits:
+    def test_queue_overflow_rejected(self):
+        offload = Offload({"work": ("thread", 1, 1)})
+        release = threading.Event()
+
+        async def main():
+            first = asyncio.create_task(offload.run("work", release.wait, 5))
+            second = asyncio.create_task(offload.run("work", release.wait, 5))
+            await asyncio.sleep(0.05)
+            assert offload.stats()["work"]["running"] == 1
+            assert offload.stats()["work"]["waiting"] == 1
+            with pytest.raises(ServerBusy):
+                await offload.run("work", release.wait, 5)
+            release.set()
+            return await asyncio.gather(first, second)
+
+        try:
+            assert asyncio.run(main()) == [True, True]
+            stats = offload.stats()["work"]
+            assert (stats["completed"], stats["rejected"]) == (2, 1)
+        finally:
+            offload.shutdown()
+
+    def test_concurrency_capped(self):
+        offload = Offload({"work": ("thread", 2, 10)})
+        active = peak = 0
+        lock = threading.Lock()
+
+        def job():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            threading.Event().wait(0.02)
+            with lock:
+                active -= 1
+
+        async def main():
+            await asyncio.gather(*(offload.run("work", job) for _ in range(8)))
+
+        try:
+            asyncio.run(main())
+            assert peak == 2
+        finally:
+            offload.shutdown()
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv("HWP_MCP_WORK_WORKERS", "3")
+        monkeypatch.setenv("HWP_MCP_WORK_QUEUE", "0")
+        stats = Offload({"work": ("thread", 1, 5)}).stats()["work"]
+        assert (stats["workers"], stats["queue"]) == (3, 0)
+
+
+class TestProcessPool:
+    def test_runs_and_recovers_from_dead_worker(self):
+        offload = Offload({"cpu": ("process", 1, 4)})
+
+        async def main():
+            assert await offload.run("cpu", os.path.basename, "/a/b.hwpx") == "b.hwpx"
+            with pytest.raises(BrokenProcessPool):
+                await offload.run("cpu", os._exit, 1)
+            return await offload.run("cpu", os.path.basename, "/c.hwp")
+
+        try:
+            assert asyncio.run(main()) == "c.hwp"
+        finally:
+            offload.shutdown()
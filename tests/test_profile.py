@@ -0,0 +1,122 @@
+"""
+hwp_profile.py 테스트.
+
+- Profile: pstats, CPU/메모리 collapsed stack, JSON 보고서 (상위 함수, 단계별 표본, 할당)
+- 단계 span: 프로파일 중에만 스레드별로 기록, timer/Stopwatch 중첩
+- profiled: 프로세스 풀 작업자에서 프로파일한 결과를 돌려받음
+- 명령줄 --profile / --profile-dir
+"""
+
+import asyncio
+import json
+import os
+import pstats
+import subprocess
+import sys
+
+import pytest
+
+import hwp_metrics
+from hwp_pool import Offload
+from hwp_profile import Profile, profiled
+from hwp_read import read_file
+from hwp_synth import synthetic_sections, write_hwp
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+
+@pytest.fixture(scope="module")
+def hwp_doc(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("profile") / "doc.hwp")
+    # No tables: every .hwp backend then reads all 150 paragraphs.
+    write_hwp(path, synthetic_sections(paragraphs=150, sections=2, tables=0))
+    # Import the backends now: under tracemalloc, importing them takes seconds.
+    read_file(path, "txt")
+    return path
+
+
+class TestProfile:
+    def test_files_and_report(self, hwp_doc, tmp_path):
+        with Profile("both", str(tmp_path), "read", interval=0.001) as prof:
+            text = read_file(hwp_doc, "txt")
+        report = prof.report
+        assert "150. " in text
+        assert set(report["files"]) == {"pstats", "cpu_collapsed", "mem_collapsed", "json"}
+        assert all(os.path.dirname(p) == str(tmp_path) for p in report["files"].values())
+
+        stats = pstats.Stats(report["files"]["pstats"])
+        assert any(func == "read_file" for _, _, func in stats.stats)
+        with open(report["files"]["cpu_collapsed"], encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any(line.startswith("[read.") for line in lines)
+
+        assert report["cpu"]["samples"] == sum(s["samples"] for s in report["cpu"]["spans"].values())
+        assert any(f["function"].startswith("read_file ") for f in report["cpu"]["functions"])
+        assert "read.decode" in report["stages"]
+        assert report["memory"]["peak_mb"] > 0 and report["memory"]["allocations"]
+        with open(report["files"]["json"], encoding="utf-8") as f:
+            assert json.load(f)["name"] == report["name"]
+
+    def test_cpu_only(self, hwp_doc, tmp_path):
+        with Profile("cpu", str(tmp_path), "read") as prof:
+            read_file(hwp_doc, "txt")
+        assert "memory" not in prof.report and "mem_collapsed" not in prof.report["files"]
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            Profile("disk")
+
+
+class TestSpans:
+    def test_recorded_only_while_tracing(self):
+        with hwp_metrics.timer("read", "open"):
+            assert hwp_metrics.spans() == ()
+        hwp_metrics.trace(True)
+        try:
+            watch = hwp_metrics.Stopwatch("read", "decode")
+            with hwp_metrics.timer("convert", "render"):
+                watch.start()
+                assert hwp_metrics.spans() == ("convert.render", "read.decode")
+                watch.stop()
+                watch.stop()
+                assert hwp_metrics.spans() == ("convert.render",)
+            assert hwp_metrics.spans() == ()
+        finally:
+            hwp_metrics.trace(False)
+
+
+class TestWorkers:
+    def test_profiled_in_process_pool(self, hwp_doc, tmp_path):
+        offload = Offload({"cpu": ("process", 1, 4)})
+
+        async def main():
+            return await offload.run("cpu", profiled, "cpu", str(tmp_path), "read",
+                                     read_file, hwp_doc, "txt")
+
+        try:
+            text, report = asyncio.run(main())
+        finally:
+            offload.shutdown()
+        assert "150. " in text
+        assert os.path.exists(report["files"]["pstats"])
+        assert "read.decode" in report["stages"]
+
+
+class TestCommandLine:
+    @pytest.mark.parametrize("script, mode, suffixes", [
+        ("hwp_analyze.py", "mem", ["json", "mem.collapsed"]),
+        ("hwp_read.py", "cpu", ["cpu.collapsed", "json", "pstats"]),
+    ])
+    def test_profile_flag(self, script, mode, suffixes, hwp_doc, tmp_path):
+        out = tmp_path / "prof"
+        result = subprocess.run(
+            [sys.executable, os.path.join(SCRIPTS, script), hwp_doc,
+             "--profile", mode, "--profile-dir", str(out)],
+            capture_output=True, text=True, timeout=120)
+        assert result.returncode == 0, result.stderr
+        names = sorted(os.listdir(out))
+        label = script[4:-3]
+        assert [n.split(".", 1)[1] for n in names] == suffixes
+        assert all(n.startswith(label + "-") for n in names)
+        assert "profile written" in result.stderr
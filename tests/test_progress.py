@@ -0,0 +1,162 @@
+"""
+hwp_progress.py 테스트.
+
+- Progress: 체크포인트에서 취소 감지, 취소 시 외부 프로그램 종료, 시간 초과
+- 파이프라인 진행 보고: 섹션 단위 읽기, 편집 작업 단위, 취소 시 출력 파일 없음
+- Offload(report=...): 진행 상황 전달, 호출 취소 시 작업 중단과 슬롯 반환,
+  체크포인트에 오지 않는 프로세스 작업자는 유예 시간 후 강제 종료
+"""
+
+import asyncio
+import os
+import queue
+import subprocess
+import sys
+import time
+
+import pytest
+
+from hwp_edit import apply_edits
+from hwp_pool import Offload
+from hwp_progress import Cancelled, Progress
+from hwp_read import Selection, write_selection
+from hwp_sink import MemorySink
+
+
+def _events(events):
+    out = []
+    while not events.empty():
+        out.append(events.get())
+    return out
+
+
+def _counting(steps: int = 1000, progress=None):
+    """Report one step every 10 ms until done or cancelled (runs in a pool worker)."""
+    for i in range(steps):
+        progress(i + 1, steps)
+        time.sleep(0.01)
+    return steps
+
+
+def _stubborn(progress):
+    """Report once, then never reach another checkpoint."""
+    progress(0, 1, "started")
+    time.sleep(60)
+
+
+class TestProgress:
+    def test_checkpoint_raises_after_cancel(self):
+        events = queue.SimpleQueue()
+        progress = Progress(events=events)
+        progress(1, 2, "half")
+        progress.cancel()
+        with pytest.raises(Cancelled):
+            progress(2, 2)
+        assert _events(events) == [("progress", 1, 2, "half")]
+
+    def test_run_kills_program_on_cancel(self):
+        progress = Progress(events=queue.SimpleQueue())
+        cmd = [sys.executable, "-c", "import time; time.sleep(30)"]
+        loop = asyncio.new_event_loop()
+        loop.call_later(0.3, progress.cancel)
+        start = time.monotonic()
+        with pytest.raises(Cancelled):
+            loop.run_until_complete(loop.run_in_executor(None, progress.run, cmd))
+        loop.close()
+        assert time.monotonic() - start < 10
+        kinds = [e[0] for e in _events(progress.events)]
+        assert kinds == ["child", "child_exit"]
+
+    def test_run_timeout_and_result(self):
+        progress = Progress()
+        done = progress.run([sys.executable, "-c", "print('ok')"], text=True)
+        assert (done.returncode, done.stdout.strip()) == (0, "ok")
+        with pytest.raises(subprocess.TimeoutExpired):
+            progress.run([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.3)
+
+
+class TestPipelines:
+    def test_read_reports_sections(self, base_hwpx):
+        events = queue.SimpleQueue()
+        sink = MemorySink()
+        write_selection(base_hwpx, sink, "txt", Selection.from_specs("0", ""), Progress(events))
+        assert "첫 번째 단락입니다." in sink.getvalue()
+        assert _events(events)[-1] == ("progress", 1, 1, "section 1/1")
+
+    def test_edit_reports_operations_and_stops_when_cancelled(self, base_hwpx, tmp_path):
+        ops = [{"op": "replace", "find": "첫 번째", "replace": "1번"},
+               {"op": "add_paragraph", "text": "끝"}]
+        events = queue.SimpleQueue()
+        apply_edits(base_hwpx, str(tmp_path / "out.hwpx"), ops, Progress(events))
+        assert _events(events) == [("progress", 1, 2, "replace"), ("progress", 2, 2, "add_paragraph")]
+
+        cancelled = Progress()
+        cancelled.cancel()
+        out = tmp_path / "cancelled.hwpx"
+        with pytest.raises(Cancelled):
+            apply_edits(base_hwpx, str(out), ops, cancelled)
+        assert not out.exists()
+
+
+class TestOffload:
+    def test_progress_forwarded_in_order(self):
+        offload = Offload({"work": ("thread", 1, 1)})
+        updates = []
+
+        async def report(done, total=None, message=None):
+            updates.append(done)
+
+        try:
+            assert asyncio.run(offload.run("work", _counting, 5, report=report)) == 5
+            assert updates == [1, 2, 3, 4, 5]
+        finally:
+            offload.shutdown()
+
+    def test_cancel_stops_thread_work_and_frees_slot(self):
+        offload = Offload({"work": ("thread", 1, 1)})
+        updates = []
+
+        async def report(done, total=None, message=None):
+            updates.append(done)
+
+        async def main():
+            task = asyncio.create_task(offload.run("work", _counting, report=report))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # The slot is returned once the worker has reached a checkpoint.
+            return await offload.run("work", _counting, 2, report=report)
+
+        try:
+            assert asyncio.run(main()) == 2
+            stats = offload.stats()["work"]
+            assert (stats["cancelled"], stats["completed"], stats["running"]) == (1, 1, 0)
+            assert 0 < len(updates) < 100
+        finally:
+            offload.shutdown()
+
+    def test_unresponsive_process_worker_killed(self):
+        offload = Offload({"cpu": ("process", 1, 2)}, cancel_grace=0.5)
+        updates = []
+
+        async def report(done, total=None, message=None):
+            updates.append(message)
+
+        async def main():
+            task = asyncio.create_task(offload.run("cpu", _stubborn, report=report))
+            while not updates:
+                await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return await offload.run("cpu", os.path.basename, "/a/b.hwpx")
+
+        try:
+            start = time.monotonic()
+            assert asyncio.run(main()) == "b.hwpx"
+            assert time.monotonic() - start < 30
+            assert updates == ["started"]
+            assert offload.stats()["cpu"]["cancelled"] == 1
+        finally:
+            offload.shutdown()
@@ -3,6 +3,7 @@ hwp_read.py 테스트.
 
 - read_file: HWPX 파일에서 텍스트 추출 (md/txt/json)
 - 내부 파서 함수: read_hwpx_with_python_hwpx
+- read_page: 커서 기반 페이지 읽기, 앞 섹션을 건너뛰고 이어 읽기
 """
 
 import json
@@ -72,3 +73,115 @@ class TestReadHwpxWithPythonHwpx:
     def test_content_nonempty(self, base_hwpx):
         result = read_hwpx_with_python_hwpx(base_hwpx)
         assert result.strip()
+
+
+class TestSelection:
+    def test_parse_sections(self):
+        from hwp_read import parse_sections
+
+        assert parse_sections("0-2,5,7-") == [(0, 3), (5, 6), (7, None)]
+
+    def test_parse_paragraphs(self):
+        from hwp_read import parse_paragraphs
+
+        assert parse_paragraphs("10:20") == (10, 20)
+        assert parse_paragraphs(":5") == (0, 5)
+        assert parse_paragraphs("3") == (3, 4)
+
+    def test_invalid_spec_raises(self):
+        from hwp_read import parse_sections
+
+        with pytest.raises(ValueError):
+            parse_sections("2-1")
+
+    def test_paragraph_range_limits_output(self, tmp_path):
+        from hwp_create import create_hwpx_from_paragraphs
+        from hwp_read import Selection
+
+        out = str(tmp_path / "range.hwpx")
+        create_hwpx_from_paragraphs(out, paragraphs=["알파", "베타", "감마", "델타"])
+        # 단락 0은 secPr을 담은 빈 단락
+        result = read_file(out, "md", Selection.from_specs(paragraphs="2:4"))
+        assert "베타" in result and "감마" in result
+        assert "알파" not in result and "델타" not in result
+
+    def test_missing_section_yields_nothing(self, base_hwpx):
+        from hwp_read import Selection
+
+        assert read_file(base_hwpx, "md", Selection.from_specs(sections="5")) == ""
+
+    def test_table_rendered_in_order(self, tmp_path):
+        from hwp_create import create_hwpx_from_paragraphs
+        from hwp_read import Selection
+
+        out = str(tmp_path / "table.hwpx")
+        create_hwpx_from_paragraphs(
+            out, paragraphs=["앞"], tables=[{"headers": ["A", "B"], "rows": [["1", "2"]]}]
+        )
+        result = read_file(out, "md", Selection.from_specs(sections="0"))
+        assert result.index("앞") < result.index("| A | B |")
+
+
+class TestReadPage:
+    @pytest.fixture
+    def long_hwpx(self, tmp_path):
+        from hwp_create import create_hwpx_from_paragraphs
+
+        out = str(tmp_path / "long.hwpx")
+        create_hwpx_from_paragraphs(out, paragraphs=[f"단락 {i:03d}" for i in range(40)])
+        return out
+
+    def test_pages_concatenate_to_whole_document(self, long_hwpx):
+        from hwp_read import read_page
+
+        pages, cursor = [], ""
+        while cursor is not None:
+            page = read_page(long_hwpx, "txt", cursor, max_chars=50)
+            assert len(page["content"]) <= 50
+            pages.append(page["content"])
+            cursor = page["next_cursor"]
+        assert len(pages) > 5
+        assert "\n".join(pages).split("\n") == [f"단락 {i:03d}" for i in range(40)]
+
+    def test_paragraph_limit_and_oversized_paragraph(self, long_hwpx):
+        from hwp_read import read_page
+
+        # 단락 0은 secPr을 담은 빈 단락
+        page = read_page(long_hwpx, "md", "0.3", max_paragraphs=2)
+        assert page["content"] == "단락 002\n\n단락 003"
+        assert page["next_cursor"] == "0.5"
+        assert read_page(long_hwpx, "md", "0.5", max_chars=1)["content"] == "단락 004"
+
+    def test_resume_skips_earlier_sections(self, base_hwpx, tmp_path):
+        import zipfile
+        from xml.etree.ElementTree import ParseError
+        from hwp_read import read_page
+
+        # section0은 깨진 XML, section1은 원래 section0: 커서가 section1이면 section0을 읽지 않는다.
+        out = str(tmp_path / "two.hwpx")
+        with zipfile.ZipFile(base_hwpx) as src, zipfile.ZipFile(out, "w") as dst:
+            for info in src.infolist():
+                data = src.read(info)
+                if info.filename == "Contents/section0.xml":
+                    dst.writestr("Contents/section1.xml", data)
+                    data = b"<broken"
+                dst.writestr(info, data)
+        page = read_page(out, "txt", "1.0")
+        assert "두 번째 단락입니다." in page["content"] and page["next_cursor"] is None
+        with pytest.raises(ParseError):
+            read_page(out, "txt", "0.0")
+
+    def test_binary_hwp_sections(self, tmp_path):
+        from hwp_read import read_page
+        from hwp_synth import write_hwp
+
+        path = write_hwp(str(tmp_path / "doc.hwp"), [["가", "나"], ["다"]])
+        page = read_page(path, "txt", max_paragraphs=2)
+        assert (page["content"], page["next_cursor"]) == ("가\n나", "1.0")
+        assert read_page(path, "txt", page["next_cursor"])["content"] == "다"
+
+    def test_invalid_cursor(self, base_hwpx):
+        from hwp_read import read_page
+
+        with pytest.raises(ValueError):
+            read_page(base_hwpx, "md", "x")
@@ -0,0 +1,141 @@
+"""
+hwp_replace.py 테스트.
+
+- Replacer: 다중 패턴 단일 패스 치환 (리터럴/정규식/단어 단위/대소문자 무시)
+- Replacer 정규식 검사: 빈 문자열 일치, 패턴 안 번호 역참조, 중복 그룹 이름 거부
+- Replacer 정규식 치환: 전후방 탐색·앵커가 원문 맥락에서 적용됨
+- replace_in_section: hp:t 텍스트만 치환, 마크업 보존, 바뀌지 않은 텍스트와 엔티티 그대로 유지
+- replace_many: HWPX 전체 치환, 패턴별 적중 수, 변경 없는 항목 원본 복사, 미리보기 적중은 세지 않음
+"""
+
+import json
+import zipfile
+
+import pytest
+
+from hwp_replace import Replacer, load_mapping, replace_in_section, replace_many
+from hwp_read import read_file
+
+
+class TestReplacer:
+    def test_longest_pattern_wins(self):
+        r = Replacer({"ab": "X", "abc": "Y", "b": "Z"})
+        assert r.sub("abcab b") == "YX Z"
+        assert r.counts == {"ab": 1, "abc": 1, "b": 1}
+
+    def test_many_literal_patterns(self):
+        mapping = {f"용어{i:04d}": f"<{i}>" for i in range(3000)}
+        r = Replacer(mapping)
+        assert r.sub("용어0007와 용어2999") == "<7>와 <2999>"
+        assert r.total == 2
+
+    def test_whole_word_and_ignore_case(self):
+        r = Replacer({"cat": "dog"}, whole_word=True, ignore_case=True)
+        assert r.sub("Cat concat CAT") == "dog concat dog"
+        assert r.counts["cat"] == 2
+
+    def test_regex_with_backreferences(self):
+        r = Replacer({r"(\d{3})-(\d{4})": r"\2-\1", "x+": "y"}, regex=True)
+        assert r.sub("123-4567 xxx") == "4567-123 y"
+
+    def test_regex_named_groups(self):
+        r = Replacer({r"(?P<y>\d{4})년": r"\g<y>.", r"(?P<w>\w)(?P=w)": "[반복]"}, regex=True)
+        assert r.sub("2024년 aa") == "2024. [반복]"
+
+    def test_regex_patterns_checked(self):
+        with pytest.raises(ValueError, match="empty"):
+            Replacer({"x*": "y"}, regex=True)
+        with pytest.raises(ValueError, match="backreference"):
+            Replacer({r"(a)\1": "b"}, regex=True)
+        with pytest.raises(ValueError, match="Group name"):
+            Replacer({"(?P<n>a)": "b", "(?P<n>c)": "d"}, regex=True)
+        assert Replacer({r"\\1": "x"}, regex=True).sub("\\1") == "x"
+
+    def test_regex_lookarounds_keep_context(self):
+        r = Replacer({"foo(?=bar)": "X", "(?<=a)b": "Y"}, regex=True)
+        assert r.sub("foobar ab foobaz") == "Xbar aY foobaz"
+        assert r.counts == {"foo(?=bar)": 1, "(?<=a)b": 1}
+
+    def test_regex_anchors(self):
+        r = Replacer({"^가": "A", "나$": "B", r"(\d+)(?=원)": r"[\1]"}, regex=True)
+        assert r.sub("가 가 나 나") == "A 가 나 B"
+        assert r.sub("100원 200") == "[100]원 200"
+
+    def test_regex_whole_word_groups(self):
+        r = Replacer({r"(\w+)@(\w+)": r"\2 at \1"}, regex=True, whole_word=True)
+        assert r.sub("a@b, xa@bx") == "b at a, bx at xa"
+
+    def test_uncounted_sub(self):
+        r = Replacer({"가": "나"})
+        assert r.sub("가가", counted=False) == "나나"
+        assert r.total == 0
+
+    def test_zero_width_matches_skipped(self):
+        r = Replacer({"(?=가)": "*", "나": "다"}, regex=True)
+        assert r.sub("가나") == "가다"
+        assert r.counts == {"(?=가)": 0, "나": 1}
+
+    def test_empty_mapping_rejected(self):
+        with pytest.raises(ValueError):
+            Replacer({})
+
+
+class TestReplaceInSection:
+    def test_only_text_nodes_changed(self):
+        xml = ('<hs:sec xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph">'
+               '<hp:p id="t"><hp:run><hp:t>t &amp; t<hp:tab/>t</hp:t></hp:run></hp:p></hs:sec>')
+        out = replace_in_section(xml, Replacer({"t": "<b>"}))
+        assert 'id="t"' in out and "<hp:tab/>" in out
+        assert "<hp:t>&lt;b&gt; &amp; &lt;b&gt;<hp:tab/>&lt;b&gt;</hp:t>" in out
+
+    def test_unchanged_runs_kept_verbatim(self):
+        kept = "say &quot;hi&quot; &#39;x&#39; &#xAC00;"
+        xml = ('<hs:sec xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph">'
+               f'<hp:p><hp:run><hp:t>{kept}</hp:t><hp:t>가 &amp; 나</hp:t></hp:run></hp:p></hs:sec>')
+        out = replace_in_section(xml, Replacer({"가 & 나": "A & B"}))
+        assert f"<hp:t>{kept}</hp:t>" in out
+        assert "<hp:t>A &amp; B</hp:t>" in out
+
+    def test_character_references_decoded_for_matching(self):
+        xml = ('<hs:sec xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph">'
+               '<hp:p><hp:run><hp:t>&#xAC00;&quot;</hp:t></hp:run></hp:p></hs:sec>')
+        out = replace_in_section(xml, Replacer({'가"': "ok"}))
+        assert "<hp:t>ok</hp:t>" in out
+
+
+class TestReplaceMany:
+    def test_counts_and_content(self, base_hwpx, tmp_path):
+        out = str(tmp_path / "replaced.hwpx")
+        counts = replace_many(base_hwpx, out, {"첫 번째": "1번", "단락": "문단", "없음": "x"})
+        assert counts == {"첫 번째": 1, "단락": 3, "없음": 0}
+        content = read_file(out, "txt")
+        assert "1번 문단입니다." in content and "단락" not in content
+
+    def test_untouched_members_copied_verbatim(self, base_hwpx, tmp_path):
+        out = str(tmp_path / "replaced.hwpx")
+        replace_many(base_hwpx, out, {"첫 번째": "1번"})
+        with zipfile.ZipFile(base_hwpx) as a, zipfile.ZipFile(out) as b:
+            assert a.namelist() == b.namelist()
+            for info in a.infolist():
+                if info.filename != "Contents/section0.xml":
+                    assert b.getinfo(info.filename).compress_size == info.compress_size
+
+    def test_load_mapping_formats(self, tmp_path):
+        (tmp_path / "m.json").write_text(json.dumps({"a": "b"}), encoding="utf-8")
+        (tmp_path / "m.csv").write_text("a,b\nc,\n", encoding="utf-8")
+        (tmp_path / "m.tsv").write_text("a\tb\n", encoding="utf-8")
+        assert load_mapping(str(tmp_path / "m.json")) == {"a": "b"}
+        assert load_mapping(str(tmp_path / "m.csv")) == {"a": "b", "c": ""}
+        assert load_mapping(str(tmp_path / "m.tsv")) == {"a": "b"}
+
+    def test_preview_hits_not_counted_twice(self, base_hwpx, tmp_path):
+        from hwp_package import HwpxPatch
+
+        src = str(tmp_path / "preview.hwpx")
+        patch = HwpxPatch(base_hwpx)
+        patch.write("Preview/PrvText.txt", "첫 번째 단락입니다.".encode("utf-8"))
+        patch.save(src)
+        out = str(tmp_path / "out.hwpx")
+        assert replace_many(src, out, {"첫 번째": "1번"}) == {"첫 번째": 1}
+        with zipfile.ZipFile(out) as zf:
+            assert zf.read("Preview/PrvText.txt").decode("utf-8") == "1번 단락입니다."
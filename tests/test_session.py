@@ -0,0 +1,162 @@
+"""
+hwp_session.py 테스트.
+
+- Session: 캐시된 문서에서 읽기/검색/분석, 연속 편집 후 명시적 저장
+- SessionStore: 메모리 예산 초과 시 LRU 해제, 편집 중인 문서는 유지, 해제 후 재파싱
+- 파일이 바뀐 경우 재파싱, 바이너리 HWP는 읽기 전용
+"""
+
+import os
+import shutil
+
+import pytest
+
+from hwp_read import Selection, read_file
+from hwp_session import SessionStore
+from hwp_sink import MemorySink
+from hwp_synth import write_hwp
+
+
+@pytest.fixture
+def hwpx(base_hwpx, tmp_path):
+    path = str(tmp_path / "doc.hwpx")
+    shutil.copy(base_hwpx, path)
+    return path
+
+
+def _read(session, output_format="txt", selection=None):
+    sink = MemorySink()
+    session.read(sink, output_format, selection)
+    return sink.getvalue()
+
+
+class TestSession:
+    def test_read_search_analyze(self, hwpx):
+        store = SessionStore()
+        handle = store.open(hwpx).handle
+        with store.use(handle) as session:
+            assert "두 번째 단락입니다." in _read(session).split("\n")
+            matches = session.search("번째")
+            assert [m["offset"] for m in matches] == [2, 2, 2]
+            assert session.text(matches[1]["para_index"]) == "두 번째 단락입니다."
+            assert _read(session, selection=Selection.from_specs("", "1:2")) == session.text(1)
+            info = session.analyze()
+            assert (info["section_count"], info["dirty"]) == (1, False)
+
+    def test_read_page_includes_unsaved_edits(self, hwpx):
+        store = SessionStore()
+        handle = store.open(hwpx).handle
+        with store.use(handle) as session:
+            session.edit([{"op": "add_paragraph", "text": "추가"}])
+            first = session.read_page("txt", max_paragraphs=3)
+            rest = session.read_page("txt", first["next_cursor"])
+            assert rest["next_cursor"] is None
+            assert f"{first['content']}\n{rest['content']}".strip().endswith("세 번째 단락입니다.\n추가")
+
+    def test_chained_edits_saved_explicitly(self, hwpx, tmp_path):
+        store = SessionStore()
+        handle = store.open(hwpx).handle
+        before = os.path.getmtime(hwpx)
+        with store.use(handle) as session:
+            session.edit([{"op": "replace", "find": "첫 번째", "replace": "1번"}])
+        with store.use(handle) as session:
+            n = session.search("세 번째")[0]["para_index"]
+            session.edit([{"op": "add_paragraph", "text": "끝 단락", "after": n},
+                          {"op": "add_table", "headers": ["A"], "rows": [["1"]]}])
+            assert session.dirty and "1번 단락입니다." in _read(session)
+        assert os.path.getmtime(hwpx) == before
+
+        out = str(tmp_path / "saved.hwpx")
+        result = store.close(handle, save=True, output_path=out)
+        assert result == {"session": handle, "path": out, "discarded": False}
+        text = read_file(out, "txt")
+        assert "1번 단락입니다." in text and "끝 단락" in text
+        assert store.stats()["sessions"] == 0
+
+    def test_save_in_place_with_table_reloads(self, hwpx):
+        store = SessionStore()
+        handle = store.open(hwpx).handle
+        with store.use(handle) as session:
+            session.edit([{"op": "add_table", "headers": ["열"], "rows": [["값"]]}])
+            assert session.save() == hwpx
+            assert not session.loaded
+        with store.use(handle) as session:
+            assert session.analyze()["table_count"] == 1
+            assert not session.dirty
+
+    def test_failed_operation_reports_applied(self, hwpx):
+        store = SessionStore()
+        handle = store.open(hwpx).handle
+        with store.use(handle) as session:
+            with pytest.raises(ValueError, match="1 earlier"):
+                session.edit([{"op": "add_paragraph", "text": "x"},
+                               {"op": "delete", "para_index": 999}])
+            assert session.dirty
+        assert store.close(handle)["discarded"]
+
+
+class TestStore:
+    def test_lru_eviction_and_reload(self, hwpx, tmp_path):
+        other = str(tmp_path / "other.hwpx")
+        shutil.copy(hwpx, other)
+        store = SessionStore(budget_mb=0)
+        first = store.open(hwpx).handle
+        second = store.open(other).handle
+        stats = store.stats()
+        assert (stats["loaded"], stats["evictions"]) == (0, 2)
+        with store.use(first) as session:
+            assert session.search("첫 번째")
+        assert store.stats()["misses"] == 3
+        store.close(first)
+        store.close(second)
+
+    def test_dirty_sessions_pinned(self, hwpx, tmp_path):
+        other = str(tmp_path / "other.hwpx")
+        shutil.copy(hwpx, other)
+        store = SessionStore(budget_mb=0)
+        first = store.open(hwpx).handle
+        with store.use(first) as session:
+            session.edit([{"op": "replace", "find": "첫 번째", "replace": "1번"}])
+        store.open(other)
+        with store.use(first) as session:
+            assert session.loaded and "1번" in session.text(session.search("1번")[0]["para_index"])
+        assert store.stats()["dirty"] == 1
+
+    def test_cache_hits_and_stale_reload(self, hwpx, base_hwpx):
+        store = SessionStore()
+        handle = store.open(hwpx).handle
+        with store.use(handle):
+            pass
+        assert (store.stats()["hits"], store.stats()["misses"]) == (1, 1)
+        from hwp_edit import replace_text
+
+        replace_text(base_hwpx, hwpx, "두 번째", "2번")
+        os.utime(hwpx, ns=(1, 1))
+        with store.use(handle) as session:
+            assert session.search("2번")
+        assert store.stats()["misses"] == 2
+
+    def test_limits_and_unknown_handles(self, hwpx):
+        store = SessionStore(max_sessions=1)
+        handle = store.open(hwpx).handle
+        with pytest.raises(RuntimeError):
+            store.open(hwpx)
+        store.close(handle)
+        with pytest.raises(ValueError):
+            with store.use(handle):
+                pass
+        with pytest.raises(FileNotFoundError):
+            store.open(hwpx + ".missing.hwpx")
+
+
+class TestBinarySession:
+    def test_read_only(self, tmp_path):
+        path = write_hwp(str(tmp_path / "doc.hwp"), [["첫 단락", ""], ["둘째 구역 단락"]])
+        store = SessionStore()
+        handle = store.open(path).handle
+        with store.use(handle) as session:
+            assert (len(session), session.section_count) == (3, 2)
+            assert session.search("구역") == [{"para_index": 2, "offset": 3, "text": "둘째 구역 단락"}]
+            assert _read(session, selection=Selection.from_specs("1", "")) == "둘째 구역 단락"
+            with pytest.raises(ValueError):
+                session.edit([{"op": "replace", "find": "첫", "replace": "1"}])
@@ -0,0 +1,102 @@
+"""
+hwp_sink.py 테스트.
+
+- MemorySink / FileSink / StdoutSink: 증분 출력, bytes_written은 인코딩된 바이트 수
+- FileSink: 임시 파일에 쓰고 정상 종료 시 교체, 실패 시 기존 파일 유지
+- write_file / write_json / write_html: 싱크 기반 변환기
+"""
+
+import json
+
+import pytest
+
+from hwp_sink import FileSink, MemorySink, StdoutSink, StreamSink, open_sink
+
+
+def _pyhwp2md_available() -> bool:
+    try:
+        import pyhwp2md  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+class TestSinks:
+    def test_memory_sink_collects_chunks(self):
+        sink = MemorySink()
+        sink.write("가")
+        sink.writelines(["나", "다"])
+        assert sink.getvalue() == "가나다"
+
+    def test_memory_sink_binary(self):
+        sink = MemorySink(binary=True)
+        sink.write(b"%PDF-")
+        assert sink.getvalue() == b"%PDF-"
+        assert sink.bytes_written == 5
+
+    def test_file_sink_writes_utf8(self, tmp_path):
+        out = tmp_path / "sub" / "out.txt"
+        with FileSink(str(out)) as sink:
+            sink.write("한글 ")
+            sink.write("텍스트")
+        assert out.read_text(encoding="utf-8") == "한글 텍스트"
+        assert sink.bytes_written == len("한글 텍스트".encode("utf-8"))
+        assert not (tmp_path / "sub" / "out.txt.tmp").exists()
+
+    def test_file_sink_failure_keeps_existing(self, tmp_path):
+        out = tmp_path / "out.md"
+        out.write_text("기존 내용", encoding="utf-8")
+        with pytest.raises(RuntimeError):
+            with FileSink(str(out)) as sink:
+                sink.write("일부")
+                assert out.read_text(encoding="utf-8") == "기존 내용"
+                raise RuntimeError("변환 실패")
+        assert out.read_text(encoding="utf-8") == "기존 내용"
+        assert [p.name for p in tmp_path.iterdir()] == ["out.md"]
+
+    def test_stdout_sink_ends_with_newline(self, capsys):
+        with StdoutSink() as sink:
+            sink.write("line")
+        assert capsys.readouterr().out == "line\n"
+
+    def test_stream_sink_leaves_stream_open(self):
+        import io
+
+        buf = io.BytesIO()
+        with StreamSink(buf) as sink:
+            sink.write(b"%PDF-")
+        assert sink.binary and not buf.closed
+        assert buf.getvalue() == b"%PDF-"
+        assert not StreamSink(io.StringIO()).binary
+
+    def test_open_sink_dispatch(self, tmp_path):
+        assert isinstance(open_sink(None), StdoutSink)
+        sink = open_sink(str(tmp_path / "x.md"))
+        sink.close()
+        assert isinstance(sink, FileSink)
+
+
+class TestSinkWriters:
+    def test_write_file_matches_read_file(self, base_hwpx):
+        from hwp_read import read_file, write_file
+
+        sink = MemorySink()
+        write_file(base_hwpx, sink, "md")
+        assert sink.getvalue() == read_file(base_hwpx, "md")
+
+    def test_write_json_is_valid(self, base_hwpx):
+        from hwp_read import read_file, write_json
+
+        sink = MemorySink()
+        write_json(base_hwpx, sink)
+        data = json.loads(sink.getvalue())
+        assert data == {"source": base_hwpx, "content": read_file(base_hwpx, "md")}
+
+    @pytest.mark.skipif(not _pyhwp2md_available(), reason="pyhwp2md 미설치")
+    def test_write_html_to_file(self, base_hwpx, tmp_path):
+        from hwp_convert import convert_to_html, write_html
+
+        out = tmp_path / "out.html"
+        with FileSink(str(out)) as sink:
+            write_html(base_hwpx, sink)
+        assert out.read_text(encoding="utf-8") == convert_to_html(base_hwpx)
@@ -0,0 +1,181 @@
+"""
+hwp_synth.py 테스트.
+
+- write_hwp: FileHeader/DocInfo/요약 정보/BodyText/BinData/PrvText 스트림, 압축/비압축
+- 구역 첫 문단의 구역·단 정의 컨트롤, 표 레코드(CTRL_HEADER/TABLE/LIST_HEADER)와 4095바이트 이상 레코드의 확장 크기 형식
+- synthetic_sections: 문단·구역·표 수 조절
+- 무작위 문서(고정 시드): 생성한 텍스트가 olefile 파서로 그대로 읽힘
+- 무작위 손상(잘림/바이트 변조): 파서가 정해진 예외만 내거나 텍스트를 돌려줌
+"""
+
+import random
+import struct
+import zlib
+
+import olefile
+import pytest
+
+from hwp_analyze import analyze_hwp
+from hwp_binary import PARA_TEXT, iter_records
+from hwp_ole import write_compound
+from hwp_read import iter_hwp_paragraphs, read_hwp_with_olefile
+from hwp_replace import replace_many
+from hwp_synth import (
+    CTRL_HEADER, LIST_HEADER, PAGE_DEF, SECTION_CONTROLS, TABLE, TABLE_CONTROL, hwp_streams,
+    paragraph, section, synthetic_sections, write_hwp,
+)
+
+HANGUL = [chr(c) for c in range(0xAC00, 0xD7A4, 97)]
+ASCII = list("abcdefghijklmnopqrstuvwxyz0123456789 .,-()")
+
+
+def _text(rng, n):
+    alphabet = HANGUL + ASCII + ["\t"]
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def _random_document(rng):
+    """Random sections of paragraphs and tables, and the texts a reader should return."""
+    sections, expected = [], []
+    for _ in range(rng.randint(1, 4)):
+        blocks = []
+        for _ in range(rng.randint(0, 12)):
+            if rng.random() < 0.2:
+                rows = [[_text(rng, rng.randint(0, 8)) for _ in range(rng.randint(1, 5))]
+                        for _ in range(rng.randint(1, 4))]
+                blocks.append(rows)
+                width = max(len(r) for r in rows)
+                expected += [cell.strip() for row in rows for cell in row + [""] * (width - len(row))]
+            else:
+                # Mostly short paragraphs, sometimes long enough for an extended-size record.
+                text = _text(rng, rng.choice([0, 1, 5, 40, 300, 2100]))
+                blocks.append(text)
+                expected.append(text.strip())
+        sections.append(blocks)
+    return sections, [t for t in expected if t]
+
+
+@pytest.fixture
+def doc(tmp_path):
+    sections = [["첫 단락", [["가", "나"], ["다", "라"]], "표 뒤 단락"], ["둘째 구역"]]
+    return write_hwp(str(tmp_path / "doc.hwp"), sections,
+                     images=[("png", b"\x89PNG" + bytes(1000)), ("jpg", b"\xff\xd8" + bytes(10))])
+
+
+class TestWriter:
+    def test_streams(self, doc):
+        with olefile.OleFileIO(doc) as ole:
+            names = {"/".join(e) for e in ole.listdir()}
+            header = ole.openstream("FileHeader").read()
+            preview = ole.openstream("PrvText").read().decode("utf-16-le")
+        assert names == {"FileHeader", "DocInfo", "\x05HwpSummaryInformation", "PrvText",
+                         "BodyText/Section0",
+                         "BodyText/Section1", "BinData/BIN0001.png", "BinData/BIN0002.jpg"}
+        assert header.startswith(b"HWP Document File") and len(header) == 256
+        assert header[36] & 1 and preview == "첫 단락"
+
+    def test_read_back(self, doc):
+        assert read_hwp_with_olefile(doc).split("\n") == [
+            "첫 단락", "가", "나", "다", "라", "표 뒤 단락", "둘째 구역"]
+        paragraphs = list(iter_hwp_paragraphs(doc))
+        assert paragraphs[1] == (0, 1, ["가", "나", "다", "라"])
+        assert paragraphs[3] == (1, 0, ["둘째 구역"])
+
+    def test_analyze(self, doc):
+        info = analyze_hwp(doc)
+        assert info["metadata"]["version"] == "5.0.3.0"
+        assert info["metadata"]["compressed"] is True
+        assert info["stats"]["section_count"] == 2
+        assert info["stats"]["image_count"] == 2
+        assert info["stats"]["table_count"] == 1
+
+    def test_table_records(self):
+        records = [(tag, level) for tag, level, *_ in iter_records(section([[["a", "b", "c"]]]))]
+        assert (TABLE, 2) in records
+        assert records.count((LIST_HEADER, 2)) == 3
+        assert records.count((PARA_TEXT, 3)) == 3
+        data = paragraph("앞" + TABLE_CONTROL)
+        texts = [data[start:end] for tag, _, _, start, end in iter_records(data) if tag == PARA_TEXT]
+        assert texts == [("앞" + TABLE_CONTROL + "\r").encode("utf-16-le")]
+
+    def test_section_definition(self):
+        body = section(["첫 단락", "둘째 단락"])
+        records = list(iter_records(body))
+        texts = [body[start:end].decode("utf-16-le") for tag, _, _, start, end in records
+                 if tag == PARA_TEXT]
+        assert texts == [SECTION_CONTROLS + "첫 단락\r", "둘째 단락\r"]
+        ids = [body[start:start + 4] for tag, _, _, start, _ in records if tag == CTRL_HEADER]
+        assert ids == [b"dces", b"dloc"]
+        assert [level for tag, level, *_ in records if tag == PAGE_DEF] == [2]
+        # An empty section still carries its definition in one empty paragraph.
+        empty = section([])
+        assert [empty[start:end] for tag, _, _, start, end in iter_records(empty)
+                if tag == PARA_TEXT] == [(SECTION_CONTROLS + "\r").encode("utf-16-le")]
+
+    def test_extended_size_and_uncompressed(self, tmp_path):
+        long = "가" * 3000
+        path = write_hwp(str(tmp_path / "long.hwp"), [["짧은 단락", long]], compressed=False)
+        with olefile.OleFileIO(path) as ole:
+            assert ole.openstream("FileHeader").read()[36] & 1 == 0
+            body = ole.openstream("BodyText/Section0").read()
+        sizes = [end - start for tag, _, _, start, end in iter_records(body) if tag == PARA_TEXT]
+        assert sizes == [44, 6002]          # the first one also holds the section definition
+        header = struct.unpack_from("<I", body, [s for t, _, s, _, _ in iter_records(body)
+                                                if t == PARA_TEXT][1])[0]
+        assert header >> 20 == 0xFFF
+        assert read_hwp_with_olefile(path) == "짧은 단락\n" + long
+
+    def test_binary_patcher(self, doc, tmp_path):
+        out = str(tmp_path / "out.hwp")
+        assert replace_many(doc, out, {"나": "나나", "구역": "섹션"}) == {"나": 1, "구역": 1}
+        assert "나나" in read_hwp_with_olefile(out) and "둘째 섹션" in read_hwp_with_olefile(out)
+
+
+class TestSyntheticSections:
+    def test_scale(self, tmp_path):
+        sections = synthetic_sections(paragraphs=200, sections=3, tables=4, table_rows=3,
+                                      table_cols=2, long_every=50)
+        assert len(sections) == 3
+        blocks = [b for s in sections for b in s]
+        assert sum(isinstance(b, str) for b in blocks) == 200
+        assert sum(isinstance(b, list) for b in blocks) == 4
+        assert sum(isinstance(b, str) and len(b) > 2046 for b in blocks) == 4
+        path = write_hwp(str(tmp_path / "big.hwp"), sections)
+        assert analyze_hwp(path)["stats"]["section_count"] == 3
+        assert synthetic_sections(10, seed=1) == synthetic_sections(10, seed=1)
+
+
+class TestFuzz:
+    @pytest.mark.parametrize("seed", range(30))
+    def test_round_trip(self, seed, tmp_path):
+        rng = random.Random(seed)
+        sections, expected = _random_document(rng)
+        path = write_hwp(str(tmp_path / "fuzz.hwp"), sections, compressed=rng.random() < 0.7)
+        text = read_hwp_with_olefile(path)
+        assert (text.split("\n") if text else []) == expected
+        # An empty section holds the paragraph carrying its definition.
+        assert [p[:2] for p in iter_hwp_paragraphs(path)] == [
+            (s, p) for s, blocks in enumerate(sections) for p in range(len(blocks) or 1)]
+
+    @pytest.mark.parametrize("seed", range(30))
+    def test_corruption(self, seed, tmp_path):
+        rng = random.Random(seed)
+        sections, _ = _random_document(rng)
+        compressed = rng.random() < 0.5
+        streams = dict(hwp_streams(sections, compressed))
+        body = bytearray(streams["BodyText/Section0"])
+        if body and rng.random() < 0.5:
+            del body[rng.randrange(len(body)):]
+        for _ in range(rng.randint(1, 8)):
+            if body:
+                body[rng.randrange(len(body))] = rng.randrange(256)
+        streams["BodyText/Section0"] = bytes(body)
+
+        path = str(tmp_path / "bad.hwp")
+        with open(path, "wb") as f:
+            write_compound(f, list(streams.items()))
+        for parse in (read_hwp_with_olefile, lambda p: list(iter_hwp_paragraphs(p)), analyze_hwp):
+            try:
+                parse(path)
+            except (ValueError, zlib.error):
+                pass
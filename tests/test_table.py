@@ -0,0 +1,97 @@
+"""
+hwp_table.py 테스트.
+
+- iter_table_xml: hp:tbl XML 직접 직렬화
+- BulkTables: 문서 저장 시 표 XML 삽입 (iterable / columnar 입력), 저장 중 실패 시 기존 파일 유지
+"""
+
+import zipfile
+
+import pytest
+
+from hwp_table import BulkTables, iter_table_xml
+
+
+def _tables(path):
+    from hwpx.document import HwpxDocument
+
+    doc = HwpxDocument.open(path)
+    return [t for p in doc.paragraphs for t in getattr(p, "tables", [])]
+
+
+def _blank_doc():
+    from io import BytesIO
+
+    from hwpx.document import HwpxDocument
+    from hwpx.templates import blank_document_bytes
+
+    return HwpxDocument.open(BytesIO(blank_document_bytes()))
+
+
+class TestIterTableXml:
+    def test_row_and_col_count(self):
+        xml = "".join(iter_table_xml(["A", "B"], [["1", "2"], ["3", "4"]]))
+        assert 'rowCnt="3"' in xml and 'colCnt="2"' in xml
+        assert xml.count("<hp:tr>") == 3
+
+    def test_generator_rows_are_counted(self):
+        rows = ([str(i), str(i * 2)] for i in range(10))
+        xml = "".join(iter_table_xml(["A", "B"], rows))
+        assert 'rowCnt="11"' in xml
+
+    def test_text_is_escaped(self):
+        xml = "".join(iter_table_xml(["<h>"], [["a&b"]]))
+        assert "&lt;h&gt;" in xml and "a&amp;b" in xml
+
+    def test_no_headers_no_rows_raises(self):
+        with pytest.raises(ValueError):
+            "".join(iter_table_xml([], []))
+
+
+class TestBulkTables:
+    def test_cells_readable_by_python_hwpx(self, tmp_path):
+        doc = _blank_doc()
+        tables = BulkTables(doc)
+        tables.add(headers=["이름", "나이"], rows=[["철수", "20"], ["영희"]])
+        out = tables.save(str(tmp_path / "bulk.hwpx"))
+
+        (table,) = _tables(out)
+        assert (table.row_count, table.column_count) == (3, 2)
+        assert table.cell(1, 0).text == "철수"
+        assert table.cell(2, 1).text == ""
+
+    def test_columnar_input(self, tmp_path):
+        doc = _blank_doc()
+        tables = BulkTables(doc)
+        tables.add(columns={"x": ["1", "2", "3"], "y": ["a", "b", "c"]})
+        out = tables.save(str(tmp_path / "columns.hwpx"))
+
+        (table,) = _tables(out)
+        assert table.cell(0, 1).text == "y"
+        assert table.cell(3, 1).text == "c"
+
+    def test_large_streamed_table(self, tmp_path):
+        doc = _blank_doc()
+        tables = BulkTables(doc)
+        tables.add(headers=["id", "v"], rows=((i, i * i) for i in range(5000)))
+        out = tables.save(str(tmp_path / "large.hwpx"))
+        with zipfile.ZipFile(out) as zf:
+            assert zf.testzip() is None
+            xml = zf.read("Contents/section0.xml").decode("utf-8")
+        assert 'rowCnt="5001"' in xml
+        assert "@@HWP-BULK-TABLE" not in xml
+
+    def test_failed_save_keeps_existing_file(self, tmp_path):
+        out = tmp_path / "keep.hwpx"
+        out.write_bytes(b"existing")
+
+        def rows():
+            yield ["1", "2"]
+            raise RuntimeError("데이터 오류")
+
+        tables = BulkTables(_blank_doc())
+        tables.add(headers=["a", "b"], rows=rows())
+        with pytest.raises(RuntimeError):
+            tables.save(str(out))
+        assert out.read_bytes() == b"existing"
+        assert [p.name for p in tmp_path.iterdir()] == ["keep.hwpx"]
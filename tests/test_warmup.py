@@ -0,0 +1,63 @@
+"""
+hwp_warmup.py 테스트.
+
+- HWP_MCP_WARMUP 해석 (all/none/목록, 알 수 없는 백엔드 거부)
+- warm: import 시간 기록, 실패해도 예외 없음, quiet이면 stdout 대신 stderr로 출력
+- WarmUp: 백그라운드 예열, 프로세스 풀 작업자가 시작할 때 백엔드를 미리 import
+"""
+
+import asyncio
+import os
+
+import pytest
+
+import hwp_warmup
+from hwp_pool import Offload
+from hwp_warmup import WarmUp, selected_backends, timings, warm
+
+
+class TestSelection:
+    def test_specs(self, monkeypatch):
+        assert selected_backends("all") == list(hwp_warmup.BACKENDS)
+        assert selected_backends("none") == []
+        assert selected_backends(" markdown, olefile ") == ["markdown", "olefile"]
+        with pytest.raises(ValueError):
+            selected_backends("markdown,docx")
+        monkeypatch.setenv("HWP_MCP_WARMUP", "off")
+        assert selected_backends() == []
+
+
+class TestWarm:
+    def test_records_timings_and_failures(self, monkeypatch, capsys):
+        monkeypatch.setitem(hwp_warmup.BACKENDS, "broken", "no_such_backend_module")
+        monkeypatch.setitem(hwp_warmup.PRIMERS, "broken", lambda: None)
+        monkeypatch.setitem(hwp_warmup.BACKENDS, "noisy", "os")
+        monkeypatch.setitem(hwp_warmup.PRIMERS, "noisy", lambda: print("banner"))
+        result = warm(["olefile", "broken", "noisy"], quiet=True)
+        entries = result["backends"]
+        assert result["pid"] == os.getpid()
+        assert entries["olefile"]["ok"] and entries["olefile"]["seconds"] >= 0
+        assert not entries["broken"]["ok"] and "ModuleNotFoundError" in entries["broken"]["error"]
+        out = capsys.readouterr()
+        assert "banner" in out.err and "banner" not in out.out
+
+
+class TestWarmUp:
+    def test_off_does_nothing(self):
+        warmup = WarmUp(Offload({"work": ("thread", 1, 1)}), backends=[])
+        warmup.start()
+        assert warmup.status()["state"] == "off"
+
+    def test_process_workers_start_warm(self):
+        offload = Offload({"cpu": ("process", 1, 2), "work": ("thread", 1, 1)})
+        warmup = WarmUp(offload, backends=["olefile"])
+        try:
+            warmup.start()
+            assert warmup.wait(60)
+            assert warmup.status()["state"] == "done"
+            worker = asyncio.run(offload.run("cpu", timings))
+            assert worker["pid"] != os.getpid()
+            assert worker["backends"]["olefile"]["ok"]
+            assert "olefile" in timings()["backends"]
+        finally:
+            offload.shutdown()